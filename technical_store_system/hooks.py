@@ -105,18 +105,57 @@ doc_events = {
 	"Store Location": {
 		"before_insert": "technical_store_system.utils.controllers.store_location_controller.before_insert_event",
 		"before_save": "technical_store_system.utils.controllers.store_location_controller.before_save_event",
+		"after_insert": "technical_store_system.utils.helpers.doctype_counter.count_after_insert_event",
+		"on_trash": "technical_store_system.utils.helpers.doctype_counter.count_on_trash_event",
 	},
 	"Store Item Group": {
 		"before_insert": "technical_store_system.utils.controllers.item_group_controller.before_insert_event",
 		"before_save": "technical_store_system.utils.controllers.item_group_controller.before_save_event",
 		"on_update": "technical_store_system.utils.controllers.item_group_controller.on_update_event",
 		"before_delete": "technical_store_system.utils.controllers.item_group_controller.before_delete_event",
+		"after_insert": "technical_store_system.utils.helpers.doctype_counter.count_after_insert_event",
+		"on_trash": "technical_store_system.utils.helpers.doctype_counter.count_on_trash_event",
+	},
+	"Store UOM": {
+		"validate": "technical_store_system.utils.controllers.store_uom_controller.validate_event",
+		"on_update": "technical_store_system.utils.controllers.store_uom_controller.on_update_event",
+		"on_trash": [
+			"technical_store_system.utils.controllers.store_uom_controller.on_trash_event",
+			"technical_store_system.utils.helpers.doctype_counter.count_on_trash_event",
+		],
+		"after_insert": "technical_store_system.utils.helpers.doctype_counter.count_after_insert_event",
+	},
+	"Store Item": {
+		"after_insert": [
+			"technical_store_system.utils.controllers.store_item_controller.after_insert_event",
+			"technical_store_system.utils.helpers.doctype_counter.count_after_insert_event",
+		],
+		"on_trash": "technical_store_system.utils.helpers.doctype_counter.count_on_trash_event",
+	},
+	"Store Stock Ledger Entry": {
+		"before_insert": "technical_store_system.utils.controllers.stock_ledger_controller.ledger_before_insert_event",
+		"validate": "technical_store_system.utils.controllers.stock_ledger_controller.ledger_validate_event",
+		"on_trash": "technical_store_system.utils.controllers.stock_ledger_controller.ledger_on_trash_event",
+	},
+	"Store Stock Balance": {
+		"validate": "technical_store_system.utils.controllers.stock_ledger_controller.balance_validate_event",
+		"on_trash": "technical_store_system.utils.controllers.stock_ledger_controller.balance_on_trash_event",
 	}
 }
 
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+	"hourly": [
+		"technical_store_system.utils.helpers.stock_repost.resume_pending_reposts",
+	],
+	"daily": [
+		"technical_store_system.utils.helpers.stock_snapshot.create_due_snapshots",
+		"technical_store_system.utils.helpers.doctype_counter.reconcile_counts",
+	],
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"technical_store_system.tasks.all"
@@ -6,37 +6,59 @@ Central installer that calls all setup modules during installation/uninstallatio
 import frappe
 from frappe import _
 
+from frappe.utils import now_datetime
+
+from technical_store_system.utils.helpers.install_phase import (
+	print_phase_timings,
+	rollback_to_savepoint,
+	run_phase,
+	save_install_log
+)
+
 
 def after_install():
 	"""
 	Universal installer - runs after app installation
 	Calls all setup modules in proper order
+	
+	Each step runs as one phase: a single transaction committed at the end
+	of the phase (see utils/helpers/install_phase.py), with per-object
+	savepoints inside the setup helpers. Wall time, query count and rows
+	written per phase are printed at the end and stored as a Store Install Log.
 	"""
+	timings = []
+	started_at = now_datetime()
 	try:
 		print("\n" + "="*60)
 		print("🚀 Installing Technical Store System...")
 		print("="*60)
 		
 		# 1. Create default roles (before DocTypes for permissions)
-		create_default_roles()
+		run_phase("Roles", create_default_roles, timings)
 		
 		# 2. Install DocTypes (auto-discovers all DocTypes + runs post-install hooks)
-		install_doctypes()
+		run_phase("DocTypes", install_doctypes, timings)
 		
 		# 3. Create Store Settings (if not auto-created)
-		create_store_settings()
+		run_phase("Store Settings", create_store_settings, timings)
 		
 		# 4. Install client scripts (for UI behavior)
-		install_client_scripts()
+		run_phase("Client Scripts", install_client_scripts, timings)
 		
 		# 5. Install workspace (after DocTypes exist, to avoid link errors)
-		install_workspace()
+		run_phase("Workspace", install_workspace, timings)
 		
 		# 6. Set up default permissions
-		setup_default_permissions()
+		run_phase("Permissions", setup_default_permissions, timings)
+		
+		# 7. Row counters (before demo data, so its inserts are counted)
+		run_phase("Counters", reconcile_counters, timings)
 		
-		# Commit changes
-		frappe.db.commit()
+		# 8. Demo data (only if enabled in Store Settings)
+		run_phase("Demo Data", install_demo_data, timings)
+		
+		print_phase_timings(timings)
+		save_install_log("Install", started_at, timings)
 		
 		print("\n" + "="*60)
 		print("✅ Technical Store System installed successfully!")
@@ -44,6 +66,8 @@ def after_install():
 		
 	except Exception as e:
 		frappe.db.rollback()
+		print_phase_timings(timings)
+		save_install_log("Install", started_at, timings, status="Failed")
 		print(f"\n❌ Installation failed: {str(e)}")
 		frappe.log_error(frappe.get_traceback(), "Technical Store System Installation Failed")
 		raise
@@ -52,27 +76,27 @@ def after_install():
 def after_uninstall():
 	"""
 	Universal uninstaller - runs after app uninstallation
-	Calls all cleanup modules in proper order
+	Calls all cleanup modules in proper order (one transaction per phase)
 	"""
+	timings = []
 	try:
 		print("\n" + "="*60)
 		print("🗑️  Uninstalling Technical Store System...")
 		print("="*60)
 		
 		# 1. Uninstall DocTypes
-		uninstall_doctypes()
+		run_phase("DocTypes", uninstall_doctypes, timings)
 		
 		# 2. Uninstall workspace
-		uninstall_workspace()
+		run_phase("Workspace", uninstall_workspace, timings)
 		
 		# 3. Optional: Remove custom roles (be careful!)
-		# remove_custom_roles()
+		# run_phase("Roles", remove_custom_roles, timings)
 		
 		# 4. Clear caches
 		frappe.clear_cache()
 		
-		# Commit changes
-		frappe.db.commit()
+		print_phase_timings(timings)
 		
 		print("\n" + "="*60)
 		print("✅ Technical Store System uninstalled successfully!")
@@ -80,6 +104,7 @@ def after_uninstall():
 		
 	except Exception as e:
 		frappe.db.rollback()
+		print_phase_timings(timings)
 		print(f"\n❌ Uninstallation failed: {str(e)}")
 		frappe.log_error(frappe.get_traceback(), "Technical Store System Uninstallation Failed")
 
@@ -87,27 +112,75 @@ def after_uninstall():
 def after_migrate():
 	"""
 	Run after migrations to update workspace and other configurations
+	(one transaction per phase, profiled into a Store Install Log)
 	"""
+	timings = []
+	started_at = now_datetime()
 	try:
 		print("\n📦 Updating Technical Store System configurations...")
 		
 		# Update workspace with latest configuration
-		update_workspace()
+		run_phase("Workspace", update_workspace, timings)
 		
 		# Update DocTypes
-		update_doctypes()
+		run_phase("DocTypes", update_doctypes, timings)
+		
+		# Create missing row counters and repair drift
+		run_phase("Counters", reconcile_counters, timings)
 		
 		# Update any other configurations
-		# update_permissions()
+		# run_phase("Permissions", update_permissions, timings)
 		
-		frappe.db.commit()
+		print_phase_timings(timings)
+		save_install_log("Migrate", started_at, timings)
 		print("✅ Configurations updated successfully!\n")
 		
 	except Exception as e:
+		print_phase_timings(timings)
+		save_install_log("Migrate", started_at, timings, status="Failed")
 		print(f"❌ Configuration update failed: {str(e)}\n")
 		frappe.log_error(frappe.get_traceback(), "Configuration Update Failed")
 
 
+def plan_migration():
+	"""
+	Dry-run migration planner - prints what after_migrate / install would change
+	
+	Diffs DocType, Client Script and workspace definitions against the
+	database read-only. DocType changes carry a DDL cost estimate so
+	expensive ALTERs on big tables can be scheduled in a maintenance window.
+	
+	Usage:
+		bench --site <site> execute technical_store_system.installer.plan_migration
+	
+	Returns:
+		dict: {"doctypes": list, "client_scripts": list, "workspace": dict}
+	"""
+	from technical_store_system.setup import client_scripts_setup, doctypes_setup, workspace_setup
+	
+	print("\n" + "="*60)
+	print("🔍 Technical Store System migration plan (dry run)")
+	print("="*60)
+	
+	plan = {
+		"doctypes": doctypes_setup.plan(),
+		"client_scripts": client_scripts_setup.plan(),
+		"workspace": workspace_setup.plan(),
+	}
+	
+	maintenance = [
+		result["doctype_name"] for result in plan["doctypes"] if result["maintenance_window"]
+	]
+	print("\n" + "="*60)
+	if maintenance:
+		print(f"⚠️  Maintenance window recommended for: {', '.join(maintenance)}")
+	else:
+		print("✅ No long-running DDL expected")
+	print("="*60 + "\n")
+	
+	return plan
+
+
 # ============================================================================
 # WORKSPACE INSTALLATION
 # ============================================================================
@@ -204,6 +277,36 @@ def uninstall_doctypes():
 		frappe.log_error(frappe.get_traceback(), "DocTypes Uninstallation Error")
 
 
+def reconcile_counters():
+	"""Create / repair the Store Doctype Counter records (committed with the phase)"""
+	frappe.db.savepoint("store_counters")
+	try:
+		from technical_store_system.utils.helpers.doctype_counter import reconcile_counts
+		print("  → Reconciling row counters...")
+		result = reconcile_counts(commit=False)
+		print(f"    ✓ {result['message']}")
+	except Exception as e:
+		# Leave all counters as they were; the daily job repairs them
+		rollback_to_savepoint("store_counters")
+		print(f"  ⚠️ Row counter reconciliation error: {str(e)}")
+		frappe.log_error(frappe.get_traceback(), "Row Counter Reconciliation Error")
+
+
+def install_demo_data():
+	"""Install demo data for all registered DocTypes (if enabled in Store Settings)"""
+	try:
+		from technical_store_system.utils.helpers.demo_data_handler import install_all_demo_data
+		print("  → Installing demo data...")
+		result = install_all_demo_data()
+		if result["total_created"] > 0:
+			print(f"    ✓ {result['total_created']} demo record(s) created")
+		else:
+			print("    ℹ No demo data installed")
+	except Exception as e:
+		print(f"  ⚠️ Demo data installation error: {str(e)}")
+		frappe.log_error(frappe.get_traceback(), "Demo Data Installation Error")
+
+
 # ============================================================================
 # ROLES & PERMISSIONS
 # ============================================================================
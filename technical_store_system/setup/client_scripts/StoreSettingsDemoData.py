@@ -1,6 +1,8 @@
 """
 Store Settings Client Script
 Handles button clicks and UI behavior for demo data management
+Install / removal run as background Store Maintenance Jobs; progress is
+shown from realtime updates
 """
 
 client_script = {
@@ -58,21 +60,18 @@ frappe.ui.form.on('Store Settings', {
 					() => {
 						// Save form first to capture checkbox selections
 						frm.save().then(() => {
-							frappe.dom.freeze('Installing selected demo data...');
 							frappe.call({
 								method: 'technical_store_system.utils.controllers.store_settings_controller.install_demo_data',
+								freeze: true,
+								freeze_message: 'Queueing demo data installation...',
 								callback: (r) => {
-									frappe.dom.unfreeze();
 									if (r.message && r.message.success) {
 										frappe.show_alert({
 											message: r.message.message,
-											indicator: 'green'
+											indicator: 'blue'
 										}, 5);
-										frm.reload_doc();
+										watch_maintenance_job(frm, r.message.job, 'Installing Demo Data');
 									}
-								},
-								error: (r) => {
-									frappe.dom.unfreeze();
 								}
 							});
 						});
@@ -119,21 +118,20 @@ frappe.ui.form.on('Store Settings', {
 					`• ${counts.location} Locations<br><br>` +
 					`<em style="color: #d9534f;">This action cannot be undone!</em>`,
 					() => {
-						frappe.dom.freeze('Removing demo data...');
 						frappe.call({
 							method: 'technical_store_system.utils.controllers.store_settings_controller.uninstall_demo_data',
+							freeze: true,
+							freeze_message: 'Queueing demo data removal...',
 							callback: (r) => {
-								frappe.dom.unfreeze();
 								if (r.message && r.message.success) {
 									frappe.show_alert({
 										message: r.message.message,
-										indicator: 'green'
+										indicator: 'blue'
 									}, 5);
-									frm.reload_doc();
+									if (r.message.job) {
+										watch_maintenance_job(frm, r.message.job, 'Removing Demo Data');
+									}
 								}
-							},
-							error: (r) => {
-								frappe.dom.unfreeze();
 							}
 						});
 					}
@@ -141,41 +139,106 @@ frappe.ui.form.on('Store Settings', {
 			});
 		});
 		
-		// Update button states
-		update_button_states(frm);
-	},
-	
-	onload: function(frm) {
-		update_button_states(frm);
+		// Demo data status is only loaded while the Demo Data tab is open
+		let demo_tab = (frm.layout.tabs || []).find(tab => tab.df.fieldname === 'demo_data_tab');
+		if (demo_tab) {
+			demo_tab.tab_link.find('.nav-link')
+				.off('shown.bs.tab.demo_data')
+				.on('shown.bs.tab.demo_data', () => {
+					update_button_states(frm);
+					resume_maintenance_job(frm);
+				});
+			if (demo_tab.is_active()) {
+				update_button_states(frm);
+				resume_maintenance_job(frm);
+			}
+		}
 	}
 });
 
+// ============================================================================
+// MAINTENANCE JOBS (demo data install / removal run in the background)
+// ============================================================================
+
+function watch_maintenance_job(frm, job_name, title) {
+	// Progress arrives over realtime from the worker (maintenance_jobs.py)
+	frappe.realtime.off('store_maintenance_progress');
+	frappe.realtime.on('store_maintenance_progress', (data) => {
+		if (data.name !== job_name) return;
+		
+		if (data.status === 'Queued' || data.status === 'Running') {
+			frappe.show_progress(title, data.progress || 0, 100, data.message || '');
+			return;
+		}
+		
+		frappe.realtime.off('store_maintenance_progress');
+		frappe.hide_progress();
+		frm.remove_custom_button('Cancel Maintenance Job');
+		
+		let indicator = {'Completed': 'green', 'Failed': 'red'}[data.status] || 'orange';
+		frappe.msgprint({
+			title: `${title}: ${data.status}`,
+			indicator: indicator,
+			message: data.result || (data.status === 'Failed' ? 'See the Store Maintenance Job for the error log.' : data.status)
+		});
+		frm.reload_doc();
+	});
+	
+	frm.remove_custom_button('Cancel Maintenance Job');
+	frm.add_custom_button('Cancel Maintenance Job', () => {
+		frappe.call({
+			method: 'technical_store_system.utils.helpers.maintenance_jobs.cancel_maintenance_job',
+			args: { name: job_name },
+			callback: (r) => {
+				if (r.message) {
+					frappe.show_alert({ message: r.message.message, indicator: 'orange' }, 5);
+				}
+				if (r.message && r.message.status === 'Cancelled') {
+					frappe.realtime.off('store_maintenance_progress');
+					frappe.hide_progress();
+					frm.remove_custom_button('Cancel Maintenance Job');
+				}
+			}
+		});
+	});
+}
+
+function resume_maintenance_job(frm) {
+	// Reattach to a job started earlier (page reload, another admin)
+	frappe.call({
+		method: 'technical_store_system.utils.helpers.maintenance_jobs.get_active_maintenance_job',
+		callback: (r) => {
+			let job = r.message;
+			if (!job) return;
+			
+			frm.fields_dict.install_demo_data_btn.$input.prop('disabled', true).css('opacity', '0.5');
+			frm.fields_dict.uninstall_demo_data_btn.$input.prop('disabled', true).css('opacity', '0.5');
+			watch_maintenance_job(frm, job.name, job.job_type);
+			frappe.show_alert({
+				message: `${job.job_type} is ${job.status.toLowerCase()} (${job.progress || 0}%)`,
+				indicator: 'blue'
+			}, 5);
+		}
+	});
+}
+
 function check_data_exists(frm, callback) {
+	// One call; counts come from maintained counters on the server
 	frappe.call({
-		method: 'frappe.client.get_count',
-		args: { doctype: 'Store UOM' },
-		callback: (r1) => {
-			let uom_count = r1.message || 0;
-			frappe.call({
-				method: 'frappe.client.get_count',
-				args: { doctype: 'Store Item Group' },
-				callback: (r2) => {
-					let group_count = r2.message || 0;
-					frappe.call({
-						method: 'frappe.client.get_count',
-						args: { doctype: 'Store Location' },
-						callback: (r3) => {
-							let location_count = r3.message || 0;
-							let has_data = uom_count > 0 || group_count > 0 || location_count > 0;
-							let is_demo = (uom_count === 27 && group_count === 19 && location_count === 11);
-							callback(has_data, is_demo, {
-								uom: uom_count,
-								group: group_count,
-								location: location_count
-							});
-						}
-					});
-				}
+		method: 'technical_store_system.utils.controllers.store_settings_controller.get_demo_data_status',
+		callback: (r) => {
+			let status = r.message || {};
+			let counts = status.counts || {};
+			let current = (doctype) => (counts[doctype] || {}).current || 0;
+			
+			if (status.html) {
+				frm.fields_dict.demo_data_status.$wrapper.html(status.html);
+			}
+			
+			callback(status.status !== 'not_installed', !!status.installed, {
+				uom: current('Store UOM'),
+				group: current('Store Item Group'),
+				location: current('Store Location')
 			});
 		}
 	});
@@ -11,7 +11,8 @@ import importlib.util
 from technical_store_system.utils.helpers.client_script_handler import (
 	create_client_script,
 	update_client_script,
-	delete_client_script
+	delete_client_script,
+	plan_client_script
 )
 
 
@@ -88,6 +89,41 @@ def install():
 		frappe.log_error(frappe.get_traceback(), "Client Scripts Installation Failed")
 
 
+def plan():
+	"""
+	Dry run: diff every Client Script definition against the database
+	and print the changes. Nothing is written.
+	
+	Returns:
+		list: One plan dict per script (see client_script_handler.plan_client_script)
+	"""
+	print("  → Planning Client Script changes (dry run)...")
+	
+	scripts = get_all_client_scripts()
+	if not scripts:
+		print("    ℹ No Client Script definitions found")
+		return []
+	
+	results = []
+	for script_dict in scripts:
+		result = plan_client_script(script_dict)
+		results.append(result)
+		
+		if result["action"] == "unchanged":
+			continue
+		
+		marker = "+" if result["action"] == "create" else "~"
+		print(f"    {marker} {result['script_name']}")
+		for change in result["changes"]:
+			print(f"      {change}")
+	
+	unchanged_count = sum(1 for result in results if result["action"] == "unchanged")
+	if unchanged_count:
+		print(f"    ✓ {unchanged_count} Client Script(s) unchanged")
+	
+	return results
+
+
 def uninstall():
 	"""Remove all Client Scripts - delegates to client_script_handler helper"""
 	try:
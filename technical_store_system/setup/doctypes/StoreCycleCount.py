@@ -0,0 +1,162 @@
+"""
+Store Cycle Count DocType Definition
+================================================================================
+One uploaded cycle count and its reconciliation against the balance table
+
+PURPOSE:
+- Holds the scanned count file (CSV: location, item_code, batch_no, serial_no, qty)
+- Reconciliation streams the file and writes Store Cycle Count Variance rows
+- Adjustment entries are posted from the variance rows in chunks
+
+WORKFLOW:
+- Draft → Reconciling → Reconciled → Posting → Posted (or Failed)
+
+RELATED FILES:
+- Reconciliation engine: utils/helpers/cycle_count.py
+- Variance rows: setup/doctypes/StoreCycleCountVariance.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Cycle Count",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 1,
+	"autoname": "format:CC-{#####}",
+	"title_field": "count_title",
+
+	"fields": [
+		{
+			"fieldname": "section_count",
+			"label": "Count",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "count_title",
+			"label": "Title",
+			"fieldtype": "Data",
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "count_file",
+			"label": "Count File",
+			"fieldtype": "Attach",
+			"reqd": 1,
+			"description": "CSV with columns location, item_code, batch_no, serial_no, qty. Rows without qty count as 1 (serial scans). Repeated keys are summed.",
+		},
+		{
+			"fieldname": "posting_date",
+			"label": "Posting Date",
+			"fieldtype": "Date",
+			"default": "Today",
+			"description": "Date of the adjustment entries",
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "status",
+			"label": "Status",
+			"fieldtype": "Select",
+			"options": "Draft\nReconciling\nReconciled\nPosting\nPosted\nFailed",
+			"default": "Draft",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+
+		# Section: Results
+		{
+			"fieldname": "section_results",
+			"label": "Results",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "counted_rows",
+			"label": "Counted Rows",
+			"fieldtype": "Int",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "counted_locations",
+			"label": "Counted Locations",
+			"fieldtype": "Int",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "column_break_2",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "variance_rows",
+			"label": "Variance Rows",
+			"fieldtype": "Int",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "total_variance_qty",
+			"label": "Total Variance Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "total_variance_value",
+			"label": "Total Variance Value",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "adjusted_rows",
+			"label": "Adjusted Rows",
+			"fieldtype": "Int",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "section_error",
+			"label": "Error",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+			"depends_on": "eval:doc.status=='Failed'",
+		},
+		{
+			"fieldname": "error_log",
+			"label": "Error Log",
+			"fieldtype": "Long Text",
+			"read_only": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"write": 1,
+			"create": 1,
+			"delete": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"write": 1,
+			"create": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Warehouse Staff",
+			"read": 1,
+			"write": 1,
+			"create": 1,
+			"report": 1
+		}
+	]
+}
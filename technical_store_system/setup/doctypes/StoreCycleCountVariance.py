@@ -0,0 +1,133 @@
+"""
+Store Cycle Count Variance DocType Definition
+================================================================================
+Difference between counted and system quantity for one balance key
+
+PURPOSE:
+- Written in bulk by the cycle count reconciliation (only keys that differ)
+- Standalone table instead of a child table: a full-warehouse count can
+  produce tens of thousands of rows, which must not load with the parent
+
+RELATED FILES:
+- Parent: setup/doctypes/StoreCycleCount.py
+- Reconciliation engine: utils/helpers/cycle_count.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Cycle Count Variance",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,
+	"autoname": "hash",
+	"title_field": "item_code",
+
+	"fields": [
+		{
+			"fieldname": "cycle_count",
+			"label": "Cycle Count",
+			"fieldtype": "Link",
+			"options": "Store Cycle Count",
+			"reqd": 1,
+			"read_only": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "location",
+			"label": "Location",
+			"fieldtype": "Link",
+			"options": "Store Location",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "item_code",
+			"label": "Item",
+			"fieldtype": "Link",
+			"options": "Store Item",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "batch_no",
+			"label": "Batch Number",
+			"fieldtype": "Data",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "system_qty",
+			"label": "System Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "counted_qty",
+			"label": "Counted Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "variance_qty",
+			"label": "Variance Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "valuation_rate",
+			"label": "Valuation Rate",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "variance_value",
+			"label": "Variance Value",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "adjustment_entry",
+			"label": "Adjustment Entry",
+			"fieldtype": "Link",
+			"options": "Store Stock Ledger Entry",
+			"read_only": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Warehouse Staff",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		}
+	]
+}
@@ -0,0 +1,86 @@
+"""
+Store Doctype Counter DocType Definition
+================================================================================
+Maintained row count of one of the app's master DocTypes
+
+PURPOSE:
+- O(1) counts for Store UOM, Store Item Group, Store Location and Store Item
+  instead of COUNT(*) scans (demo data status, system statistics)
+- row_count is moved by +1 / -1 from the insert / delete hooks, in the
+  same transaction as the insert or delete
+
+STRUCTURE:
+- One record per counted DocType, named after it
+- Reconciled against COUNT(*) by a daily job and on install / migrate;
+  last_drift shows how far off the counter was at the last reconciliation
+
+RELATED FILES:
+- Counter registry: utils/helpers/doctype_counter.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Doctype Counter",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,
+	"autoname": "field:counted_doctype",
+	"title_field": "counted_doctype",
+
+	"fields": [
+		{
+			"fieldname": "counted_doctype",
+			"label": "DocType",
+			"fieldtype": "Link",
+			"options": "DocType",
+			"reqd": 1,
+			"unique": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "row_count",
+			"label": "Row Count",
+			"fieldtype": "Int",
+			"default": 0,
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "last_reconciled",
+			"label": "Last Reconciled",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "last_drift",
+			"label": "Last Drift",
+			"fieldtype": "Int",
+			"read_only": 1,
+			"description": "Difference between the counter and COUNT(*) found at the last reconciliation",
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "System Manager",
+			"read": 1,
+			"report": 1,
+		},
+		{
+			"role": "Dev User",
+			"read": 1,
+			"report": 1,
+		}
+	]
+}
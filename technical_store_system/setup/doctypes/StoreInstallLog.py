@@ -0,0 +1,121 @@
+"""
+Store Install Log DocType Definition
+================================================================================
+Profiling report of one installer or migrate run
+
+PURPOSE:
+- Wall time, query count and rows written per installer step (roles,
+  DocTypes, settings, client scripts, workspace, permissions, demo data)
+- Shows which step makes site rebuilds (e.g. in CI) slow
+
+STRUCTURE:
+- One log per after_install / after_migrate run
+- steps: Store Install Log Step rows, in execution order
+
+RELATED FILES:
+- Phase runner / profiler: utils/helpers/install_phase.py
+- Installer: installer.py
+- Step rows: setup/doctypes/StoreInstallLogStep.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Install Log",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,
+	"autoname": "format:SIL-{#####}",
+	"title_field": "operation",
+
+	"fields": [
+		{
+			"fieldname": "operation",
+			"label": "Operation",
+			"fieldtype": "Select",
+			"options": "Install\nMigrate",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "status",
+			"label": "Status",
+			"fieldtype": "Select",
+			"options": "Success\nFailed",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "started_at",
+			"label": "Started At",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "total_seconds",
+			"label": "Total Seconds",
+			"fieldtype": "Float",
+			"precision": "3",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "total_queries",
+			"label": "Total Queries",
+			"fieldtype": "Int",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "total_rows_written",
+			"label": "Total Rows Written",
+			"fieldtype": "Int",
+			"read_only": 1,
+		},
+
+		# Section: Steps
+		{
+			"fieldname": "section_steps",
+			"label": "Steps",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "steps",
+			"label": "Steps",
+			"fieldtype": "Table",
+			"options": "Store Install Log Step",
+			"read_only": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "System Manager",
+			"read": 1,
+			"delete": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Installer User",
+			"read": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Dev User",
+			"read": 1,
+			"report": 1
+		}
+	]
+}
@@ -0,0 +1,57 @@
+"""
+Store Install Log Step Child Table
+One timed installer / migrate phase of a Store Install Log.
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Install Log Step",
+	"module": "Technical Store System",
+	"custom": 1,
+	"istable": 1,  # Child table
+	"editable_grid": 0,
+	"fields": [
+		{
+			"fieldname": "step",
+			"label": "Step",
+			"fieldtype": "Data",
+			"in_list_view": 1,
+			"read_only": 1,
+		},
+		{
+			"fieldname": "status",
+			"label": "Status",
+			"fieldtype": "Select",
+			"options": "ok\nfailed",
+			"in_list_view": 1,
+			"read_only": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "seconds",
+			"label": "Seconds",
+			"fieldtype": "Float",
+			"precision": "3",
+			"in_list_view": 1,
+			"read_only": 1,
+		},
+		{
+			"fieldname": "queries",
+			"label": "Queries",
+			"fieldtype": "Int",
+			"in_list_view": 1,
+			"read_only": 1,
+		},
+		{
+			"fieldname": "rows_written",
+			"label": "Rows Written",
+			"fieldtype": "Int",
+			"in_list_view": 1,
+			"read_only": 1,
+		},
+	],
+	"permissions": []  # Inherits from parent
+}
@@ -50,6 +50,7 @@ doctype = {
 			"fieldtype": "Link",
 			"options": "Store Item Group",
 			"reqd": 1,
+			"search_index": 1,  # Per-group statistics count by this field
 			"in_list_view": 1,
 		},
 		{
@@ -87,6 +87,7 @@ doctype = {
 			"label": "Parent Item Group",
 			"fieldtype": "Link",
 			"options": "Store Item Group",
+			"search_index": 1,  # Per-group statistics count by this field
 			"in_list_view": 1,
 			"in_standard_filter": 1,
 			"description": "Parent category for creating nested hierarchy. Leave blank for top-level groups."
@@ -283,6 +284,35 @@ doctype = {
 			"fieldtype": "Datetime",
 			"read_only": 1,
 			"description": "Last time this group was modified."
+		},
+
+		# Nested set (maintained by NestedSet, rebuilt by the fixture loader)
+		{
+			"fieldname": "lft",
+			"label": "Left",
+			"fieldtype": "Int",
+			"read_only": 1,
+			"hidden": 1,
+			"no_copy": 1,
+			"search_index": 1
+		},
+		{
+			"fieldname": "rgt",
+			"label": "Right",
+			"fieldtype": "Int",
+			"read_only": 1,
+			"hidden": 1,
+			"no_copy": 1,
+			"search_index": 1
+		},
+		{
+			"fieldname": "old_parent",
+			"label": "Old Parent",
+			"fieldtype": "Link",
+			"options": "Store Item Group",
+			"read_only": 1,
+			"hidden": 1,
+			"no_copy": 1
 		}
 	],
 	
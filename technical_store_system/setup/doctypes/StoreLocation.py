@@ -63,6 +63,7 @@ doctype = {
 			"fieldtype": "Select",
 			"options": "\nWarehouse\nZone\nRack\nShelf\nBin\nTransit\nStaging\nOther",
 			"reqd": 1,
+			"search_index": 1,  # List API filter, keyset-paged by name within the index
 			"in_list_view": 1,
 			"in_standard_filter": 1,
 			"bold": 1,
@@ -121,6 +122,7 @@ doctype = {
 			"options": "Store Location",
 			"description": "Select parent warehouse (required for Zone, Rack, Shelf, Bin)",
 			"reqd": 0,
+			"search_index": 1,  # List API filter, keyset-paged by name within the index
 			"depends_on": "eval:['Zone', 'Rack', 'Shelf', 'Bin'].includes(doc.location_type)"
 		},
 		{
@@ -130,6 +132,7 @@ doctype = {
 			"options": "Store Location",
 			"description": "Select zone within selected warehouse (required for Rack, Shelf, Bin)",
 			"reqd": 0,
+			"search_index": 1,  # Subtree lookups (stock_rollup.get_location_descendants)
 			"depends_on": "eval:['Rack', 'Shelf', 'Bin'].includes(doc.location_type)"
 		},
 		{
@@ -153,6 +156,7 @@ doctype = {
 			"options": "Store Location",
 			"description": "Select rack within selected zone (required for Shelf, Bin)",
 			"reqd": 0,
+			"search_index": 1,  # Subtree lookups (stock_rollup.get_location_descendants)
 			"depends_on": "eval:['Shelf', 'Bin'].includes(doc.location_type)"
 		},
 		{
@@ -171,6 +175,7 @@ doctype = {
 			"options": "Store Location",
 			"description": "Select shelf within selected rack (required for Bin)",
 			"reqd": 0,
+			"search_index": 1,  # Subtree lookups (stock_rollup.get_location_descendants)
 			"depends_on": "eval:['Shelf', 'Bin'].includes(doc.location_type)"
 		},
 		{
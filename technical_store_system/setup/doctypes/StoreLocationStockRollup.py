@@ -0,0 +1,102 @@
+"""
+Store Location Stock Rollup DocType Definition
+================================================================================
+Stock quantity and value of a Store Location including everything below it
+
+PURPOSE:
+- "Value in WH-2" is a single-row read instead of a SUM over every bin
+- Maintained incrementally: each posting adds its ledger deltas to the row of
+  the location and every ancestor (shelf, rack, zone, warehouse)
+
+STRUCTURE:
+- name: the Store Location it rolls up (one row per location with stock history)
+- total_qty / stock_value: subtree totals, all items and batches
+
+RELATED FILES:
+- Rollup logic: utils/helpers/stock_rollup.py
+- Balance table: setup/doctypes/StoreStockBalance.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Location Stock Rollup",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,  # Changes on every movement - history lives in the ledger
+	"autoname": "field:location",
+	"title_field": "location",
+
+	"fields": [
+		{
+			"fieldname": "location",
+			"label": "Location",
+			"fieldtype": "Link",
+			"options": "Store Location",
+			"reqd": 1,
+			"unique": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "location_type",
+			"label": "Location Type",
+			"fieldtype": "Data",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "total_qty",
+			"label": "Total Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "stock_value",
+			"label": "Stock Value",
+			"fieldtype": "Currency",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Warehouse Staff",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		},
+		{
+			"role": "Store Viewer",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		}
+	]
+}
@@ -0,0 +1,142 @@
+"""
+Store Maintenance Job DocType Definition
+================================================================================
+Status of a heavy maintenance operation running in a background job
+
+PURPOSE:
+- Demo data install / removal and statistics recalculation run on the
+  "long" queue instead of in the web request
+- Progress (percent + message) is updated after every chunk and pushed to
+  the requesting user over realtime
+- Only one maintenance job can be queued or running at a time
+- A queued or running job can be cancelled; it stops after the current chunk
+
+RELATED FILES:
+- Job runner: utils/helpers/maintenance_jobs.py
+- Operations: utils/controllers/store_settings_controller.py,
+  utils/controllers/item_group_controller.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Maintenance Job",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,
+	"autoname": "format:SMJ-{#####}",
+	"title_field": "job_type",
+
+	"fields": [
+		{
+			"fieldname": "job_type",
+			"label": "Job Type",
+			"fieldtype": "Select",
+			"options": "Install Demo Data\nRemove Demo Data\nRecalculate Item Group Statistics",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "status",
+			"label": "Status",
+			"fieldtype": "Select",
+			"options": "Queued\nRunning\nCompleted\nFailed\nCancelled",
+			"default": "Queued",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "progress",
+			"label": "Progress",
+			"fieldtype": "Percent",
+			"default": 0,
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "progress_message",
+			"label": "Progress Message",
+			"fieldtype": "Data",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "cancel_requested",
+			"label": "Cancel Requested",
+			"fieldtype": "Check",
+			"default": 0,
+			"read_only": 1,
+		},
+		{
+			"fieldname": "started_at",
+			"label": "Started At",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "completed_at",
+			"label": "Completed At",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+		},
+
+		# Section: Result
+		{
+			"fieldname": "section_result",
+			"label": "Result",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "job_kwargs",
+			"label": "Arguments",
+			"fieldtype": "Code",
+			"options": "JSON",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "result_message",
+			"label": "Result",
+			"fieldtype": "Small Text",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "section_error",
+			"label": "Error",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+			"depends_on": "eval:doc.status=='Failed'",
+		},
+		{
+			"fieldname": "error_log",
+			"label": "Error Log",
+			"fieldtype": "Long Text",
+			"read_only": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "System Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+		},
+		{
+			"role": "Dev User",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+		},
+	]
+}
@@ -105,6 +105,33 @@ doctype = {
 			"description": "Automatically create serial numbers (SN001, SN002, etc.)",
 			"depends_on": "eval:doc.enable_serial_tracking==1",
 		},
+		{
+			"fieldname": "valuation_section",
+			"label": "Valuation",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+		},
+		{
+			"fieldname": "valuation_queue_max_bins",
+			"label": "Max FIFO/LIFO Queue Bins",
+			"fieldtype": "Int",
+			"default": 0,
+			"description": "0 keeps FIFO/LIFO queues exact. A positive value caps the receipt bins kept per item and location by averaging the bins consumed last, so issues reaching them are costed at averaged rates.",
+		},
+		{
+			"fieldname": "stock_snapshot_section",
+			"label": "Stock Snapshots",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+		},
+		{
+			"fieldname": "stock_snapshot_frequency",
+			"label": "Snapshot Frequency",
+			"fieldtype": "Select",
+			"options": "Monthly\nWeekly\nDaily\nDisabled",
+			"default": "Monthly",
+			"description": "How often balances are checkpointed. As-of-date stock queries start from the nearest snapshot instead of replaying the whole ledger.",
+		},
 		
 		# Tab 3: Integration
 		{
@@ -0,0 +1,148 @@
+"""
+Store Stock Balance DocType Definition
+================================================================================
+Current quantity per (item, location, batch), maintained by the ledger
+
+PURPOSE:
+- "Qty of X in bin B" is a primary-key lookup, not a SUM over the ledger
+- Updated in the same transaction as the ledger insert
+
+STRUCTURE:
+- name: deterministic balance key built from (item_code, location, batch_no)
+  (see utils/helpers/stock_ledger.py: get_balance_key)
+- One row per key, created on the first movement
+- Valuation state (stock_queue) is kept next to the quantity and advanced
+  per ledger entry (see utils/helpers/stock_valuation.py)
+
+RELATED FILES:
+- Ledger: setup/doctypes/StoreStockLedgerEntry.py
+- Posting logic: utils/helpers/stock_ledger.py
+- Valuation: utils/helpers/stock_valuation.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Stock Balance",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,  # Changes on every movement - history lives in the ledger
+	"autoname": "hash",  # Real name is set by the posting API (balance key)
+	"title_field": "item_code",
+
+	"fields": [
+		{
+			"fieldname": "section_key",
+			"label": "Balance Key",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "item_code",
+			"label": "Item",
+			"fieldtype": "Link",
+			"options": "Store Item",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "location",
+			"label": "Location",
+			"fieldtype": "Link",
+			"options": "Store Location",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "batch_no",
+			"label": "Batch Number",
+			"fieldtype": "Data",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "actual_qty",
+			"label": "Actual Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "valuation_rate",
+			"label": "Valuation Rate",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "stock_value",
+			"label": "Stock Value",
+			"fieldtype": "Currency",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "stock_queue",
+			"label": "Stock Queue",
+			"fieldtype": "Long Text",
+			"read_only": 1,
+			"hidden": 1,
+			"description": "FIFO/LIFO bins or moving-average state (JSON [[qty, rate], ...])",
+		},
+		{
+			"fieldname": "last_posting_datetime",
+			"label": "Last Posting",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+			"description": "Latest posting datetime applied to this balance. Earlier postings are backdated.",
+		},
+		{
+			"fieldname": "last_ledger_entry",
+			"label": "Last Ledger Entry",
+			"fieldtype": "Link",
+			"options": "Store Stock Ledger Entry",
+			"read_only": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Warehouse Staff",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		},
+		{
+			"role": "Store Viewer",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		}
+	]
+}
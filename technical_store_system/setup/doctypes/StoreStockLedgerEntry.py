@@ -0,0 +1,243 @@
+"""
+Store Stock Ledger Entry DocType Definition
+================================================================================
+Append-only journal of every stock movement
+
+PURPOSE:
+- One row per quantity change of an item in a location (and batch)
+- Never edited or deleted after insert - corrections are new entries
+- Source of truth for stock history; balances are derived from it
+
+STRUCTURE:
+- Keyed by (item_code, location, batch_no)
+- actual_qty: signed movement (+ receipt, - issue)
+- qty_after_transaction: running balance for the key after this entry
+- stock_queue: valuation state after this entry (see utils/helpers/stock_valuation.py)
+
+RELATED FILES:
+- Balance table: setup/doctypes/StoreStockBalance.py
+- Posting logic: utils/helpers/stock_ledger.py
+- Controller: utils/controllers/stock_ledger_controller.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Stock Ledger Entry",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,  # Append-only, versions would only duplicate the ledger
+	"autoname": "hash",
+	"title_field": "item_code",
+
+	"fields": [
+		# Section: Item & Location
+		{
+			"fieldname": "section_item",
+			"label": "Item & Location",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "item_code",
+			"label": "Item",
+			"fieldtype": "Link",
+			"options": "Store Item",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "location",
+			"label": "Location",
+			"fieldtype": "Link",
+			"options": "Store Location",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "batch_no",
+			"label": "Batch Number",
+			"fieldtype": "Data",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "serial_no",
+			"label": "Serial Numbers",
+			"fieldtype": "Small Text",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "posting_date",
+			"label": "Posting Date",
+			"fieldtype": "Date",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "posting_time",
+			"label": "Posting Time",
+			"fieldtype": "Time",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "posting_datetime",
+			"label": "Posting Datetime",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+			"hidden": 1,
+			"search_index": 1,
+			"description": "Combined posting date and time used for ordering the ledger",
+		},
+
+		# Section: Voucher
+		{
+			"fieldname": "section_voucher",
+			"label": "Voucher",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "voucher_type",
+			"label": "Voucher Type",
+			"fieldtype": "Data",
+			"read_only": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "voucher_no",
+			"label": "Voucher No",
+			"fieldtype": "Data",
+			"read_only": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "column_break_2",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "voucher_detail_no",
+			"label": "Voucher Detail No",
+			"fieldtype": "Data",
+			"read_only": 1,
+		},
+
+		# Section: Quantity
+		{
+			"fieldname": "section_quantity",
+			"label": "Quantity",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "actual_qty",
+			"label": "Qty Change",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+			"description": "Positive for receipts, negative for issues",
+		},
+		{
+			"fieldname": "column_break_3",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "qty_after_transaction",
+			"label": "Qty After Transaction",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+
+		# Section: Valuation
+		{
+			"fieldname": "section_valuation",
+			"label": "Valuation",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "incoming_rate",
+			"label": "Incoming Rate",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "outgoing_rate",
+			"label": "Outgoing Rate",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "valuation_rate",
+			"label": "Valuation Rate",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "column_break_4",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "stock_value",
+			"label": "Stock Value",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "stock_value_difference",
+			"label": "Stock Value Difference",
+			"fieldtype": "Currency",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "stock_queue",
+			"label": "Stock Queue",
+			"fieldtype": "Long Text",
+			"read_only": 1,
+			"hidden": 1,
+			"description": "Valuation state after this entry (JSON [[qty, rate], ...])",
+		},
+	],
+
+	# Ledger rows are written by the posting API only - nobody gets write/create/delete
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Warehouse Staff",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		},
+		{
+			"role": "Store Viewer",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		}
+	]
+}
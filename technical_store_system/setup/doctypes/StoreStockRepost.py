@@ -0,0 +1,163 @@
+"""
+Store Stock Repost DocType Definition
+================================================================================
+Queue of windowed reposts triggered by backdated stock entries
+
+PURPOSE:
+- One record per (item, location) window that needs recomputing
+- Overlapping requests for the same window are coalesced into one record
+  (from_datetime moves back to the earliest backdated posting)
+- Progress is checkpointed so an interrupted job resumes where it stopped
+
+RELATED FILES:
+- Repost engine: utils/helpers/stock_repost.py
+- Ledger: setup/doctypes/StoreStockLedgerEntry.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Stock Repost",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,
+	"autoname": "hash",
+	"title_field": "item_code",
+
+	"fields": [
+		{
+			"fieldname": "section_window",
+			"label": "Repost Window",
+			"fieldtype": "Section Break",
+		},
+		{
+			"fieldname": "item_code",
+			"label": "Item",
+			"fieldtype": "Link",
+			"options": "Store Item",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "location",
+			"label": "Location",
+			"fieldtype": "Link",
+			"options": "Store Location",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+		},
+		{
+			"fieldname": "from_datetime",
+			"label": "Repost From",
+			"fieldtype": "Datetime",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"description": "Earliest backdated posting - every later entry of this item and location is recomputed",
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "status",
+			"label": "Status",
+			"fieldtype": "Select",
+			"options": "Queued\nIn Progress\nCompleted\nFailed",
+			"default": "Queued",
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "entries_processed",
+			"label": "Entries Processed",
+			"fieldtype": "Int",
+			"default": 0,
+			"read_only": 1,
+		},
+
+		# Section: Checkpoint
+		{
+			"fieldname": "section_checkpoint",
+			"label": "Checkpoint",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+		},
+		{
+			"fieldname": "current_batch_no",
+			"label": "Current Batch",
+			"fieldtype": "Data",
+			"read_only": 1,
+			"description": "Batch being reposted when the checkpoint was saved",
+		},
+		{
+			"fieldname": "last_processed_entry",
+			"label": "Last Processed Entry",
+			"fieldtype": "Link",
+			"options": "Store Stock Ledger Entry",
+			"read_only": 1,
+			"description": "Resume point - the job continues after this entry",
+		},
+		{
+			"fieldname": "column_break_2",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "started_at",
+			"label": "Started At",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "completed_at",
+			"label": "Completed At",
+			"fieldtype": "Datetime",
+			"read_only": 1,
+		},
+		{
+			"fieldname": "section_error",
+			"label": "Error",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+			"depends_on": "eval:doc.status=='Failed'",
+		},
+		{
+			"fieldname": "error_log",
+			"label": "Error Log",
+			"fieldtype": "Long Text",
+			"read_only": 1,
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+		},
+		{
+			"role": "System Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+		},
+	]
+}
@@ -0,0 +1,114 @@
+"""
+Store Stock Snapshot DocType Definition
+================================================================================
+Periodic checkpoint of stock balances for as-of-date queries
+
+PURPOSE:
+- "Stock as of 31 March" starts from the nearest snapshot on or before that
+  date and applies only the later ledger delta
+- Snapshots are taken at the end of each period (Store Settings →
+  Snapshot Frequency) by a daily scheduler job
+
+STRUCTURE:
+- One row per (snapshot_date, item_code)
+- balances: compact JSON [[location, batch_no, qty, value], ...] holding every
+  non-zero balance of the item at the end of snapshot_date
+- Rebuilt per item when a backdated repost touches an item's history
+
+RELATED FILES:
+- Snapshot logic: utils/helpers/stock_snapshot.py
+- Ledger: setup/doctypes/StoreStockLedgerEntry.py
+================================================================================
+"""
+
+doctype = {
+	"doctype": "DocType",
+	"name": "Store Stock Snapshot",
+	"module": "Technical Store System",
+	"custom": 1,
+	"issingle": 0,
+	"is_submittable": 0,
+	"is_tree": 0,
+	"editable_grid": 0,
+	"track_changes": 0,  # Derived data, rebuilt from the ledger
+	"autoname": "hash",  # Real name is set by the snapshot builder
+	"title_field": "item_code",
+
+	"fields": [
+		{
+			"fieldname": "snapshot_date",
+			"label": "Snapshot Date",
+			"fieldtype": "Date",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "item_code",
+			"label": "Item",
+			"fieldtype": "Link",
+			"options": "Store Item",
+			"reqd": 1,
+			"read_only": 1,
+			"in_list_view": 1,
+			"in_standard_filter": 1,
+			"search_index": 1,
+		},
+		{
+			"fieldname": "column_break_1",
+			"fieldtype": "Column Break",
+		},
+		{
+			"fieldname": "total_qty",
+			"label": "Total Qty",
+			"fieldtype": "Float",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "total_value",
+			"label": "Total Value",
+			"fieldtype": "Currency",
+			"read_only": 1,
+			"in_list_view": 1,
+		},
+		{
+			"fieldname": "section_balances",
+			"label": "Balances",
+			"fieldtype": "Section Break",
+			"collapsible": 1,
+		},
+		{
+			"fieldname": "balances",
+			"label": "Balances",
+			"fieldtype": "Long Text",
+			"read_only": 1,
+			"description": "JSON [[location, batch_no, qty, value], ...]",
+		},
+	],
+
+	"permissions": [
+		{
+			"role": "Store Manager",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Inventory Admin",
+			"read": 1,
+			"select": 1,
+			"report": 1,
+			"export": 1
+		},
+		{
+			"role": "Store Viewer",
+			"read": 1,
+			"select": 1,
+			"report": 1
+		}
+	]
+}
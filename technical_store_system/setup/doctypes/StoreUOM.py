@@ -102,7 +102,7 @@ doctype = {
 			"label": "Has Conversion",
 			"fieldtype": "Check",
 			"default": 0,
-			"description": "Can convert to other UOMs (future enhancement)"
+			"description": "Can convert to other UOMs through its Base UOM (chains like Box → Pack → Piece are resolved automatically)"
 		},
 		{
 			"fieldname": "base_uom",
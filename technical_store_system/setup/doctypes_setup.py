@@ -3,50 +3,172 @@ DocTypes Setup Module
 Universal installer/uninstaller for DocTypes
 Auto-discovers all DocType definitions in setup/doctypes/
 Delegates all logic to utils/helpers/doctype_installer.py
+
+Discovery is cached in a manifest (install order, dependency edges and
+definition hash per DocType) that is rebuilt only when a file in
+setup/doctypes/ is added, removed or modified. Definition modules are then
+imported lazily - only for DocTypes that actually need syncing.
 """
 
 import frappe
+import json
 import os
 import importlib
+import sys
 from technical_store_system.utils.helpers.doctype_installer import (
 	create_doctype,
 	update_doctype,
 	delete_doctype,
-	install_demo_data_for_doctype_if_enabled
+	get_definition_hash,
+	get_stored_hashes,
+	save_stored_hashes,
+	clear_stored_hashes,
+	plan_doctype,
+	get_table_row_estimates
 )
 
 
-def get_all_doctypes():
-	"""Auto-discover all DocType definitions from setup/doctypes/ folder"""
-	doctypes = []
-	
-	# Get path to doctypes folder
-	doctypes_folder = os.path.join(
+DOCTYPES_PACKAGE = "technical_store_system.setup.doctypes"
+MANIFEST_KEY = "technical_store_system:doctype_manifest"
+
+
+# ============================================================================
+# DISCOVERY MANIFEST
+# ============================================================================
+
+def get_doctypes_folder():
+	"""Path to setup/doctypes/"""
+	return os.path.join(
 		frappe.get_app_path("technical_store_system"),
 		"setup",
 		"doctypes"
 	)
+
+
+def get_file_fingerprint():
+	"""
+	Modification time of every definition file (stat only, nothing imported)
 	
-	# Get all .py files except __init__.py
-	for filename in os.listdir(doctypes_folder):
-		if filename.endswith(".py") and filename != "__init__.py":
-			module_name = filename[:-3]  # Remove .py
-			
-			try:
-				# Import module dynamically
-				module = importlib.import_module(
-					f"technical_store_system.setup.doctypes.{module_name}"
-				)
-				
-				# Get doctype definition
-				if hasattr(module, "doctype"):
-					doctypes.append(module.doctype.copy())
-					
-			except Exception as e:
-				print(f"    ⚠️ Error loading {filename}: {str(e)}")
+	Returns:
+		dict: {filename: mtime_ns}
+	"""
+	fingerprint = {}
+	with os.scandir(get_doctypes_folder()) as entries:
+		for entry in entries:
+			if entry.name.endswith(".py") and entry.name != "__init__.py":
+				fingerprint[entry.name] = entry.stat().st_mtime_ns
+	return fingerprint
+
+
+def get_manifest():
+	"""
+	Cached discovery manifest, rebuilt when definition files changed
+	
+	Returns:
+		dict: {
+			"files": {filename: mtime_ns},
+			"doctypes": [{"name", "module", "hash", "istable", "dependencies"}, ...]
+				in install order
+		}
+	"""
+	fingerprint = get_file_fingerprint()
+	
+	stored = frappe.db.get_global(MANIFEST_KEY)
+	try:
+		manifest = json.loads(stored) if stored else None
+	except ValueError:
+		manifest = None
+	
+	if manifest and manifest.get("files") == fingerprint:
+		return manifest
+	
+	manifest = build_manifest(fingerprint)
+	frappe.db.set_global(MANIFEST_KEY, json.dumps(manifest, sort_keys=True))
+	return manifest
+
+
+def build_manifest(fingerprint):
+	"""
+	Import every definition module once and record order, edges and hashes
+	
+	Files whose name does not match their DocType (e.g. a stale copy like
+	StoreItemGroup_original.py) are left out, so each DocType has exactly one
+	definition.
+	"""
+	print("    ℹ Rebuilding DocType discovery manifest...")
+	
+	doctypes = []
+	module_by_name = {}
+	
+	for filename in sorted(fingerprint):
+		module_name = filename[:-3]  # Remove .py
+		
+		try:
+			doctype_dict = import_definition(module_name, reload=True)
+		except Exception as e:
+			print(f"    ⚠️ Error loading {filename}: {str(e)}")
+			continue
+		
+		if doctype_dict is None:
+			continue
+		
+		doctype_name = doctype_dict.get("name", "")
+		if module_name != doctype_name.replace(" ", ""):
+			print(f"    ⚠️ Ignoring {filename}: file name does not match DocType '{doctype_name}'")
+			continue
+		
+		doctypes.append(doctype_dict)
+		module_by_name[doctype_name] = module_name
 	
 	# Sort by dependencies (child tables first, then parent DocTypes, then DocTypes with dependencies)
-	return sort_doctypes_by_dependencies(doctypes)
+	return {
+		"files": fingerprint,
+		"doctypes": [
+			{
+				"name": doctype_dict.get("name"),
+				"module": module_by_name[doctype_dict.get("name")],
+				"hash": get_definition_hash(doctype_dict),
+				"istable": doctype_dict.get("istable", 0),
+				"dependencies": sorted(get_link_dependencies(doctype_dict)),
+			}
+			for doctype_dict in sort_doctypes_by_dependencies(doctypes)
+		],
+	}
+
+
+def clear_manifest():
+	"""Forget the manifest so the next install/migrate rediscovers all files"""
+	frappe.db.set_global(MANIFEST_KEY, None)
+
+
+def import_definition(module_name, reload=False):
+	"""
+	Import one definition module and return a copy of its doctype dict
+	
+	Args:
+		module_name: File name without .py
+		reload: Re-execute the module if it was imported before (file changed)
+	
+	Returns:
+		dict: DocType definition, or None if the module defines none
+	"""
+	full_name = f"{DOCTYPES_PACKAGE}.{module_name}"
+	if reload and full_name in sys.modules:
+		module = importlib.reload(sys.modules[full_name])
+	else:
+		module = importlib.import_module(full_name)
+	
+	return module.doctype.copy() if hasattr(module, "doctype") else None
+
+
+def load_doctype(entry):
+	"""DocType definition of a manifest entry (imports its module on demand)"""
+	return import_definition(entry["module"])
+
+
+def get_all_doctypes():
+	"""All DocType definitions in install order (imports every module)"""
+	return [load_doctype(entry) for entry in get_manifest()["doctypes"]]
 
 
 def sort_doctypes_by_dependencies(doctypes):
@@ -133,31 +255,43 @@ def topological_sort(doctypes, dependency_map):
 
 
 def install():
-	"""Install all DocTypes - delegates to doctype_installer helper"""
+	"""
+	Install all DocTypes - delegates to doctype_installer helper
+	
+	Only definitions of DocTypes that do not exist yet are imported.
+	Demo data is installed afterwards by the installer's own "Demo Data" phase.
+	"""
 	try:
 		print("  → Installing DocTypes...")
 		
-		doctypes = get_all_doctypes()
+		entries = get_manifest()["doctypes"]
 		
-		if not doctypes:
+		if not entries:
 			print("    ℹ No DocType definitions found")
 			return
 		
+		existing = set(frappe.get_all(
+			"DocType",
+			filters={"name": ["in", [entry["name"] for entry in entries]]},
+			pluck="name"
+		))
+		
+		hashes = get_stored_hashes()
 		created_count = 0
-		for doctype_dict in doctypes:
-			doctype_name = doctype_dict.get("name")
+		for entry in entries:
+			doctype_name = entry["name"]
+			
+			if doctype_name in existing:
+				print(f"    ℹ DocType '{doctype_name}' already exists")
+				continue
 			
 			# Delegate to helper
-			result = create_doctype(doctype_dict)
+			result = create_doctype(load_doctype(entry))
 			
 			if result["action"] == "created":
 				created_count += 1
+				hashes[doctype_name] = entry["hash"]
 				print(f"    ✓ {result['message']}")
-				
-				# Install demo data if enabled
-				demo_result = install_demo_data_for_doctype_if_enabled(doctype_name)
-				if demo_result.get("created", 0) > 0:
-					print(f"      → Demo data: {demo_result['created']} records")
 			
 			elif result["action"] == "skipped":
 				print(f"    ℹ {result['message']}")
@@ -166,6 +300,7 @@ def install():
 				print(f"    ✗ {result['message']}")
 		
 		if created_count > 0:
+			save_stored_hashes(hashes)
 			print(f"    ✓ {created_count} DocType(s) installed successfully")
 		
 	except Exception as e:
@@ -173,27 +308,51 @@ def install():
 		frappe.log_error(frappe.get_traceback(), "DocTypes Installation Failed")
 
 
-def update():
-	"""Update existing DocTypes - delegates to doctype_installer helper"""
+def update(force=False):
+	"""
+	Update existing DocTypes - delegates to doctype_installer helper
+	
+	DocTypes whose definition hash matches the one stored after the last
+	successful sync are skipped without touching the database or importing
+	their definition module.
+	
+	Args:
+		force: Compare every DocType even if its definition is unchanged
+	"""
 	try:
 		print("  → Checking DocTypes for updates...")
 		
-		doctypes = get_all_doctypes()
+		entries = get_manifest()["doctypes"]
 		
-		if not doctypes:
+		if not entries:
 			print("    ℹ No DocType definitions found")
 			return
 		
 		updated_count = 0
 		unchanged_count = 0
+		skipped_count = 0
+		
+		hashes = {} if force else get_stored_hashes()
+		new_hashes = dict(hashes)
 		
-		for doctype_dict in doctypes:
+		for entry in entries:
+			doctype_name = entry["name"]
+			definition_hash = entry["hash"]
+			
+			if hashes.get(doctype_name) == definition_hash:
+				skipped_count += 1
+				continue
+			
 			# Delegate to helper
-			result = update_doctype(doctype_dict)
+			result = update_doctype(load_doctype(entry))
 			
 			if result["success"]:
 				action = result.get("action")
 				
+				# Synced - remember the definition that is now in the database
+				if action in ("updated", "unchanged"):
+					new_hashes[doctype_name] = definition_hash
+				
 				if action == "updated":
 					# Show detailed changes
 					print(f"    ✓ {result['message']}")
@@ -225,26 +384,72 @@ def update():
 			print(f"    ✓ Updated {updated_count} DocType(s)")
 		if unchanged_count > 0:
 			print(f"    ✓ Checked {unchanged_count} DocType(s) (no changes needed)")
+		if skipped_count > 0:
+			print(f"    ✓ Skipped {skipped_count} DocType(s) (definition unchanged since last sync)")
+		
+		if new_hashes != hashes or force:
+			save_stored_hashes(new_hashes)
 		
 	except Exception as e:
 		print(f"    ✗ Error updating DocTypes: {str(e)}")
 		frappe.log_error(frappe.get_traceback(), "DocTypes Update Failed")
 
 
+def plan():
+	"""
+	Dry run of update(): diff every DocType definition against the database
+	and print the changes with a DDL cost estimate. Nothing is written.
+	
+	Returns:
+		list: One plan dict per DocType (see doctype_installer.plan_doctype)
+	"""
+	print("  → Planning DocType changes (dry run)...")
+	
+	doctypes = get_all_doctypes()
+	if not doctypes:
+		print("    ℹ No DocType definitions found")
+		return []
+	
+	table_rows = get_table_row_estimates([doctype_dict.get("name") for doctype_dict in doctypes])
+	
+	results = []
+	for doctype_dict in doctypes:
+		result = plan_doctype(doctype_dict, table_rows)
+		results.append(result)
+		
+		if result["action"] == "unchanged":
+			continue
+		
+		marker = "+" if result["action"] == "create" else "~"
+		warning = "  ⚠️ schedule in a maintenance window" if result["maintenance_window"] else ""
+		print(
+			f"    {marker} {result['doctype_name']} "
+			f"[DDL: {result['ddl']}, ~{result['rows']} rows, ~{result['estimated_seconds']}s]{warning}"
+		)
+		for change in result["changes"]:
+			print(f"      {change['change']} [{change['ddl']}] {change['detail']}")
+	
+	unchanged_count = sum(1 for result in results if result["action"] == "unchanged")
+	if unchanged_count:
+		print(f"    ✓ {unchanged_count} DocType(s) unchanged")
+	
+	return results
+
+
 def uninstall():
 	"""Remove all DocTypes - delegates to doctype_installer helper"""
 	try:
 		print("  → Uninstalling DocTypes...")
 		
-		doctypes = get_all_doctypes()
+		entries = get_manifest()["doctypes"]
 		
-		if not doctypes:
+		if not entries:
 			print("    ℹ No DocType definitions found")
 			return
 		
 		removed_count = 0
-		for doctype_dict in doctypes:
-			doctype_name = doctype_dict.get("name")
+		for entry in entries:
+			doctype_name = entry["name"]
 			
 			# Delegate to helper
 			result = delete_doctype(doctype_name)
@@ -259,6 +464,9 @@ def uninstall():
 			elif result["action"] == "failed":
 				print(f"    ✗ {result['message']}")
 		
+		clear_stored_hashes()
+		clear_manifest()
+		
 		if removed_count > 0:
 			print(f"    ✓ {removed_count} DocType(s) uninstalled successfully")
 		
@@ -75,6 +75,52 @@ workspace = {
 			"description": "Item categories and classifications (tree view)",
 			"hidden": 0,
 		},
+		{
+			"type": "Card Break",
+			"label": "Stock",
+			"description": "Stock movements and balances",
+			"hidden": 0,
+		},
+		{
+			"type": "Link",
+			"link_type": "DocType",
+			"link_to": "Store Stock Balance",
+			"label": "Store Stock Balance",
+			"description": "Current quantity per item, location and batch",
+			"hidden": 0,
+		},
+		{
+			"type": "Link",
+			"link_type": "DocType",
+			"link_to": "Store Stock Ledger Entry",
+			"label": "Store Stock Ledger Entry",
+			"description": "Append-only history of every stock movement",
+			"hidden": 0,
+		},
+		{
+			"type": "Link",
+			"link_type": "DocType",
+			"link_to": "Store Cycle Count",
+			"label": "Store Cycle Count",
+			"description": "Upload scanned counts and post stock adjustments",
+			"hidden": 0,
+		},
+		{
+			"type": "Link",
+			"link_type": "DocType",
+			"link_to": "Store Stock Snapshot",
+			"label": "Store Stock Snapshot",
+			"description": "Periodic balance checkpoints for as-of-date stock",
+			"hidden": 0,
+		},
+		{
+			"type": "Link",
+			"link_type": "DocType",
+			"link_to": "Store Location Stock Rollup",
+			"label": "Store Location Stock Rollup",
+			"description": "Quantity and value per warehouse, zone, rack and shelf",
+			"hidden": 0,
+		},
 		{
 			"type": "Card Break",
 			"label": "Settings",
@@ -121,6 +121,79 @@ def update():
 		frappe.log_error(frappe.get_traceback(), "Workspace Update Failed")
 
 
+def plan():
+	"""
+	Dry run of update(): diff the workspace definition against the database
+	and print the changes. Nothing is written.
+	
+	Returns:
+		dict: {"workspace_name": str, "action": "create"|"update"|"unchanged", "changes": [str]}
+	"""
+	print("  → Planning workspace changes (dry run)...")
+	
+	from technical_store_system.setup.workspace.Workspace import workspace
+	
+	if not frappe.db.exists("Workspace", workspace["name"]):
+		print(f"    + Workspace '{workspace['name']}' will be created")
+		return {"workspace_name": workspace["name"], "action": "create", "changes": []}
+	
+	workspace_doc = frappe.get_doc("Workspace", workspace["name"])
+	changes = []
+	
+	# Basic properties (same defaults as update())
+	expected = {
+		"title": workspace["title"],
+		"icon": workspace.get("icon", workspace_doc.icon),
+		"is_hidden": workspace.get("is_hidden", 0),
+		"public": workspace.get("public", 1),
+		"hide_custom": workspace.get("hide_custom", 0),
+		"content": workspace.get("content", "[]"),
+	}
+	for prop, new_value in expected.items():
+		if str(workspace_doc.get(prop) or "") != str(new_value or ""):
+			changes.append(f"~ {prop}")
+	
+	# Links and shortcuts are rebuilt by update() - report the net difference
+	def link_key(link):
+		return (link.get("type"), link.get("label"), link.get("link_type") or "", link.get("link_to") or "")
+	
+	existing_links = [link_key(link.as_dict()) for link in workspace_doc.links]
+	new_links = [link_key(link) for link in workspace.get("links", [])]
+	for key in new_links:
+		if key not in existing_links:
+			changes.append(f"+ link {key[1]} ({key[0]})")
+	for key in existing_links:
+		if key not in new_links:
+			changes.append(f"- link {key[1]} ({key[0]})")
+	if not changes and existing_links != new_links:
+		changes.append("~ link order")
+	
+	def shortcut_key(shortcut):
+		return (shortcut.get("type"), shortcut.get("label"), shortcut.get("link_to") or "")
+	
+	existing_shortcuts = [shortcut_key(shortcut.as_dict()) for shortcut in workspace_doc.shortcuts]
+	new_shortcuts = [shortcut_key(shortcut) for shortcut in workspace.get("shortcuts", [])]
+	for key in new_shortcuts:
+		if key not in existing_shortcuts:
+			changes.append(f"+ shortcut {key[1]}")
+	for key in existing_shortcuts:
+		if key not in new_shortcuts:
+			changes.append(f"- shortcut {key[1]}")
+	
+	if changes:
+		print(f"    ~ Workspace '{workspace['name']}'")
+		for change in changes:
+			print(f"      {change}")
+	else:
+		print(f"    ✓ Workspace '{workspace['name']}' unchanged")
+	
+	return {
+		"workspace_name": workspace["name"],
+		"action": "update" if changes else "unchanged",
+		"changes": changes,
+	}
+
+
 def uninstall():
 	"""Remove workspace during app uninstallation"""
 	try:
@@ -0,0 +1,87 @@
+"""
+Demo Data Benchmarks
+
+- install_all_demo_data: runtime and query budget of a full demo install
+- remove_fixtures: bulk removal of a location tree, whose query count
+  depends on the number of levels, not the number of locations
+
+The demo install only runs on a site without UOMs, item groups, locations
+or items, and removes the demo data again afterwards.
+"""
+
+import pytest
+
+import frappe
+
+from technical_store_system.tests.benchmarks.conftest import BENCH_PREFIX
+from technical_store_system.tests.query_budget import query_budget
+from technical_store_system.utils.helpers.demo_data_handler import (
+	get_demo_data_counts,
+	install_all_demo_data,
+	uninstall_all_demo_data,
+)
+from technical_store_system.utils.helpers.fixture_loader import load_fixtures, remove_fixtures
+
+
+# Query budget of a full demo install (ceiling - lower it when the install gets cheaper)
+INSTALL_DEMO_BUDGET = 400
+
+# Query budget of removing REMOVE_TREE_BINS bins and their four ancestors
+REMOVE_TREE_BUDGET = 150
+REMOVE_TREE_BINS = 500
+
+
+def test_install_demo_data(benchmark, site):
+	"""Bulk install of all demo DocTypes, once"""
+	if any(count["current"] for count in get_demo_data_counts().values()):
+		pytest.skip("The site already has store data")
+
+	def install():
+		with query_budget(INSTALL_DEMO_BUDGET, "Install demo data") as budget:
+			install_all_demo_data(force=True)
+		benchmark.extra_info["queries"] = budget.queries
+
+	try:
+		benchmark.pedantic(install, rounds=1, iterations=1)
+	finally:
+		uninstall_all_demo_data()
+		frappe.db.commit()
+
+
+def make_removal_tree():
+	"""Warehouse → zone → rack → shelf → REMOVE_TREE_BINS bins, as fixture records"""
+	warehouse = f"{BENCH_PREFIX}-RM"
+	zone, rack, shelf = f"{warehouse}-Z-A", f"{warehouse}-Z-A-R01", f"{warehouse}-Z-A-R01-S01"
+	records = [
+		{"location_code": warehouse, "location_type": "Warehouse", "warehouse_name": warehouse},
+		{"location_code": zone, "location_type": "Zone", "store": warehouse},
+		{"location_code": rack, "location_type": "Rack", "store": warehouse, "zone": zone},
+		{"location_code": shelf, "location_type": "Shelf", "store": warehouse, "zone": zone, "rack": rack},
+	]
+	records.extend(
+		{
+			"location_code": f"{shelf}-B-{number}", "location_type": "Bin", "bin": f"B-{number}",
+			"store": warehouse, "zone": zone, "rack": rack, "shelf": shelf,
+		}
+		for number in range(1, REMOVE_TREE_BINS + 1)
+	)
+	return records
+
+
+def test_remove_location_tree(benchmark, site):
+	"""Bulk removal of a location tree, deepest level first"""
+	records = make_removal_tree()
+
+	def setup():
+		load_fixtures("Store Location", records)
+		frappe.db.commit()
+
+	def remove():
+		with query_budget(REMOVE_TREE_BUDGET, "Remove location tree") as budget:
+			result = remove_fixtures("Store Location", records)
+		frappe.db.commit()
+		benchmark.extra_info["queries"] = budget.queries
+		assert (result["deleted"], result["levels"]) == (len(records), 5)
+
+	benchmark.pedantic(remove, setup=setup, rounds=3, iterations=1)
+	assert not frappe.db.exists("Store Location", records[0]["location_code"])
@@ -0,0 +1,59 @@
+"""
+Store Item Group Controller Benchmarks
+
+- on_update_event: cost of saving a leaf group against the tree depth
+- recalculate_all_statistics: runtime over a few hundred groups
+"""
+
+import pytest
+
+import frappe
+
+from technical_store_system.tests.benchmarks.conftest import BENCH_PREFIX, make_group_chain
+from technical_store_system.tests.query_budget import query_budget
+from technical_store_system.utils.controllers.item_group_controller import (
+	on_update_event,
+	recalculate_all_statistics,
+)
+from technical_store_system.utils.helpers.fixture_loader import load_fixtures
+
+
+STATISTICS_GROUPS = 200
+
+# Query budget of saving a leaf group (ceiling - lower it when the path gets cheaper)
+SAVE_GROUP_BUDGET = 30
+
+
+@pytest.mark.parametrize("depth", [1, 4, 8])
+def test_on_update_vs_depth(benchmark, site, depth):
+	"""on_update of the deepest group of a chain"""
+	chain = make_group_chain(depth)
+	doc = frappe.get_doc("Store Item Group", chain[-1])
+
+	benchmark(on_update_event, doc)
+
+	with query_budget(SAVE_GROUP_BUDGET, f"Item group on_update at depth {depth}") as budget:
+		on_update_event(doc)
+	benchmark.extra_info.update({"depth": depth, "queries": budget.queries})
+	frappe.db.rollback()
+
+
+def test_recalculate_all_statistics(benchmark, site):
+	"""Full statistics rebuild (commits per group, so only a few rounds)"""
+	roots = [f"{BENCH_PREFIX} Stats {index:03d}" for index in range(STATISTICS_GROUPS // 10)]
+	records = [{"item_group_name": root, "is_group": 1} for root in roots]
+	records += [
+		{"item_group_name": f"{root} Child {index}", "is_group": 0, "parent_item_group": root}
+		for root in roots
+		for index in range(9)
+	]
+	load_fixtures("Store Item Group", records)
+	frappe.db.commit()
+
+	benchmark.pedantic(recalculate_all_statistics, rounds=3, iterations=1)
+
+	groups = frappe.db.count("Store Item Group")
+	# Unbudgeted (grows with the number of groups), recorded for comparison
+	with query_budget(float("inf")) as budget:
+		recalculate_all_statistics()
+	benchmark.extra_info.update({"groups": groups, "queries": budget.queries})
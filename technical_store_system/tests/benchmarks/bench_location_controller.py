@@ -0,0 +1,81 @@
+"""
+Store Location Controller Benchmarks
+
+- before_insert_event: throughput of inserting bins under one shelf
+- get_next_location_name: latency against the number of siblings
+- generate_location_name: queries needed for a full hierarchy name
+"""
+
+import pytest
+
+import frappe
+
+from technical_store_system.tests.benchmarks.conftest import make_bins
+from technical_store_system.tests.query_budget import query_budget
+from technical_store_system.utils.controllers.store_location_controller import (
+	before_insert_event,
+	generate_location_name,
+	get_next_location_name,
+)
+from technical_store_system.utils.helpers.fixture_loader import load_fixtures
+
+
+# Query budgets (ceilings - lower them when a path gets cheaper)
+INSERT_BIN_BUDGET = 40
+NEXT_NAME_BUDGET = 1
+NAME_BUDGET = 4  # Parent lookups for a bin: warehouse, zone, rack and shelf names
+
+
+def new_bin(tree):
+	"""Unsaved bin document below the benchmark shelf (code left to the controller)"""
+	return frappe.get_doc({
+		"doctype": "Store Location",
+		"location_type": "Bin",
+		"store": tree.warehouse,
+		"zone": tree.zone,
+		"rack": tree.rack,
+		"shelf": tree.shelf,
+	})
+
+
+def test_before_insert_throughput(benchmark, location_tree):
+	"""Run the before_insert handler on a fresh bin per round"""
+	def setup():
+		return (new_bin(location_tree),), {}
+
+	benchmark.pedantic(before_insert_event, setup=setup, rounds=200)
+
+	with query_budget(INSERT_BIN_BUDGET, "Bin before_insert") as budget:
+		before_insert_event(new_bin(location_tree))
+	benchmark.extra_info["queries"] = budget.queries
+	frappe.db.rollback()
+
+
+@pytest.mark.parametrize("siblings", [10, 100, 1000])
+def test_next_location_name_vs_siblings(benchmark, location_tree, siblings):
+	"""Auto-increment lookup under a shelf holding a given number of bins"""
+	shelf = f"{location_tree.shelf}-{siblings}"
+	load_fixtures("Store Location", [{
+		"location_code": shelf, "location_type": "Shelf",
+		"store": location_tree.warehouse, "zone": location_tree.zone, "rack": location_tree.rack,
+	}])
+	make_bins(location_tree, siblings, shelf=shelf)
+	settings = frappe.get_single("Store Settings")
+
+	result = benchmark(get_next_location_name, shelf, "Bin", settings)
+
+	with query_budget(NEXT_NAME_BUDGET, "Next bin name") as budget:
+		get_next_location_name(shelf, "Bin", settings)
+	benchmark.extra_info.update({"siblings": siblings, "queries": budget.queries, "next_name": result})
+
+
+def test_generate_location_name_queries(benchmark, location_tree):
+	"""Display name of a bin (walks all four parent levels)"""
+	doc = new_bin(location_tree)
+	doc.bin = "B-1"
+
+	benchmark(generate_location_name, doc)
+
+	with query_budget(NAME_BUDGET, "Bin display name") as budget:
+		generate_location_name(doc)
+	benchmark.extra_info["queries"] = budget.queries
@@ -0,0 +1,136 @@
+"""
+Benchmark Fixtures
+================================================================================
+pytest-benchmark suite for the controller hot paths (location and item group)
+
+The benchmarks run against a real site. Synthetic data is loaded with the
+bulk fixture loader under a "BENCH" prefix and removed again after the
+session. Query counts are stored in each benchmark's extra_info, so they
+end up in the JSON results next to the timings, and checked against the
+query budgets of the benchmark modules (tests/query_budget.py).
+
+Usage (from frappe-bench/sites):
+	BENCH_SITE=test_site pytest ../apps/technical_store_system/technical_store_system/tests/benchmarks \
+		--benchmark-autosave
+
+	# Compare against the last saved run (e.g. from the previous commit)
+	BENCH_SITE=test_site pytest ../apps/technical_store_system/technical_store_system/tests/benchmarks \
+		--benchmark-compare --benchmark-compare-fail=mean:20%
+
+Results are saved as JSON under .benchmarks/ (one file per run, tagged
+with the commit).
+================================================================================
+"""
+
+import os
+
+import pytest
+
+frappe = pytest.importorskip("frappe")
+
+
+BENCH_PREFIX = "BENCH"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def site():
+	"""Connect to BENCH_SITE for the whole session and clean up benchmark data"""
+	site_name = os.environ.get("BENCH_SITE")
+	if not site_name:
+		pytest.skip("Set BENCH_SITE to the site the benchmarks should run on")
+
+	frappe.init(site=site_name, sites_path=os.environ.get("SITES_PATH", "."))
+	frappe.connect()
+	frappe.set_user("Administrator")
+
+	remove_benchmark_data()
+	yield site_name
+	remove_benchmark_data()
+
+	frappe.destroy()
+
+
+def remove_benchmark_data():
+	"""
+	Delete everything the benchmarks created (prefixed names only)
+
+	Goes through remove_fixtures, so the Store Doctype Counter, the location
+	rollup rows and the Store Settings statistics follow the deleted rows.
+	"""
+	from technical_store_system.utils.helpers.fixture_loader import remove_fixtures
+
+	remove_fixtures("Store Location", frappe.get_all(
+		"Store Location", filters={"name": ["like", f"{BENCH_PREFIX}-%"]}, fields=["location_code"]
+	))
+	remove_fixtures("Store Item Group", frappe.get_all(
+		"Store Item Group", filters={"name": ["like", f"{BENCH_PREFIX} %"]}, fields=["item_group_name"]
+	))
+	frappe.db.commit()
+
+
+@pytest.fixture(scope="session")
+def location_tree(site):
+	"""
+	One benchmark warehouse with a zone, rack and shelf
+
+	Returns:
+		frappe._dict: {"warehouse", "zone", "rack", "shelf"} location codes
+	"""
+	from technical_store_system.utils.helpers.fixture_loader import load_fixtures
+
+	warehouse = f"{BENCH_PREFIX}-WH"
+	tree = frappe._dict({
+		"warehouse": warehouse,
+		"zone": f"{warehouse}-Z-A",
+		"rack": f"{warehouse}-Z-A-R01",
+		"shelf": f"{warehouse}-Z-A-R01-S01",
+	})
+
+	load_fixtures("Store Location", [
+		{"location_code": tree.warehouse, "location_type": "Warehouse", "warehouse_name": tree.warehouse},
+		{"location_code": tree.zone, "location_type": "Zone", "store": tree.warehouse},
+		{"location_code": tree.rack, "location_type": "Rack", "store": tree.warehouse, "zone": tree.zone},
+		{
+			"location_code": tree.shelf, "location_type": "Shelf",
+			"store": tree.warehouse, "zone": tree.zone, "rack": tree.rack,
+		},
+	])
+	frappe.db.commit()
+	return tree
+
+
+def make_bins(tree, count, shelf=None):
+	"""Bulk-load count bins below a shelf (siblings for auto-increment benchmarks)"""
+	from technical_store_system.utils.helpers.fixture_loader import load_fixtures
+
+	shelf = shelf or tree.shelf
+	load_fixtures("Store Location", [
+		{
+			"location_code": f"{shelf}-B-{number}", "location_type": "Bin", "bin": f"B-{number}",
+			"store": tree.warehouse, "zone": tree.zone, "rack": tree.rack, "shelf": shelf,
+		}
+		for number in range(1, count + 1)
+	])
+	frappe.db.commit()
+
+
+def make_group_chain(depth, prefix=BENCH_PREFIX):
+	"""
+	Item group chain root → ... → leaf of the given depth
+
+	Returns:
+		list: Group names, root first
+	"""
+	from technical_store_system.utils.helpers.fixture_loader import load_fixtures
+
+	names = [f"{prefix} Depth {depth} Level {level}" for level in range(depth)]
+	load_fixtures("Store Item Group", [
+		{
+			"item_group_name": name,
+			"is_group": 1 if level < depth - 1 else 0,
+			"parent_item_group": names[level - 1] if level else None,
+		}
+		for level, name in enumerate(names)
+	])
+	frappe.db.commit()
+	return names
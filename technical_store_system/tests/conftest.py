@@ -0,0 +1,104 @@
+"""
+Test Fixtures
+================================================================================
+Controller tests run against the in-memory frappe from fake_frappe.py
+
+Usage:
+	pytest technical_store_system/tests --ignore=technical_store_system/tests/benchmarks
+================================================================================
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+
+# Field defaults of Store Settings (setup/doctypes/StoreSettings.py)
+DEFAULT_SETTINGS = {
+	"enable_auto_location_code": 1,
+	"allow_manual_override": 0,
+	"enforce_unique_names": 1,
+	"enable_hierarchy_validation": 1,
+	"warehouse_naming_pattern": "Numeric",
+	"warehouse_prefix": "WH",
+	"zone_naming_pattern": "Alphabetic",
+	"zone_prefix": "Z",
+	"rack_naming_pattern": "Numeric",
+	"rack_prefix": "R",
+	"shelf_naming_pattern": "Numeric",
+	"shelf_prefix": "S",
+	"bin_naming_pattern": "Numeric",
+	"bin_prefix": "B",
+}
+
+
+@pytest.fixture
+def frappe():
+	"""Fake frappe with an empty database and default Store Settings"""
+	module = fake_frappe.install()
+	module.reset()
+	module.db.set_single("Store Settings", DEFAULT_SETTINGS)
+	return module
+
+
+@pytest.fixture
+def ledger(frappe, monkeypatch):
+	"""
+	Stock ledger core on the in-memory database
+
+	Only the SQL steps (row locking, bulk ledger/balance/rollup writes) are
+	replaced by table writes; valuation, negative stock, backdating, reposts
+	and rollup propagation run unchanged.
+	"""
+	from technical_store_system.utils.helpers import cycle_count, stock_ledger, stock_rollup, stock_snapshot, stock_transfer
+
+	def lock_balances(sl_entries):
+		table = frappe.db.tables.setdefault(stock_ledger.BALANCE_DOCTYPE, {})
+		balances = {}
+		for sle in sorted(sl_entries, key=lambda sle: sle.balance_key):
+			row = table.get(sle.balance_key) or {
+				"name": sle.balance_key, "item_code": sle.item_code, "location": sle.location,
+				"batch_no": sle.batch_no, "actual_qty": 0, "valuation_rate": 0, "stock_value": 0,
+				"stock_queue": None, "last_posting_datetime": None, "last_ledger_entry": None,
+			}
+			balances[sle.balance_key] = frappe._dict(row)
+		return balances
+
+	def insert_ledger_rows(sl_entries):
+		frappe.db.insert(stock_ledger.LEDGER_DOCTYPE, *sl_entries)
+
+	def write_balance_rows(rows, chunk_size=5000):
+		frappe.db.insert(stock_ledger.BALANCE_DOCTYPE, *rows)
+
+	def write_rollup_rows(values_by_location, increment=False):
+		table = frappe.db.tables.setdefault(stock_rollup.ROLLUP_DOCTYPE, {})
+		for location in sorted(values_by_location):
+			row = table.setdefault(location, frappe._dict(name=location, total_qty=0.0, stock_value=0.0))
+			for field in ("total_qty", "stock_value"):
+				row[field] = (row[field] if increment else 0.0) + values_by_location[location][field]
+
+	for module in (stock_ledger, stock_transfer, cycle_count):
+		monkeypatch.setattr(module, "lock_balances", lock_balances)
+	monkeypatch.setattr(stock_ledger, "insert_ledger_rows", insert_ledger_rows)
+	monkeypatch.setattr(stock_ledger, "write_balance_rows", write_balance_rows)
+	monkeypatch.setattr(stock_rollup, "write_rollup_rows", write_rollup_rows)
+
+	# No snapshots yet (tests set a date to make postings count as backdated)
+	frappe.cache.set_value(stock_snapshot.LATEST_SNAPSHOT_CACHE_KEY, None)
+	return frappe
+
+
+@pytest.fixture
+def loader(frappe, monkeypatch):
+	"""
+	Fixture loader on the in-memory database
+
+	Only the SQL steps (counter UPDATE, item group child counts) are
+	replaced; ordering, naming, inheritance and the tree rebuild run
+	unchanged.
+	"""
+	from technical_store_system.utils.helpers import fixture_loader
+
+	monkeypatch.setattr(fixture_loader, "adjust_count", lambda doctype, delta: None)
+	monkeypatch.setitem(fixture_loader.FIXTURE_SPECS["Store Item Group"], "after_batch", lambda docs, context: None)
+	return frappe
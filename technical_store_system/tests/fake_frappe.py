@@ -0,0 +1,861 @@
+"""
+Fake Frappe
+================================================================================
+In-memory stand-in for the parts of the frappe API the controllers use
+
+Controller logic (utils/controllers/*) can be unit-tested and
+micro-benchmarked without a bench, MariaDB or Redis. Tables are plain
+dicts of rows, Single DocTypes are one dict each, and every database call
+is counted so tests can assert how many queries a code path needs.
+
+Covered:
+- frappe.db: get_all, get_value, get_single_value, set_value, exists, count,
+  get_single, get_doc, delete, bulk_insert, bulk_update,
+  commit / rollback / savepoint (no-ops),
+  after_commit / after_rollback callbacks (run by commit / rollback)
+- frappe: get_all, get_list, get_value, get_doc, new_doc, get_single, throw,
+  msgprint, log_error, _, _dict, bold, parse_json, as_json, get_attr, scrub,
+  conf, cache (values and lists)
+- frappe.get_meta: fields, get_field, get_table_fields and get_valid_columns
+  from the DocType definitions in setup/doctypes
+- frappe.enqueue and frappe.publish_realtime: collected in enqueued and
+  realtime_log, nothing runs
+- frappe.utils: cint, flt, cstr, now, nowdate, nowtime, today, now_datetime,
+  getdate, get_datetime, get_last_day, add_days, add_to_date
+- frappe.utils.background_jobs: is_job_enqueued (job ids in enqueued)
+- frappe.model.document: Document
+
+Not covered: raw SQL (frappe.db.sql raises NotImplementedError), meta,
+permissions and doc_events - tests call the event handlers directly.
+
+Usage:
+	from technical_store_system.tests import fake_frappe
+
+	frappe = fake_frappe.install()    # before importing any controller
+	from technical_store_system.utils.controllers import store_location_controller
+
+	frappe.db.reset()
+	frappe.db.insert("Store Location", {"name": "WH-1", "location_type": "Warehouse"})
+	frappe.db.set_single("Store Settings", {"enable_auto_location_code": 1})
+
+	frappe.db.reset_query_count()
+	store_location_controller.generate_location_name(doc)
+	assert frappe.db.queries == 4
+
+Note: install() replaces "frappe" in sys.modules for the whole process.
+Do not run these tests in the same session as the site benchmarks
+(tests/benchmarks), which need the real frappe.
+================================================================================
+"""
+
+import copy
+import datetime
+import json
+import re
+import sys
+import types
+
+
+# ============================================================================
+# BASICS
+# ============================================================================
+
+class _dict(dict):
+	"""dict with attribute access (missing keys read as None), like frappe._dict"""
+
+	__getattr__ = dict.get
+	__setattr__ = dict.__setitem__
+	__delattr__ = dict.__delitem__
+
+	def __deepcopy__(self, memo):
+		return _dict(copy.deepcopy(dict(self), memo))
+
+	def copy(self):
+		return _dict(dict(self))
+
+
+class ValidationError(Exception):
+	pass
+
+
+class DoesNotExistError(ValidationError):
+	pass
+
+
+class DuplicateEntryError(ValidationError):
+	pass
+
+
+class PermissionError(Exception):
+	pass
+
+
+def _(message, *args, **kwargs):
+	"""Translation is the identity"""
+	return message
+
+
+def throw(msg, exc=ValidationError, title=None, **kwargs):
+	"""Raise exc(msg) like frappe.throw"""
+	raise exc(msg)
+
+
+def msgprint(msg, *args, **kwargs):
+	"""Collect the message in message_log"""
+	message_log.append(msg)
+
+
+def log_error(message=None, title=None, *args, **kwargs):
+	"""Collect the error in error_log"""
+	error_log.append(_dict(title=title, message=message))
+
+
+def get_traceback(*args, **kwargs):
+	import traceback
+	return traceback.format_exc()
+
+
+def bold(text):
+	return f"<strong>{text}</strong>"
+
+
+def parse_json(value):
+	return json.loads(value) if isinstance(value, str) else value
+
+
+def as_json(value, indent=1):
+	return json.dumps(value, indent=indent, default=str, sort_keys=True)
+
+
+def get_attr(method_string):
+	import importlib
+	module_name, attr = method_string.rsplit(".", 1)
+	return getattr(importlib.import_module(module_name), attr)
+
+
+def enqueue(
+	method, queue="default", timeout=None, event=None, is_async=True, job_name=None, now=False,
+	enqueue_after_commit=False, *, on_success=None, on_failure=None, at_front=False, job_id=None,
+	deduplicate=False, **kwargs
+):
+	"""
+	Collect the job in enqueued (tests run it themselves)
+
+	Same signature as frappe.enqueue: its own parameters (job_name is the
+	RQ display name) are not passed on, kwargs holds only what the method
+	receives.
+	"""
+	enqueued.append(_dict(method=method, queue=queue, job_id=job_id, kwargs=kwargs))
+
+
+def publish_realtime(event=None, message=None, user=None, **kwargs):
+	realtime_log.append(_dict(event=event, message=message, user=user))
+
+
+def is_job_enqueued(job_id):
+	return any(job.job_id == job_id for job in enqueued)
+
+
+def scrub(text):
+	return text.replace(" ", "_").replace("-", "_").lower()
+
+
+def whitelist(*args, **kwargs):
+	"""@frappe.whitelist() with or without arguments"""
+	if args and callable(args[0]):
+		return args[0]
+	return lambda func: func
+
+
+def only_for(roles, message=False):
+	"""Everyone is System Manager here"""
+
+
+def has_permission(*args, **kwargs):
+	return True
+
+
+def set_user(user):
+	session.user = user
+
+
+def generate_hash(*args, length=10, **kwargs):
+	import secrets
+	return secrets.token_hex(length)[:length]
+
+
+message_log = []
+error_log = []
+enqueued = []
+realtime_log = []
+session = _dict(user="Administrator")
+conf = _dict()
+flags = _dict()
+local = _dict(flags=flags)
+
+
+# ============================================================================
+# UTILS
+# ============================================================================
+
+def cint(value, default=0):
+	try:
+		return int(float(value))
+	except (TypeError, ValueError):
+		return default
+
+
+def flt(value, precision=None):
+	try:
+		number = float(value)
+	except (TypeError, ValueError):
+		number = 0.0
+	return round(number, precision) if precision is not None else number
+
+
+def cstr(value, encoding="utf-8"):
+	return "" if value is None else str(value)
+
+
+def now_datetime():
+	return datetime.datetime.now()
+
+
+def now():
+	return now_datetime().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def nowdate():
+	return now_datetime().strftime("%Y-%m-%d")
+
+
+today = nowdate
+
+
+def nowtime():
+	return now_datetime().strftime("%H:%M:%S.%f")
+
+
+def getdate(value=None):
+	if not value:
+		return datetime.date.today()
+	if isinstance(value, datetime.datetime):
+		return value.date()
+	if isinstance(value, datetime.date):
+		return value
+	return datetime.date.fromisoformat(str(value)[:10])
+
+
+def add_days(date, days):
+	result = getdate(date) + datetime.timedelta(days=days)
+	return result.isoformat() if isinstance(date, str) else result
+
+
+def get_last_day(date):
+	date = getdate(date)
+	next_month = (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+	return next_month - datetime.timedelta(days=1)
+
+
+def get_datetime(value=None):
+	if not value:
+		return now_datetime()
+	if isinstance(value, datetime.datetime):
+		return value
+	return datetime.datetime.fromisoformat(str(value))
+
+
+def add_to_date(date, days=0, hours=0, minutes=0, seconds=0, **kwargs):
+	return get_datetime(date) + datetime.timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+# ============================================================================
+# DOCUMENT
+# ============================================================================
+
+class Document:
+	"""
+	Minimal Document: fields as attributes, save/insert into the fake db
+
+	Unset fields read as None (there is no meta to tell them apart from
+	unknown attributes).
+	"""
+
+	def __init__(self, *args, **kwargs):
+		values = {**(args[0] if args and isinstance(args[0], dict) else {}), **kwargs}
+		self.__dict__["flags"] = _dict()
+		for key, value in copy.deepcopy(values).items():
+			self.set(key, value)
+
+	def __getattr__(self, key):
+		if key.startswith("__"):
+			raise AttributeError(key)
+		return None
+
+	def get(self, key, default=None):
+		value = self.__dict__.get(key)
+		return default if value is None else value
+
+	def set(self, key, value):
+		if isinstance(value, list):
+			value = [_dict(row) if isinstance(row, dict) else row for row in value]
+		self.__dict__[key] = value
+
+	def update(self, values):
+		for key, value in values.items():
+			self.set(key, value)
+		return self
+
+	def append(self, fieldname, row=None):
+		row = _dict(row or {})
+		self.__dict__.setdefault(fieldname, []).append(row)
+		row.idx = len(self.__dict__[fieldname])
+		return row
+
+	def is_new(self):
+		return bool(self.__dict__.get("__islocal"))
+
+	def as_dict(self):
+		return _dict({
+			key: copy.deepcopy(value)
+			for key, value in self.__dict__.items()
+			if key != "flags" and not key.startswith("__")
+		})
+
+	def insert(self, ignore_permissions=None, ignore_mandatory=None, **kwargs):
+		if not self.name:
+			self.name = generate_hash()
+		if db.exists(self.doctype, self.name):
+			throw(f"{self.doctype} {self.name} already exists", DuplicateEntryError)
+		self.__dict__.pop("__islocal", None)
+		db.insert(self.doctype, self.as_dict())
+		return self
+
+	def save(self, ignore_permissions=None, **kwargs):
+		if self.is_new():
+			return self.insert()
+		db.write(self.doctype, self.name, self.as_dict())
+		return self
+
+	def db_update(self):
+		db.write(self.doctype, self.name, self.as_dict())
+
+	def db_set(self, fieldname, value=None, update_modified=True, commit=False):
+		values = fieldname if isinstance(fieldname, dict) else {fieldname: value}
+		self.update(values)
+		db.set_value(self.doctype, self.name, values)
+
+	def delete(self, *args, **kwargs):
+		db.delete(self.doctype, self.name)
+
+	def get_valid_dict(self, convert_dates_to_str=False, **kwargs):
+		"""Values of the DocType's columns (unset ones as None)"""
+		return _dict({column: self.__dict__.get(column) for column in get_meta(self.doctype).get_valid_columns()})
+
+	def get_all_children(self):
+		"""Rows of all table fields, as Documents of the child DocType"""
+		children = []
+		for field in get_meta(self.doctype).get_table_fields():
+			for row in self.__dict__.get(field.fieldname) or []:
+				children.append(Document(row, doctype=field.options, parentfield=field.fieldname))
+		return children
+
+	def reload(self):
+		self.__dict__.update(copy.deepcopy(db.get_row(self.doctype, self.name)))
+		return self
+
+
+# ============================================================================
+# META
+# ============================================================================
+
+# Fieldtypes without a database column
+NO_VALUE_FIELDTYPES = {
+	"Section Break", "Column Break", "Tab Break", "HTML", "Table", "Table MultiSelect",
+	"Button", "Image", "Fold", "Heading",
+}
+
+STANDARD_COLUMNS = ["name", "owner", "creation", "modified", "modified_by", "docstatus", "idx"]
+CHILD_COLUMNS = ["parent", "parentfield", "parenttype"]
+
+
+class Meta:
+	"""DocType meta from the app's definition in setup/doctypes/<Name>.py"""
+
+	def __init__(self, doctype):
+		import importlib
+		module = importlib.import_module(f"technical_store_system.setup.doctypes.{doctype.replace(' ', '')}")
+		definition = module.doctype
+		self.name = doctype
+		self.istable = definition.get("istable", 0)
+		self.issingle = definition.get("issingle", 0)
+		self.fields = [_dict(field) for field in definition.get("fields", [])]
+
+	def get_field(self, fieldname):
+		return next((field for field in self.fields if field.fieldname == fieldname), None)
+
+	def get_table_fields(self):
+		return [field for field in self.fields if field.fieldtype in ("Table", "Table MultiSelect")]
+
+	def get_valid_columns(self):
+		return [
+			*STANDARD_COLUMNS,
+			*(CHILD_COLUMNS if self.istable else []),
+			*(field.fieldname for field in self.fields if field.fieldtype not in NO_VALUE_FIELDTYPES),
+		]
+
+
+def get_meta(doctype, cached=True):
+	return Meta(doctype)
+
+
+# ============================================================================
+# DATABASE
+# ============================================================================
+
+class FakeDatabase:
+	"""
+	In-memory frappe.db
+
+	tables: {doctype: {name: row}}, singles: {doctype: {field: value}}.
+	Each public read or write counts as one query (queries, query_log);
+	the seeding helpers insert() and set_single() are not counted.
+	"""
+
+	def __init__(self):
+		self.listeners = []  # Callables notified of every counted call (see query_budget.py)
+		self.reset()
+
+	def reset(self):
+		"""Drop all data and reset the query counter"""
+		self.tables = {}
+		self.singles = {}
+		self.after_commit = CallbackManager()
+		self.after_rollback = CallbackManager()
+		self.reset_query_count()
+
+	def reset_query_count(self):
+		self.queries = 0
+		self.query_log = []
+
+	def _count(self, method, doctype):
+		self.queries += 1
+		self.query_log.append((method, doctype))
+		for listener in self.listeners:
+			listener(f"{method} {doctype}")
+
+	# ------------------------------------------------------------------------
+	# Seeding (not counted)
+	# ------------------------------------------------------------------------
+
+	def insert(self, doctype, *records):
+		"""Add rows to a table; each record needs a name"""
+		table = self.tables.setdefault(doctype, {})
+		for record in records:
+			table[record["name"]] = _dict(copy.deepcopy(dict(record)), doctype=doctype)
+
+	def set_single(self, doctype, values):
+		"""Replace the values of a Single DocType"""
+		self.singles[doctype] = _dict(copy.deepcopy(dict(values)))
+
+	def write(self, doctype, name, values):
+		"""Store a saved document (counted as one query)"""
+		self._count("write", doctype)
+		if doctype in self.singles or name == doctype:
+			self.singles[doctype] = _dict(values)
+		else:
+			self.tables.setdefault(doctype, {})[name] = _dict(values, doctype=doctype)
+
+	def get_row(self, doctype, name):
+		if name == doctype:
+			return self.singles.setdefault(doctype, _dict())
+		row = self.tables.get(doctype, {}).get(name)
+		if row is None:
+			throw(f"{doctype} {name} not found", DoesNotExistError)
+		return row
+
+	# ------------------------------------------------------------------------
+	# Reads
+	# ------------------------------------------------------------------------
+
+	def get_all(self, doctype, filters=None, fields=None, order_by=None, limit=None,
+			limit_page_length=None, limit_start=0, pluck=None, as_list=False, **kwargs):
+		self._count("get_all", doctype)
+		return self._select(
+			doctype, filters, fields, order_by, limit or limit_page_length, limit_start, pluck, as_list
+		)
+
+	get_list = get_all
+
+	def get_value(self, doctype, filters=None, fieldname="name", as_dict=False, order_by=None, **kwargs):
+		self._count("get_value", doctype)
+		if doctype in self.singles or filters == doctype:
+			return self._single_value(doctype, fieldname, as_dict)
+
+		if isinstance(filters, str):
+			filters = {"name": filters}
+		fields = [fieldname] if isinstance(fieldname, str) else list(fieldname)
+		rows = self._select(doctype, filters, fields, order_by, 1, 0, None, False)
+		if not rows:
+			return None
+		if as_dict:
+			return rows[0]
+		values = [rows[0].get(field) for field in fields]
+		return values[0] if isinstance(fieldname, str) else values
+
+	def _single_value(self, doctype, fieldname, as_dict=False):
+		values = self.singles.get(doctype, {})
+		fields = [fieldname] if isinstance(fieldname, str) else list(fieldname)
+		if as_dict:
+			return _dict({field: values.get(field) for field in fields})
+		result = [values.get(field) for field in fields]
+		return result[0] if isinstance(fieldname, str) else result
+
+	def get_single_value(self, doctype, fieldname):
+		self._count("get_single_value", doctype)
+		return self.singles.get(doctype, {}).get(fieldname)
+
+	def exists(self, doctype, filters=None, **kwargs):
+		self._count("exists", doctype)
+		if isinstance(doctype, dict):
+			doctype, filters = doctype["doctype"], {k: v for k, v in doctype.items() if k != "doctype"}
+		if filters is None:
+			return doctype in self.tables or doctype in self.singles or None
+		if isinstance(filters, str):
+			filters = {"name": filters}
+		rows = self._select(doctype, filters, ["name"], None, 1, 0, None, False)
+		return rows[0].name if rows else None
+
+	def count(self, doctype, filters=None, **kwargs):
+		self._count("count", doctype)
+		return len(self._filter(doctype, filters))
+
+	def get_single(self, doctype):
+		self._count("get_single", doctype)
+		return Document(self.singles.get(doctype, {}), doctype=doctype, name=doctype)
+
+	def get_doc(self, doctype, name=None):
+		self._count("get_doc", doctype)
+		return Document(self.get_row(doctype, name or doctype), doctype=doctype, name=name or doctype)
+
+	# ------------------------------------------------------------------------
+	# Writes
+	# ------------------------------------------------------------------------
+
+	def set_value(self, doctype, name, fieldname, value=None, update_modified=True):
+		self._count("set_value", doctype)
+		values = fieldname if isinstance(fieldname, dict) else {fieldname: value}
+		if doctype in self.singles or name == doctype:
+			self.singles.setdefault(doctype, _dict()).update(values)
+			return
+		names = [name] if isinstance(name, str) else [row.name for row in self._filter(doctype, name)]
+		for row_name in names:
+			self.get_row(doctype, row_name).update(values)
+
+	def set_single_value(self, doctype, fieldname, value=None):
+		self.set_value(doctype, doctype, fieldname, value)
+
+	def delete(self, doctype, filters=None):
+		self._count("delete", doctype)
+		if isinstance(filters, str):
+			filters = {"name": filters}
+		for row in self._filter(doctype, filters):
+			del self.tables[doctype][row.name]
+
+	def bulk_insert(self, doctype, fields, values, ignore_duplicates=False, *, chunk_size=10000):
+		self._count("bulk_insert", doctype)
+		table = self.tables.setdefault(doctype, {})
+		for row in values:
+			row = _dict(zip(fields, row), doctype=doctype)
+			if row.name in table:
+				if ignore_duplicates:
+					continue
+				throw(f"{doctype} {row.name} already exists", DuplicateEntryError)
+			table[row.name] = row
+
+	def bulk_update(self, doctype, doc_updates, *, chunk_size=100, modified=None, modified_by=None,
+			update_modified=True, debug=False):
+		self._count("bulk_update", doctype)
+		for name, values in doc_updates.items():
+			self.get_row(doctype, name).update(values)
+
+	def sql(self, query, *args, **kwargs):
+		self._count("sql", None)
+		raise NotImplementedError("The fake frappe.db does not run SQL")
+
+	def commit(self):
+		self.after_rollback.reset()
+		self.after_commit.run()
+
+	def rollback(self, save_point=None):
+		if save_point:
+			return
+		self.after_commit.reset()
+		self.after_rollback.run()
+
+	def savepoint(self, save_point):
+		pass
+
+	def table_exists(self, doctype, cached=True):
+		return doctype in self.tables
+
+	# ------------------------------------------------------------------------
+	# Query engine
+	# ------------------------------------------------------------------------
+
+	def _select(self, doctype, filters, fields, order_by, limit, limit_start, pluck, as_list):
+		rows = self._filter(doctype, filters)
+
+		if order_by:
+			for part in reversed([part.strip() for part in order_by.split(",")]):
+				field, _, direction = part.partition(" ")
+				field = field.split(".")[-1].strip("`")
+				rows.sort(
+					key=lambda row: (row.get(field) is not None, row.get(field) or 0),
+					reverse=direction.strip().lower() == "desc",
+				)
+
+		rows = rows[limit_start or 0:]
+		if limit:
+			rows = rows[:limit]
+
+		if pluck:
+			return [row.get(pluck) for row in rows]
+
+		fields = fields or ["name"]
+		if isinstance(fields, str):
+			fields = [field.strip() for field in fields.split(",")]
+		if "*" in fields:
+			selected = [row.copy() for row in rows]
+		else:
+			selected = [_dict({parse_field(field)[1]: row.get(parse_field(field)[0]) for field in fields}) for row in rows]
+
+		return [list(row.values()) for row in selected] if as_list else selected
+
+	def _filter(self, doctype, filters):
+		rows = list(self.tables.get(doctype, {}).values())
+		for field, operator, value in normalize_filters(filters):
+			rows = [row for row in rows if matches(row.get(field), operator, value)]
+		return rows
+
+
+class CallbackManager:
+	"""frappe.db.after_commit / after_rollback: callables run once, in order"""
+
+	def __init__(self):
+		self.callbacks = []
+
+	def add(self, func):
+		self.callbacks.append(func)
+
+	def run(self):
+		callbacks, self.callbacks = self.callbacks, []
+		for func in callbacks:
+			func()
+
+	def reset(self):
+		self.callbacks = []
+
+
+def parse_field(field):
+	""""name as alias" → ("name", "alias")"""
+	match = re.match(r"^`?([\w.]+)`?(?:\s+as\s+`?(\w+)`?)?$", field.strip(), re.IGNORECASE)
+	if not match:
+		raise NotImplementedError(f"The fake frappe.db does not support field expression {field!r}")
+	column = match.group(1).split(".")[-1]
+	return column, match.group(2) or column
+
+
+def normalize_filters(filters):
+	"""Dict or list filters → [(field, operator, value)]"""
+	if not filters:
+		return []
+
+	if isinstance(filters, dict):
+		normalized = []
+		for field, value in filters.items():
+			if isinstance(value, (list, tuple)):
+				normalized.append((field, value[0], value[1] if len(value) > 1 else None))
+			else:
+				normalized.append((field, "=", value))
+		return normalized
+
+	normalized = []
+	for condition in filters:
+		if isinstance(condition, dict):
+			normalized.extend(normalize_filters(condition))
+		elif len(condition) == 4:
+			normalized.append((condition[1], condition[2], condition[3]))
+		else:
+			normalized.append(tuple(condition))
+	return normalized
+
+
+def matches(actual, operator, value):
+	"""Evaluate one filter condition against a row value"""
+	operator = operator.lower().strip()
+
+	if operator == "=":
+		return actual == value
+	if operator == "!=":
+		return actual != value
+	if operator in ("in", "not in"):
+		values = [item.strip() for item in value.split(",")] if isinstance(value, str) else list(value)
+		return (actual in values) == (operator == "in")
+	if operator == "is":
+		return (actual not in (None, "")) == (value == "set")
+	if operator in ("like", "not like"):
+		pattern = "^" + re.escape(value).replace("%", ".*").replace("_", ".") + "$"
+		found = actual is not None and re.match(pattern, str(actual), re.IGNORECASE) is not None
+		return found == (operator == "like")
+	if operator in (">", "<", ">=", "<="):
+		if actual is None:
+			return False
+		return {
+			">": actual > value, "<": actual < value, ">=": actual >= value, "<=": actual <= value,
+		}[operator]
+
+	raise NotImplementedError(f"The fake frappe.db does not support operator {operator!r}")
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class FakeCache:
+	"""Dict-backed frappe.cache (get_value / set_value / delete_value, hashes)"""
+
+	def __init__(self):
+		self.data = {}
+
+	def get_value(self, key, generator=None, **kwargs):
+		if key not in self.data and generator:
+			self.data[key] = generator()
+		return self.data.get(key)
+
+	def set_value(self, key, value, expires_in_sec=None, **kwargs):
+		self.data[key] = value
+
+	def delete_value(self, keys, **kwargs):
+		for key in [keys] if isinstance(keys, str) else keys:
+			self.data.pop(key, None)
+
+	def hget(self, name, key, generator=None, **kwargs):
+		values = self.data.setdefault(name, {})
+		if key not in values and generator:
+			values[key] = generator()
+		return values.get(key)
+
+	def hset(self, name, key, value, **kwargs):
+		self.data.setdefault(name, {})[key] = value
+
+	def hdel(self, name, key, **kwargs):
+		self.data.get(name, {}).pop(key, None)
+
+	def delete_key(self, key, **kwargs):
+		self.delete_value(key)
+
+	def lpush(self, key, value):
+		self.data.setdefault(key, []).insert(0, value)
+
+	def ltrim(self, key, start, stop):
+		self.data[key] = self.data.get(key, [])[start:None if stop == -1 else stop + 1]
+
+	def lrange(self, key, start, stop):
+		return self.data.get(key, [])[start:None if stop == -1 else stop + 1]
+
+	def llen(self, key):
+		return len(self.data.get(key, []))
+
+
+db = FakeDatabase()
+cache = FakeCache()
+
+
+# ============================================================================
+# MODULE-LEVEL API
+# ============================================================================
+
+def get_all(doctype, *args, **kwargs):
+	return db.get_all(doctype, *args, **kwargs)
+
+
+get_list = get_all
+
+
+def get_value(*args, **kwargs):
+	return db.get_value(*args, **kwargs)
+
+
+def get_single(doctype):
+	return db.get_single(doctype)
+
+
+def get_cached_doc(*args, **kwargs):
+	return get_doc(*args, **kwargs)
+
+
+def get_doc(doctype, name=None, **kwargs):
+	"""get_doc(dict) builds a new document, get_doc(doctype, name) loads one"""
+	if isinstance(doctype, dict):
+		doc = Document(doctype)
+		doc.__dict__["__islocal"] = 1
+		return doc
+	return db.get_doc(doctype, name)
+
+
+def new_doc(doctype, **kwargs):
+	return get_doc({"doctype": doctype, **kwargs})
+
+
+def reset():
+	"""Fresh database, cache and message logs"""
+	db.reset()
+	cache.data.clear()
+	message_log.clear()
+	error_log.clear()
+	enqueued.clear()
+	realtime_log.clear()
+	conf.clear()
+	flags.clear()
+
+
+def install():
+	"""
+	Register this module as "frappe" (plus frappe.utils, frappe.model,
+	frappe.model.document) in sys.modules
+
+	Call before the code under test imports frappe. Safe to call again.
+
+	Returns:
+		module: The fake frappe module
+	"""
+	module = sys.modules[__name__]
+
+	utils = types.ModuleType("frappe.utils")
+	for name in (
+		"cint", "flt", "cstr", "now", "nowdate", "nowtime", "today", "now_datetime", "getdate",
+		"get_datetime", "get_last_day", "add_days", "add_to_date",
+	):
+		setattr(utils, name, getattr(module, name))
+
+	background_jobs = types.ModuleType("frappe.utils.background_jobs")
+	background_jobs.is_job_enqueued = is_job_enqueued
+	utils.background_jobs = background_jobs
+
+	model = types.ModuleType("frappe.model")
+	document = types.ModuleType("frappe.model.document")
+	document.Document = Document
+	model.document = document
+
+	module.utils = utils
+	module.model = model
+
+	sys.modules.update({
+		"frappe": module,
+		"frappe.utils": utils,
+		"frappe.utils.background_jobs": background_jobs,
+		"frappe.model": model,
+		"frappe.model.document": document,
+	})
+	return module
@@ -0,0 +1,147 @@
+"""
+Query Budget
+================================================================================
+Assert the maximum number of queries a code path may run
+
+Works against the real frappe (every frappe.db.sql call counts) and the
+in-memory fake_frappe (every db call counts). When the budget is
+exceeded, the AssertionError lists the app call sites that issued the
+queries - innermost technical_store_system frame first, with a stack
+trace of the first query from each site - so an extra get_value per
+ancestor shows up as the line that added it.
+
+Usage:
+	from technical_store_system.tests.query_budget import query_budget
+
+	with query_budget(4, "Bin display name"):
+		generate_location_name(doc)
+
+	# As a decorator
+	@query_budget(12, "Save item group")
+	def save_group():
+		...
+
+	# In a benchmark: record the count next to the timings
+	with query_budget(4) as budget:
+		generate_location_name(doc)
+	benchmark.extra_info["queries"] = budget.queries
+================================================================================
+"""
+
+import contextlib
+import os
+import traceback
+
+import frappe
+
+from technical_store_system.tests import fake_frappe
+
+
+APP_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Call sites listed in the failure message
+MAX_REPORTED_SITES = 10
+
+
+class query_budget(contextlib.ContextDecorator):
+	"""
+	Fail if the block runs more than max_queries queries
+
+	Args:
+		max_queries: Allowed number of queries
+		label: Name of the operation in the failure message
+	"""
+
+	def __init__(self, max_queries, label=None):
+		self.max_queries = max_queries
+		self.label = label
+		self.calls = []
+		self.db = None
+		self.previous = None
+
+	@property
+	def queries(self):
+		return len(self.calls)
+
+	def __enter__(self):
+		self.calls = []
+		self.db = frappe.db
+
+		if isinstance(self.db, fake_frappe.FakeDatabase):
+			self.db.listeners.append(self.record)
+		else:
+			self.previous = self.db.__dict__.get("sql")
+			sql = self.db.sql
+
+			def recorded_sql(query, *args, **kwargs):
+				self.record(query)
+				return sql(query, *args, **kwargs)
+
+			self.db.sql = recorded_sql
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, tb):
+		if isinstance(self.db, fake_frappe.FakeDatabase):
+			self.db.listeners.remove(self.record)
+		elif self.previous is None:
+			del self.db.sql
+		else:
+			self.db.sql = self.previous
+
+		if exc_type is None and self.queries > self.max_queries:
+			raise AssertionError(self.report())
+		return False
+
+	def record(self, query):
+		"""Remember a query and the stack that issued it"""
+		stack = [
+			frame for frame in traceback.extract_stack()[:-2]
+			if not frame.filename.startswith(os.path.abspath(__file__))
+		]
+		self.calls.append((" ".join(str(query).split()), stack))
+
+	def report(self):
+		"""Failure message: budget, actual count and queries per call site"""
+		sites = {}
+		for query, stack in self.calls:
+			site = get_call_site(stack)
+			entry = sites.setdefault(site, {"count": 0, "queries": [], "stack": stack})
+			entry["count"] += 1
+			entry["queries"].append(query)
+
+		label = f" for {self.label}" if self.label else ""
+		lines = [f"Query budget exceeded{label}: {self.queries} queries, budget {self.max_queries}", ""]
+
+		ranked = sorted(sites.items(), key=lambda item: item[1]["count"], reverse=True)
+		for site, entry in ranked[:MAX_REPORTED_SITES]:
+			lines.append(f"{entry['count']} × {site}")
+			for query in dict.fromkeys(entry["queries"]):
+				lines.append(f"      {query[:200]}")
+			lines.append("    first call:")
+			lines.extend(
+				"    " + line
+				for line in "".join(traceback.format_list(get_app_frames(entry["stack"]))).splitlines()
+			)
+			lines.append("")
+
+		if len(ranked) > MAX_REPORTED_SITES:
+			lines.append(f"... and {len(ranked) - MAX_REPORTED_SITES} more call sites")
+
+		return "\n".join(lines)
+
+
+def get_app_frames(stack):
+	"""Frames inside the app, without the tests themselves (whole stack if none)"""
+	frames = [
+		frame for frame in stack
+		if frame.filename.startswith(APP_PATH) and not frame.filename.startswith(TESTS_PATH)
+	]
+	return frames or stack
+
+
+def get_call_site(stack):
+	"""'path:line in function' of the innermost app frame"""
+	frame = get_app_frames(stack)[-1]
+	return f"{os.path.relpath(frame.filename, os.path.dirname(APP_PATH))}:{frame.lineno} in {frame.name}"
@@ -0,0 +1,116 @@
+"""
+Cycle Count Tests (in-memory frappe)
+"""
+
+import random
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import cycle_count
+from technical_store_system.utils.helpers.stock_ledger import (
+	LEDGER_DOCTYPE,
+	get_stock_balance,
+	make_stock_ledger_entries
+)
+
+
+def test_external_sort_spills_runs_and_merges_them():
+	rows = [(f"B-{number % 7}", f"ITEM-{number % 5}", "", float(number)) for number in range(40)]
+	random.Random(1).shuffle(rows)
+
+	assert list(cycle_count.external_sort(iter(rows), run_size=6)) == sorted(rows)
+
+
+def test_repeated_scans_are_summed():
+	rows = [("B-1", "ITEM-1", "", 1.0), ("B-1", "ITEM-1", "", 2.0), ("B-1", "ITEM-1", "LOT", 1.0)]
+
+	assert list(cycle_count.aggregate_counts(rows)) == [("B-1", "ITEM-1", "", 3.0), ("B-1", "ITEM-1", "LOT", 1.0)]
+
+
+def test_merge_join_is_a_full_outer_join():
+	left = [("a", 1), ("c", 3)]
+	right = [("b", "B"), ("c", "C")]
+
+	assert list(cycle_count.merge_join(left, right)) == [("a", 1, None), ("b", None, "B"), ("c", 3, "C")]
+
+
+def test_location_batches_keep_locations_whole():
+	rows = [("B-1", "I", "", 1.0), ("B-1", "J", "", 1.0), ("B-2", "I", "", 1.0), ("B-3", "I", "", 1.0)]
+
+	batches = list(cycle_count.iter_location_batches(iter(rows), 2))
+
+	assert [[location for location, _rows in batch] for batch in batches] == [["B-1", "B-2"], ["B-3"]]
+	assert len(batches[0][0][1]) == 2
+
+
+def test_reconcile_reports_counted_and_uncounted_differences(frappe, monkeypatch):
+	balance = fake_frappe._dict
+	monkeypatch.setattr(cycle_count, "get_location_balances", lambda locations: {
+		"B-1": [
+			balance(item_code="ITEM-1", batch_no="", actual_qty=10, valuation_rate=2),
+			balance(item_code="ITEM-3", batch_no="", actual_qty=4, valuation_rate=5),
+			balance(item_code="ITEM-4", batch_no="", actual_qty=1, valuation_rate=1),
+		],
+	})
+	inserted = []
+	monkeypatch.setattr(frappe.db, "bulk_insert", lambda doctype, fields, rows: inserted.extend(rows), raising=False)
+
+	counted = [("B-1", "ITEM-1", "", 8.0), ("B-1", "ITEM-2", "", 3.0), ("B-1", "ITEM-4", "", 1.0)]
+	stats = cycle_count.reconcile_counts("CC-1", iter(counted))
+
+	item_code, variance_qty = (cycle_count.VARIANCE_FIELDS.index(field) for field in ("item_code", "variance_qty"))
+	variances = [(row[item_code], row[variance_qty]) for row in inserted]
+	assert variances == [("ITEM-1", -2.0), ("ITEM-2", 3.0), ("ITEM-3", -4.0)]
+	assert (stats["variance_rows"], stats["total_variance_qty"], stats["total_variance_value"]) == (3, -3.0, -24.0)
+	assert (stats["counted_rows"], stats["counted_locations"]) == (3, 1)
+
+
+def test_adjustments_count_stock_moved_after_the_reconciliation(ledger, monkeypatch):
+	def get_qty_posted_after(keys, after_datetime):
+		posted = {}
+		for sle in ledger.db.tables[LEDGER_DOCTYPE].values():
+			key = (sle.item_code, sle.location, sle.batch_no)
+			if key in keys and sle.posting_datetime > after_datetime:
+				posted[key] = posted.get(key, 0.0) + sle.actual_qty
+		return posted
+
+	def post(item_code, qty, date):
+		make_stock_ledger_entries([{
+			"item_code": item_code, "location": "B-1", "actual_qty": qty, "incoming_rate": 2,
+			"posting_date": date, "posting_time": "10:00:00",
+		}])
+
+	monkeypatch.setattr(cycle_count, "get_qty_posted_after", get_qty_posted_after)
+	for item_code in ("ITEM-1", "ITEM-2", "ITEM-3"):
+		post(item_code, 10, "2025-03-01")
+
+	# Reconciled at 10 each: counted 8, 8 and 12
+	rows = [
+		fake_frappe._dict(name=f"V-{number}", item_code=f"ITEM-{number}", location="B-1", batch_no="",
+			counted_qty=counted, valuation_rate=2)
+		for number, counted in ((1, 8), (2, 8), (3, 12))
+	]
+	ledger.db.insert(cycle_count.VARIANCE_DOCTYPE, *rows)
+
+	# Before posting: ITEM-1 receives 4 before the posting date, ITEM-2 issues 2
+	# (now matching the count), ITEM-3 issues 5 after the posting date
+	post("ITEM-1", 4, "2025-03-02")
+	post("ITEM-2", -2, "2025-03-02")
+	post("ITEM-3", -5, "2025-03-08")
+
+	doc = fake_frappe._dict(name="CC-1", posting_date="2025-03-05")
+	cycle_count.post_adjustment_chunk(doc, [row.copy() for row in rows])
+
+	variances = ledger.db.tables[cycle_count.VARIANCE_DOCTYPE]
+	assert [(row.system_qty, row.variance_qty) for row in variances.values()] == [(14, -6), (8, 0), (10, 2)]
+	assert variances["V-2"].adjustment_entry is None
+
+	# Stock as of the posting date is the counted quantity; later movements stay on top
+	adjustments = {
+		sle.item_code: sle for sle in ledger.db.tables[LEDGER_DOCTYPE].values() if sle.voucher_no == "CC-1"
+	}
+	assert sorted(adjustments) == ["ITEM-1", "ITEM-3"]
+	assert adjustments["ITEM-1"].name == variances["V-1"].adjustment_entry
+	assert [get_stock_balance(f"ITEM-{number}", "B-1") for number in (1, 2, 3)] == [8, 8, 7]
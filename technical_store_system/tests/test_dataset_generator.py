@@ -0,0 +1,61 @@
+"""
+Dataset Generator Tests (in-memory frappe)
+"""
+
+import random
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.tests.test_fixture_loader import assert_valid_tree
+from technical_store_system.utils.helpers import dataset_generator, fixture_loader
+from technical_store_system.utils.helpers.stock_ledger import LEDGER_DOCTYPE
+
+
+SIZES = {"items": 60, "locations": 80, "groups": 40, "depth": 3, "seed": 8}
+
+
+@pytest.fixture
+def generator(loader, ledger, monkeypatch):
+	"""Generator on the in-memory loader and ledger (series names without tabSeries)"""
+	monkeypatch.setattr(
+		fixture_loader, "reserve_series_names",
+		lambda doctype, count: [f"ITEM-{number:05d}" for number in range(1, count + 1)],
+	)
+	return loader
+
+
+def test_same_seed_gives_the_same_records():
+	def generate(seed):
+		rng = random.Random(seed)
+		groups, leaves = dataset_generator.generate_item_groups(rng, 40, 3)
+		locations, bins = dataset_generator.generate_locations(rng, 80)
+		return groups, locations, dataset_generator.generate_items(rng, 60, leaves, bins, ["Nos"])
+
+	assert generate(7) == generate(7)
+	assert generate(7) != generate(8)
+
+
+def test_seeded_run_loads_counts_a_valid_tree_and_opening_stock(generator):
+	result = dataset_generator.generate_dataset(**SIZES)
+
+	assert result["created"] == {"Store UOM": 6, "Store Item Group": 40, "Store Location": 80, "Store Item": 60}
+	assert_valid_tree(generator)
+
+	depths = {}
+	for name, row in generator.db.tables["Store Item Group"].items():
+		depths[name] = depths[row.parent_item_group] + 1 if row.parent_item_group else 0
+	assert max(depths.values()) < SIZES["depth"]
+
+	# Batch quantities add up, so every item with opening stock is posted
+	items = generator.db.tables["Store Item"].values()
+	posted = sum(sle.actual_qty for sle in generator.db.tables[LEDGER_DOCTYPE].values())
+	assert posted == sum(item.opening_stock for item in items)
+	assert generator.message_log == []
+
+	rerun = dataset_generator.generate_dataset(**SIZES)
+	assert set(rerun["created"].values()) == {0}
+	assert_valid_tree(generator)
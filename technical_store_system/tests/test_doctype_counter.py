@@ -0,0 +1,50 @@
+"""
+DocType Counter Tests (in-memory frappe)
+"""
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import doctype_counter
+
+
+def test_reconcile_counts_with_locking_reads_per_doctype(frappe, monkeypatch):
+	frappe.db.insert(doctype_counter.COUNTER_DOCTYPE, {"name": "Store UOM", "row_count": 3})
+	frappe.db.insert("Store UOM", {"name": "Nos"})
+	frappe.db.insert("Store Item", {"name": "ITEM-1"})
+	log = []
+
+	def sql(query, values=None, **kwargs):
+		query = " ".join(query.split())
+		log.append(query)
+		if query.startswith("SELECT `row_count`"):
+			return [[3]] if values == "Store UOM" else []
+		if query.startswith("SELECT COUNT(*)"):
+			return [[5]]
+		return []
+
+	monkeypatch.setattr(frappe.db, "sql", sql)
+	monkeypatch.setattr(frappe.db, "commit", lambda: log.append("COMMIT"))
+
+	result = doctype_counter.reconcile_counts(["Store UOM", "Store Item"])
+
+	assert result["drift"] == {"Store UOM": 2, "Store Item": 0}
+	assert [query for query in log if "COUNT(*)" in query] == [
+		"SELECT COUNT(*) FROM `tabStore UOM` LOCK IN SHARE MODE",
+		"SELECT COUNT(*) FROM `tabStore Item` LOCK IN SHARE MODE",
+	]
+	assert [query.split()[0] for query in log] == ["SELECT", "SELECT", "INSERT", "COMMIT"] * 2
+
+
+def test_reconcile_inside_a_phase_leaves_the_commit_to_the_caller(frappe, monkeypatch):
+	log = []
+	monkeypatch.setattr(frappe.db, "sql", lambda query, values=None, **kwargs: log.append(query.split()[0]) or [[1]])
+	monkeypatch.setattr(frappe.db, "commit", lambda: log.append("COMMIT"))
+	for doctype in (doctype_counter.COUNTER_DOCTYPE, "Store UOM", "Store Item"):
+		frappe.db.insert(doctype, {"name": "X"})
+
+	doctype_counter.reconcile_counts(["Store UOM", "Store Item"], commit=False)
+
+	assert "COMMIT" not in log
+	assert len(log) == 6
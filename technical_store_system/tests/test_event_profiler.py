@@ -0,0 +1,55 @@
+"""
+Event Profiler Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import event_profiler
+
+
+@pytest.fixture
+def profiling(frappe):
+	frappe.conf.store_event_profiling = 1
+
+
+@event_profiler.profile_event
+def sample_event(doc, method=None):
+	return doc.name
+
+
+def test_calls_are_recorded_newest_first(frappe, profiling):
+	for name in ("A", "B"):
+		sample_event(frappe.get_doc({"doctype": "Store UOM", "name": name}), method="validate")
+
+	entries = event_profiler.get_recent_events("Store UOM")
+
+	assert [entry["name"] for entry in entries] == ["B", "A"]
+	assert entries[0]["event"] == "validate"
+	assert entries[0]["handler"].endswith("sample_event")
+
+
+def test_stats_aggregate_per_handler(frappe, profiling):
+	for _ in range(3):
+		sample_event(frappe.get_doc({"doctype": "Store UOM", "name": "A"}), method="validate")
+
+	stats = event_profiler.get_event_stats()
+
+	assert stats["calls"] == 3
+	assert [(row["event"], row["calls"]) for row in stats["stats"]] == [("validate", 3)]
+
+
+def test_slow_calls_are_logged(frappe, profiling):
+	frappe.conf.store_slow_event_threshold_ms = 0
+
+	sample_event(frappe.get_doc({"doctype": "Store UOM", "name": "A"}), method="validate")
+
+	assert [error.title for error in frappe.error_log] == ["Slow Store Event"]
+
+
+def test_profiling_is_off_by_default(frappe):
+	assert sample_event(frappe.get_doc({"doctype": "Store UOM", "name": "A"})) == "A"
+	assert event_profiler.get_recent_events() == []
@@ -0,0 +1,68 @@
+"""
+Fixture Loader Tests (in-memory frappe)
+"""
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import fixture_loader
+
+
+def assert_valid_tree(frappe, doctype="Store Item Group", parent_field="parent_item_group"):
+	"""lft/rgt number every node once, and each subtree nests inside its parent"""
+	rows = {row.name: row for row in frappe.get_all(doctype, fields=["name", parent_field, "lft", "rgt"])}
+
+	bounds = sorted([*(row.lft for row in rows.values()), *(row.rgt for row in rows.values())])
+	assert bounds == list(range(1, 2 * len(rows) + 1))
+
+	for row in rows.values():
+		parent = rows.get(row.get(parent_field))
+		descendants = sum(1 for other in rows.values() if row.lft < other.lft < row.rgt)
+		assert row.rgt - row.lft == 2 * descendants + 1
+		if parent:
+			assert parent.lft < row.lft and row.rgt < parent.rgt
+
+
+def test_item_group_levels_are_inserted_parents_first_with_a_valid_tree(loader):
+	# An existing tree from an earlier load
+	loader.db.insert("Store Item Group", {
+		"name": "Office", "item_group_name": "Office", "is_group": 1, "group_code": "OFFIC", "lft": 1, "rgt": 2,
+	})
+	records = [
+		{"item_group_name": "Laptops", "parent_item_group": "Computers"},
+		{"item_group_name": "Computers", "parent_item_group": "Electronics", "is_group": 1},
+		{"item_group_name": "Paper", "parent_item_group": "Office"},
+		{"item_group_name": "Electronics", "is_group": 1, "default_uom": "Piece"},
+		{"item_group_name": "Phones", "parent_item_group": "Electronics"},
+	]
+
+	result = fixture_loader.load_fixtures("Store Item Group", records)
+
+	assert (result["created"], result["skipped"]) == (5, 0)
+	names = list(loader.db.tables["Store Item Group"])
+	for record in records:
+		if record.get("parent_item_group"):
+			assert names.index(record["parent_item_group"]) < names.index(record["item_group_name"])
+	assert_valid_tree(loader)
+
+	laptops = loader.db.get_value("Store Item Group", "Laptops", "*", as_dict=True)
+	assert (laptops.default_uom, laptops.old_parent) == ("Piece", "Computers")
+
+
+def test_reloading_keeps_the_tree(loader):
+	records = [{"item_group_name": "Tools", "is_group": 1}, {"item_group_name": "Hammers", "parent_item_group": "Tools"}]
+	fixture_loader.load_fixtures("Store Item Group", records)
+	before = {name: (row.lft, row.rgt) for name, row in loader.db.tables["Store Item Group"].items()}
+
+	fixture_loader.load_fixtures("Store Item Group", [*records, {"item_group_name": "Saws", "parent_item_group": "Tools"}])
+
+	assert_valid_tree(loader)
+	assert loader.db.tables["Store Item Group"]["Hammers"].lft == before["Hammers"][0]
+
+
+def test_parent_cycles_get_no_bounds():
+	row = fake_frappe._dict
+	rows = [row(name="A", parent="B"), row(name="B", parent="A"), row(name="C", parent=None), row(name="D", parent="C")]
+
+	assert fixture_loader.get_nested_set_bounds(rows, "parent") == {"C": (1, 4), "D": (2, 3)}
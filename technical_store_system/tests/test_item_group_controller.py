@@ -0,0 +1,58 @@
+"""
+Store Item Group Controller Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.controllers import item_group_controller as controller
+
+
+def add_groups(frappe):
+	"""Tools → Hand Tools (2 items), Power Tools (1 item)"""
+	frappe.db.insert(
+		"Store Item Group",
+		{"name": "Tools", "item_group_name": "Tools", "is_group": 1, "group_code": "TOOLS"},
+		{"name": "Hand Tools", "item_group_name": "Hand Tools", "is_group": 0, "parent_item_group": "Tools"},
+		{"name": "Power Tools", "item_group_name": "Power Tools", "is_group": 0, "parent_item_group": "Tools"},
+	)
+	frappe.db.insert(
+		"Store Item",
+		{"name": "ITEM-1", "item_group": "Hand Tools"},
+		{"name": "ITEM-2", "item_group": "Hand Tools"},
+		{"name": "ITEM-3", "item_group": "Power Tools"},
+	)
+
+
+def test_group_code_avoids_existing_codes(frappe):
+	add_groups(frappe)
+	doc = frappe.get_doc({"doctype": "Store Item Group", "item_group_name": "Tools"})
+
+	assert controller.ItemGroupController(doc).generate_group_code() == "TOOLS1"
+
+
+def test_on_update_refreshes_own_and_parent_statistics(frappe):
+	add_groups(frappe)
+	for name in ("Hand Tools", "Power Tools"):
+		controller.on_update_event(frappe.get_doc("Store Item Group", name))
+
+	assert frappe.db.get_value("Store Item Group", "Hand Tools", "item_count") == 2
+	assert frappe.db.get_value("Store Item Group", "Tools", "child_group_count") == 2
+
+
+def test_group_with_items_cannot_become_group(frappe):
+	add_groups(frappe)
+	doc = frappe.get_doc("Store Item Group", "Hand Tools")
+	doc.is_group = 1
+
+	with pytest.raises(frappe.ValidationError, match="has 2 item"):
+		controller.before_save_event(doc)
+
+
+def test_group_hierarchy(frappe):
+	add_groups(frappe)
+
+	assert controller.get_group_hierarchy("Hand Tools") == ["Tools", "Hand Tools"]
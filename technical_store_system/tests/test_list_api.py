@@ -0,0 +1,84 @@
+"""
+List API Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import list_api
+
+
+def add_items(frappe, count):
+	frappe.db.insert("Store Item", *[
+		{
+			"name": f"ITEM-{number:05d}",
+			"item_name": f"Item {number}",
+			"item_group": "Tools" if number % 2 else "Electronics",
+			"enabled": 1,
+			"description": "long text",
+		}
+		for number in range(1, count + 1)
+	])
+
+
+def test_pages_continue_after_the_cursor(frappe):
+	add_items(frappe, 5)
+
+	first = list_api.get_items(page_length=2)
+	second = list_api.get_items(cursor=first["next_cursor"], page_length=2)
+	last = list_api.get_items(cursor=second["next_cursor"], page_length=2)
+
+	assert [row.name for row in first["data"] + second["data"] + last["data"]] == [
+		f"ITEM-{number:05d}" for number in range(1, 6)
+	]
+	assert last["next_cursor"] is None
+
+
+def test_one_query_per_page(frappe):
+	add_items(frappe, 10)
+	cursor = list_api.get_items(page_length=3)["next_cursor"]
+
+	frappe.db.reset_query_count()
+	list_api.get_items(cursor=cursor, page_length=3)
+
+	assert frappe.db.queries == 1
+
+
+def test_projection_always_includes_the_cursor_key(frappe):
+	add_items(frappe, 1)
+
+	row = list_api.get_items(fields='["item_name"]')["data"][0]
+
+	assert dict(row) == {"name": "ITEM-00001", "item_name": "Item 1"}
+
+
+def test_filters_are_applied_in_the_query(frappe):
+	add_items(frappe, 6)
+
+	page = list_api.get_items(filters='{"item_group": "Tools"}', page_length=2)
+	rest = list_api.get_items(filters='{"item_group": "Tools"}', cursor=page["next_cursor"], page_length=2)
+
+	assert [row.name for row in page["data"] + rest["data"]] == ["ITEM-00001", "ITEM-00003", "ITEM-00005"]
+
+
+@pytest.mark.parametrize("kwargs", [
+	{"fields": '["item_name", "count(*)"]'},
+	{"filters": '{"no_such_field": 1}'},
+	{"filters": '[["Store Item Serial Number", "serial_no", "=", "X"]]'},
+	{"filters": '[["item_name", "regexp", "x"]]'},
+	{"cursor": "not-a-cursor"},
+])
+def test_invalid_requests_are_rejected(frappe, kwargs):
+	with pytest.raises(frappe.ValidationError):
+		list_api.get_items(**kwargs)
+
+
+def test_iter_pages_yields_every_row_once(frappe):
+	add_items(frappe, 7)
+
+	pages = list(list_api.iter_pages("Store Item", filters={"enabled": 1}, page_length=3))
+
+	assert [len(page) for page in pages] == [3, 3, 1]
@@ -0,0 +1,134 @@
+"""
+Maintenance Job Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import maintenance_jobs
+
+
+def sample_operation(chunks, job=None, fail_at=None, cancel_at=None):
+	for index in range(1, chunks + 1):
+		if index == fail_at:
+			raise RuntimeError("chunk failed")
+		if index == cancel_at:
+			maintenance_jobs.cancel_maintenance_job(job.doc.name)
+		job.progress(index, chunks, f"chunk {index}")
+	return {"success": True, "message": f"{chunks} chunks"}
+
+
+@pytest.fixture(autouse=True)
+def queue_lock(frappe, monkeypatch):
+	"""
+	Row lock of lock_maintenance_queue: held until commit
+
+	A second caller would block until the holder's transaction ends; here
+	that transaction is committed when the second caller asks for the lock.
+	"""
+	lock = frappe._dict(held=False, waits=0)
+
+	def lock_maintenance_queue():
+		frappe.db.query_log.append(("lock", maintenance_jobs.JOB_DOCTYPE))
+		if lock.held:
+			lock.waits += 1
+			frappe.db.commit()
+		lock.held = True
+		frappe.db.after_commit.add(lambda: lock.update(held=False))
+
+	monkeypatch.setattr(maintenance_jobs, "lock_maintenance_queue", lock_maintenance_queue)
+	return lock
+
+
+@pytest.fixture
+def job_types(monkeypatch):
+	monkeypatch.setitem(maintenance_jobs.JOB_TYPES, "Sample", f"{__name__}.sample_operation")
+
+
+def run_enqueued(frappe):
+	"""Run the queued jobs the way the worker calls them"""
+	for job in frappe.enqueued:
+		frappe.get_attr(job.method)(**job.kwargs)
+
+
+def get_job(frappe, name):
+	return frappe.db.get_value(maintenance_jobs.JOB_DOCTYPE, name, "*", as_dict=True)
+
+
+def test_only_one_job_at_a_time(frappe, job_types):
+	name = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+
+	assert get_job(frappe, name).status == "Queued"
+	assert [job.kwargs for job in frappe.enqueued] == [{"maintenance_job": name}]
+
+	with pytest.raises(frappe.ValidationError):
+		maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+
+
+def test_second_caller_waits_for_the_first_and_is_rejected(frappe, job_types, queue_lock):
+	first = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+
+	with pytest.raises(frappe.ValidationError):
+		maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+
+	# The active-job check runs under the lock, so the second caller sees the first job
+	query_log = frappe.db.query_log
+	assert query_log.index(("lock", maintenance_jobs.JOB_DOCTYPE)) < query_log.index(("get_value", maintenance_jobs.JOB_DOCTYPE))
+	assert queue_lock.waits == 1
+	assert frappe.get_all(maintenance_jobs.JOB_DOCTYPE, pluck="name") == [first]
+	assert [job.kwargs for job in frappe.enqueued] == [{"maintenance_job": first}]
+
+
+def test_job_of_a_dead_worker_does_not_block(frappe, job_types):
+	name = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+	frappe.db.set_value(maintenance_jobs.JOB_DOCTYPE, name, "status", "Running")
+	frappe.enqueued.clear()
+
+	second = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+
+	assert get_job(frappe, name).status == "Failed"
+	assert get_job(frappe, second).status == "Queued"
+
+
+def test_run_reports_progress_per_chunk(frappe, job_types):
+	name = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=4)
+
+	run_enqueued(frappe)
+
+	job = get_job(frappe, name)
+	assert (job.status, job.progress, job.result_message) == ("Completed", 100, "4 chunks")
+	progress = [entry.message["progress"] for entry in frappe.realtime_log if entry.message["status"] == "Running"]
+	assert progress[1:] == [25.0, 50.0, 75.0, 100.0]
+
+
+def test_running_job_stops_after_current_chunk(frappe, job_types):
+	name = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=4, cancel_at=3)
+
+	maintenance_jobs.run_maintenance_job(name)
+
+	job = get_job(frappe, name)
+	assert (job.status, job.progress) == ("Cancelled", 50.0)
+
+
+def test_queued_job_is_cancelled_without_running(frappe, job_types):
+	name = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=2)
+
+	maintenance_jobs.cancel_maintenance_job(name)
+	maintenance_jobs.run_maintenance_job(name)
+
+	job = get_job(frappe, name)
+	assert (job.status, job.progress) == ("Cancelled", None)
+
+
+def test_failure_is_recorded(frappe, job_types):
+	name = maintenance_jobs.enqueue_maintenance_job("Sample", chunks=3, fail_at=2)
+
+	maintenance_jobs.run_maintenance_job(name)
+
+	job = get_job(frappe, name)
+	assert job.status == "Failed"
+	assert "chunk failed" in job.error_log
+	assert frappe.error_log[-1].title == f"Maintenance Job Failed: {name}"
@@ -0,0 +1,49 @@
+"""
+Query Budgets of Controller Code Paths (in-memory frappe)
+
+Budgets are the current counts: a change that adds a query to one of
+these paths fails here and lists the call site that added it.
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.tests.query_budget import query_budget
+from technical_store_system.tests.test_item_group_controller import add_groups
+from technical_store_system.tests.test_store_location_controller import add_locations, new_bin
+from technical_store_system.utils.controllers import item_group_controller, store_location_controller
+
+
+def test_insert_bin(frappe):
+	add_locations(frappe)
+
+	with query_budget(12, "Bin before_insert"):
+		store_location_controller.before_insert_event(new_bin(frappe))
+
+
+def test_save_item_group(frappe):
+	add_groups(frappe)
+	doc = frappe.get_doc("Store Item Group", "Hand Tools")
+
+	with query_budget(15, "Save item group"):
+		item_group_controller.before_save_event(doc)
+		item_group_controller.on_update_event(doc)
+
+
+def test_exceeded_budget_reports_call_sites(frappe):
+	add_locations(frappe)
+	doc = new_bin(frappe)
+	doc.bin = "B-3"
+
+	with pytest.raises(AssertionError) as error:
+		with query_budget(2, "Bin display name"):
+			store_location_controller.generate_location_name(doc)
+
+	message = str(error.value)
+	assert "Query budget exceeded for Bin display name: 4 queries, budget 2" in message
+	# One call site per parent level
+	assert message.count("1 × technical_store_system/utils/controllers/store_location_controller.py") == 4
+	assert 'frappe.get_value("Store Location", doc.shelf, "shelf_name")' in message
@@ -0,0 +1,109 @@
+"""
+Stock Ledger Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import stock_ledger, stock_snapshot
+
+
+def test_balances_are_created_and_locked_in_one_sorted_pass(frappe, monkeypatch):
+	statements = []
+
+	def sql(query, values=None, as_dict=False):
+		statements.append((" ".join(query.split()), values))
+		return []
+
+	monkeypatch.setattr(frappe.db, "sql", sql)
+	entries = [
+		stock_ledger.prepare_sl_entry({"item_code": item_code, "location": "B-1", "actual_qty": 1}, None, None, idx)
+		for idx, item_code in enumerate(["ITEM-3", "ITEM-1", "ITEM-2", "ITEM-1"], start=1)
+	]
+
+	stock_ledger.lock_balances(entries, chunk_size=2)
+
+	inserts = [values[::len(stock_ledger.BALANCE_FIELDS)] for query, values in statements if query.startswith("INSERT")]
+	assert inserts == [["ITEM-1::B-1::", "ITEM-2::B-1::"], ["ITEM-3::B-1::"]]
+	assert all("ON DUPLICATE KEY UPDATE" in query for query, values in statements[:2])
+	assert statements[-1][0].endswith("ORDER BY `name` FOR UPDATE")
+	assert frappe.db.queries == 0
+
+
+@pytest.fixture
+def stock(ledger):
+	"""FIFO item in a group, stock validation on"""
+	ledger.db.singles["Store Settings"].update(stock_validation=1, allow_negative_stock=0)
+	ledger.db.insert("Store Item Group", {"name": "Tools", "allow_negative_stock": 0})
+	ledger.db.insert("Store Item", {"name": "ITEM-1", "item_group": "Tools", "valuation_method": "FIFO"})
+	return ledger
+
+
+def post(*entries, **kwargs):
+	return stock_ledger.make_stock_ledger_entries(list(entries), voucher_type="Store Stock Entry", **kwargs)
+
+
+def entry(qty, day, rate=None):
+	return {
+		"item_code": "ITEM-1", "location": "B-1", "actual_qty": qty, "incoming_rate": rate,
+		"posting_date": f"2025-03-{day:02d}", "posting_time": "10:00:00",
+	}
+
+
+def get_entries(frappe):
+	return sorted(
+		frappe.get_all(stock_ledger.LEDGER_DOCTYPE, fields=["*"]),
+		key=lambda sle: (sle.posting_datetime, sle.idx),
+	)
+
+
+def test_entries_of_a_posting_apply_in_posting_order(stock):
+	post(entry(-4, 3), entry(10, 1, rate=2), entry(5, 2, rate=4))
+
+	entries = get_entries(stock)
+	assert [sle.qty_after_transaction for sle in entries] == [10, 15, 11]
+	assert entries[-1].outgoing_rate == 2
+	balance = stock.db.get_value(stock_ledger.BALANCE_DOCTYPE, "ITEM-1::B-1::", "*", as_dict=True)
+	assert (balance.actual_qty, balance.stock_value) == (11, 32)
+
+
+def test_issue_below_zero_is_rejected(stock):
+	post(entry(3, 1, rate=2))
+
+	with pytest.raises(stock.ValidationError):
+		post(entry(-5, 2))
+
+	assert stock_ledger.get_stock_balance("ITEM-1", "B-1") == 3
+
+
+def test_item_group_can_allow_negative_stock(stock):
+	stock.db.set_value("Store Item Group", "Tools", "allow_negative_stock", 1)
+
+	post(entry(-5, 2))
+
+	assert stock_ledger.get_stock_balance("ITEM-1", "B-1") == -5
+
+
+def test_backdated_entries_queue_one_repost_from_the_earliest_date(stock):
+	post(entry(10, 5, rate=2))
+
+	post(entry(1, 3, rate=2))
+	post(entry(1, 2, rate=2))
+	post(entry(1, 4, rate=2))
+
+	reposts = stock.get_all("Store Stock Repost", fields=["item_code", "location", "from_datetime", "status"])
+	assert [(row.item_code, row.location, str(row.from_datetime), row.status) for row in reposts] == [
+		("ITEM-1", "B-1", "2025-03-02 10:00:00", "Queued"),
+	]
+	assert [job.job_id for job in stock.enqueued].count("technical_store_system:stock_repost") == 3
+
+
+def test_posting_on_a_snapshot_date_is_reposted(stock):
+	stock.cache.set_value(stock_snapshot.LATEST_SNAPSHOT_CACHE_KEY, stock.getdate("2025-03-31"))
+
+	post(entry(10, 31, rate=2))
+
+	assert stock.db.exists("Store Stock Repost", {"item_code": "ITEM-1", "location": "B-1"})
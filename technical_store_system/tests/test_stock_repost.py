@@ -0,0 +1,112 @@
+"""
+Stock Repost Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import stock_ledger, stock_repost
+from technical_store_system.utils.helpers.stock_ledger import BALANCE_DOCTYPE, LEDGER_DOCTYPE
+
+
+def ledger_order(sle):
+	return (sle.posting_datetime, sle.idx, sle.name)
+
+
+@pytest.fixture
+def reposts(ledger, monkeypatch):
+	"""Repost worker on the in-memory ledger, one entry per chunk"""
+	ledger.db.insert("Store Item", {"name": "ITEM-1", "valuation_method": "Moving Average"})
+
+	def key_entries(doc, batch_no):
+		return sorted(
+			(
+				sle for sle in ledger.db.tables[LEDGER_DOCTYPE].values()
+				if (sle.item_code, sle.location, sle.batch_no or "") == (doc.item_code, doc.location, batch_no)
+			),
+			key=ledger_order,
+		)
+
+	def get_entries_after(doc, batch_no, position, limit=1):
+		if position:
+			rows = [sle for sle in key_entries(doc, batch_no) if ledger_order(sle) > ledger_order(position)]
+		else:
+			rows = [sle for sle in key_entries(doc, batch_no) if sle.posting_datetime >= doc.from_datetime]
+		return [sle.copy() for sle in rows[:limit]]
+
+	def get_previous_entry_state(item_code, location, batch_no, before_datetime):
+		doc = fake_frappe._dict(item_code=item_code, location=location)
+		rows = [sle for sle in key_entries(doc, batch_no) if sle.posting_datetime < before_datetime]
+		return rows[-1].copy() if rows else None
+
+	def update_ledger_rows(rows, fields, chunk_size=1000):
+		for row in rows:
+			ledger.db.tables[LEDGER_DOCTYPE][row.name].update({field: row.get(field) for field in fields})
+
+	def lock_balance(item_code, location, batch_no):
+		row = ledger.db.tables[BALANCE_DOCTYPE].get(stock_ledger.get_balance_key(item_code, location, batch_no))
+		return row.copy() if row else None
+
+	monkeypatch.setattr(stock_repost, "get_entries_after", get_entries_after)
+	monkeypatch.setattr(stock_repost, "get_previous_entry_state", get_previous_entry_state)
+	monkeypatch.setattr(stock_repost, "update_ledger_rows", update_ledger_rows)
+	monkeypatch.setattr(stock_repost, "lock_balance", lock_balance)
+	monkeypatch.setattr(stock_repost, "write_balance_rows", stock_ledger.write_balance_rows)
+	monkeypatch.setattr(stock_repost, "rebuild_item_snapshots", lambda item_codes, from_date: None)
+
+	# Moving average: the backdated receipt changes the rate of the later issue
+	for qty, day, rate in ((10, 1, 2), (-5, 3, None), (10, 2, 5)):
+		stock_ledger.make_stock_ledger_entries([{
+			"item_code": "ITEM-1", "location": "B-1", "actual_qty": qty, "incoming_rate": rate,
+			"posting_date": f"2025-03-0{day}", "posting_time": "10:00:00",
+		}])
+	return ledger
+
+
+def get_issue(frappe):
+	return frappe.db.get_value(LEDGER_DOCTYPE, {"actual_qty": -5}, "*", as_dict=True)
+
+
+def assert_reposted(frappe):
+	issue = get_issue(frappe)
+	balance = frappe.db.get_value(BALANCE_DOCTYPE, "ITEM-1::B-1::", "*", as_dict=True)
+	repost = frappe.db.get_value(stock_repost.REPOST_DOCTYPE, {}, "*", as_dict=True)
+
+	assert (issue.outgoing_rate, issue.qty_after_transaction) == (3.5, 15)
+	assert (balance.actual_qty, balance.stock_value) == (15, 52.5)
+	assert frappe.db.get_value("Store Location Stock Rollup", "B-1", "stock_value") == 52.5
+	assert (repost.status, repost.entries_processed) == ("Completed", 2)
+
+
+def test_backdated_receipt_is_reposted_from_its_checkpoint(reposts):
+	# Applied immediately at the end of the row, the later issue is still wrong
+	assert get_issue(reposts).outgoing_rate == 2
+
+	stock_repost.process_repost_queue()
+
+	assert_reposted(reposts)
+
+
+def test_interrupted_repost_resumes_after_the_last_chunk(reposts, monkeypatch):
+	update_ledger_rows = stock_repost.update_ledger_rows
+	calls = []
+
+	def fail_on_second_chunk(rows, fields, chunk_size=1000):
+		calls.append(rows)
+		if len(calls) == 2:
+			raise RuntimeError("worker killed")
+		update_ledger_rows(rows, fields, chunk_size)
+
+	monkeypatch.setattr(stock_repost, "update_ledger_rows", fail_on_second_chunk)
+	stock_repost.process_repost_queue()
+
+	repost = reposts.db.get_value(stock_repost.REPOST_DOCTYPE, {}, "*", as_dict=True)
+	assert (repost.status, repost.entries_processed) == ("Failed", 1)
+
+	stock_repost.retry_repost(repost.name)
+	stock_repost.process_repost_queue()
+
+	assert_reposted(reposts)
@@ -0,0 +1,93 @@
+"""
+Stock Rollup Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.tests.test_store_location_controller import add_locations
+from technical_store_system.utils.controllers import store_location_controller
+from technical_store_system.utils.helpers import stock_rollup
+
+
+BIN = "WH-1-Z-A-R01-S01-B-1"
+
+
+@pytest.fixture
+def rollups(ledger):
+	"""Location tree with rollup rows upserted into the fake database"""
+	add_locations(ledger)
+	return ledger
+
+
+def post(location, qty, value):
+	stock_rollup.apply_rollup_deltas(stock_rollup.get_rollup_deltas([
+		fake_frappe._dict(location=location, actual_qty=qty, stock_value_difference=value),
+	]))
+
+
+def test_posting_to_a_bin_rolls_up_to_the_warehouse(rollups):
+	post(BIN, 10, 50.0)
+	post("WH-1-Z-A-R01-S01-B-2", 5, 20.0)
+
+	assert stock_rollup.get_location_stock(BIN) == {"total_qty": 10, "stock_value": 50.0}
+	assert stock_rollup.get_location_stock("WH-1-Z-A-R01-S01") == {"total_qty": 15, "stock_value": 70.0}
+	assert stock_rollup.get_location_stock("WH-1") == {"total_qty": 15, "stock_value": 70.0}
+
+
+def test_ancestors_follow_the_hierarchy_fields(rollups):
+	assert stock_rollup.get_location_ancestors([BIN])[BIN] == [
+		BIN, "WH-1-Z-A-R01-S01", "WH-1-Z-A-R01", "WH-1-Z-A", "WH-1",
+	]
+
+
+def test_descendants_of_a_rack(rollups):
+	assert stock_rollup.get_location_descendants("WH-1-Z-A-R01") == [
+		"WH-1-Z-A-R01", "WH-1-Z-A-R01-S01", BIN, "WH-1-Z-A-R01-S01-B-2",
+	]
+
+
+def test_descendants_of_a_moved_shelf(rollups):
+	rollups.db.insert("Store Location", {
+		"name": "WH-1-Z-A-R02", "location_type": "Rack", "rack_name": "R02", "store": "WH-1", "zone": "WH-1-Z-A",
+	})
+	shelf = rollups.get_doc("Store Location", "WH-1-Z-A-R01-S01")
+	shelf.rack = "WH-1-Z-A-R02"
+	store_location_controller.move_location(shelf)
+	shelf.save()
+
+	assert stock_rollup.get_location_descendants("WH-1-Z-A-R01-S01") == [
+		"WH-1-Z-A-R01-S01", BIN, "WH-1-Z-A-R01-S01-B-2",
+	]
+	assert stock_rollup.get_location_descendants("WH-1-Z-A-R02") == [
+		"WH-1-Z-A-R02", "WH-1-Z-A-R01-S01", BIN, "WH-1-Z-A-R01-S01-B-2",
+	]
+
+
+def test_moving_a_rack_moves_its_stock(rollups):
+	rollups.db.insert(
+		"Store Location",
+		{"name": "WH-2", "location_type": "Warehouse", "warehouse_name": "WH-2"},
+		{"name": "WH-2-Z-A", "location_type": "Zone", "zone_name": "Z-A", "store": "WH-2"},
+	)
+	post(BIN, 10, 50.0)
+
+	rack = rollups.get_doc("Store Location", "WH-1-Z-A-R01")
+	rack.store, rack.zone = "WH-2", "WH-2-Z-A"
+	store_location_controller.move_location(rack)
+	rack.save()
+
+	# Cached paths are only dropped once the move is committed
+	assert rollups.cache.hget(stock_rollup.ANCESTOR_CACHE_KEY, BIN)[-1] == "WH-1"
+	rollups.db.commit()
+
+	assert stock_rollup.get_location_stock("WH-1")["total_qty"] == 0
+	assert stock_rollup.get_location_stock("WH-2")["total_qty"] == 10
+	assert rollups.db.get_value("Store Location", BIN, ["zone", "store"]) == ["WH-2-Z-A", "WH-2"]
+
+	post(BIN, -4, -20.0)
+	assert stock_rollup.get_location_stock("WH-2-Z-A") == {"total_qty": 6, "stock_value": 30.0}
+	assert stock_rollup.get_location_stock("WH-1")["total_qty"] == 0
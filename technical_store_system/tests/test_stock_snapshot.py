@@ -0,0 +1,49 @@
+"""
+Stock Snapshot Tests (in-memory frappe)
+"""
+
+import datetime
+import json
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import stock_snapshot
+
+
+@pytest.mark.parametrize("from_date, to_date, frequency, expected", [
+	("2025-01-15", "2025-03-31", "Monthly", ["2025-01-31", "2025-02-28", "2025-03-31"]),
+	("2025-01-15", "2025-03-30", "Monthly", ["2025-01-31", "2025-02-28"]),
+	("2025-03-01", "2025-03-16", "Weekly", ["2025-03-02", "2025-03-09", "2025-03-16"]),
+	("2025-03-01", "2025-03-03", "Daily", ["2025-03-01", "2025-03-02", "2025-03-03"]),
+])
+def test_period_end_dates_cover_only_complete_periods(from_date, to_date, frequency, expected):
+	dates = stock_snapshot.get_period_end_dates(from_date, to_date, frequency)
+
+	assert [date.isoformat() for date in dates] == expected
+
+
+def test_stock_as_of_starts_from_the_latest_snapshot(frappe, monkeypatch):
+	frappe.db.insert(stock_snapshot.SNAPSHOT_DOCTYPE, {
+		"name": "S-1",
+		"snapshot_date": datetime.date(2025, 2, 28),
+		"item_code": "ITEM-1",
+		"balances": json.dumps([["B-1", "", 10, 40], ["B-2", "", 3, 12]]),
+	})
+	deltas = []
+
+	def get_ledger_delta(after_date, to_date, item_codes=None):
+		deltas.append((after_date, to_date))
+		return {("ITEM-1", "B-1", ""): {"qty": -4, "value": -16}, ("ITEM-1", "B-2", ""): {"qty": -3, "value": -12}}
+
+	monkeypatch.setattr(stock_snapshot, "_get_latest_snapshot_date", lambda before=None: datetime.date(2025, 2, 28))
+	monkeypatch.setattr(stock_snapshot, "get_ledger_delta", get_ledger_delta)
+
+	stock = stock_snapshot.get_stock_as_of("2025-03-10", ["ITEM-1"])
+
+	# Only the delta after the snapshot is read; emptied rows are left out
+	assert deltas == [(datetime.date(2025, 2, 28), datetime.date(2025, 3, 10))]
+	assert stock == {("ITEM-1", "B-1", ""): {"qty": 6, "value": 24}}
@@ -0,0 +1,85 @@
+"""
+Stock Transfer Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.tests.test_store_location_controller import add_locations
+from technical_store_system.utils.helpers import stock_ledger, stock_snapshot, stock_transfer
+from technical_store_system.utils.helpers.stock_rollup import get_location_stock
+
+
+SHELF = "WH-1-Z-A-R01-S01"
+TARGET = "WH-2-Z-A"
+
+
+@pytest.fixture
+def store(ledger, monkeypatch):
+	"""Two warehouses and a FIFO item stocked in both bins of WH-1's shelf"""
+	add_locations(ledger)
+	ledger.db.insert(
+		"Store Location",
+		{"name": "WH-2", "location_type": "Warehouse", "warehouse_name": "WH-2", "enabled": 1},
+		{"name": TARGET, "location_type": "Zone", "zone_name": "Z-A", "store": "WH-2", "enabled": 1},
+	)
+	ledger.db.insert("Store Item", {"name": "ITEM-1", "valuation_method": "FIFO"})
+
+	def get_transfer_candidates(source_locations):
+		return sorted(
+			(
+				row for row in ledger.db.tables[stock_ledger.BALANCE_DOCTYPE].values()
+				if row.location in source_locations and row.actual_qty > 0
+			),
+			key=lambda row: row.name,
+		)
+
+	monkeypatch.setattr(stock_transfer, "get_transfer_candidates", get_transfer_candidates)
+
+	stock_ledger.make_stock_ledger_entries([
+		{"item_code": "ITEM-1", "location": f"{SHELF}-B-1", "actual_qty": 10, "incoming_rate": 4},
+		{"item_code": "ITEM-1", "location": f"{SHELF}-B-1", "actual_qty": 5, "incoming_rate": 6},
+		{"item_code": "ITEM-1", "location": f"{SHELF}-B-2", "actual_qty": 3, "incoming_rate": 5},
+	], voucher_type="Store Stock Entry", voucher_no="SE-1")
+	return ledger
+
+
+def test_transfer_moves_quantity_and_value(store):
+	result = stock_transfer.transfer_location_stock(SHELF, TARGET, preview=0)
+
+	assert (result["line_count"], result["total_qty"], result["total_value"]) == (2, 18, 85.0)
+	assert stock_ledger.get_stock_balance("ITEM-1", f"{SHELF}-B-1") == 0
+	assert stock_ledger.get_stock_balance("ITEM-1", TARGET) == 18
+	assert get_location_stock("WH-1") == {"total_qty": 0, "stock_value": 0}
+	assert get_location_stock("WH-2") == {"total_qty": 18, "stock_value": 85.0}
+
+	receipts = store.get_all(
+		stock_ledger.LEDGER_DOCTYPE, filters={"voucher_no": result["voucher_no"], "actual_qty": [">", 0]},
+		fields=["incoming_rate"], order_by="idx asc",
+	)
+	assert [row.incoming_rate for row in receipts] == [70 / 15, 5.0]
+
+
+def test_target_inside_the_source_is_rejected(store):
+	with pytest.raises(store.ValidationError):
+		stock_transfer.transfer_location_stock("WH-1-Z-A", f"{SHELF}-B-2", preview=0)
+
+
+def test_transfer_on_or_before_the_latest_snapshot_is_reposted(store):
+	store.cache.set_value(stock_snapshot.LATEST_SNAPSHOT_CACHE_KEY, store.getdate())
+
+	stock_transfer.transfer_location_stock(SHELF, TARGET, preview=0)
+
+	reposts = store.get_all("Store Stock Repost", fields=["location"], order_by="location asc", pluck="location")
+	assert reposts == [f"{SHELF}-B-1", f"{SHELF}-B-2", TARGET]
+
+
+def test_receipt_rate_must_come_from_an_earlier_issue(store):
+	with pytest.raises(store.ValidationError):
+		stock_ledger.make_stock_ledger_entries([
+			{"item_code": "ITEM-1", "location": TARGET, "actual_qty": 1, "incoming_rate_from": 2},
+			{"item_code": "ITEM-1", "location": f"{SHELF}-B-2", "actual_qty": -1},
+		])
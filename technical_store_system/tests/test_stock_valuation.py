@@ -0,0 +1,129 @@
+"""
+Stock Valuation Tests (pure functions)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import stock_valuation
+from technical_store_system.utils.helpers.stock_valuation import (
+	FIFO,
+	LIFO,
+	MovingAverageValuation,
+	QueueValuation,
+	apply_valuation,
+	dump_queue,
+	get_valuation
+)
+
+
+def receive(valuation, *bins):
+	for qty, rate in bins:
+		valuation.add_stock(qty, rate)
+	return valuation
+
+
+@pytest.mark.parametrize("method, value, state", [
+	(FIFO, 10 * 4 + 2 * 6, [[3, 6]]),
+	(LIFO, 5 * 6 + 7 * 4, [[3, 4]]),
+])
+def test_queue_issue_order(method, value, state):
+	valuation = receive(QueueValuation(method=method), (10, 4), (5, 6))
+
+	assert valuation.remove_stock(12) == value
+	assert valuation.get_state() == state
+
+
+def test_issue_beyond_stock_is_settled_by_the_next_receipt():
+	valuation = receive(QueueValuation(), (2, 5))
+
+	assert valuation.remove_stock(5) == 25
+	assert valuation.get_state() == [[-3, 5]]
+
+	valuation.add_stock(4, 7)
+	assert valuation.get_state() == [[1, 7]]
+
+
+def test_moving_average_reaverages_receipts():
+	valuation = receive(MovingAverageValuation(), (10, 4), (10, 6))
+
+	assert valuation.rate == 5
+	assert valuation.remove_stock(5) == 25
+	assert valuation.get_state() == [[15, 5]]
+
+
+def test_moving_average_restarts_at_the_receipt_rate_after_negative_stock():
+	valuation = MovingAverageValuation([[-2, 3]])
+
+	valuation.add_stock(5, 8)
+
+	assert valuation.get_state() == [[3, 8]]
+
+
+def test_compaction_merges_equal_rates_and_caps_the_queue():
+	valuation = receive(QueueValuation(max_bins=3), (1, 1), (1, 2), (1, 2), (1, 3), (1, 4))
+	value = valuation.value
+
+	valuation.compact()
+
+	# FIFO keeps the bins issued next exact and averages the ones issued last
+	assert valuation.get_state() == [[1, 1], [2, 2], [2, 3.5]]
+	assert valuation.value == value
+
+
+def test_fifo_issues_stay_exact_past_many_receipts():
+	receipts = [(2, rate) for rate in range(1, 121)]
+	valuation = get_valuation(FIFO)
+
+	for qty, rate in receipts:
+		apply_valuation(valuation, fake_frappe._dict(actual_qty=qty, incoming_rate=rate))
+	issue = fake_frappe._dict(actual_qty=-200)
+	apply_valuation(valuation, issue)
+
+	# The first 100 receipts at their own rates, the last 20 untouched
+	assert issue.stock_value_difference == -sum(qty * rate for qty, rate in receipts[:100])
+	assert valuation.get_state() == [[float(qty), float(rate)] for qty, rate in receipts[100:]]
+
+
+def test_queue_cap_is_opt_in(frappe):
+	assert stock_valuation.get_max_queue_bins() == 0
+	assert get_valuation(FIFO).max_bins == 0
+
+	frappe.db.set_single_value("Store Settings", "valuation_queue_max_bins", 10)
+
+	assert stock_valuation.get_max_queue_bins() == 10
+
+
+def test_lifo_compaction_merges_the_oldest_bins():
+	valuation = receive(QueueValuation(method=LIFO, max_bins=2), (1, 1), (1, 3), (1, 5))
+
+	valuation.compact()
+
+	assert valuation.get_state() == [[2, 2], [1, 5]]
+
+
+def test_apply_valuation_fills_the_entry():
+	valuation = get_valuation(FIFO)
+	receipt = fake_frappe._dict(actual_qty=4, incoming_rate=None)
+	issue = fake_frappe._dict(actual_qty=-4)
+
+	apply_valuation(valuation, receipt, fallback_rate=2.5)
+	apply_valuation(valuation, issue)
+
+	assert (receipt.incoming_rate, receipt.stock_value, receipt.stock_value_difference) == (2.5, 10, 10)
+	assert (issue.outgoing_rate, issue.stock_value, issue.stock_value_difference) == (2.5, 0, -10)
+	# Empty row keeps reporting its last rate
+	assert issue.valuation_rate == 2.5
+
+
+def test_state_round_trips_through_storage():
+	valuation = receive(get_valuation(FIFO), (1.5, 2), (2, 3))
+
+	stored = dump_queue(valuation.get_state())
+
+	assert stored == "[[1.5,2.0],[2.0,3.0]]"
+	assert get_valuation(FIFO, stored).value == valuation.value
+	assert isinstance(get_valuation(stock_valuation.MOVING_AVERAGE, stored), MovingAverageValuation)
@@ -0,0 +1,70 @@
+"""
+Store Item Controller Tests (in-memory frappe)
+"""
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.controllers import store_item_controller as controller
+from technical_store_system.utils.helpers.stock_ledger import get_stock_balance
+
+
+def new_item(frappe, **values):
+	doc = frappe.get_doc({
+		"doctype": "Store Item",
+		"name": "ITEM-1",
+		"item_name": "Drill",
+		"is_stock_item": 1,
+		"opening_stock": 10,
+		"opening_valuation_rate": 2.5,
+		"default_location": "B-1",
+		**values,
+	})
+	frappe.db.insert("Store Item", doc.as_dict())
+	return doc
+
+
+def test_opening_stock_is_posted_to_the_default_location(ledger):
+	controller.after_insert_event(new_item(ledger))
+
+	assert get_stock_balance("ITEM-1", "B-1") == 10
+
+
+def test_missing_default_location_warns_instead_of_failing(ledger):
+	controller.after_insert_event(new_item(ledger, default_location=None))
+
+	assert "Default Location" in ledger.message_log[-1]
+	assert not ledger.get_all("Store Stock Ledger Entry")
+
+
+def test_batch_items_post_per_batch(ledger):
+	doc = new_item(ledger, has_batch_no=1)
+	doc.append("batch_numbers", {"batch_no": "LOT-1", "quantity": 4})
+	doc.append("batch_numbers", {"batch_no": "LOT-2", "quantity": 6})
+
+	controller.after_insert_event(doc)
+
+	assert get_stock_balance("ITEM-1", "B-1", "LOT-1") == 4
+	assert get_stock_balance("ITEM-1", "B-1", "LOT-2") == 6
+	assert get_stock_balance("ITEM-1", "B-1") == 0
+
+
+def test_single_batch_without_quantity_takes_the_opening_stock(frappe):
+	doc = new_item(frappe, has_batch_no=1)
+	doc.append("batch_numbers", {"batch_no": "LOT-1"})
+
+	entries, warning = controller.get_opening_stock_entries(doc)
+
+	assert warning is None
+	assert [(entry["batch_no"], entry["actual_qty"]) for entry in entries] == [("LOT-1", 10)]
+
+
+def test_batch_quantities_must_match_the_opening_stock(frappe):
+	doc = new_item(frappe, has_batch_no=1)
+	doc.append("batch_numbers", {"batch_no": "LOT-1", "quantity": 4})
+
+	entries, warning = controller.get_opening_stock_entries(doc)
+
+	assert entries == []
+	assert "must add up" in warning
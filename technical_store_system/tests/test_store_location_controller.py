@@ -0,0 +1,101 @@
+"""
+Store Location Controller Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.controllers import store_location_controller as controller
+
+
+def add_locations(frappe):
+	"""WH-1 → Z-A → R01 → S01 with bins B-1 and B-2"""
+	frappe.db.insert(
+		"Store Location",
+		{"name": "WH-1", "location_type": "Warehouse", "warehouse_name": "WH-1"},
+		{"name": "WH-1-Z-A", "location_type": "Zone", "zone_name": "Z-A", "store": "WH-1"},
+		{"name": "WH-1-Z-A-R01", "location_type": "Rack", "rack_name": "R01", "store": "WH-1", "zone": "WH-1-Z-A"},
+		{
+			"name": "WH-1-Z-A-R01-S01", "location_type": "Shelf", "shelf_name": "S01",
+			"store": "WH-1", "zone": "WH-1-Z-A", "rack": "WH-1-Z-A-R01",
+		},
+		*[
+			{
+				"name": f"WH-1-Z-A-R01-S01-B-{number}", "location_type": "Bin", "bin": f"B-{number}",
+				"store": "WH-1", "zone": "WH-1-Z-A", "rack": "WH-1-Z-A-R01", "shelf": "WH-1-Z-A-R01-S01",
+			}
+			for number in (1, 2)
+		],
+	)
+	frappe.db.insert("Store Doctype Counter", {"name": "Store Location", "counted_doctype": "Store Location", "row_count": 6})
+
+
+def new_bin(frappe):
+	return frappe.get_doc({
+		"doctype": "Store Location",
+		"location_type": "Bin",
+		"store": "WH-1",
+		"zone": "WH-1-Z-A",
+		"rack": "WH-1-Z-A-R01",
+		"shelf": "WH-1-Z-A-R01-S01",
+	})
+
+
+def test_next_location_name_increments_per_parent(frappe):
+	add_locations(frappe)
+
+	assert controller.get_next_location_name("WH-1-Z-A-R01-S01", "Bin") == "B-3"
+	assert controller.get_next_location_name("WH-1-Z-A-R01", "Shelf") == "S02"
+	assert controller.get_next_location_name("WH-1", "Zone") == "Z-B"
+	assert controller.get_next_location_name(None, "Warehouse") == "WH-2"
+
+
+def test_next_location_name_with_preloaded_names_skips_query(frappe):
+	settings = frappe.get_single("Store Settings")
+	frappe.db.reset_query_count()
+
+	assert controller.get_next_location_name("WH-1", "Zone", settings, existing=["Z-A", "Z-B"]) == "Z-C"
+	assert frappe.db.queries == 0
+
+
+def test_before_insert_generates_code_and_name(frappe):
+	add_locations(frappe)
+	doc = new_bin(frappe)
+
+	controller.before_insert_event(doc)
+
+	assert doc.name == doc.location_code == "WH-1-Z-A-R01-S01-B-3"
+	assert doc.location_name == "WH-1 - Z-A - R01 - S01 - B-3"
+
+
+def test_generate_location_name_queries(frappe):
+	add_locations(frappe)
+	doc = new_bin(frappe)
+	doc.bin = "B-3"
+	frappe.db.reset_query_count()
+
+	controller.generate_location_name(doc)
+
+	# One lookup per parent level
+	assert frappe.db.queries == 4
+
+
+def test_hierarchy_validation_rejects_wrong_parent(frappe):
+	add_locations(frappe)
+	doc = new_bin(frappe)
+	doc.shelf = "WH-1-Z-A-R01"
+
+	with pytest.raises(frappe.ValidationError, match="Bin must have a Shelf parent"):
+		controller.validate_location(doc)
+
+
+def test_system_stats_count_pending_location(frappe):
+	add_locations(frappe)
+
+	controller.update_system_stats(None, pending=1)
+
+	assert frappe.db.get_single_value("Store Settings", "total_locations_count") == 7
+	assert frappe.db.get_single_value("Store Settings", "system_initialized") == 1
@@ -0,0 +1,68 @@
+"""
+UOM Conversion Tests (in-memory frappe)
+"""
+
+import pytest
+
+from technical_store_system.tests import fake_frappe
+
+fake_frappe.install()
+
+from technical_store_system.utils.helpers import uom_conversion
+
+
+UOMS = [
+	{"name": "Piece", "must_be_whole_number": 1},
+	{"name": "Pack", "has_conversion": 1, "base_uom": "Piece", "conversion_factor": 6},
+	{"name": "Box", "has_conversion": 1, "base_uom": "Pack", "conversion_factor": 4},
+	{"name": "Kg"},
+	{"name": "Gram", "has_conversion": 1, "base_uom": "Kg", "conversion_factor": 0.001},
+]
+
+
+@pytest.fixture
+def closure(frappe):
+	closure = uom_conversion.build_conversion_closure(UOMS)
+	frappe.cache.set_value(uom_conversion.CLOSURE_CACHE_KEY, closure)
+	return closure
+
+
+def test_closure_multiplies_along_the_chain(closure):
+	factors = closure["factors"]
+
+	assert factors["Box"]["Piece"] == 24
+	assert factors["Piece"]["Box"] == pytest.approx(1 / 24)
+	assert factors["Pack"]["Box"] == 0.25
+	assert "Kg" not in factors["Box"]
+	assert closure["errors"] == []
+
+
+def test_cycles_and_bad_factors_are_reported_not_resolved():
+	closure = uom_conversion.build_conversion_closure([
+		{"name": "A", "has_conversion": 1, "base_uom": "B", "conversion_factor": 2},
+		{"name": "B", "has_conversion": 1, "base_uom": "A", "conversion_factor": 3},
+		{"name": "C", "has_conversion": 1, "base_uom": "D", "conversion_factor": 0},
+		{"name": "D"},
+	])
+
+	assert [error.split(":")[0] for error in closure["errors"]] == ["C has no valid conversion factor", "Conversion cycle"]
+	assert "A" not in closure["factors"] and "B" not in closure["factors"]
+	assert closure["factors"]["C"] == {"C": 1.0}
+
+
+def test_convert_many_converts_all_lines_in_one_call(closure):
+	assert uom_conversion.convert_many([2, 3, 10], ["Box", "Pack", "Piece"], "Piece") == [48, 18, 10]
+	assert uom_conversion.convert_many([1500], "Gram", "Kg") == [1.5]
+
+
+def test_whole_number_violations_are_reported_together(closure):
+	with pytest.raises(fake_frappe.ValidationError) as error:
+		uom_conversion.convert_many([1.5, 1, 0.1], ["Piece", "Box", "Pack"], "Piece")
+
+	assert "Row 1" in str(error.value) and "Row 3" in str(error.value)
+	assert "Row 2" not in str(error.value)
+
+
+def test_unconvertible_uoms_are_rejected(closure):
+	with pytest.raises(fake_frappe.ValidationError):
+		uom_conversion.convert_many([1], ["Kg"], "Piece")
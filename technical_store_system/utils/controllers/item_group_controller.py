@@ -21,6 +21,12 @@ from frappe import _
 from frappe.utils import now, getdate
 import re
 
+from technical_store_system.utils.helpers.event_profiler import profile_event
+
+
+# Groups per progress report / cancellation check in recalculate_all_statistics
+STATISTICS_PROGRESS_EVERY = 50
+
 
 class ItemGroupController:
 	"""Controller for Store Item Group business logic"""
@@ -110,23 +116,7 @@ class ItemGroupController:
 		Returns:
 			str: Generated group code
 		"""
-		name = self.doc.item_group_name
-		
-		# Extract initials or abbreviation
-		words = name.split()
-		if len(words) == 1:
-			# Single word: take first 4-5 letters
-			code_base = name[:5].upper()
-		else:
-			# Multiple words: take first letter of each word
-			code_base = "".join([word[0] for word in words]).upper()
-			
-			# If too short, add more letters from first word
-			if len(code_base) < 3:
-				code_base = (name[:3] + "".join([word[0] for word in words[1:]])).upper()
-		
-		# Remove special characters
-		code_base = re.sub(r'[^A-Z0-9]', '', code_base)
+		code_base = get_group_code_base(self.doc.item_group_name)
 		
 		# Check if code exists
 		code = code_base
@@ -286,21 +276,25 @@ class ItemGroupController:
 # EVENT FUNCTIONS (Called by hooks)
 # ============================================================
 
+@profile_event
 def before_insert_event(doc, method=None):
 	"""Hook: Called before inserting Store Item Group"""
 	controller = ItemGroupController(doc)
 	controller.before_insert()
 
+@profile_event
 def before_save_event(doc, method=None):
 	"""Hook: Called before saving Store Item Group"""
 	controller = ItemGroupController(doc)
 	controller.before_save()
 
+@profile_event
 def on_update_event(doc, method=None):
 	"""Hook: Called after Store Item Group is saved"""
 	controller = ItemGroupController(doc)
 	controller.on_update()
 
+@profile_event
 def before_delete_event(doc, method=None):
 	"""Hook: Called before deleting Store Item Group"""
 	controller = ItemGroupController(doc)
@@ -311,28 +305,103 @@ def before_delete_event(doc, method=None):
 # UTILITY FUNCTIONS
 # ============================================================
 
-def recalculate_all_statistics():
+def recalculate_all_statistics(job=None):
 	"""
 	Recalculate statistics for all item groups
 	Useful for maintenance or after data migration
 	
+	Runs as a Store Maintenance Job (see queue_statistics_recalculation);
+	progress is reported every STATISTICS_PROGRESS_EVERY groups, which is
+	also where a cancellation takes effect.
+	
+	Args:
+		job: MaintenanceJob for progress and cancellation (optional)
+	
+	Returns:
+		dict: {"success": True, "message": str}
+	
 	Usage:
-		bench execute technical_store_system.utils.controllers.item_group_controller.recalculate_all_statistics
+		bench execute technical_store_system.utils.controllers.item_group_controller.queue_statistics_recalculation
 	"""
-	groups = frappe.get_all("Store Item Group", fields=["name"])
+	groups = frappe.get_all("Store Item Group", pluck="name")
+	failed = 0
 	
-	frappe.msgprint(f"Recalculating statistics for {len(groups)} item groups...")
+	if not job:
+		frappe.msgprint(f"Recalculating statistics for {len(groups)} item groups...")
 	
-	for group_data in groups:
+	for index, group_name in enumerate(groups, start=1):
 		try:
-			doc = frappe.get_doc("Store Item Group", group_data.name)
+			doc = frappe.get_doc("Store Item Group", group_name)
 			controller = ItemGroupController(doc)
 			controller.update_statistics()
 			frappe.db.commit()
 		except Exception as e:
-			frappe.log_error(f"Error recalculating stats for {group_data.name}: {str(e)}")
+			failed += 1
+			frappe.log_error(f"Error recalculating stats for {group_name}: {str(e)}")
+		
+		if job and (index % STATISTICS_PROGRESS_EVERY == 0 or index == len(groups)):
+			job.progress(index, len(groups), f"{index} of {len(groups)} item groups")
+	
+	message = f"Recalculated statistics for {len(groups) - failed} item groups"
+	if failed:
+		message += f" ({failed} failed, see Error Log)"
+	
+	if not job:
+		frappe.msgprint("Statistics recalculation complete!")
+	
+	return {
+		"success": True,
+		"message": message
+	}
+
+
+@frappe.whitelist()
+def queue_statistics_recalculation():
+	"""
+	Queue recalculate_all_statistics as a Store Maintenance Job
+
+	Returns:
+		dict: {"success": True, "message": str, "job": str}
+	"""
+	frappe.only_for(["System Manager", "Dev User"])
+	
+	from technical_store_system.utils.helpers.maintenance_jobs import enqueue_maintenance_job
+	
+	job = enqueue_maintenance_job("Recalculate Item Group Statistics")
+	frappe.db.commit()
+	return {
+		"success": True,
+		"message": f"Item group statistics are being recalculated in the background ({job})",
+		"job": job
+	}
+
+def get_group_code_base(item_group_name):
+	"""
+	Group code before uniqueness suffixes (e.g. "Electronics" → "ELECT", "Hand Tools" → "HANT")
+	
+	Args:
+		item_group_name: Name of the group
+	
+	Returns:
+		str: Upper-case code base (initials or first letters)
+	"""
+	name = item_group_name
+	
+	# Extract initials or abbreviation
+	words = name.split()
+	if len(words) == 1:
+		# Single word: take first 4-5 letters
+		code_base = name[:5].upper()
+	else:
+		# Multiple words: take first letter of each word
+		code_base = "".join([word[0] for word in words]).upper()
+		
+		# If too short, add more letters from first word
+		if len(code_base) < 3:
+			code_base = (name[:3] + "".join([word[0] for word in words[1:]])).upper()
 	
-	frappe.msgprint("Statistics recalculation complete!")
+	# Remove special characters
+	return re.sub(r'[^A-Z0-9]', '', code_base)
 
 def get_group_hierarchy(group_name):
 	"""
@@ -0,0 +1,71 @@
+"""
+Store Stock Ledger Controller
+================================================================================
+Guards the append-only stock ledger and its balance table
+
+FEATURES:
+- Ledger entries can't be created, edited or deleted through the document API
+- Balance rows can't be edited or deleted by hand
+- All stock movements go through utils/helpers/stock_ledger.py, which writes
+  ledger and balances in one transaction
+
+RELATED FILES:
+- DocTypes: setup/doctypes/StoreStockLedgerEntry.py, setup/doctypes/StoreStockBalance.py
+- Posting logic: utils/helpers/stock_ledger.py
+================================================================================
+"""
+
+import frappe
+from frappe import _
+
+from technical_store_system.utils.helpers.event_profiler import profile_event
+
+
+# ============================================================
+# EVENT FUNCTIONS (Called by hooks)
+# ============================================================
+
+@profile_event
+def ledger_before_insert_event(doc, method=None):
+	"""Hook: Block ledger rows that bypass the posting API"""
+	frappe.throw(
+		_("Stock Ledger Entries can only be created by stock transactions"),
+		title=_("Not Allowed")
+	)
+
+
+@profile_event
+def ledger_validate_event(doc, method=None):
+	"""Hook: Ledger entries are immutable once written"""
+	if not doc.is_new():
+		frappe.throw(
+			_("Stock Ledger Entry {0} cannot be modified. Post a correcting entry instead.").format(doc.name),
+			title=_("Not Allowed")
+		)
+
+
+@profile_event
+def ledger_on_trash_event(doc, method=None):
+	"""Hook: Ledger entries are never deleted"""
+	frappe.throw(
+		_("Stock Ledger Entry {0} cannot be deleted. Post a correcting entry instead.").format(doc.name),
+		title=_("Not Allowed")
+	)
+
+
+@profile_event
+def balance_validate_event(doc, method=None):
+	"""Hook: Balances are maintained by the ledger only"""
+	frappe.throw(
+		_("Stock balances are updated automatically by stock transactions"),
+		title=_("Not Allowed")
+	)
+
+
+@profile_event
+def balance_on_trash_event(doc, method=None):
+	"""Hook: Balances are maintained by the ledger only"""
+	frappe.throw(
+		_("Stock balance {0} cannot be deleted").format(doc.name),
+		title=_("Not Allowed")
+	)
@@ -0,0 +1,109 @@
+"""
+Store Item Controller
+================================================================================
+Business logic for Store Item DocType
+
+FEATURES:
+- Post opening stock (opening_stock @ opening_valuation_rate) to the stock
+  ledger in the item's default location when the item is created
+- Batch-tracked items post their opening stock per batch (Batch Numbers
+  table); without a default location or batch split the item is saved and
+  the user is warned that the opening stock was not posted
+
+RELATED FILES:
+- DocType: setup/doctypes/StoreItem.py
+- Stock ledger: utils/helpers/stock_ledger.py
+================================================================================
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import flt
+
+from technical_store_system.utils.helpers.event_profiler import profile_event
+
+
+OPENING_VOUCHER_TYPE = "Opening Stock"
+
+# Batch quantities within this of the opening stock add up
+QTY_TOLERANCE = 1e-9
+
+
+# ============================================================
+# EVENT FUNCTIONS (Called by hooks)
+# ============================================================
+
+@profile_event
+def after_insert_event(doc, method=None):
+	"""Hook: Called after Store Item is inserted"""
+	post_opening_stock(doc)
+
+
+# ============================================================
+# OPENING STOCK
+# ============================================================
+
+def post_opening_stock(doc):
+	"""
+	Post the item's opening stock as its first ledger entries
+
+	Skipped for non-stock items or when no opening quantity is given. When
+	the opening stock cannot be posted (no default location, batches not
+	given) the item is still created and the user is told why.
+	"""
+	entries, warning = get_opening_stock_entries(doc)
+	if warning:
+		frappe.msgprint(warning, title=_("Opening Stock Not Posted"), indicator="orange")
+	if not entries:
+		return
+
+	from technical_store_system.utils.helpers.stock_ledger import make_stock_ledger_entries
+
+	make_stock_ledger_entries(entries, voucher_type=OPENING_VOUCHER_TYPE, voucher_no=doc.name)
+
+
+def get_opening_stock_entries(doc):
+	"""
+	Ledger entries for an item's opening stock
+
+	Batch-tracked items need their opening stock split over the Batch Numbers
+	rows: the quantities of the rows must add up to opening_stock, or a single
+	row without quantity takes all of it.
+
+	Args:
+		doc: Store Item document (or dict)
+
+	Returns:
+		tuple: (list of entries, warning message or None)
+	"""
+	opening_stock = flt(doc.get("opening_stock"))
+	if not opening_stock or not doc.get("is_stock_item", 1):
+		return [], None
+
+	item_label = frappe.bold(doc.get("item_name") or doc.get("name"))
+	if not doc.get("default_location"):
+		return [], _("Set a Default Location and post the opening stock of {0} as a stock entry").format(item_label)
+
+	entry = {
+		"item_code": doc.get("name"),
+		"location": doc.get("default_location"),
+		"incoming_rate": flt(doc.get("opening_valuation_rate")),
+	}
+	if not doc.get("has_batch_no"):
+		return [{**entry, "actual_qty": opening_stock}], None
+
+	batches = [row for row in doc.get("batch_numbers") or [] if row.get("batch_no")]
+	if len(batches) == 1 and not flt(batches[0].get("quantity")):
+		return [{**entry, "actual_qty": opening_stock, "batch_no": batches[0].get("batch_no")}], None
+
+	batch_total = sum(flt(row.get("quantity")) for row in batches)
+	if not batches or abs(batch_total - opening_stock) > QTY_TOLERANCE:
+		return [], _(
+			"The Batch Numbers quantities of {0} ({1}) must add up to its opening stock ({2})"
+		).format(item_label, batch_total, opening_stock)
+
+	return [
+		{**entry, "actual_qty": flt(row.get("quantity")), "batch_no": row.get("batch_no")}
+		for row in batches
+		if flt(row.get("quantity"))
+	], None
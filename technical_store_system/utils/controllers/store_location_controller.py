@@ -21,11 +21,30 @@ Hierarchy: Warehouse → Zone → Rack → Shelf → Bin
 import frappe
 from frappe.model.document import Document
 
+from technical_store_system.utils.helpers.doctype_counter import get_count
+from technical_store_system.utils.helpers.event_profiler import profile_controller, profile_event
+
+
+# ============================================================================
+# DOCUMENT CLASS
+# ============================================================================
+
+@profile_controller
+class StoreLocationController(Document):
+	"""
+	Document class for Store Location (hooks.override_doctype_class)
+
+	Naming and validation run in the doc event handlers below, so they can
+	be called on plain documents too (bulk loaders, tests). Lifecycle
+	methods added here are profiled like the handlers.
+	"""
+
 
 # ============================================================================
 # DOC EVENT HANDLERS
 # ============================================================================
 
+@profile_event
 def before_insert_event(doc, method=None):
 	"""
 	Event handler for before_insert hook
@@ -51,14 +70,56 @@ def before_insert_event(doc, method=None):
 	update_system_stats(doc)
 
 
+@profile_event
 def before_save_event(doc, method=None):
 	"""
 	Event handler for before_save hook
 	
 	Updates location_name on save (location_code is immutable after insert)
+	and moves stock rollups when the location is re-parented
 	"""
 	if not doc.is_new():
 		generate_location_name(doc)
+		move_location(doc)
+
+
+def move_location(doc):
+	"""
+	Re-parent a saved location whose hierarchy fields changed
+
+	Moves the stock rollup of its subtree to the new ancestors and copies its
+	store/zone/rack/shelf down to every location below it, so queries on
+	those fields keep finding the whole subtree.
+
+	Args:
+		doc: Store Location document being saved
+	"""
+	from technical_store_system.utils.helpers.stock_rollup import (
+		DESCENDANT_FIELDS,
+		PARENT_FIELDS,
+		get_parent_location,
+		move_location_rollup
+	)
+
+	old = frappe.db.get_value("Store Location", doc.name, ["name", *PARENT_FIELDS], as_dict=True)
+	if not old or all((old.get(field) or None) == (doc.get(field) or None) for field in PARENT_FIELDS):
+		return
+
+	old_parent, new_parent = get_parent_location(old), get_parent_location(doc)
+	if old_parent != new_parent:
+		move_location_rollup(doc.name, old_parent, new_parent)
+
+	own_field = DESCENDANT_FIELDS.get(doc.location_type)
+	if own_field:
+		hierarchy = list(DESCENDANT_FIELDS.values())
+		ancestor_fields = hierarchy[:hierarchy.index(own_field)]
+		if ancestor_fields:
+			frappe.db.set_value(
+				"Store Location",
+				{own_field: doc.name},
+				{field: doc.get(field) for field in ancestor_fields},
+				update_modified=False,
+			)
 
 
 # ============================================================================
@@ -145,7 +206,7 @@ def generate_location_code(doc):
 # AUTO-INCREMENT SYSTEM
 # ============================================================================
 
-def get_next_location_name(parent_location, location_type):
+def get_next_location_name(parent_location, location_type, settings=None, existing=None):
 	"""
 	Calculate next available location name with auto-increment
 	
@@ -157,6 +218,9 @@ def get_next_location_name(parent_location, location_type):
 	Args:
 		parent_location: Parent location code (None for Warehouse)
 		location_type: Location type (Warehouse, Zone, Rack, Shelf, Bin)
+		settings: Store Settings document (loaded if None)
+		existing: Names already used under the parent (queried if None) -
+			lets bulk loaders number many locations from one lookup
 	
 	Returns:
 		Next name with prefix (e.g., "WH-4", "Z-D", "R05", "S3", "B-10")
@@ -167,7 +231,7 @@ def get_next_location_name(parent_location, location_type):
 		Existing: R01, R02 → Next: R03
 		Existing: I, II, III → Next: IV
 	"""
-	settings = frappe.get_single("Store Settings")
+	settings = settings or frappe.get_single("Store Settings")
 	
 	# Get configuration for this location type
 	pattern_field = f"{location_type.lower()}_naming_pattern"
@@ -205,12 +269,13 @@ def get_next_location_name(parent_location, location_type):
 		return f"{prefix}-1"
 	
 	# Query existing names
-	existing = frappe.get_all(
-		"Store Location",
-		filters=filters,
-		fields=[field_name],
-		pluck=field_name
-	)
+	if existing is None:
+		existing = frappe.get_all(
+			"Store Location",
+			filters=filters,
+			fields=[field_name],
+			pluck=field_name
+		)
 	
 	# Extract values (strip prefixes and separators)
 	existing_values = []
@@ -541,7 +606,7 @@ def validate_parent_type(parent_name, expected_type, child_type):
 # SYSTEM STATISTICS
 # ============================================================================
 
-def update_system_stats(doc):
+def update_system_stats(doc, pending=1):
 	"""
 	Update system statistics in Store Settings
 	
@@ -550,13 +615,18 @@ def update_system_stats(doc):
 	- First location created date
 	- System initialized flag
 	- Last sync date
+	
+	Args:
+		doc: Store Location being inserted (None for bulk loads)
+		pending: Locations not yet in the table (1 from before_insert,
+			0 after a bulk insert)
 	"""
 	try:
 		settings = frappe.get_single("Store Settings")
 		
 		# Update total count
-		location_count = frappe.db.count("Store Location")
-		settings.total_locations_count = location_count + 1  # +1 for current doc
+		location_count = get_count("Store Location")
+		settings.total_locations_count = location_count + pending  # + locations not inserted yet
 		
 		# Set first location date if not set
 		if not settings.first_location_created_date:
@@ -571,7 +641,6 @@ def update_system_stats(doc):
 		# Save without triggering validation
 		settings.flags.ignore_validate = True
 		settings.save()
-		frappe.db.commit()
 	
 	except Exception as e:
 		# Don't fail location creation if stats update fails
@@ -0,0 +1,74 @@
+"""
+Store UOM Controller
+================================================================================
+Business logic for Store UOM DocType
+
+FEATURES:
+- Validate conversion settings (positive factor, no base UOM cycles)
+- Rebuild the cached UOM conversion closure whenever a UOM changes
+
+RELATED FILES:
+- DocType: setup/doctypes/StoreUOM.py
+- Conversion closure: utils/helpers/uom_conversion.py
+================================================================================
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import flt
+
+from technical_store_system.utils.helpers.event_profiler import profile_event
+from technical_store_system.utils.helpers.uom_conversion import (
+	find_conversion_cycle,
+	refresh_conversion_closure
+)
+
+
+# ============================================================
+# EVENT FUNCTIONS (Called by hooks)
+# ============================================================
+
+@profile_event
+def validate_event(doc, method=None):
+	"""Hook: Validate conversion settings before save"""
+	validate_conversion(doc)
+
+
+@profile_event
+def on_update_event(doc, method=None):
+	"""Hook: Conversion factors may have changed (rebuilt once committed)"""
+	frappe.db.after_commit.add(refresh_conversion_closure)
+
+
+@profile_event
+def on_trash_event(doc, method=None):
+	"""Hook: Deleted UOM leaves the closure"""
+	frappe.db.after_commit.add(refresh_conversion_closure)
+
+
+# ============================================================
+# VALIDATION
+# ============================================================
+
+def validate_conversion(doc):
+	"""Check factor and base UOM of a convertible UOM"""
+	if not doc.has_conversion:
+		return
+
+	if not doc.base_uom:
+		frappe.throw(_("Select a Base UOM for {0}").format(doc.uom_name))
+
+	if doc.base_uom == doc.name:
+		frappe.throw(_("{0} cannot be its own Base UOM").format(doc.uom_name))
+
+	if flt(doc.conversion_factor) <= 0:
+		frappe.throw(_("Conversion Factor of {0} must be greater than zero").format(doc.uom_name))
+
+	cycle = find_conversion_cycle(doc.name, doc.base_uom)
+	if cycle:
+		frappe.throw(
+			_("Base UOM {0} creates a conversion cycle: {1}").format(
+				frappe.bold(doc.base_uom), " → ".join(cycle)
+			),
+			title=_("Conversion Cycle")
+		)
@@ -9,6 +9,8 @@ setup/client_scripts_setup.py discovers files and delegates to this helper.
 import frappe
 from frappe import _
 
+from technical_store_system.utils.helpers.install_phase import rollback_to_savepoint
+
 
 def create_client_script(script_dict):
 	"""
@@ -20,6 +22,7 @@ def create_client_script(script_dict):
 	Returns:
 		dict: {"success": bool, "message": str, "script_name": str}
 	"""
+	frappe.db.savepoint("store_client_script")
 	try:
 		script_name = script_dict.get("name")
 		
@@ -42,7 +45,6 @@ def create_client_script(script_dict):
 		
 		# Insert Client Script
 		doc.insert(ignore_permissions=True)
-		frappe.db.commit()
 		
 		return {
 			"success": True,
@@ -52,6 +54,7 @@ def create_client_script(script_dict):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_client_script")
 		frappe.log_error(frappe.get_traceback(), f"Client Script Creation Failed: {script_name}")
 		return {
 			"success": False,
@@ -71,6 +74,7 @@ def update_client_script(script_dict):
 	Returns:
 		dict: {"success": bool, "message": str, "script_name": str}
 	"""
+	frappe.db.savepoint("store_client_script")
 	try:
 		script_name = script_dict.get("name")
 		
@@ -94,7 +98,6 @@ def update_client_script(script_dict):
 		
 		# Save changes
 		doc.save(ignore_permissions=True)
-		frappe.db.commit()
 		
 		return {
 			"success": True,
@@ -104,6 +107,7 @@ def update_client_script(script_dict):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_client_script")
 		frappe.log_error(frappe.get_traceback(), f"Client Script Update Failed: {script_name}")
 		return {
 			"success": False,
@@ -113,6 +117,45 @@ def update_client_script(script_dict):
 		}
 
 
+def plan_client_script(script_dict):
+	"""
+	Describe what syncing a Client Script would change (read-only)
+	
+	Args:
+		script_dict: Dictionary with Client Script configuration
+		
+	Returns:
+		dict: {"script_name": str, "action": "create"|"update"|"unchanged", "changes": [str]}
+	"""
+	script_name = script_dict.get("name")
+	
+	existing = frappe.db.get_value(
+		"Client Script", script_name, ["dt", "script_type", "enabled", "script"], as_dict=True
+	)
+	if not existing:
+		return {"script_name": script_name, "action": "create", "changes": [f"create for {script_dict.get('dt')}"]}
+	
+	changes = []
+	expected = {
+		"dt": script_dict.get("dt"),
+		"script_type": script_dict.get("script_type", "Form"),
+		"enabled": script_dict.get("enabled", 1),
+	}
+	for prop, new_value in expected.items():
+		if str(existing.get(prop)) != str(new_value):
+			changes.append(f"{prop}: {existing.get(prop)} → {new_value}")
+	
+	old_script = existing.script or ""
+	new_script = script_dict.get("script", "")
+	if old_script != new_script:
+		old_lines, new_lines = old_script.splitlines(), new_script.splitlines()
+		changed = sum(1 for old, new in zip(old_lines, new_lines) if old != new)
+		changed += abs(len(new_lines) - len(old_lines))
+		changes.append(f"script: {changed} line(s) differ ({len(old_lines)} → {len(new_lines)} lines)")
+	
+	return {"script_name": script_name, "action": "update" if changes else "unchanged", "changes": changes}
+
+
 def delete_client_script(script_name):
 	"""
 	Delete a Client Script
@@ -123,6 +166,7 @@ def delete_client_script(script_name):
 	Returns:
 		dict: {"success": bool, "message": str, "script_name": str}
 	"""
+	frappe.db.savepoint("store_client_script")
 	try:
 		# Check if Client Script exists
 		if not frappe.db.exists("Client Script", script_name):
@@ -135,7 +179,6 @@ def delete_client_script(script_name):
 		
 		# Delete Client Script
 		frappe.delete_doc("Client Script", script_name, force=True, ignore_permissions=True)
-		frappe.db.commit()
 		
 		return {
 			"success": True,
@@ -145,6 +188,7 @@ def delete_client_script(script_name):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_client_script")
 		frappe.log_error(frappe.get_traceback(), f"Client Script Deletion Failed: {script_name}")
 		return {
 			"success": False,
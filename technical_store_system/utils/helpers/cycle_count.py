@@ -0,0 +1,502 @@
+"""
+Cycle Count Helper
+Streaming reconciliation of scanned counts against Store Stock Balance
+
+A count file can hold tens of thousands of (location, item, batch, qty)
+rows and cover a whole warehouse. Nothing here loads the whole file or all
+balances into memory:
+
+1. The CSV is read row by row and sorted externally (sorted runs spilled to
+   temporary files, then a k-way merge); repeated keys are summed
+2. Counted locations are taken in batches; the balances of each batch are
+   read with keyset pagination on the balance key
+3. Per location, the sorted count rows and sorted balance rows are merged
+   (sort-merge join) and every key whose quantity differs becomes a
+   Store Cycle Count Variance row - including stocked keys nobody counted
+4. Adjustments are posted from the variance rows in committed chunks,
+   each recomputed under the balance lock against the stock as of the
+   adjustment's posting time (stock keeps moving after the reconciliation)
+
+Both steps run as background jobs on the long queue.
+
+Usage:
+	# From the Store Cycle Count form or:
+	reconcile_cycle_count("CC-00001")
+	post_cycle_count_adjustments("CC-00001")
+"""
+
+import csv
+import heapq
+import itertools
+import tempfile
+
+import frappe
+from frappe import _
+from frappe.utils import flt, get_datetime, getdate, now, nowtime
+
+from technical_store_system.utils.helpers.stock_ledger import (
+	BALANCE_DOCTYPE,
+	STANDARD_FIELDS,
+	get_balance_key,
+	get_qty_posted_after,
+	lock_balances,
+	make_stock_ledger_entries
+)
+
+
+COUNT_DOCTYPE = "Store Cycle Count"
+VARIANCE_DOCTYPE = "Store Cycle Count Variance"
+
+VARIANCE_FIELDS = [
+	*STANDARD_FIELDS,
+	"cycle_count", "location", "item_code", "batch_no",
+	"system_qty", "counted_qty", "variance_qty", "valuation_rate", "variance_value",
+	"adjustment_entry",
+]
+
+# Count rows held in memory before a sorted run is spilled to disk
+RUN_SIZE = 50000
+
+# Locations whose balances are held in memory at once
+LOCATION_BATCH_SIZE = 200
+
+# Balance rows per keyset page
+BALANCE_PAGE_SIZE = 5000
+
+# Variance rows per bulk insert
+VARIANCE_FLUSH_SIZE = 5000
+
+# Adjustment entries posted and committed together
+ADJUSTMENT_CHUNK_SIZE = 500
+
+QTY_TOLERANCE = 1e-9
+
+
+# ============================================================================
+# WHITELISTED ACTIONS
+# ============================================================================
+
+@frappe.whitelist()
+def reconcile_cycle_count(name):
+	"""Queue the reconciliation of a cycle count"""
+	doc = frappe.get_doc(COUNT_DOCTYPE, name)
+	doc.check_permission("write")
+
+	if doc.status not in ("Draft", "Reconciled", "Failed"):
+		frappe.throw(_("Cycle count {0} is {1}").format(name, doc.status))
+
+	doc.db_set({"status": "Reconciling", "error_log": None})
+	frappe.enqueue(
+		"technical_store_system.utils.helpers.cycle_count.run_reconciliation",
+		queue="long",
+		timeout=3600,
+		job_id=f"technical_store_system:cycle_count:{name}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		name=name,
+	)
+	return {"success": True, "status": "Reconciling"}
+
+
+@frappe.whitelist()
+def post_cycle_count_adjustments(name):
+	"""Queue posting of the adjustment entries of a reconciled cycle count"""
+	doc = frappe.get_doc(COUNT_DOCTYPE, name)
+	doc.check_permission("write")
+
+	if doc.status not in ("Reconciled", "Failed") or not doc.variance_rows:
+		frappe.throw(_("Cycle count {0} has no reconciled variances to post").format(name))
+
+	doc.db_set({"status": "Posting", "error_log": None})
+	frappe.enqueue(
+		"technical_store_system.utils.helpers.cycle_count.run_adjustment_posting",
+		queue="long",
+		timeout=3600,
+		job_id=f"technical_store_system:cycle_count:{name}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		name=name,
+	)
+	return {"success": True, "status": "Posting"}
+
+
+# ============================================================================
+# RECONCILIATION
+# ============================================================================
+
+def run_reconciliation(name):
+	"""Background job: stream the count file and write variance rows"""
+	doc = frappe.get_doc(COUNT_DOCTYPE, name)
+
+	try:
+		frappe.db.delete(VARIANCE_DOCTYPE, {"cycle_count": name})
+
+		rows = read_count_file(get_count_file_path(doc))
+		counted = aggregate_counts(external_sort(rows))
+		stats = reconcile_counts(name, counted)
+
+		doc.db_set({**stats, "adjusted_rows": 0, "status": "Reconciled"})
+		frappe.db.commit()
+
+	except Exception:
+		mark_failed(doc, "Cycle Count Reconciliation Failed")
+
+
+def get_count_file_path(doc):
+	"""Absolute path of the attached count file"""
+	if not doc.count_file:
+		frappe.throw(_("Attach a count file first"))
+
+	file_doc = frappe.get_doc("File", {"file_url": doc.count_file})
+	return file_doc.get_full_path()
+
+
+def read_count_file(path):
+	"""
+	Stream count rows from a CSV file
+
+	Headers are matched case-insensitively (location, item_code, batch_no,
+	serial_no, qty). A row without qty counts as 1, so serial scans can be
+	uploaded one serial per line.
+
+	Yields:
+		tuple: (location, item_code, batch_no, qty)
+	"""
+	with open(path, newline="", encoding="utf-8-sig") as count_file:
+		reader = csv.DictReader(count_file)
+		reader.fieldnames = [
+			(field or "").strip().lower().replace(" ", "_") for field in reader.fieldnames or []
+		]
+
+		for missing in {"location", "item_code"} - set(reader.fieldnames):
+			frappe.throw(_("Count file has no {0} column").format(frappe.bold(missing)))
+
+		for line_no, row in enumerate(reader, start=2):
+			location = (row.get("location") or "").strip()
+			item_code = (row.get("item_code") or "").strip()
+			if not location and not item_code:
+				continue
+			if not location or not item_code:
+				frappe.throw(_("Line {0}: location and item_code are required").format(line_no))
+
+			qty = (row.get("qty") or "").strip()
+			yield (location, item_code, (row.get("batch_no") or "").strip(), flt(qty) if qty else 1.0)
+
+
+def external_sort(rows, run_size=RUN_SIZE):
+	"""
+	Sort count rows with bounded memory
+
+	Rows are sorted in runs of run_size, each run spilled to a temporary
+	file, and the runs merged lazily. Small inputs never touch the disk.
+
+	Yields:
+		tuple: (location, item_code, batch_no, qty) in ascending order
+	"""
+	runs = []
+	buffer = []
+
+	try:
+		for row in rows:
+			buffer.append(row)
+			if len(buffer) >= run_size:
+				runs.append(spill_run(buffer))
+				buffer = []
+
+		if not runs:
+			buffer.sort()
+			yield from buffer
+			return
+
+		if buffer:
+			runs.append(spill_run(buffer))
+			buffer = []
+
+		yield from heapq.merge(*(read_run(run) for run in runs))
+
+	finally:
+		for run in runs:
+			run.close()
+
+
+def spill_run(buffer):
+	"""Sort a buffer and write it to a temporary file (rewound for reading)"""
+	buffer.sort()
+	run = tempfile.TemporaryFile("w+", newline="", encoding="utf-8")
+	csv.writer(run).writerows(buffer)
+	run.seek(0)
+	return run
+
+
+def read_run(run):
+	"""Read a spilled run back as typed rows"""
+	for location, item_code, batch_no, qty in csv.reader(run):
+		yield (location, item_code, batch_no, float(qty))
+
+
+def aggregate_counts(sorted_rows):
+	"""Sum repeated scans of the same (location, item, batch)"""
+	for key, group in itertools.groupby(sorted_rows, key=lambda row: row[:3]):
+		yield (*key, sum(row[3] for row in group))
+
+
+def reconcile_counts(cycle_count, counted):
+	"""
+	Sort-merge counted rows against balances, location batch by location batch
+
+	Args:
+		cycle_count: Store Cycle Count name
+		counted: Sorted, aggregated (location, item_code, batch_no, qty) rows
+
+	Returns:
+		dict: Counters for the Store Cycle Count record
+	"""
+	stats = {
+		"counted_rows": 0,
+		"counted_locations": 0,
+		"variance_rows": 0,
+		"total_variance_qty": 0.0,
+		"total_variance_value": 0.0,
+	}
+	writer = VarianceWriter(cycle_count)
+
+	for location_batch in iter_location_batches(counted, LOCATION_BATCH_SIZE):
+		balances = get_location_balances([location for location, _rows in location_batch])
+
+		for location, count_rows in location_batch:
+			stats["counted_locations"] += 1
+			stats["counted_rows"] += len(count_rows)
+
+			counts = (((item_code, batch_no), qty) for _location, item_code, batch_no, qty in count_rows)
+			system = (((row.item_code, row.batch_no), row) for row in balances.get(location, []))
+
+			for (item_code, batch_no), counted_qty, balance in merge_join(counts, system):
+				system_qty = flt(balance.actual_qty) if balance else 0.0
+				counted_qty = flt(counted_qty)
+				variance_qty = counted_qty - system_qty
+				if abs(variance_qty) <= QTY_TOLERANCE:
+					continue
+
+				valuation_rate = flt(balance.valuation_rate) if balance else 0.0
+				writer.add(location, item_code, batch_no, system_qty, counted_qty, variance_qty, valuation_rate)
+
+				stats["variance_rows"] += 1
+				stats["total_variance_qty"] += variance_qty
+				stats["total_variance_value"] += variance_qty * valuation_rate
+
+	writer.flush()
+	return stats
+
+
+def iter_location_batches(counted, batch_size):
+	"""
+	Group sorted count rows by location, batch_size locations at a time
+
+	Yields:
+		list: [(location, [count rows]), ...]
+	"""
+	batch = []
+	for location, rows in itertools.groupby(counted, key=lambda row: row[0]):
+		batch.append((location, list(rows)))
+		if len(batch) >= batch_size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+
+def get_location_balances(locations):
+	"""
+	Balance rows of some locations, read in keyset pages on the balance key
+
+	Returns:
+		dict: {location: [rows sorted by (item_code, batch_no)]}
+	"""
+	balances = {}
+	last_name = ""
+
+	while True:
+		rows = frappe.db.sql(
+			f"""
+			SELECT `name`, `location`, `item_code`, IFNULL(`batch_no`, '') AS `batch_no`,
+				`actual_qty`, `valuation_rate`
+			FROM `tab{BALANCE_DOCTYPE}`
+			WHERE `location` IN %(locations)s AND `name` > %(last_name)s
+			ORDER BY `name`
+			LIMIT %(limit)s
+			""",
+			{"locations": tuple(locations), "last_name": last_name, "limit": BALANCE_PAGE_SIZE},
+			as_dict=True,
+		)
+		for row in rows:
+			balances.setdefault(row.location, []).append(row)
+
+		if len(rows) < BALANCE_PAGE_SIZE:
+			break
+		last_name = rows[-1].name
+
+	# Same order as the count rows (Python ordering, independent of DB collation)
+	for rows in balances.values():
+		rows.sort(key=lambda row: (row.item_code, row.batch_no))
+
+	return balances
+
+
+def merge_join(left, right):
+	"""
+	Full outer sort-merge join of two (key, value) streams sorted by key
+
+	Yields:
+		tuple: (key, left value or None, right value or None)
+	"""
+	left, right = iter(left), iter(right)
+	left_row, right_row = next(left, None), next(right, None)
+
+	while left_row is not None or right_row is not None:
+		if right_row is None or (left_row is not None and left_row[0] < right_row[0]):
+			yield left_row[0], left_row[1], None
+			left_row = next(left, None)
+		elif left_row is None or right_row[0] < left_row[0]:
+			yield right_row[0], None, right_row[1]
+			right_row = next(right, None)
+		else:
+			yield left_row[0], left_row[1], right_row[1]
+			left_row, right_row = next(left, None), next(right, None)
+
+
+class VarianceWriter:
+	"""Buffers variance rows and bulk inserts them"""
+
+	def __init__(self, cycle_count, flush_size=VARIANCE_FLUSH_SIZE):
+		self.cycle_count = cycle_count
+		self.flush_size = flush_size
+		self.rows = []
+		self.timestamp = now()
+		self.user = frappe.session.user
+
+	def add(self, location, item_code, batch_no, system_qty, counted_qty, variance_qty, valuation_rate):
+		self.rows.append((
+			frappe.generate_hash(length=20), self.timestamp, self.timestamp, self.user, self.user, 0,
+			len(self.rows) + 1,
+			self.cycle_count, location, item_code, batch_no,
+			system_qty, counted_qty, variance_qty, valuation_rate, variance_qty * valuation_rate,
+			None,
+		))
+		if len(self.rows) >= self.flush_size:
+			self.flush()
+
+	def flush(self):
+		if self.rows:
+			frappe.db.bulk_insert(VARIANCE_DOCTYPE, VARIANCE_FIELDS, self.rows)
+			self.rows = []
+
+
+# ============================================================================
+# ADJUSTMENT POSTING
+# ============================================================================
+
+def run_adjustment_posting(name):
+	"""Background job: post adjustments for unposted variance rows, chunk by chunk"""
+	doc = frappe.get_doc(COUNT_DOCTYPE, name)
+
+	try:
+		adjusted = doc.adjusted_rows or 0
+		last_name = ""
+
+		while True:
+			rows = frappe.db.sql(
+				f"""
+				SELECT `name`, `location`, `item_code`, `batch_no`, `counted_qty`, `valuation_rate`
+				FROM `tab{VARIANCE_DOCTYPE}`
+				WHERE `cycle_count` = %(cycle_count)s
+					AND IFNULL(`adjustment_entry`, '') = ''
+					AND `name` > %(last_name)s
+				ORDER BY `name`
+				LIMIT %(limit)s
+				""",
+				{"cycle_count": name, "last_name": last_name, "limit": ADJUSTMENT_CHUNK_SIZE},
+				as_dict=True,
+			)
+			if not rows:
+				break
+
+			post_adjustment_chunk(doc, rows)
+			adjusted += len(rows)
+			last_name = rows[-1].name
+
+			doc.db_set("adjusted_rows", adjusted)
+			frappe.db.commit()
+
+		doc.db_set("status", "Posted")
+		frappe.db.commit()
+
+	except Exception:
+		mark_failed(doc, "Cycle Count Adjustment Failed")
+
+
+def post_adjustment_chunk(doc, rows):
+	"""
+	Post one chunk of adjustments and link each variance row to its entry
+
+	The variance stored at reconciliation is stale once stock moves, and the
+	posting date may lie before the reconciliation. Under the balance locks
+	(taken again by the posting, in the same transaction) each row's system
+	quantity is re-read as of the adjustment's posting time, so the
+	adjustment brings the stock at that time to the counted quantity. Rows
+	that no longer differ get no entry.
+	"""
+	# One posting time for the chunk keeps entries in variance row order
+	posting_time = nowtime()
+	posting_datetime = get_datetime(f"{getdate(doc.posting_date)} {posting_time}")
+
+	keys = [(row.item_code, row.location, row.batch_no or "") for row in rows]
+	balances = lock_balances([
+		frappe._dict(item_code=key[0], location=key[1], batch_no=key[2], balance_key=get_balance_key(*key))
+		for key in keys
+	])
+	posted_after = get_qty_posted_after(keys, posting_datetime)
+
+	updates = {}
+	adjustments = []
+	for row, key in zip(rows, keys):
+		balance = balances.get(get_balance_key(*key))
+		system_qty = (flt(balance.actual_qty) if balance else 0.0) - posted_after.get(key, 0.0)
+		row.variance_qty = flt(row.counted_qty) - system_qty
+
+		updates[row.name] = {
+			"system_qty": system_qty,
+			"variance_qty": row.variance_qty,
+			"variance_value": row.variance_qty * flt(row.valuation_rate),
+		}
+		if abs(row.variance_qty) > QTY_TOLERANCE:
+			adjustments.append(row)
+
+	if adjustments:
+		entry_names = make_stock_ledger_entries(
+			[
+				{
+					"item_code": row.item_code,
+					"location": row.location,
+					"batch_no": row.batch_no,
+					"actual_qty": row.variance_qty,
+					"posting_date": doc.posting_date,
+					"posting_time": posting_time,
+					"voucher_detail_no": row.name,
+				}
+				for row in adjustments
+			],
+			voucher_type=COUNT_DOCTYPE,
+			voucher_no=doc.name,
+		)
+		for row, entry_name in zip(adjustments, entry_names):
+			updates[row.name]["adjustment_entry"] = entry_name
+
+	frappe.db.bulk_update(VARIANCE_DOCTYPE, updates, chunk_size=ADJUSTMENT_CHUNK_SIZE, update_modified=False)
+
+
+def mark_failed(doc, title):
+	"""Roll back the current chunk and record the error on the cycle count"""
+	frappe.db.rollback()
+	doc.db_set({"status": "Failed", "error_log": frappe.get_traceback()})
+	frappe.db.commit()
+	frappe.log_error(frappe.get_traceback(), f"{title}: {doc.name}")
@@ -0,0 +1,311 @@
+"""
+Dataset Generator Helper
+Seeded synthetic datasets for load and performance testing
+
+The demo data (DEMO_DATA_REGISTRY) and generate_complete_demo.py only cover
+a few hundred records in a regular grid. This generator builds
+production-sized, skewed data from a seed, so the same dataset can be
+rebuilt on any site:
+
+- Store UOMs: a small base set with conversions (Box → Pack → Nos, ...)
+- Store Item Groups: a tree of the requested depth, grown by preferential
+  attachment (a few large branches, a long tail of small ones)
+- Store Locations: Warehouse → Zone → Rack → Shelf → Bin with uneven fan-out
+- Store Items: item popularity follows a Zipf distribution - popular items
+  get more opening stock, popular groups and bins get more items;
+  a share of the items is batch or serial tracked, with child rows
+
+Everything is written through the bulk fixture loader
+(utils/helpers/fixture_loader.py); records that already exist are skipped,
+so re-running with the same seed is idempotent.
+
+Usage:
+	bench --site <site> execute technical_store_system.utils.helpers.dataset_generator.generate_dataset \
+		--kwargs "{'items': 500000, 'locations': 50000, 'groups': 5000, 'depth': 6, 'seed': 42}"
+"""
+
+import random
+import time
+from bisect import bisect_left
+from itertools import accumulate
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, nowdate
+
+from technical_store_system.utils.helpers.fixture_loader import load_fixtures
+
+
+# Location levels below the warehouse: (type, field referencing this level
+# from the levels below, level name field, name pattern)
+LOCATION_LEVELS = [
+	("Zone", "zone", "zone_name", lambda n: f"Z-{letters(n)}"),
+	("Rack", "rack", "rack_name", lambda n: f"R{n:02d}"),
+	("Shelf", "shelf", "shelf_name", lambda n: f"S{n:02d}"),
+	("Bin", None, "bin", lambda n: f"B-{n}"),
+]
+
+GROUP_WORDS = [
+	"Electrical", "Mechanical", "Hydraulic", "Pneumatic", "Safety", "Office", "IT",
+	"Fasteners", "Bearings", "Cables", "Valves", "Pumps", "Motors", "Sensors",
+	"Filters", "Seals", "Tools", "Lubricants", "Fittings", "Consumables",
+]
+
+ITEM_NOUNS = [
+	"Bolt", "Nut", "Washer", "Bearing", "Cable", "Relay", "Fuse", "Valve", "Pump",
+	"Motor", "Sensor", "Filter", "Gasket", "Hose", "Clamp", "Switch", "Drill Bit",
+	"Glove", "Helmet", "Toner", "Adapter", "Connector", "Belt", "Spring",
+]
+
+ITEM_SPECS = ["M6", "M8", "M10", "10A", "16A", "24V", "230V", "1/2\"", "3/4\"", "50mm", "100mm", "XL", "Type B"]
+
+BASE_UOMS = [
+	{"uom_name": "Nos", "uom_symbol": "nos", "uom_type": "Quantity", "must_be_whole_number": 1},
+	{"uom_name": "Pack", "uom_symbol": "pk", "uom_type": "Quantity", "must_be_whole_number": 1,
+		"has_conversion": 1, "base_uom": "Nos", "conversion_factor": 10},
+	{"uom_name": "Box", "uom_symbol": "box", "uom_type": "Quantity", "must_be_whole_number": 1,
+		"has_conversion": 1, "base_uom": "Pack", "conversion_factor": 12},
+	{"uom_name": "Kg", "uom_symbol": "kg", "uom_type": "Weight"},
+	{"uom_name": "Meter", "uom_symbol": "m", "uom_type": "Length"},
+	{"uom_name": "Liter", "uom_symbol": "l", "uom_type": "Volume"},
+]
+
+# Exponent of the Zipf distribution (1.0 = classic 80/20-like skew)
+ZIPF_EXPONENT = 1.1
+
+BATCH_TRACKED_SHARE = 0.15
+SERIAL_TRACKED_SHARE = 0.05
+MAX_SERIALS_PER_ITEM = 20
+
+
+def generate_dataset(items=10000, locations=2000, groups=500, depth=4, seed=42, batch_size=1000):
+	"""
+	Generate and load a synthetic dataset
+
+	Args:
+		items: Number of Store Items
+		locations: Approximate number of Store Locations (all levels)
+		groups: Number of Store Item Groups
+		depth: Maximum depth of the item group tree
+		seed: Random seed (same seed = same dataset)
+		batch_size: Documents per bulk insert
+
+	Returns:
+		dict: {"success": bool, "created": {doctype: int}, "seconds": {doctype: float}}
+	"""
+	frappe.only_for(["System Manager", "Dev User"])
+
+	items, locations, groups, depth = cint(items), cint(locations), cint(groups), max(cint(depth), 1)
+	rng = random.Random(cint(seed))
+
+	print("\n" + "="*60)
+	print(f"🧪 Generating dataset (seed {cint(seed)}): {items} items, ~{locations} locations, {groups} groups, depth {depth}")
+	print("="*60)
+
+	uom_records = BASE_UOMS
+	group_records, leaf_groups = generate_item_groups(rng, groups, depth)
+	location_records, bins = generate_locations(rng, locations)
+	item_records = generate_items(rng, items, leaf_groups, bins, [uom["uom_name"] for uom in BASE_UOMS])
+
+	created, seconds = {}, {}
+	for doctype, records in (
+		("Store UOM", uom_records),
+		("Store Item Group", group_records),
+		("Store Location", location_records),
+		("Store Item", item_records),
+	):
+		start = time.perf_counter()
+		result = load_fixtures(doctype, records, batch_size=cint(batch_size))
+		frappe.db.commit()
+
+		created[doctype] = result["created"]
+		seconds[doctype] = round(time.perf_counter() - start, 2)
+		print(f"  ✓ {doctype}: {result['created']} created, {result['skipped']} existing ({seconds[doctype]}s)")
+
+	print("="*60 + "\n")
+	return {"success": True, "created": created, "seconds": seconds}
+
+
+# ============================================================================
+# ITEM GROUPS
+# ============================================================================
+
+def generate_item_groups(rng, count, depth):
+	"""
+	Item group tree grown by preferential attachment
+
+	Each new group picks its parent among the existing groups above the
+	depth limit, weighted by how many children they already have, so a few
+	branches become large and most stay small.
+
+	Returns:
+		tuple: (records, leaf group names)
+	"""
+	records = []
+	level_of = {}
+	children = {}
+	candidates = []  # One entry per (child + 1) of every group that may get children
+
+	for index in range(1, count + 1):
+		name = f"{rng.choice(GROUP_WORDS)} {index:05d}"
+		parent = rng.choice(candidates) if candidates and rng.random() > 0.02 else None
+
+		record = {"item_group_name": name, "is_group": 0, "enabled": 1}
+		if parent:
+			record["parent_item_group"] = parent
+			children[parent] = children.get(parent, 0) + 1
+			candidates.append(parent)
+
+		level_of[name] = level_of[parent] + 1 if parent else 0
+		if level_of[name] < depth - 1:
+			candidates.append(name)
+
+		records.append(record)
+
+	for record in records:
+		if children.get(record["item_group_name"]):
+			record["is_group"] = 1
+
+	leaf_groups = [record["item_group_name"] for record in records if not record["is_group"]]
+	return records, leaf_groups
+
+
+# ============================================================================
+# LOCATIONS
+# ============================================================================
+
+def generate_locations(rng, count):
+	"""
+	Warehouse → Zone → Rack → Shelf → Bin hierarchy of roughly count locations
+
+	Fan-out per level is drawn around the value that gives count locations
+	over five levels, with a long tail (some racks hold many more shelves).
+
+	Returns:
+		tuple: (records, bin location codes)
+	"""
+	warehouses = max(1, round(count ** 0.2 / 2))
+	fan_out = max(1.0, (count / warehouses) ** 0.25)
+
+	records = []
+	parents = []  # Ancestor fields (store, zone, ...) of each location of the current level
+	for number in range(1, warehouses + 1):
+		code = f"WH-{number}"
+		records.append({"location_code": code, "location_type": "Warehouse", "warehouse_name": code, "enabled": 1})
+		parents.append(({"store": code}, code))
+
+	for location_type, child_field, name_field, make_name in LOCATION_LEVELS:
+		next_parents = []
+		for ancestors, parent_code in parents:
+			# Pareto(2.5) has mean 5/3, so fan_out is the average
+			children = max(1, round(rng.paretovariate(2.5) * fan_out * 0.6))
+			for number in range(1, children + 1):
+				if len(records) >= count:
+					break
+				level_name = make_name(number)
+				code = f"{parent_code}-{level_name}"
+				records.append({
+					"location_code": code,
+					"location_type": location_type,
+					name_field: level_name,
+					"enabled": 1,
+					**ancestors,
+				})
+				if child_field:
+					next_parents.append(({**ancestors, child_field: code}, code))
+		parents = next_parents
+
+	bins = [record["location_code"] for record in records if record["location_type"] == "Bin"]
+	return records, bins or [record["location_code"] for record in records]
+
+
+def letters(number):
+	"""1 → A, 26 → Z, 27 → AA (spreadsheet column style)"""
+	result = ""
+	while number > 0:
+		number, remainder = divmod(number - 1, 26)
+		result = chr(65 + remainder) + result
+	return result
+
+
+# ============================================================================
+# ITEMS
+# ============================================================================
+
+def generate_items(rng, count, groups, bins, uoms):
+	"""
+	Items with Zipf-distributed popularity
+
+	Item rank 1 is the most popular: it gets the largest opening stock.
+	Groups and default bins are drawn from their own Zipf distributions,
+	so some groups and bins hold far more items than others.
+	"""
+	if not groups:
+		frappe.throw(_("The dataset needs at least one item group without sub-groups"))
+
+	group_sampler = zipf_sampler(rng, len(groups))
+	bin_sampler = zipf_sampler(rng, len(bins))
+	today = nowdate()
+
+	records = []
+	for rank in range(1, count + 1):
+		popularity = 1.0 / rank ** ZIPF_EXPONENT
+		opening_stock = max(1, round(5000 * popularity)) if rng.random() < 0.8 else 0
+		rate = round(rng.lognormvariate(3, 1.2), 2)
+
+		record = {
+			"item_name": f"{rng.choice(ITEM_NOUNS)} {rng.choice(ITEM_SPECS)} {rank:07d}",
+			"item_group": groups[group_sampler()],
+			"default_uom": rng.choice(uoms),
+			"default_location": bins[bin_sampler()],
+			"valuation_method": rng.choice(["FIFO", "FIFO", "FIFO", "Moving Average", "LIFO"]),
+			"standard_rate": rate,
+			"opening_stock": opening_stock,
+			"opening_valuation_rate": rate if opening_stock else 0,
+			"enabled": 1,
+		}
+
+		tracking = rng.random()
+		if tracking < SERIAL_TRACKED_SHARE:
+			serials = min(opening_stock, MAX_SERIALS_PER_ITEM)
+			record["has_serial_no"] = 1
+			record["opening_stock"] = serials
+			record["opening_valuation_rate"] = rate if serials else 0
+			record["serial_numbers"] = [
+				{"serial_no": f"SN-{rank:07d}-{number:03d}", "status": "Available", "purchase_date": today}
+				for number in range(1, serials + 1)
+			]
+		elif tracking < SERIAL_TRACKED_SHARE + BATCH_TRACKED_SHARE:
+			record["has_batch_no"] = 1
+			record["has_expiry_date"] = 1
+			batches = rng.randint(1, 4)
+			record["batch_numbers"] = [
+				{
+					"batch_no": f"B-{rank:07d}-{number}",
+					"quantity": quantity,
+					"manufacturing_date": add_days(today, -rng.randint(30, 365)),
+					"expiry_date": add_days(today, rng.randint(30, 730)),
+				}
+				for number, quantity in enumerate(split_whole(opening_stock, batches), 1)
+			]
+
+		records.append(record)
+
+	return records
+
+
+def split_whole(total, parts):
+	"""Whole quantities adding up to total, the first ones one larger (5 over 3 → 2, 2, 1)"""
+	quotient, remainder = divmod(cint(total), parts)
+	return [quotient + (1 if part < remainder else 0) for part in range(parts)]
+
+
+def zipf_sampler(rng, size):
+	"""Sampler of indexes 0..size-1 where index k has weight 1/(k+1)^s"""
+	cumulative = list(accumulate(1.0 / rank ** ZIPF_EXPONENT for rank in range(1, size + 1)))
+	total = cumulative[-1]
+
+	def sample():
+		return min(bisect_left(cumulative, rng.random() * total), size - 1)
+
+	return sample
@@ -9,6 +9,10 @@ All demo data is stored in setup/demo_data/*.py files as pure data.
 import frappe
 from frappe import _
 
+from technical_store_system.utils.helpers.doctype_counter import get_count, get_counts
+from technical_store_system.utils.helpers.fixture_loader import load_fixtures, remove_fixtures
+from technical_store_system.utils.helpers.install_phase import rollback_to_savepoint
+
 
 # Demo data registry - maps DocType names to their demo data modules
 DEMO_DATA_REGISTRY = {
@@ -75,6 +79,7 @@ def install_demo_data_for_doctype(doctype_name, force=False):
 	Returns:
 		dict: {"success": bool, "created": int, "message": str}
 	"""
+	frappe.db.savepoint("store_demo_data")
 	try:
 		# Skip flag check if force=True (called from button)
 		if not force:
@@ -91,18 +96,9 @@ def install_demo_data_for_doctype(doctype_name, force=False):
 		config = DEMO_DATA_REGISTRY[doctype_name]
 		name_field = config["name_field"]
 		
-		# Insert records
-		created_count = 0
-		for record_data in demo_data:
-			record_name = record_data.get(name_field)
-			if not frappe.db.exists(doctype_name, record_name):
-				doc = frappe.new_doc(doctype_name)
-				for key, value in record_data.items():
-					doc.set(key, value)
-				doc.insert(ignore_permissions=True)
-				created_count += 1
-		
-		frappe.db.commit()
+		# Bulk insert missing records, parents first (one hook run per batch)
+		result = load_fixtures(doctype_name, demo_data, key_field=name_field)
+		created_count = result["created"]
 		
 		message = f"Created {created_count} {doctype_name} records" if created_count > 0 else f"All {doctype_name} records already exist"
 		
@@ -113,6 +109,7 @@ def install_demo_data_for_doctype(doctype_name, force=False):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_demo_data")
 		frappe.log_error(f"Error installing demo data for {doctype_name}: {str(e)}")
 		return {
 			"success": False,
@@ -126,18 +123,23 @@ def uninstall_demo_data_for_doctype(doctype_name):
 	Uninstall demo data for a specific DocType
 	Only deletes if exact count matches expected demo data count (safety check)
 	
+	Records are removed level by level, deepest first, with one link check
+	and one DELETE per level (see fixture_loader.remove_fixtures). A link
+	from a record outside the demo data rolls the whole DocType back.
+	
 	Args:
 		doctype_name: Name of the DocType
 		
 	Returns:
 		dict: {"success": bool, "deleted": int, "message": str}
 	"""
+	frappe.db.savepoint("store_demo_data")
 	try:
 		config = DEMO_DATA_REGISTRY[doctype_name]
 		expected_count = config["count"]
 		
 		# Safety check: only delete if count matches exactly
-		actual_count = frappe.db.count(doctype_name)
+		actual_count = get_count(doctype_name)
 		if actual_count != expected_count:
 			return {
 				"success": False,
@@ -149,15 +151,9 @@ def uninstall_demo_data_for_doctype(doctype_name):
 		demo_data = get_demo_data(doctype_name)
 		name_field = config["name_field"]
 		
-		# Delete records
-		deleted_count = 0
-		for record_data in demo_data:
-			record_name = record_data.get(name_field)
-			if frappe.db.exists(doctype_name, record_name):
-				frappe.delete_doc(doctype_name, record_name, ignore_permissions=True, force=True)
-				deleted_count += 1
-		
-		frappe.db.commit()
+		# Bulk delete, children before parents
+		result = remove_fixtures(doctype_name, demo_data, key_field=name_field)
+		deleted_count = result["deleted"]
 		
 		return {
 			"success": True,
@@ -166,6 +162,7 @@ def uninstall_demo_data_for_doctype(doctype_name):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_demo_data")
 		frappe.log_error(f"Error uninstalling demo data for {doctype_name}: {str(e)}")
 		return {
 			"success": False,
@@ -202,23 +199,32 @@ def install_all_demo_data(force=False):
 	}
 
 
-def uninstall_all_demo_data():
+def uninstall_all_demo_data(job=None):
 	"""
 	Uninstall demo data for all registered DocTypes
 	
+	DocTypes are removed in reverse registry order, so items go before the
+	locations, groups and UOMs they link to.
+	
+	Args:
+		job: MaintenanceJob to report progress to, one chunk per DocType (optional)
+	
 	Returns:
 		dict: {"success": bool, "results": list, "total_deleted": int}
 	"""
 	results = []
 	total_deleted = 0
 	
-	for doctype_name in DEMO_DATA_REGISTRY.keys():
+	for index, doctype_name in enumerate(reversed(DEMO_DATA_REGISTRY), start=1):
 		result = uninstall_demo_data_for_doctype(doctype_name)
 		results.append({
 			"doctype": doctype_name,
 			"result": result
 		})
 		total_deleted += result["deleted"]
+		
+		if job:
+			job.progress(index, len(DEMO_DATA_REGISTRY), f"Removed {result['deleted']} {doctype_name}")
 	
 	return {
 		"success": True,
@@ -234,10 +240,11 @@ def get_demo_data_counts():
 	Returns:
 		dict: {doctype_name: {"current": int, "expected": int}}
 	"""
+	current = get_counts(list(DEMO_DATA_REGISTRY))
 	counts = {}
 	for doctype_name, config in DEMO_DATA_REGISTRY.items():
 		counts[doctype_name] = {
-			"current": frappe.db.count(doctype_name),
+			"current": current[doctype_name],
 			"expected": config["count"]
 		}
 	return counts
@@ -0,0 +1,182 @@
+"""
+DocType Counter Helper
+Maintained row counts for the app's master DocTypes
+
+frappe.db.count is a full COUNT(*) on InnoDB. The counts of COUNTED_DOCTYPES
+are kept in Store Doctype Counter records instead, one per DocType:
+
+- after_insert / on_trash hooks move row_count by +1 / -1 with an UPDATE in
+  the same transaction, so a rolled back insert or delete leaves the
+  counter unchanged
+- Bulk writes that bypass the hooks (fixture loader) adjust it themselves
+- reconcile_counts() recounts the tables and repairs drift (daily job,
+  and on install / migrate, which also creates missing counter records);
+  counter and COUNT(*) are both locking reads, committed per DocType
+  unless the caller owns the transaction (installer phase, commit=False)
+
+Reading a count is a primary key lookup.
+
+Usage:
+	from technical_store_system.utils.helpers.doctype_counter import get_count, get_counts
+
+	get_count("Store Location")
+	get_counts()
+	# {"Store UOM": 27, "Store Item Group": 19, "Store Location": 11, "Store Item": 16}
+"""
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+from technical_store_system.utils.helpers.event_profiler import profile_event
+
+
+COUNTER_DOCTYPE = "Store Doctype Counter"
+
+COUNTED_DOCTYPES = ["Store UOM", "Store Item Group", "Store Location", "Store Item"]
+
+
+# ============================================================================
+# COUNTS
+# ============================================================================
+
+def get_count(doctype):
+	"""Row count of a counted DocType"""
+	return get_counts([doctype])[doctype]
+
+
+def get_counts(doctypes=None):
+	"""
+	Row counts of several DocTypes from their counters (one query)
+
+	DocTypes without a counter record yet (before the first
+	reconciliation) fall back to COUNT(*).
+
+	Args:
+		doctypes: DocType names (defaults to COUNTED_DOCTYPES)
+
+	Returns:
+		dict: {doctype: count}
+	"""
+	doctypes = list(doctypes or COUNTED_DOCTYPES)
+	counters = dict(frappe.get_all(
+		COUNTER_DOCTYPE,
+		filters={"name": ["in", doctypes]},
+		fields=["name", "row_count"],
+		as_list=True,
+	))
+
+	return {
+		doctype: cint(counters[doctype]) if doctype in counters else frappe.db.count(doctype)
+		for doctype in doctypes
+	}
+
+
+def adjust_count(doctype, delta):
+	"""
+	Move the counter of a DocType by delta, inside the current transaction
+
+	The counter row stays locked until the transaction ends, so concurrent
+	inserts of the same DocType are counted one after the other.
+	"""
+	if doctype not in COUNTED_DOCTYPES or not delta:
+		return
+
+	frappe.db.sql(
+		"""UPDATE `tabStore Doctype Counter`
+		SET `row_count` = GREATEST(`row_count` + %s, 0)
+		WHERE `name` = %s""",
+		(delta, doctype),
+	)
+
+
+# ============================================================================
+# RECONCILIATION
+# ============================================================================
+
+def reconcile_counts(doctypes=None, commit=True):
+	"""
+	Recount the tables and repair the counters (scheduled daily)
+
+	Creates missing counter records. Drift is stored on the counter and
+	logged, as it means some write path bypasses the hooks.
+
+	Args:
+		doctypes: DocType names (defaults to COUNTED_DOCTYPES)
+		commit: Commit after each DocType to release its share locks. Pass
+			False inside a transaction the caller commits or rolls back as
+			a whole (installer phases); the locks are then held until then.
+
+	Returns:
+		dict: {"success": bool, "drift": {doctype: int}, "message": str}
+	"""
+	if not frappe.db.table_exists(COUNTER_DOCTYPE):
+		return {"success": False, "drift": {}, "message": f"{COUNTER_DOCTYPE} is not installed"}
+
+	drift = {}
+	timestamp = now_datetime()
+
+	for doctype in doctypes or COUNTED_DOCTYPES:
+		if not frappe.db.table_exists(doctype):
+			continue
+
+		# Lock the counter while counting, so no hook moves it in between.
+		# The count is a locking read too: a plain COUNT(*) would read the
+		# transaction's REPEATABLE READ snapshot, older than the locked counter.
+		counter = frappe.db.sql(
+			"SELECT `row_count` FROM `tabStore Doctype Counter` WHERE `name` = %s FOR UPDATE",
+			doctype,
+		)
+		actual = cint(frappe.db.sql(f"SELECT COUNT(*) FROM `tab{doctype}` LOCK IN SHARE MODE")[0][0])
+		drift[doctype] = actual - cint(counter[0][0]) if counter else 0
+
+		frappe.db.sql(
+			"""INSERT INTO `tabStore Doctype Counter`
+				(`name`, `counted_doctype`, `row_count`, `last_reconciled`, `last_drift`,
+				`creation`, `modified`, `owner`, `modified_by`, `docstatus`)
+			VALUES (%(doctype)s, %(doctype)s, %(count)s, %(now)s, %(drift)s, %(now)s, %(now)s, %(user)s, %(user)s, 0)
+			ON DUPLICATE KEY UPDATE
+				`row_count` = VALUES(`row_count`),
+				`last_reconciled` = VALUES(`last_reconciled`),
+				`last_drift` = VALUES(`last_drift`),
+				`modified` = VALUES(`modified`)""",
+			{
+				"doctype": doctype,
+				"count": actual,
+				"now": timestamp,
+				"drift": drift[doctype],
+				"user": frappe.session.user,
+			},
+		)
+
+		# Release the table's share locks before counting the next one
+		if commit:
+			frappe.db.commit()
+
+	drifted = {doctype: value for doctype, value in drift.items() if value}
+	if drifted:
+		frappe.log_error(
+			title="Store Doctype Counter Drift",
+			message="\n".join(f"{doctype}: {value:+d}" for doctype, value in drifted.items()),
+		)
+
+	return {
+		"success": True,
+		"drift": drift,
+		"message": f"Reconciled {len(drift)} counter(s), {len(drifted)} drifted",
+	}
+
+
+# ============================================================================
+# DOC EVENT HANDLERS
+# ============================================================================
+
+@profile_event
+def count_after_insert_event(doc, method=None):
+	"""Hook: one more row"""
+	adjust_count(doc.doctype, 1)
+
+
+@profile_event
+def count_on_trash_event(doc, method=None):
+	"""Hook: one row less"""
+	adjust_count(doc.doctype, -1)
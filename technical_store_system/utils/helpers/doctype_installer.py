@@ -6,9 +6,18 @@ All logic for DocType operations is centralized here.
 setup/doctypes_setup.py discovers files and delegates to this helper.
 """
 
+import hashlib
+import json
+
 import frappe
 from frappe import _
 
+from technical_store_system.utils.helpers.install_phase import rollback_to_savepoint
+
+
+# Global default holding {doctype_name: definition hash} of the last successful sync
+DOCTYPE_HASHES_KEY = "technical_store_system_doctype_hashes"
+
 
 def create_doctype(doctype_dict):
 	"""
@@ -20,6 +29,7 @@ def create_doctype(doctype_dict):
 	Returns:
 		dict: {"success": bool, "message": str, "doctype_name": str}
 	"""
+	frappe.db.savepoint("store_doctype")
 	try:
 		doctype_name = doctype_dict.get("name")
 		
@@ -59,7 +69,6 @@ def create_doctype(doctype_dict):
 		
 		# Insert DocType
 		doc.insert(ignore_permissions=True)
-		frappe.db.commit()
 		
 		return {
 			"success": True,
@@ -69,6 +78,7 @@ def create_doctype(doctype_dict):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_doctype")
 		frappe.log_error(frappe.get_traceback(), f"DocType Creation Failed: {doctype_name}")
 		return {
 			"success": False,
@@ -89,6 +99,7 @@ def update_doctype(doctype_dict):
 	Returns:
 		dict: {"success": bool, "message": str, "doctype_name": str, "changes": dict}
 	"""
+	frappe.db.savepoint("store_doctype")
 	try:
 		doctype_name = doctype_dict.get("name")
 		
@@ -105,9 +116,6 @@ def update_doctype(doctype_dict):
 		# Get existing DocType
 		doc = frappe.get_doc("DocType", doctype_name)
 		
-		# Build map of existing fields by fieldname
-		existing_fields = {field.fieldname: field for field in doc.fields if field.fieldname}
-		
 		# Track changes
 		changes = {
 			"fields_added": [],
@@ -115,75 +123,21 @@ def update_doctype(doctype_dict):
 			"properties_updated": []
 		}
 		
-		# Process new field definitions
-		new_fields = doctype_dict.get("fields", [])
-		
-		for new_field in new_fields:
-			fieldname = new_field.get("fieldname")
+		# Apply the differences between definition and database
+		for change in diff_doctype(doc, doctype_dict):
+			if change["type"] == "add_field":
+				doc.append("fields", change["field"])
+				changes["fields_added"].append(change["label"])
 			
-			# Skip if no fieldname (section breaks, column breaks, etc. without fieldname)
-			if not fieldname:
-				# Check if this non-fieldname item exists by comparing label and fieldtype
-				exists = False
-				for existing in doc.fields:
-					if (existing.fieldtype == new_field.get("fieldtype") and 
-						existing.label == new_field.get("label")):
-						exists = True
-						break
-				
-				if not exists:
-					# Add new section break, column break, etc.
-					doc.append("fields", new_field)
-					changes["fields_added"].append(f"{new_field.get('fieldtype')} - {new_field.get('label', 'No Label')}")
-				continue
+			elif change["type"] == "update_field":
+				for prop, _old_value, new_value in change["props"]:
+					setattr(change["existing"], prop, new_value)
+				updated_props = [f"{prop}: {old} → {new}" for prop, old, new in change["props"]]
+				changes["fields_updated"].append(f"{change['fieldname']} ({', '.join(updated_props)})")
 			
-			# Check if field exists
-			if fieldname in existing_fields:
-				# Field exists - check if properties need updating
-				existing = existing_fields[fieldname]
-				updated_props = []
-				
-				# Compare important properties
-				props_to_check = ["label", "fieldtype", "options", "reqd", "default", 
-								 "description", "read_only", "hidden", "in_list_view"]
-				
-				for prop in props_to_check:
-					new_value = new_field.get(prop)
-					existing_value = getattr(existing, prop, None)
-					
-					# Normalize for comparison (handle int/bool vs string)
-					def normalize_value(val):
-						if val is None:
-							return None
-						# Convert to string for comparison
-						return str(val) if not isinstance(val, str) else val
-					
-					# Update if different and new_value is not None
-					if new_value is not None:
-						norm_new = normalize_value(new_value)
-						norm_existing = normalize_value(existing_value)
-						
-						if norm_new != norm_existing:
-							setattr(existing, prop, new_value)
-							updated_props.append(f"{prop}: {existing_value} → {new_value}")
-				
-				if updated_props:
-					changes["fields_updated"].append(f"{fieldname} ({', '.join(updated_props)})")
-			else:
-				# Field doesn't exist - add it
-				doc.append("fields", new_field)
-				changes["fields_added"].append(fieldname)
-		
-		# Update basic DocType properties if provided
-		basic_props = ["module", "is_submittable", "is_tree", "track_changes", 
-					   "editable_grid", "title_field", "nsm_parent_field"]
-		
-		for prop in basic_props:
-			new_value = doctype_dict.get(prop)
-			if new_value is not None and new_value != getattr(doc, prop, None):
-				old_value = getattr(doc, prop, None)
-				setattr(doc, prop, new_value)
-				changes["properties_updated"].append(f"{prop}: {old_value} → {new_value}")
+			elif change["type"] == "update_property":
+				setattr(doc, change["prop"], change["new"])
+				changes["properties_updated"].append(f"{change['prop']}: {change['old']} → {change['new']}")
 		
 		# Check if any changes were made
 		has_changes = (changes["fields_added"] or changes["fields_updated"] or changes["properties_updated"])
@@ -191,7 +145,6 @@ def update_doctype(doctype_dict):
 		if has_changes:
 			# Save changes
 			doc.save()
-			frappe.db.commit()
 			
 			# Build summary message
 			summary = []
@@ -219,6 +172,7 @@ def update_doctype(doctype_dict):
 			}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_doctype")
 		frappe.log_error(frappe.get_traceback(), f"DocType Update Failed: {doctype_name}")
 		return {
 			"success": False,
@@ -229,6 +183,251 @@ def update_doctype(doctype_dict):
 		}
 
 
+# Field properties synced from the definition onto existing fields
+FIELD_PROPS_TO_CHECK = ["label", "fieldtype", "options", "reqd", "default",
+						"description", "read_only", "hidden", "in_list_view"]
+
+# DocType properties synced from the definition
+DOCTYPE_PROPS_TO_CHECK = ["module", "is_submittable", "is_tree", "track_changes",
+						  "editable_grid", "title_field", "nsm_parent_field"]
+
+
+def diff_doctype(doc, doctype_dict):
+	"""
+	Compare an existing DocType with its definition (read-only)
+	
+	Used by update_doctype to apply changes and by the migration planner
+	to report them without writing anything.
+	
+	Args:
+		doc: Existing DocType document
+		doctype_dict: Dictionary with DocType configuration
+		
+	Returns:
+		list: Change dicts, one of
+			{"type": "add_field", "field": dict, "label": str}
+			{"type": "update_field", "fieldname": str, "existing": field row, "props": [(prop, old, new)]}
+			{"type": "update_property", "prop": str, "old": value, "new": value}
+	"""
+	changes = []
+	
+	# Build map of existing fields by fieldname
+	existing_fields = {field.fieldname: field for field in doc.fields if field.fieldname}
+	
+	for new_field in doctype_dict.get("fields", []):
+		fieldname = new_field.get("fieldname")
+		
+		# Items without fieldname are matched by fieldtype and label
+		if not fieldname:
+			exists = any(
+				existing.fieldtype == new_field.get("fieldtype") and existing.label == new_field.get("label")
+				for existing in doc.fields
+			)
+			if not exists:
+				changes.append({
+					"type": "add_field",
+					"field": new_field,
+					"label": f"{new_field.get('fieldtype')} - {new_field.get('label', 'No Label')}",
+				})
+			continue
+		
+		if fieldname not in existing_fields:
+			changes.append({"type": "add_field", "field": new_field, "label": fieldname})
+			continue
+		
+		# Field exists - compare important properties
+		existing = existing_fields[fieldname]
+		props = []
+		for prop in FIELD_PROPS_TO_CHECK:
+			new_value = new_field.get(prop)
+			existing_value = getattr(existing, prop, None)
+			
+			# Update if different and new_value is given
+			if new_value is not None and normalize_value(new_value) != normalize_value(existing_value):
+				props.append((prop, existing_value, new_value))
+		
+		if props:
+			changes.append({"type": "update_field", "fieldname": fieldname, "existing": existing, "props": props})
+	
+	for prop in DOCTYPE_PROPS_TO_CHECK:
+		new_value = doctype_dict.get(prop)
+		old_value = getattr(doc, prop, None)
+		if new_value is not None and new_value != old_value:
+			changes.append({"type": "update_property", "prop": prop, "old": old_value, "new": new_value})
+	
+	return changes
+
+
+def normalize_value(val):
+	"""Normalize for comparison (handle int/bool vs string)"""
+	if val is None:
+		return None
+	return str(val) if not isinstance(val, str) else val
+
+
+# ============================================================================
+# MIGRATION PLANNING (read-only)
+# ============================================================================
+
+# Field types without a database column
+NO_COLUMN_FIELDTYPES = {
+	"Section Break", "Column Break", "Tab Break", "HTML", "Button", "Heading",
+	"Fold", "Image", "Table", "Table MultiSelect",
+}
+
+# DDL cost classes, cheapest first
+DDL_NONE = "none"          # Metadata only (DocField row)
+DDL_CREATE = "create"      # CREATE TABLE for a new DocType
+DDL_INSTANT = "instant"    # ADD COLUMN (instant on MariaDB 10.3+ InnoDB)
+DDL_INDEX = "index"        # Index build, scans the table
+DDL_REBUILD = "rebuild"    # MODIFY COLUMN, copies the table
+
+DDL_COST_ORDER = [DDL_NONE, DDL_CREATE, DDL_INSTANT, DDL_INDEX, DDL_REBUILD]
+
+# Rough throughput used for time estimates
+INDEX_ROWS_PER_SECOND = 200000
+REBUILD_ROWS_PER_SECOND = 50000
+
+# Changes estimated above this belong in a maintenance window
+MAINTENANCE_WINDOW_SECONDS = 30
+
+
+def plan_doctype(doctype_dict, table_rows=None):
+	"""
+	Describe what update_doctype would change, with a DDL cost estimate
+	
+	Nothing is written.
+	
+	Args:
+		doctype_dict: Dictionary with DocType configuration
+		table_rows: {doctype_name: estimated rows} (see get_table_row_estimates)
+		
+	Returns:
+		dict: {"doctype_name", "action": "create"|"update"|"unchanged",
+			"changes": [{"change", "ddl", "detail"}], "ddl", "rows", "estimated_seconds",
+			"maintenance_window"}
+	"""
+	doctype_name = doctype_dict.get("name")
+	rows = (table_rows or {}).get(doctype_name, 0)
+	
+	if not frappe.db.exists("DocType", doctype_name):
+		changes = [{"change": "create DocType", "ddl": DDL_CREATE, "detail": f"{len(doctype_dict.get('fields', []))} fields"}]
+		return build_plan_result(doctype_name, "create", changes, 0)
+	
+	doc = frappe.get_doc("DocType", doctype_name)
+	changes = []
+	
+	for change in diff_doctype(doc, doctype_dict):
+		if change["type"] == "add_field":
+			field = change["field"]
+			changes.append({
+				"change": f"+ field {change['label']}",
+				"ddl": get_add_field_ddl(field),
+				"detail": field.get("fieldtype"),
+			})
+		
+		elif change["type"] == "update_field":
+			changes.append({
+				"change": f"~ field {change['fieldname']}",
+				"ddl": get_update_field_ddl(change["existing"], change["props"]),
+				"detail": ", ".join(f"{prop}: {old} → {new}" for prop, old, new in change["props"]),
+			})
+		
+		elif change["type"] == "update_property":
+			# Becoming a tree adds lft/rgt columns with indexes
+			ddl = DDL_INDEX if change["prop"] == "is_tree" and change["new"] else DDL_NONE
+			changes.append({
+				"change": f"~ property {change['prop']}",
+				"ddl": ddl,
+				"detail": f"{change['old']} → {change['new']}",
+			})
+	
+	return build_plan_result(doctype_name, "update" if changes else "unchanged", changes, rows)
+
+
+def get_add_field_ddl(field):
+	"""DDL class of adding a field"""
+	if field.get("fieldtype") in NO_COLUMN_FIELDTYPES:
+		return DDL_NONE
+	if field.get("search_index") or field.get("unique"):
+		return DDL_INDEX
+	return DDL_INSTANT
+
+
+def get_update_field_ddl(existing, props):
+	"""DDL class of changing properties of an existing field"""
+	ddl = DDL_NONE
+	for prop, old_value, new_value in props:
+		if prop == "fieldtype":
+			if get_column_type(old_value) != get_column_type(new_value):
+				# Column added, dropped or retyped
+				if get_column_type(old_value) is None:
+					ddl = max_ddl(ddl, DDL_INSTANT)
+				else:
+					ddl = max_ddl(ddl, DDL_REBUILD)
+		elif prop == "default" and existing.fieldtype not in NO_COLUMN_FIELDTYPES:
+			# Frappe re-declares the column (conservative: may copy the table)
+			ddl = max_ddl(ddl, DDL_REBUILD)
+	return ddl
+
+
+def get_column_type(fieldtype):
+	"""Database column type of a field type (None if it has no column)"""
+	if fieldtype in NO_COLUMN_FIELDTYPES:
+		return None
+	type_map = getattr(frappe.db, "type_map", None) or {}
+	return type_map.get(fieldtype, (fieldtype,))[0]
+
+
+def max_ddl(first, second):
+	"""The more expensive of two DDL classes"""
+	return max(first, second, key=DDL_COST_ORDER.index)
+
+
+def build_plan_result(doctype_name, action, changes, rows):
+	"""Summarize the changes of one DocType with an overall cost"""
+	ddl = DDL_NONE
+	for change in changes:
+		ddl = max_ddl(ddl, change["ddl"])
+	
+	estimated_seconds = 0.0
+	if ddl == DDL_INDEX:
+		estimated_seconds = rows / INDEX_ROWS_PER_SECOND
+	elif ddl == DDL_REBUILD:
+		estimated_seconds = rows / REBUILD_ROWS_PER_SECOND
+	
+	return {
+		"doctype_name": doctype_name,
+		"action": action,
+		"changes": changes,
+		"ddl": ddl,
+		"rows": rows,
+		"estimated_seconds": round(estimated_seconds, 1),
+		"maintenance_window": estimated_seconds >= MAINTENANCE_WINDOW_SECONDS,
+	}
+
+
+def get_table_row_estimates(doctype_names):
+	"""
+	Approximate row counts of DocType tables from information_schema (one query)
+	
+	Returns:
+		dict: {doctype_name: rows}
+	"""
+	if not doctype_names:
+		return {}
+	
+	rows = frappe.db.sql(
+		"""
+		SELECT `TABLE_NAME`, `TABLE_ROWS`
+		FROM `information_schema`.`TABLES`
+		WHERE `TABLE_SCHEMA` = DATABASE() AND `TABLE_NAME` IN %(tables)s
+		""",
+		{"tables": tuple(f"tab{name}" for name in doctype_names)},
+	)
+	return {table_name[3:]: int(table_rows or 0) for table_name, table_rows in rows}
+
+
 def delete_doctype(doctype_name):
 	"""
 	Delete a DocType
@@ -239,6 +438,7 @@ def delete_doctype(doctype_name):
 	Returns:
 		dict: {"success": bool, "message": str, "doctype_name": str}
 	"""
+	frappe.db.savepoint("store_doctype")
 	try:
 		# Check if DocType exists
 		if not frappe.db.exists("DocType", doctype_name):
@@ -251,7 +451,6 @@ def delete_doctype(doctype_name):
 		
 		# Delete DocType
 		frappe.delete_doc("DocType", doctype_name, force=True, ignore_permissions=True)
-		frappe.db.commit()
 		
 		return {
 			"success": True,
@@ -261,6 +460,7 @@ def delete_doctype(doctype_name):
 		}
 		
 	except Exception as e:
+		rollback_to_savepoint("store_doctype")
 		frappe.log_error(frappe.get_traceback(), f"DocType Deletion Failed: {doctype_name}")
 		return {
 			"success": False,
@@ -270,6 +470,44 @@ def delete_doctype(doctype_name):
 		}
 
 
+# ============================================================================
+# DEFINITION HASHES
+# ============================================================================
+
+def get_definition_hash(doctype_dict):
+	"""
+	Fingerprint of a DocType definition dict
+
+	Keys are sorted, so only real changes to the definition change the hash.
+	"""
+	payload = json.dumps(doctype_dict, sort_keys=True, default=str, separators=(",", ":"))
+	return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_stored_hashes():
+	"""
+	Definition hashes recorded after the last successful sync (one DB read)
+
+	Returns:
+		dict: {doctype_name: hash}
+	"""
+	stored = frappe.db.get_global(DOCTYPE_HASHES_KEY)
+	try:
+		return json.loads(stored) if stored else {}
+	except ValueError:
+		return {}
+
+
+def save_stored_hashes(hashes):
+	"""Persist definition hashes (call only after the DocTypes synced successfully)"""
+	frappe.db.set_global(DOCTYPE_HASHES_KEY, json.dumps(hashes, sort_keys=True))
+
+
+def clear_stored_hashes():
+	"""Forget all definition hashes so the next migrate compares every DocType"""
+	frappe.db.set_global(DOCTYPE_HASHES_KEY, None)
+
+
 def install_demo_data_for_doctype_if_enabled(doctype_name, force=False):
 	"""
 	Install demo data for a DocType after it's created
@@ -0,0 +1,212 @@
+"""
+Event Profiler Helper
+Wall time, query count and rows read per doc event handler
+
+Every handler registered in hooks.doc_events is decorated with
+@profile_event, and the override_doctype_class controllers with
+@profile_controller. While profiling is switched on (site config), each
+call is recorded into a ring buffer in Redis (the last EVENT_BUFFER_SIZE
+calls across all workers):
+
+	{"doctype", "name", "event", "handler", "ms", "queries", "rows_read", "rows_written", "at"}
+
+get_event_stats() aggregates the buffer per handler (calls, mean / p95 /
+max ms, mean queries and rows read), so a slow Store Location save can be
+traced to the hook that causes it.
+
+Site config (bench --site <site> set-config <key> <value>):
+- store_event_profiling: 1 turns recording on (default off - each recorded
+  call costs a Redis LPUSH + LTRIM, so enable it while investigating)
+- store_slow_event_threshold_ms: calls at or above this many milliseconds
+  are also written to the Error Log as "Slow Store Event" (default off)
+
+Usage:
+	@profile_event
+	def before_insert_event(doc, method=None):
+		...
+
+	@profile_controller
+	class StoreSettings(Document):
+		...
+
+	bench --site <site> execute technical_store_system.utils.helpers.event_profiler.get_event_stats \\
+		--kwargs "{'doctype': 'Store Location'}"
+"""
+
+import functools
+import json
+import math
+import time
+
+import frappe
+from frappe.utils import now
+
+from technical_store_system.utils.helpers.install_phase import QueryCounter
+
+
+EVENT_BUFFER_KEY = "technical_store_system:event_profile"
+EVENT_BUFFER_SIZE = 2000
+
+# Document methods wrapped by @profile_controller (when the class defines them)
+CONTROLLER_EVENTS = (
+	"autoname", "before_insert", "after_insert", "before_validate", "validate",
+	"before_save", "on_update", "on_change", "before_rename", "after_rename",
+	"on_trash", "after_delete", "before_submit", "on_submit", "before_cancel", "on_cancel",
+)
+
+SLOWEST_EVENTS = 10
+
+
+# ============================================================================
+# DECORATORS
+# ============================================================================
+
+def profile_event(func):
+	"""
+	Record wall time, queries and rows read of every call of a handler
+	(only while store_event_profiling is set in site config)
+
+	Works for hook handlers (doc, method=None) and Document methods (self).
+	The handler's exceptions pass through unchanged; a failing call is
+	recorded too.
+	"""
+	handler = f"{func.__module__}.{func.__qualname__}"
+
+	@functools.wraps(func)
+	def wrapper(doc, *args, **kwargs):
+		if not frappe.conf.get("store_event_profiling"):
+			return func(doc, *args, **kwargs)
+
+		event = kwargs.get("method") or (args[0] if args and isinstance(args[0], str) else func.__name__)
+		counter = QueryCounter()
+		start = time.perf_counter()
+		try:
+			with counter:
+				return func(doc, *args, **kwargs)
+		finally:
+			record_event({
+				"doctype": getattr(doc, "doctype", None),
+				"name": getattr(doc, "name", None),
+				"event": event,
+				"handler": handler,
+				"ms": round((time.perf_counter() - start) * 1000, 3),
+				"queries": counter.queries,
+				"rows_read": counter.rows_read,
+				"rows_written": counter.rows_written,
+				"at": now(),
+			})
+
+	return wrapper
+
+
+def profile_controller(cls):
+	"""Class decorator: @profile_event on each of CONTROLLER_EVENTS the class defines"""
+	for method in CONTROLLER_EVENTS:
+		if method in cls.__dict__:
+			setattr(cls, method, profile_event(cls.__dict__[method]))
+	return cls
+
+
+# ============================================================================
+# RING BUFFER
+# ============================================================================
+
+def record_event(entry):
+	"""
+	Push one call into the ring buffer and log it if it was slow
+
+	Never raises - profiling must not make a save fail.
+	"""
+	try:
+		frappe.cache.lpush(EVENT_BUFFER_KEY, json.dumps(entry, default=str))
+		frappe.cache.ltrim(EVENT_BUFFER_KEY, 0, EVENT_BUFFER_SIZE - 1)
+
+		threshold = frappe.conf.get("store_slow_event_threshold_ms")
+		if threshold is not None and entry["ms"] >= float(threshold):
+			frappe.log_error(
+				title="Slow Store Event",
+				message=f"{entry['handler']} ({entry['doctype']} {entry['name']}, {entry['event']}) "
+					f"took {entry['ms']} ms\n\n{json.dumps(entry, indent=1, default=str)}",
+			)
+	except Exception:
+		pass
+
+
+def get_recent_events(doctype=None):
+	"""
+	Calls in the ring buffer, newest first
+
+	Args:
+		doctype: Only calls for this DocType (all if None)
+
+	Returns:
+		list: Entry dicts as recorded by profile_event
+	"""
+	entries = [json.loads(raw) for raw in frappe.cache.lrange(EVENT_BUFFER_KEY, 0, -1) or []]
+	if doctype:
+		entries = [entry for entry in entries if entry["doctype"] == doctype]
+	return entries
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+@frappe.whitelist()
+def get_event_stats(doctype=None):
+	"""
+	Aggregate the ring buffer per DocType, event and handler
+
+	Args:
+		doctype: Only handlers for this DocType (all if None)
+
+	Returns:
+		dict: {
+			"success": True,
+			"calls": int,
+			"stats": [{"doctype", "event", "handler", "calls", "mean_ms", "p95_ms",
+				"max_ms", "total_ms", "mean_queries", "mean_rows_read"}, ...],
+			"slowest": [entry, ...],
+		}
+		Stats are sorted by total_ms, the handlers costing the most first.
+	"""
+	frappe.only_for(["System Manager", "Dev User"])
+
+	entries = get_recent_events(doctype)
+
+	groups = {}
+	for entry in entries:
+		groups.setdefault((entry["doctype"], entry["event"], entry["handler"]), []).append(entry)
+
+	stats = []
+	for (group_doctype, event, handler), calls in groups.items():
+		durations = sorted(call["ms"] for call in calls)
+		stats.append({
+			"doctype": group_doctype,
+			"event": event,
+			"handler": handler,
+			"calls": len(calls),
+			"mean_ms": round(sum(durations) / len(durations), 3),
+			"p95_ms": durations[math.ceil(0.95 * len(durations)) - 1],
+			"max_ms": durations[-1],
+			"total_ms": round(sum(durations), 3),
+			"mean_queries": round(sum(call["queries"] for call in calls) / len(calls), 1),
+			"mean_rows_read": round(sum(call["rows_read"] for call in calls) / len(calls), 1),
+		})
+
+	stats.sort(key=lambda row: row["total_ms"], reverse=True)
+
+	return {
+		"success": True,
+		"calls": len(entries),
+		"stats": stats,
+		"slowest": sorted(entries, key=lambda entry: entry["ms"], reverse=True)[:SLOWEST_EVENTS],
+	}
+
+
+@frappe.whitelist()
+def clear_event_stats():
+	"""Empty the ring buffer"""
+	frappe.only_for(["System Manager", "Dev User"])
+	frappe.cache.delete_value(EVENT_BUFFER_KEY)
+	return {"success": True, "message": "Event profile cleared"}
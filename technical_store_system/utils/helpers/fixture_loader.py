@@ -0,0 +1,822 @@
+"""
+Fixture Loader Helper
+Bulk, dependency-ordered loader for demo data and fixtures
+
+Inserting fixtures one document at a time (frappe.db.exists + new_doc().insert())
+runs every controller hook per row - for Store Location that includes a save
+of Store Settings per location. The loader instead:
+
+1. Resolves which records already exist with one IN query per DocType
+2. Orders the new records by hierarchy depth (parents before children)
+3. Computes derived fields (codes, display names, inherited settings) in
+   memory, per level, from the batch plus one lookup of existing parents
+4. Bulk-inserts each level in batches (frappe.db.bulk_insert)
+5. Runs the DocType's side effects once per batch (statistics, opening
+   stock, UOM closure refresh) instead of once per row, and once per load
+   what needs the whole dataset (the item group tree's lft/rgt)
+
+remove_fixtures() is the reverse: deepest level first (bins before shelves
+before racks, leaf item groups before their parents), one link check and
+one DELETE per level instead of frappe.delete_doc per record. Rows derived
+from a removed record (a location's stock rollup row) are deleted with it.
+
+Supported DocTypes are registered in FIXTURE_SPECS.
+
+Usage:
+	from technical_store_system.utils.helpers.fixture_loader import load_fixtures, remove_fixtures
+
+	load_fixtures("Store Location", [
+		{"location_code": "WH-1", "location_type": "Warehouse"},
+		{"location_code": "WH-1-A", "location_type": "Zone", "store": "WH-1"},
+	])
+
+	remove_fixtures("Store Location", [{"location_code": "WH-1"}, {"location_code": "WH-1-A"}])
+"""
+
+import re
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, now
+
+from technical_store_system.utils.controllers.item_group_controller import get_group_code_base
+from technical_store_system.utils.controllers.store_location_controller import (
+	get_next_location_name,
+	update_system_stats
+)
+from technical_store_system.utils.controllers.store_item_controller import (
+	OPENING_VOUCHER_TYPE,
+	get_opening_stock_entries
+)
+from technical_store_system.utils.helpers.doctype_counter import adjust_count
+
+
+FIXTURE_BATCH_SIZE = 1000
+
+# Keys per IN query when checking which records exist
+EXISTS_CHUNK_SIZE = 10000
+
+# Guard against parent cycles in fixture data
+MAX_DEPTH = 50
+
+
+# ============================================================================
+# LOADER
+# ============================================================================
+
+def load_fixtures(doctype, records, key_field=None, batch_size=FIXTURE_BATCH_SIZE):
+	"""
+	Insert the records of a dataset that do not exist yet, level by level
+
+	Args:
+		doctype: DocType registered in FIXTURE_SPECS
+		records: List of dicts (field values, child tables as lists of dicts)
+		key_field: Field identifying a record (defaults to the spec's key field)
+		batch_size: Documents per bulk insert
+
+	Returns:
+		dict: {"success": bool, "created": int, "skipped": int, "message": str}
+	"""
+	spec = FIXTURE_SPECS.get(doctype)
+	if not spec:
+		frappe.throw(_("No fixture loader registered for {0}").format(doctype))
+
+	key_field = key_field or spec["key_field"]
+
+	# Dataset order wins for duplicate keys
+	unique = {}
+	for record in records:
+		key = record.get(key_field)
+		if key and key not in unique:
+			unique[key] = frappe._dict(record)
+
+	existing = get_existing_keys(doctype, key_field, list(unique))
+	new_records = [record for key, record in unique.items() if key not in existing]
+
+	if not new_records:
+		return {
+			"success": True,
+			"created": 0,
+			"skipped": len(unique),
+			"message": f"All {doctype} records already exist",
+		}
+
+	context = frappe._dict({"key_field": key_field})
+	if spec.get("validate"):
+		spec["validate"](new_records, context)
+
+	created = 0
+	for level in group_by_depth(new_records, key_field, spec["parent_fields"]):
+		for start in range(0, len(level), batch_size):
+			docs = spec["prepare"](level[start:start + batch_size], context)
+			insert_documents(doctype, docs)
+			# The bulk insert skips the counting hooks
+			adjust_count(doctype, len(docs))
+			if spec.get("after_batch"):
+				spec["after_batch"](docs, context)
+			created += len(docs)
+
+	if spec.get("after_load"):
+		spec["after_load"](context)
+
+	return {
+		"success": True,
+		"created": created,
+		"skipped": len(unique) - len(new_records),
+		"message": f"Created {created} {doctype} records",
+	}
+
+
+def get_existing_keys(doctype, key_field, keys):
+	"""Keys of the dataset that are already in the table (IN query per chunk)"""
+	existing = set()
+	for start in range(0, len(keys), EXISTS_CHUNK_SIZE):
+		existing.update(frappe.get_all(
+			doctype,
+			filters={key_field: ["in", keys[start:start + EXISTS_CHUNK_SIZE]]},
+			pluck=key_field,
+		))
+	return existing
+
+
+def group_by_depth(records, key_field, parent_fields):
+	"""
+	Split records into hierarchy levels, parents before children
+
+	A record's parent is the first of parent_fields that is set; parents
+	outside the dataset (already in the database) count as roots.
+
+	Returns:
+		list: [[records at depth 0], [records at depth 1], ...]
+	"""
+	by_key = {record[key_field]: record for record in records}
+	depth = {}
+
+	for record in records:
+		chain = []
+		key = record[key_field]
+		while key in by_key and key not in depth and key not in chain and len(chain) < MAX_DEPTH:
+			chain.append(key)
+			key = get_parent_key(by_key[key], parent_fields)
+
+		base = depth[key] + 1 if key in depth else 0
+		for offset, chain_key in enumerate(reversed(chain)):
+			depth[chain_key] = base + offset
+
+	levels = []
+	for record in records:
+		level = depth[record[key_field]]
+		while len(levels) <= level:
+			levels.append([])
+		levels[level].append(record)
+
+	return [level for level in levels if level]
+
+
+# ============================================================================
+# REMOVAL
+# ============================================================================
+
+def remove_fixtures(doctype, records, key_field=None):
+	"""
+	Delete the records of a dataset that exist, deepest level first
+
+	Each level is checked for links from other records once (one query per
+	link field) and deleted with one statement, child rows and the spec's
+	derived rows included. The per-document hooks do not run: the counter
+	is adjusted here and the spec's after_remove callback runs once at the
+	end.
+
+	Args:
+		doctype: DocType registered in FIXTURE_SPECS
+		records: List of dicts with at least the key field
+		key_field: Field identifying a record (defaults to the spec's key field)
+
+	Returns:
+		dict: {"success": True, "deleted": int, "levels": int, "message": str}
+
+	Raises:
+		frappe.LinkExistsError: If a record of a level is still linked
+	"""
+	spec = FIXTURE_SPECS.get(doctype)
+	if not spec:
+		frappe.throw(_("No fixture loader registered for {0}").format(doctype))
+
+	key_field = key_field or spec["key_field"]
+	keys = list(dict.fromkeys(record.get(key_field) for record in records if record.get(key_field)))
+
+	rows = []
+	fields = list(dict.fromkeys(["name", key_field, *spec["parent_fields"]]))
+	for start in range(0, len(keys), EXISTS_CHUNK_SIZE):
+		rows.extend(frappe.get_all(
+			doctype,
+			filters={key_field: ["in", keys[start:start + EXISTS_CHUNK_SIZE]]},
+			fields=fields,
+		))
+
+	levels = group_by_depth(rows, "name", spec["parent_fields"])
+	derived = spec.get("derived_doctypes") or {}
+	link_fields = [link for link in get_link_fields(doctype) if link.parent not in derived]
+
+	for level in reversed(levels):
+		names = [row.name for row in level]
+		check_links(doctype, names, link_fields)
+		for derived_doctype, fieldname in derived.items():
+			frappe.db.delete(derived_doctype, {fieldname: ["in", names]})
+		delete_documents(doctype, names)
+
+	# The bulk delete skips the counting hooks
+	adjust_count(doctype, -len(rows))
+	if rows and spec.get("after_remove"):
+		spec["after_remove"](rows, frappe._dict({"key_field": key_field}))
+
+	return {
+		"success": True,
+		"deleted": len(rows),
+		"levels": len(levels),
+		"message": f"Deleted {len(rows)} {doctype} records",
+	}
+
+
+def get_link_fields(doctype):
+	"""
+	Link fields pointing to a DocType (DocFields and Custom Fields)
+
+	DocTypes in the ignore_links_on_delete hook are skipped, as in
+	frappe.delete_doc.
+
+	Returns:
+		list: [{"parent", "fieldname", "issingle", "istable"}, ...]
+	"""
+	from frappe.model.rename_doc import get_link_fields as get_frappe_link_fields
+
+	ignored = set(frappe.get_hooks("ignore_links_on_delete") or [])
+	link_fields = []
+	for link in get_frappe_link_fields(doctype):
+		if link["parent"] in ignored:
+			continue
+		link = frappe._dict(link)
+		link.istable = 0 if link.issingle else frappe.get_meta(link.parent).istable
+		link_fields.append(link)
+	return link_fields
+
+
+def check_links(doctype, names, link_fields):
+	"""
+	Fail if any of names is linked from a record outside names
+
+	One query per link field for the whole level. Deeper levels are
+	already deleted, so children of names do not count as links.
+	"""
+	for link in link_fields:
+		if link.issingle:
+			linked = frappe.db.sql(
+				"""SELECT `value` FROM `tabSingles`
+				WHERE `doctype` = %s AND `field` = %s AND `value` IN %s LIMIT 1""",
+				(link.parent, link.fieldname, tuple(names)),
+			)
+			if linked:
+				raise_link_exists(doctype, linked[0][0], link.parent, link.parent)
+			continue
+
+		filters = {link.fieldname: ["in", names]}
+		if link.parent == doctype:
+			filters["name"] = ["not in", names]
+
+		linked = frappe.get_all(
+			link.parent,
+			filters=filters,
+			fields=["name", link.fieldname, *(["parent", "parenttype"] if link.istable else [])],
+			limit=1,
+		)
+		if linked:
+			row = linked[0]
+			if link.istable:
+				raise_link_exists(doctype, row.get(link.fieldname), row.parenttype, row.parent)
+			raise_link_exists(doctype, row.get(link.fieldname), link.parent, row.name)
+
+
+def raise_link_exists(doctype, name, linked_doctype, linked_name):
+	frappe.throw(
+		_("Cannot delete {0} {1} because it is linked with {2} {3}").format(
+			doctype, frappe.bold(name), linked_doctype, frappe.bold(linked_name)
+		),
+		frappe.LinkExistsError,
+		title=_("Linked Records Exist"),
+	)
+
+
+def delete_documents(doctype, names):
+	"""Delete documents and their child rows, one statement per table"""
+	for table_field in frappe.get_meta(doctype).get_table_fields():
+		frappe.db.delete(table_field.options, {"parent": ["in", names], "parenttype": doctype})
+	frappe.db.delete(doctype, {"name": ["in", names]})
+
+
+def get_parent_key(record, parent_fields):
+	"""Nearest parent of a fixture record (first parent field that is set)"""
+	for fieldname in parent_fields:
+		if record.get(fieldname):
+			return record[fieldname]
+	return None
+
+
+def insert_documents(doctype, docs):
+	"""Bulk insert named documents and their child rows (no per-row hooks)"""
+	if not docs:
+		return
+
+	timestamp = now()
+	user = frappe.session.user
+
+	rows = []
+	child_rows = {}
+	for doc in docs:
+		set_standard_fields(doc, timestamp, user)
+		rows.append(doc.get_valid_dict(convert_dates_to_str=True))
+
+		for child in doc.get_all_children():
+			set_standard_fields(child, timestamp, user)
+			child.name = child.name or frappe.generate_hash(length=10)
+			child.parent = doc.name
+			child.parenttype = doctype
+			child_rows.setdefault(child.doctype, []).append(child.get_valid_dict(convert_dates_to_str=True))
+
+	bulk_insert_rows(doctype, rows)
+	for child_doctype, rows in child_rows.items():
+		bulk_insert_rows(child_doctype, rows)
+
+
+def set_standard_fields(doc, timestamp, user):
+	"""Fill the fields Document.insert would set"""
+	doc.creation = doc.modified = timestamp
+	doc.owner = doc.modified_by = user
+	doc.docstatus = 0
+
+
+def bulk_insert_rows(doctype, rows):
+	"""One multi-row INSERT per chunk for dicts sharing the same columns"""
+	fields = list(rows[0])
+	frappe.db.bulk_insert(doctype, fields, [[row.get(field) for field in fields] for row in rows])
+
+
+def make_documents(doctype, records):
+	"""New documents with DocType defaults applied, not yet named"""
+	docs = []
+	for record in records:
+		doc = frappe.new_doc(doctype)
+		doc.update(record)
+		docs.append(doc)
+	return docs
+
+
+# ============================================================================
+# NAMING SERIES
+# ============================================================================
+
+def reserve_series_names(doctype, count):
+	"""
+	Reserve count consecutive names of a "format:PREFIX-{#####}" DocType
+
+	The series counter is advanced once for the whole batch instead of
+	once per document.
+
+	Returns:
+		list: Names in order (e.g. ["ITEM-00017", "ITEM-00018", ...])
+	"""
+	autoname = frappe.get_meta(doctype).autoname or ""
+	match = re.match(r"^format:(.*)\{(#+)\}$", autoname)
+	if not match:
+		frappe.throw(_("{0} is not named by a numbered format series").format(doctype))
+
+	prefix, digits = match.group(1), len(match.group(2))
+
+	frappe.db.sql(
+		"INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, 0) ON DUPLICATE KEY UPDATE `name` = `name`",
+		prefix,
+	)
+	current = cint(frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", prefix)[0][0])
+	frappe.db.sql("UPDATE `tabSeries` SET `current` = %s WHERE `name` = %s", (current + count, prefix))
+
+	return [f"{prefix}{number:0{digits}d}" for number in range(current + 1, current + count + 1)]
+
+
+# ============================================================================
+# STORE UOM
+# ============================================================================
+
+def validate_uoms(records, context):
+	"""Check conversion settings of the whole dataset against existing UOMs"""
+	from technical_store_system.utils.helpers.uom_conversion import build_conversion_closure
+
+	for record in records:
+		record.name = record.uom_name
+		if record.get("has_conversion"):
+			if not record.get("base_uom"):
+				frappe.throw(_("Select a Base UOM for {0}").format(record.uom_name))
+			if flt(record.get("conversion_factor")) <= 0:
+				frappe.throw(_("Conversion Factor of {0} must be greater than zero").format(record.uom_name))
+
+	uoms = frappe.get_all(
+		"Store UOM",
+		fields=["name", "has_conversion", "base_uom", "conversion_factor", "must_be_whole_number"],
+	)
+	uoms.extend(records)
+
+	errors = build_conversion_closure(uoms)["errors"]
+	if errors:
+		frappe.throw("<br>".join(errors), title=_("Invalid UOM Conversions"))
+
+
+def prepare_uoms(records, context):
+	"""UOM documents named by uom_name"""
+	docs = make_documents("Store UOM", records)
+	for doc in docs:
+		doc.name = doc.uom_name
+	return docs
+
+
+def after_uom_batch(docs, context):
+	"""Rebuild the conversion closure once for the batch (after commit)"""
+	from technical_store_system.utils.helpers.uom_conversion import refresh_conversion_closure
+	frappe.db.after_commit.add(refresh_conversion_closure)
+
+
+# ============================================================================
+# STORE ITEM GROUP
+# ============================================================================
+
+GROUP_INHERITED_FIELDS = [
+	"default_uom", "default_warehouse", "has_serial_no", "has_batch_no",
+	"allow_negative_stock", "auto_create_bins",
+]
+
+
+def prepare_item_groups(records, context):
+	"""Group codes, parent inheritance and statistics, computed in memory"""
+	if context.group_codes is None:
+		context.group_codes = set(frappe.get_all(
+			"Store Item Group", filters={"group_code": ["is", "set"]}, pluck="group_code"
+		))
+		context.groups = {}
+
+	load_missing_rows(
+		"Store Item Group",
+		{record.parent_item_group for record in records if record.get("parent_item_group")},
+		["name", "is_group", *GROUP_INHERITED_FIELDS],
+		context.groups,
+	)
+
+	timestamp = now()
+	docs = make_documents("Store Item Group", records)
+	for doc in docs:
+		doc.name = doc.item_group_name
+
+		if doc.parent_item_group:
+			parent = context.groups.get(doc.parent_item_group)
+			if not parent:
+				frappe.throw(_("Parent Item Group {0} does not exist").format(frappe.bold(doc.parent_item_group)))
+			if not parent.is_group:
+				frappe.throw(
+					_("Parent '{0}' must be marked as 'Is Group' to contain sub-groups").format(doc.parent_item_group)
+				)
+			for fieldname in GROUP_INHERITED_FIELDS:
+				if not doc.get(fieldname) and parent.get(fieldname):
+					doc.set(fieldname, parent.get(fieldname))
+
+		if not doc.group_code:
+			code_base = get_group_code_base(doc.item_group_name)
+			code, counter = code_base, 1
+			while code in context.group_codes:
+				code = f"{code_base}{counter}"
+				counter += 1
+			doc.group_code = code
+		context.group_codes.add(doc.group_code)
+
+		doc.created_date = doc.modified_date = doc.last_updated = timestamp
+		doc.item_count = doc.child_group_count = doc.total_item_count = 0
+		# NestedSet compares old_parent to detect moves on the next save
+		doc.old_parent = doc.parent_item_group
+
+		context.groups[doc.name] = frappe._dict(
+			{fieldname: doc.get(fieldname) for fieldname in ["name", "is_group", *GROUP_INHERITED_FIELDS]}
+		)
+
+	return docs
+
+
+def rebuild_item_group_tree(context=None):
+	"""
+	Renumber lft/rgt of the whole Store Item Group tree (once per load)
+
+	The bulk insert bypasses NestedSet, which keeps lft/rgt current on
+	doc.insert(). The tree is read once, numbered in memory and only rows
+	whose bounds changed are written.
+	"""
+	rows = frappe.get_all(
+		"Store Item Group", fields=["name", "parent_item_group", "lft", "rgt"], order_by="name asc"
+	)
+	bounds = get_nested_set_bounds(rows, "parent_item_group")
+
+	updates = {
+		row.name: {"lft": bounds[row.name][0], "rgt": bounds[row.name][1]}
+		for row in rows
+		if row.name in bounds and (cint(row.lft), cint(row.rgt)) != bounds[row.name]
+	}
+	if updates:
+		frappe.db.bulk_update("Store Item Group", updates, chunk_size=FIXTURE_BATCH_SIZE, update_modified=False)
+
+
+def get_nested_set_bounds(rows, parent_field):
+	"""
+	lft/rgt of every node of a tree, siblings in the order of rows
+
+	Rows whose parent is not in rows are roots. Rows in a parent cycle are
+	not reachable from a root and get no bounds.
+
+	Returns:
+		dict: {name: (lft, rgt)}
+	"""
+	names = {row.name for row in rows}
+	children = {}
+	for row in rows:
+		parent = row.get(parent_field)
+		children.setdefault(parent if parent in names and parent != row.name else None, []).append(row.name)
+
+	bounds = {}
+	lft = {}
+	position = 0
+	stack = [(name, False) for name in reversed(children.get(None, []))]
+	while stack:
+		name, closed = stack.pop()
+		position += 1
+		if closed:
+			bounds[name] = (lft.pop(name), position)
+			continue
+		lft[name] = position
+		stack.append((name, True))
+		stack.extend((child, False) for child in reversed(children.get(name, [])))
+
+	return bounds
+
+
+def after_item_group_remove(rows, context):
+	"""Refresh child_group_count of surviving parents with one statement"""
+	removed = {row.name for row in rows}
+	parents = tuple({row.parent_item_group for row in rows if row.parent_item_group} - removed)
+	if not parents:
+		return
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabStore Item Group` g
+		SET g.`child_group_count` = (
+			SELECT COUNT(*) FROM `tabStore Item Group` c WHERE c.`parent_item_group` = g.`name`
+		), g.`last_updated` = %(timestamp)s
+		WHERE g.`name` IN %(parents)s
+		""",
+		{"parents": parents, "timestamp": now()},
+	)
+
+
+def after_item_group_batch(docs, context):
+	"""Refresh child_group_count of the batch's parents with one statement"""
+	parents = tuple({doc.parent_item_group for doc in docs if doc.parent_item_group})
+	if not parents:
+		return
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabStore Item Group` g
+		JOIN (
+			SELECT `parent_item_group` AS `name`, COUNT(*) AS `children`
+			FROM `tabStore Item Group`
+			WHERE `parent_item_group` IN %(parents)s
+			GROUP BY `parent_item_group`
+		) c ON c.`name` = g.`name`
+		SET g.`child_group_count` = c.`children`, g.`last_updated` = %(timestamp)s
+		""",
+		{"parents": parents, "timestamp": now()},
+	)
+
+
+# ============================================================================
+# STORE LOCATION
+# ============================================================================
+
+# location_type: (parent field, level name field)
+LOCATION_LEVELS = {
+	"Warehouse": (None, "warehouse_name"),
+	"Zone": ("store", "zone_name"),
+	"Rack": ("zone", "rack_name"),
+	"Shelf": ("rack", "shelf_name"),
+	"Bin": ("shelf", "bin"),
+}
+
+# Ancestor fields of each level, outermost first
+LOCATION_ANCESTORS = ["store", "zone", "rack", "shelf"]
+
+LOCATION_NAME_FIELDS = ["warehouse_name", "zone_name", "rack_name", "shelf_name", "bin"]
+
+
+def prepare_locations(records, context):
+	"""
+	Codes, level names and display names of one hierarchy level, in memory
+
+	Same rules as store_location_controller, but parents are read once per
+	batch and auto-increment numbering continues from one lookup per parent.
+	A location_code given in the fixture is kept and its level name derived
+	from it.
+	"""
+	if context.settings is None:
+		context.settings = frappe.get_single("Store Settings")
+		context.locations = {}
+		context.used_names = {}
+
+	settings = context.settings
+	load_missing_rows(
+		"Store Location",
+		{record.get(field) for record in records for field in LOCATION_ANCESTORS if record.get(field)},
+		["name", "location_type", *LOCATION_NAME_FIELDS],
+		context.locations,
+	)
+
+	docs = make_documents("Store Location", records)
+	for doc in docs:
+		parent_field, name_field = LOCATION_LEVELS.get(doc.location_type, (None, "warehouse_name"))
+		parent = doc.get(parent_field) if parent_field else None
+
+		if parent_field and settings.get("enable_hierarchy_validation"):
+			validate_location_parent(doc, parent_field, context.locations)
+
+		if not doc.get(name_field):
+			if doc.location_code:
+				prefix = f"{parent}-" if parent else ""
+				doc.set(name_field, doc.location_code[len(prefix):] if doc.location_code.startswith(prefix) else doc.location_code)
+			elif doc.location_type in LOCATION_LEVELS:
+				doc.set(name_field, next_location_name(parent, doc.location_type, name_field, context))
+			else:
+				doc.set(name_field, doc.location_type.upper())
+
+		if not doc.location_code:
+			doc.location_code = f"{parent}-{doc.get(name_field)}" if parent else doc.get(name_field)
+
+		doc.name = doc.location_code
+		doc.location_name = build_location_name(doc, name_field, context.locations)
+
+		context.locations[doc.name] = frappe._dict(
+			{"name": doc.name, "location_type": doc.location_type, **{field: doc.get(field) for field in LOCATION_NAME_FIELDS}}
+		)
+		context.used_names.setdefault((parent, doc.location_type), []).append(doc.get(name_field))
+
+	return docs
+
+
+def validate_location_parent(doc, parent_field, locations):
+	"""Parent must exist and be one level up (see validate_hierarchy)"""
+	expected = {"store": "Warehouse", "zone": "Zone", "rack": "Rack", "shelf": "Shelf"}[parent_field]
+	parent = locations.get(doc.get(parent_field))
+
+	if not doc.get(parent_field):
+		frappe.throw(_("{0} {1} needs a {2} parent").format(doc.location_type, doc.location_code or "", expected))
+	if not parent:
+		frappe.throw(_("Parent location '{0}' does not exist").format(doc.get(parent_field)))
+	if parent.location_type != expected:
+		frappe.throw(
+			f"{doc.location_type} must have a {expected} parent. '{parent.name}' is a {parent.location_type}"
+		)
+
+
+def next_location_name(parent, location_type, name_field, context):
+	"""Auto-increment level name; existing names under the parent are read once"""
+	used = context.used_names.get((parent, location_type))
+	if used is None:
+		filters = {"location_type": location_type}
+		if parent:
+			filters[LOCATION_LEVELS[location_type][0]] = parent
+		used = context.used_names[(parent, location_type)] = frappe.get_all(
+			"Store Location", filters=filters, pluck=name_field
+		)
+
+	return get_next_location_name(parent, location_type, settings=context.settings, existing=used)
+
+
+def build_location_name(doc, name_field, locations):
+	"""Display name from ancestor level names (see generate_location_name)"""
+	parts = []
+	for ancestor_field in get_location_ancestor_fields(doc.location_type):
+		ancestor = locations.get(doc.get(ancestor_field))
+		ancestor_name_field = LOCATION_NAME_FIELDS[LOCATION_ANCESTORS.index(ancestor_field)]
+		if ancestor and ancestor.get(ancestor_name_field):
+			parts.append(ancestor.get(ancestor_name_field))
+
+	if doc.get(name_field):
+		parts.append(doc.get(name_field))
+
+	return " - ".join(parts) if parts else (doc.location_code or "New Location")
+
+
+def get_location_ancestor_fields(location_type):
+	"""Ancestor fields that make up the display name of a level, outermost first"""
+	parent_field = LOCATION_LEVELS.get(location_type, (None,))[0]
+	if not parent_field:
+		return []
+	return LOCATION_ANCESTORS[:LOCATION_ANCESTORS.index(parent_field) + 1]
+
+
+def after_location_batch(docs, context):
+	"""Store Settings statistics once per batch instead of once per location"""
+	update_system_stats(None, pending=0)
+
+
+def after_location_remove(rows, context):
+	"""Store Settings statistics once after a removal"""
+	update_system_stats(None, pending=0)
+
+
+# ============================================================================
+# STORE ITEM
+# ============================================================================
+
+def prepare_items(records, context):
+	"""Series names for the batch in one reservation"""
+	docs = make_documents("Store Item", records)
+	for doc, name in zip(docs, reserve_series_names("Store Item", len(docs))):
+		doc.name = name
+		doc.item_code = doc.item_code or name
+	return docs
+
+
+def after_item_batch(docs, context):
+	"""
+	Post the opening stock of the whole batch as one ledger posting
+
+	Items whose opening stock cannot be posted (see get_opening_stock_entries)
+	are still loaded; one message lists them.
+	"""
+	entries, warnings = [], []
+	for doc in docs:
+		doc_entries, warning = get_opening_stock_entries(doc)
+		if warning:
+			warnings.append(warning)
+		entries.extend(
+			{**entry, "voucher_type": OPENING_VOUCHER_TYPE, "voucher_no": doc.name} for entry in doc_entries
+		)
+
+	if entries:
+		from technical_store_system.utils.helpers.stock_ledger import make_stock_ledger_entries
+		make_stock_ledger_entries(entries)
+
+	if warnings:
+		frappe.msgprint("<br>".join(warnings), title=_("Opening Stock Not Posted"), indicator="orange")
+
+
+# ============================================================================
+# SHARED
+# ============================================================================
+
+def load_missing_rows(doctype, names, fields, rows):
+	"""Add rows for names not yet in the rows cache (one IN query)"""
+	missing = [name for name in names if name not in rows]
+	if not missing:
+		return
+
+	for row in frappe.get_all(doctype, filters={"name": ["in", missing]}, fields=fields):
+		rows[row.name] = row
+
+
+# doctype: key field, parent fields (nearest first), per-batch, per-load and after-removal callbacks,
+# derived DocTypes ({doctype: link field}) whose rows are deleted with their record
+FIXTURE_SPECS = {
+	"Store UOM": {
+		"key_field": "uom_name",
+		"parent_fields": ["base_uom"],
+		"validate": validate_uoms,
+		"prepare": prepare_uoms,
+		"after_batch": after_uom_batch,
+		"after_remove": after_uom_batch,
+	},
+	"Store Item Group": {
+		"key_field": "item_group_name",
+		"parent_fields": ["parent_item_group"],
+		"prepare": prepare_item_groups,
+		"after_batch": after_item_group_batch,
+		"after_load": rebuild_item_group_tree,
+		"after_remove": after_item_group_remove,
+	},
+	"Store Location": {
+		"key_field": "location_code",
+		"parent_fields": ["shelf", "rack", "zone", "store", "parent_location"],
+		"prepare": prepare_locations,
+		"after_batch": after_location_batch,
+		"after_remove": after_location_remove,
+		# Subtree totals; a removable location has no stock left below it
+		"derived_doctypes": {"Store Location Stock Rollup": "location"},
+	},
+	"Store Item": {
+		"key_field": "item_name",
+		"parent_fields": [],
+		"prepare": prepare_items,
+		"after_batch": after_item_batch,
+	},
+}
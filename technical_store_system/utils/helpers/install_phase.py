@@ -0,0 +1,204 @@
+"""
+Install Phase Helper
+Transaction handling for the installer
+
+The installer runs in phases (roles, DocTypes, settings, client scripts,
+workspace, ...). Each phase is one transaction that is committed once at
+its end, instead of one commit (and fsync) per created object. Inside a
+phase every object gets a savepoint, so a failing object is rolled back on
+its own and reported while the rest of the phase still goes through.
+
+Every phase is profiled: wall time, number of queries and rows written.
+The report is printed as a table and stored as a Store Install Log.
+
+Note: MariaDB commits implicitly around DDL (CREATE/ALTER/DROP TABLE), so
+phases that create or drop DocType tables cannot be undone as a whole -
+their savepoints only cover the work done since the last DDL statement.
+
+Usage:
+	timings = []
+	started_at = now_datetime()
+	run_phase("Roles", create_default_roles, timings)
+	print_phase_timings(timings)
+	save_install_log("Install", started_at, timings)
+
+	# Per object, inside a helper
+	frappe.db.savepoint(savepoint)
+	try:
+		...
+	except Exception:
+		rollback_to_savepoint(savepoint)
+"""
+
+import time
+
+import frappe
+
+
+INSTALL_LOG_DOCTYPE = "Store Install Log"
+
+WRITE_STATEMENTS = ("insert", "update", "delete", "replace")
+
+
+def rollback_to_savepoint(savepoint):
+	"""
+	Undo everything since a savepoint, keeping the rest of the transaction
+
+	If a DDL statement committed implicitly after the savepoint was set, the
+	savepoint no longer exists and there is nothing left to roll back.
+
+	Args:
+		savepoint: Name passed to frappe.db.savepoint
+	"""
+	try:
+		frappe.db.rollback(save_point=savepoint)
+	except Exception:
+		pass
+
+
+def run_phase(label, func, timings):
+	"""
+	Run one installer phase in a single transaction and profile it
+
+	The phase is committed once when func returns. If func raises, the
+	uncommitted part of the phase is rolled back and the error re-raised.
+
+	Args:
+		label: Phase name shown in the report
+		func: Callable doing the work of the phase
+		timings: List the {"phase", "seconds", "queries", "rows_written",
+			"status"} result is appended to
+	"""
+	start = time.perf_counter()
+	status = "failed"
+	counter = QueryCounter()
+
+	try:
+		with counter:
+			func()
+		frappe.db.commit()
+		status = "ok"
+	except Exception:
+		frappe.db.rollback()
+		raise
+	finally:
+		timings.append({
+			"phase": label,
+			"seconds": time.perf_counter() - start,
+			"queries": counter.queries,
+			"rows_written": counter.rows_written,
+			"status": status,
+		})
+
+
+class QueryCounter:
+	"""
+	Count the queries and rows read / written going through frappe.db.sql
+
+	frappe.db.sql is wrapped on the connection object for the duration of
+	the with block; every ORM call, bulk insert and raw query of the phase
+	passes through it. Rows written are the affected row counts reported
+	by the driver for INSERT / UPDATE / DELETE / REPLACE statements, rows
+	read the number of rows returned by all other statements.
+	"""
+
+	def __init__(self):
+		self.queries = 0
+		self.rows_read = 0
+		self.rows_written = 0
+		self.db = None
+		self.previous = None
+
+	def __enter__(self):
+		self.db = frappe.db
+		self.previous = self.db.__dict__.get("sql")
+		sql = self.db.sql
+
+		def counted_sql(query, *args, **kwargs):
+			result = sql(query, *args, **kwargs)
+			self.queries += 1
+			if str(query).lstrip()[:7].lower().startswith(WRITE_STATEMENTS):
+				self.rows_written += max(getattr(self.db._cursor, "rowcount", 0) or 0, 0)
+			elif isinstance(result, (list, tuple)):
+				self.rows_read += len(result)
+			return result
+
+		self.db.sql = counted_sql
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if self.previous is None:
+			del self.db.sql
+		else:
+			self.db.sql = self.previous
+		return False
+
+
+def print_phase_timings(timings):
+	"""Print the per-phase report collected by run_phase"""
+	if not timings:
+		return
+
+	width = max(len("Total"), *(len(timing["phase"]) for timing in timings))
+
+	print("\n  ⏱  Phase report:")
+	print(f"      {'Phase'.ljust(width)}  {'Seconds':>9}  {'Queries':>8}  {'Rows':>8}")
+	for timing in timings:
+		marker = "✓" if timing["status"] == "ok" else "✗"
+		print(
+			f"    {marker} {timing['phase'].ljust(width)}  {timing['seconds']:9.2f}"
+			f"  {timing['queries']:8d}  {timing['rows_written']:8d}"
+		)
+	print(
+		f"      {'Total'.ljust(width)}  {sum(timing['seconds'] for timing in timings):9.2f}"
+		f"  {sum(timing['queries'] for timing in timings):8d}"
+		f"  {sum(timing['rows_written'] for timing in timings):8d}"
+	)
+
+
+def save_install_log(operation, started_at, timings, status="Success"):
+	"""
+	Store the phase report as a Store Install Log
+
+	Skipped when the log DocType does not exist (yet), e.g. when the
+	DocTypes phase of a fresh install failed.
+
+	Args:
+		operation: "Install" or "Migrate"
+		started_at: Datetime the run started
+		timings: Phase results collected by run_phase
+		status: "Success" or "Failed"
+
+	Returns:
+		str: Name of the log, or None if it was not saved
+	"""
+	if not timings or not frappe.db.table_exists(INSTALL_LOG_DOCTYPE):
+		return None
+
+	try:
+		log = frappe.get_doc({
+			"doctype": INSTALL_LOG_DOCTYPE,
+			"operation": operation,
+			"status": status,
+			"started_at": started_at,
+			"total_seconds": sum(timing["seconds"] for timing in timings),
+			"total_queries": sum(timing["queries"] for timing in timings),
+			"total_rows_written": sum(timing["rows_written"] for timing in timings),
+			"steps": [
+				{
+					"step": timing["phase"],
+					"status": timing["status"],
+					"seconds": timing["seconds"],
+					"queries": timing["queries"],
+					"rows_written": timing["rows_written"],
+				}
+				for timing in timings
+			],
+		})
+		log.insert(ignore_permissions=True)
+		frappe.db.commit()
+		return log.name
+
+	except Exception:
+		frappe.log_error(frappe.get_traceback(), "Install Log Save Failed")
+		return None
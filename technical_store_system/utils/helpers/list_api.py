@@ -0,0 +1,258 @@
+"""
+List API Helper
+Keyset-paginated, projected list endpoints for integrations
+
+Paging with limit_start makes MariaDB read and discard every row before
+the offset, so page 1,000 of a 100k item export costs as much as reading
+the whole table. These endpoints page by cursor instead:
+
+1. Rows are ordered by name (the primary key) and a page continues after
+   the last name of the previous one (WHERE name > cursor) - every page is
+   an index range read, however deep
+2. fields is an explicit projection, checked against the DocType's columns
+   (name is always included, it is the cursor)
+3. filters are validated and passed to frappe.get_list, so they run in SQL
+   together with the user's permissions
+4. export_* streams all matching rows as NDJSON (one JSON object per line),
+   fetching one page at a time, so memory stays at one page
+
+Usage:
+	GET /api/method/technical_store_system.utils.helpers.list_api.get_items
+		?fields=["item_code","item_name","item_group"]
+		&filters={"item_group":"Electronics","enabled":1}
+		&page_length=500
+	# {"data": [...], "next_cursor": "eyJuYW1lIjogIklURU0tMDA1MDAifQ"}
+
+	# Next page: same fields and filters, plus the cursor
+		&cursor=eyJuYW1lIjogIklURU0tMDA1MDAifQ
+
+	GET /api/method/technical_store_system.utils.helpers.list_api.export_locations
+		?filters={"store":"WH-1"}
+	# {"name": "WH-1", ...}\n{"name": "WH-1-Z-A", ...}\n...
+"""
+
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+
+DEFAULT_PAGE_LENGTH = 500
+MAX_PAGE_LENGTH = 5000
+
+# Projection when the caller does not pass fields
+LIST_DOCTYPES = {
+	"Store Item": ["name", "item_code", "item_name", "item_group", "default_uom", "enabled", "modified"],
+	"Store Location": ["name", "location_name", "location_type", "store", "enabled", "modified"],
+}
+
+FILTER_OPERATORS = {
+	"=", "!=", ">", "<", ">=", "<=", "in", "not in", "like", "not like", "is", "between",
+}
+
+
+# ============================================================================
+# PAGES
+# ============================================================================
+
+def get_page(doctype, fields=None, filters=None, cursor=None, page_length=None):
+	"""
+	One page of rows after a cursor
+
+	Args:
+		doctype: One of LIST_DOCTYPES
+		fields: Column names (JSON list or list; defaults to LIST_DOCTYPES)
+		filters: Dict or list filters on the DocType's own columns (JSON or object)
+		cursor: next_cursor of the previous page (None for the first page)
+		page_length: Rows per page (default DEFAULT_PAGE_LENGTH, max MAX_PAGE_LENGTH)
+
+	Returns:
+		dict: {"data": [row, ...], "next_cursor": str or None}
+	"""
+	fields = get_projection(doctype, fields)
+	filters = get_filters(doctype, filters)
+	page_length = min(cint(page_length) or DEFAULT_PAGE_LENGTH, MAX_PAGE_LENGTH)
+
+	after = decode_cursor(cursor)
+	if after is not None:
+		filters.append([doctype, "name", ">", after])
+
+	# One row more than the page tells whether another page follows
+	rows = frappe.get_list(
+		doctype,
+		fields=fields,
+		filters=filters,
+		order_by=f"`tab{doctype}`.`name` asc",
+		limit_page_length=page_length + 1,
+	)
+
+	next_cursor = None
+	if len(rows) > page_length:
+		rows = rows[:page_length]
+		next_cursor = encode_cursor(rows[-1].name)
+
+	return {"data": rows, "next_cursor": next_cursor}
+
+
+def iter_pages(doctype, fields=None, filters=None, page_length=None):
+	"""
+	All matching rows, one page at a time
+
+	Yields:
+		list: Rows of one page
+	"""
+	cursor = None
+	while True:
+		page = get_page(doctype, fields, filters, cursor, page_length)
+		if page["data"]:
+			yield page["data"]
+		cursor = page["next_cursor"]
+		if not cursor:
+			return
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def get_projection(doctype, fields=None):
+	"""
+	Validated column list, name first
+
+	Raises:
+		frappe.ValidationError: For DocTypes not in LIST_DOCTYPES and unknown columns
+	"""
+	if doctype not in LIST_DOCTYPES:
+		frappe.throw(_("No list API for {0}").format(doctype))
+
+	fields = frappe.parse_json(fields) if fields else LIST_DOCTYPES[doctype]
+	if isinstance(fields, str):
+		fields = [field.strip() for field in fields.split(",")]
+
+	columns = set(frappe.get_meta(doctype).get_valid_columns())
+	unknown = [field for field in fields if field not in columns]
+	if unknown:
+		frappe.throw(_("Unknown {0} fields: {1}").format(doctype, ", ".join(map(str, unknown))))
+
+	return list(dict.fromkeys(["name", *fields]))
+
+
+def get_filters(doctype, filters=None):
+	"""
+	Validated filters as a list of [doctype, field, operator, value]
+
+	Only the DocType's own columns can be filtered (no child table joins).
+	"""
+	filters = frappe.parse_json(filters) if filters else []
+	if isinstance(filters, dict):
+		filters = [
+			[field, *value] if isinstance(value, (list, tuple)) else [field, "=", value]
+			for field, value in filters.items()
+		]
+
+	columns = set(frappe.get_meta(doctype).get_valid_columns())
+	normalized = []
+	for condition in filters:
+		if not isinstance(condition, (list, tuple)) or len(condition) not in (3, 4):
+			frappe.throw(_("Invalid filter {0}").format(condition))
+		if len(condition) == 4:
+			if condition[0] != doctype:
+				frappe.throw(_("Filters on {0} are not supported").format(condition[0]))
+			condition = condition[1:]
+
+		field, operator, value = condition
+		if field not in columns:
+			frappe.throw(_("Unknown {0} field in filters: {1}").format(doctype, field))
+		if str(operator).lower() not in FILTER_OPERATORS:
+			frappe.throw(_("Unsupported filter operator {0}").format(operator))
+		normalized.append([doctype, field, operator, value])
+
+	return normalized
+
+
+def encode_cursor(name):
+	"""Opaque cursor for the row after name"""
+	return base64.urlsafe_b64encode(json.dumps({"name": name}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+	"""Name a cursor continues after (None for no cursor)"""
+	if not cursor:
+		return None
+	try:
+		padded = cursor + "=" * (-len(cursor) % 4)
+		return json.loads(base64.urlsafe_b64decode(padded.encode()))["name"]
+	except Exception:
+		frappe.throw(_("Invalid cursor"))
+
+
+# ============================================================================
+# NDJSON EXPORT
+# ============================================================================
+
+def export_ndjson(doctype, fields=None, filters=None, page_length=None):
+	"""
+	Streaming NDJSON response of all matching rows
+
+	Fields and filters are validated before the response starts, so mistakes
+	come back as a normal error. The body is generated while it is sent:
+	by then the request's database connection is closed, so the generator
+	connects again as the same user and reads one page at a time.
+
+	Returns:
+		werkzeug.wrappers.Response
+	"""
+	from werkzeug.wrappers import Response
+
+	frappe.has_permission(doctype, "read", throw=True)
+	fields = get_projection(doctype, fields)
+	filters = get_filters(doctype, filters)
+
+	site, sites_path, user = frappe.local.site, frappe.local.sites_path, frappe.session.user
+
+	def generate():
+		own_connection = not getattr(frappe.local, "db", None)
+		if own_connection:
+			frappe.init(site=site, sites_path=sites_path)
+			frappe.connect()
+			frappe.set_user(user)
+		try:
+			for rows in iter_pages(doctype, fields, filters, page_length):
+				yield "".join(json.dumps(row, default=str, separators=(",", ":")) + "\n" for row in rows)
+		finally:
+			if own_connection:
+				frappe.destroy()
+
+	response = Response(generate(), mimetype="application/x-ndjson", direct_passthrough=True)
+	response.headers["Content-Disposition"] = f'attachment; filename="{frappe.scrub(doctype)}.ndjson"'
+	return response
+
+
+# ============================================================================
+# WHITELISTED ENDPOINTS
+# ============================================================================
+
+@frappe.whitelist()
+def get_items(fields=None, filters=None, cursor=None, page_length=None):
+	"""Page of Store Items (see get_page)"""
+	return get_page("Store Item", fields, filters, cursor, page_length)
+
+
+@frappe.whitelist()
+def get_locations(fields=None, filters=None, cursor=None, page_length=None):
+	"""Page of Store Locations (see get_page)"""
+	return get_page("Store Location", fields, filters, cursor, page_length)
+
+
+@frappe.whitelist()
+def export_items(fields=None, filters=None):
+	"""All matching Store Items as NDJSON"""
+	return export_ndjson("Store Item", fields, filters)
+
+
+@frappe.whitelist()
+def export_locations(fields=None, filters=None):
+	"""All matching Store Locations as NDJSON"""
+	return export_ndjson("Store Location", fields, filters)
@@ -0,0 +1,269 @@
+"""
+Maintenance Jobs Helper
+Background execution of heavy maintenance operations
+
+Demo data install / removal and the item group statistics rebuild used to
+run inside the web request (or a bench execute) and hit request timeouts
+on larger sites. They now run on the "long" queue:
+
+1. enqueue_maintenance_job() creates a Store Maintenance Job (Queued) and
+   enqueues the runner once the request commits
+2. Only one maintenance job is queued or running at a time: callers take
+   the same row lock before checking for an active job (held until their
+   transaction ends), and the RQ job id is shared (deduplicate=True)
+3. The operation reports progress per chunk through job.progress(), which
+   commits the chunk, stores the percentage and pushes it to the user over
+   publish_realtime ("store_maintenance_progress")
+4. cancel_maintenance_job() cancels a queued job at once, and a running one
+   at its next progress() call
+
+Operations take an optional job argument, so they can still be called
+directly (job=None) from the console or tests.
+
+Usage:
+	name = enqueue_maintenance_job("Install Demo Data", doctypes=["Store UOM"])
+
+	# Inside an operation
+	def install_selected_demo_data(doctypes, job=None):
+		for index, doctype in enumerate(doctypes, start=1):
+			...
+			if job:
+				job.progress(index, len(doctypes), f"Installed {doctype}")
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, get_datetime, now, now_datetime
+
+JOB_DOCTYPE = "Store Maintenance Job"
+JOB_ID = "technical_store_system:maintenance"
+JOB_TIMEOUT = 4 * 3600
+PROGRESS_EVENT = "store_maintenance_progress"
+
+ACTIVE_STATUSES = ["Queued", "Running"]
+
+# Queued jobs younger than this are not considered lost yet (enqueued after commit)
+ENQUEUE_GRACE_SECONDS = 60
+
+JOB_TYPES = {
+	"Install Demo Data":
+		"technical_store_system.utils.controllers.store_settings_controller.install_selected_demo_data",
+	"Remove Demo Data":
+		"technical_store_system.utils.controllers.store_settings_controller.remove_demo_data",
+	"Recalculate Item Group Statistics":
+		"technical_store_system.utils.controllers.item_group_controller.recalculate_all_statistics",
+}
+
+
+class JobCancelled(Exception):
+	"""Raised by MaintenanceJob.progress when the job was cancelled"""
+
+
+# ============================================================================
+# QUEUEING
+# ============================================================================
+
+def enqueue_maintenance_job(job_type, **kwargs):
+	"""
+	Queue a maintenance operation (single flight)
+
+	Args:
+		job_type: Key of JOB_TYPES
+		**kwargs: Arguments for the operation (JSON serialisable)
+
+	Returns:
+		str: Name of the Store Maintenance Job
+
+	Raises:
+		frappe.ValidationError: If another maintenance job is queued or running
+	"""
+	if job_type not in JOB_TYPES:
+		frappe.throw(_("Unknown maintenance job {0}").format(job_type))
+
+	lock_maintenance_queue()
+	active = frappe.db.get_value(
+		JOB_DOCTYPE,
+		{"status": ["in", ACTIVE_STATUSES]},
+		["name", "job_type", "status", "creation"],
+		as_dict=True,
+		for_update=True,
+	)
+
+	if active and is_lost(active):
+		frappe.db.set_value(
+			JOB_DOCTYPE, active.name,
+			{"status": "Failed", "error_log": "The background worker stopped before the job finished", "completed_at": now()},
+			update_modified=False,
+		)
+	elif active:
+		frappe.throw(
+			_("{0} ({1}) is {2}. Wait for it to finish or cancel it first.").format(
+				active.job_type, active.name, active.status.lower()
+			),
+			title=_("Maintenance Job Running"),
+		)
+
+	doc = frappe.get_doc({
+		"doctype": JOB_DOCTYPE,
+		"job_type": job_type,
+		"status": "Queued",
+		"job_kwargs": frappe.as_json(kwargs),
+	})
+	doc.insert(ignore_permissions=True)
+
+	frappe.enqueue(
+		"technical_store_system.utils.helpers.maintenance_jobs.run_maintenance_job",
+		queue="long",
+		timeout=JOB_TIMEOUT,
+		job_id=JOB_ID,
+		deduplicate=True,
+		enqueue_after_commit=True,
+		maintenance_job=doc.name,
+	)
+	return doc.name
+
+
+def lock_maintenance_queue():
+	"""
+	Serialize callers of enqueue_maintenance_job until their transaction ends
+
+	While no job is active, a locking read of the active jobs matches no row
+	and locks nothing, so two callers could both insert a job. Every caller
+	locks the same existing row first instead: the DocType record of
+	Store Maintenance Job. The second caller waits for the first to commit,
+	then sees its job.
+	"""
+	frappe.db.sql("SELECT `name` FROM `tabDocType` WHERE `name` = %s FOR UPDATE", JOB_DOCTYPE)
+
+
+def is_lost(active):
+	"""True if an active job record has no RQ job behind it anymore (worker died)"""
+	from frappe.utils.background_jobs import is_job_enqueued
+
+	if is_job_enqueued(JOB_ID):
+		return False
+	if active.status == "Queued":
+		return get_datetime(active.creation) < add_to_date(now_datetime(), seconds=-ENQUEUE_GRACE_SECONDS)
+	return True
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def run_maintenance_job(maintenance_job):
+	"""Background job: run one Store Maintenance Job and record its outcome"""
+	job = MaintenanceJob(maintenance_job)
+	if job.doc.status != "Queued":
+		# Cancelled before a worker picked it up
+		return
+
+	job.update(status="Running", started_at=now())
+
+	try:
+		operation = frappe.get_attr(JOB_TYPES[job.doc.job_type])
+		result = operation(job=job, **frappe.parse_json(job.doc.job_kwargs or "{}"))
+		job.finish("Completed", (result or {}).get("message"))
+
+	except JobCancelled:
+		frappe.db.rollback()
+		job.finish("Cancelled", _("Cancelled at {0}% - completed chunks were kept").format(job.doc.progress or 0))
+
+	except Exception:
+		frappe.db.rollback()
+		job.finish("Failed", error_log=frappe.get_traceback())
+		frappe.log_error(frappe.get_traceback(), f"Maintenance Job Failed: {maintenance_job}")
+
+
+class MaintenanceJob:
+	"""Handle passed to operations for progress reporting and cancellation"""
+
+	def __init__(self, name):
+		self.doc = frappe.get_doc(JOB_DOCTYPE, name)
+
+	def progress(self, done, total, message=None):
+		"""
+		Commit the finished chunk and report progress
+
+		Raises:
+			JobCancelled: If cancellation was requested (the chunk stays committed)
+		"""
+		frappe.db.commit()
+
+		if frappe.db.get_value(JOB_DOCTYPE, self.doc.name, "cancel_requested"):
+			raise JobCancelled
+
+		self.update(progress=round(100.0 * done / total, 1) if total else 100, progress_message=message)
+
+	def update(self, **values):
+		"""Store values on the job record, commit and publish them"""
+		self.doc.db_set(values, update_modified=False)
+		frappe.db.commit()
+		self.publish()
+
+	def finish(self, status, result_message=None, error_log=None):
+		"""Final status of the job"""
+		values = {"status": status, "completed_at": now(), "result_message": result_message, "error_log": error_log}
+		if status == "Completed":
+			values.update(progress=100)
+		self.update(**values)
+
+	def publish(self):
+		"""Push the job state to the user who queued it"""
+		frappe.publish_realtime(
+			PROGRESS_EVENT,
+			{
+				"name": self.doc.name,
+				"job_type": self.doc.job_type,
+				"status": self.doc.status,
+				"progress": self.doc.progress,
+				"message": self.doc.progress_message,
+				"result": self.doc.result_message,
+			},
+			user=self.doc.owner,
+		)
+
+
+# ============================================================================
+# WHITELISTED ACTIONS
+# ============================================================================
+
+@frappe.whitelist()
+def get_active_maintenance_job():
+	"""
+	The queued or running maintenance job, if any
+
+	Returns:
+		dict: {"name", "job_type", "status", "progress", "progress_message"} or None
+	"""
+	frappe.only_for(["System Manager", "Dev User"])
+	return frappe.db.get_value(
+		JOB_DOCTYPE,
+		{"status": ["in", ACTIVE_STATUSES]},
+		["name", "job_type", "status", "progress", "progress_message"],
+		as_dict=True,
+	)
+
+
+@frappe.whitelist()
+def cancel_maintenance_job(name):
+	"""
+	Cancel a maintenance job
+
+	A queued job is cancelled at once; a running job stops at the end of
+	its current chunk (chunks already committed are kept).
+	"""
+	frappe.only_for(["System Manager", "Dev User"])
+
+	status = frappe.db.get_value(JOB_DOCTYPE, name, "status", for_update=True)
+	if status not in ACTIVE_STATUSES:
+		frappe.throw(_("Maintenance job {0} is {1}").format(name, status))
+
+	if status == "Queued":
+		frappe.db.set_value(
+			JOB_DOCTYPE, name, {"status": "Cancelled", "completed_at": now()}, update_modified=False
+		)
+		return {"success": True, "message": _("Job cancelled"), "status": "Cancelled"}
+
+	frappe.db.set_value(JOB_DOCTYPE, name, "cancel_requested", 1, update_modified=False)
+	return {"success": True, "message": _("Job will stop after the current chunk"), "status": "Running"}
@@ -0,0 +1,569 @@
+"""
+Stock Ledger Helper
+Posts stock movements to the append-only Store Stock Ledger Entry table
+and keeps Store Stock Balance in step with it.
+
+All writes of one posting happen inside a savepoint: either every ledger
+row and every balance update lands, or none of them do.
+
+Valuation (FIFO / LIFO / Moving Average) is advanced per entry from the
+state stored on the balance row - see utils/helpers/stock_valuation.py.
+
+Issues that would take a balance below zero are rejected unless negative
+stock is allowed for the item - see utils/validators/stock_validator.py.
+Balance rows are locked in one deterministic order (by balance key, i.e.
+item, location, batch), so multi-line postings cannot deadlock each other.
+
+Backdated entries (posted before the latest entry of their balance row) are
+applied to the balance immediately and queue a windowed repost of the
+(item, location) that recomputes every later entry - see
+utils/helpers/stock_repost.py. Entries dated on or before the latest stock
+snapshot are handled the same way, so the repost rebuilds the item's
+snapshots (utils/helpers/stock_snapshot.py).
+
+Location subtree totals (Store Location Stock Rollup) are advanced by the
+net delta of each posting - see utils/helpers/stock_rollup.py.
+
+Usage:
+	from technical_store_system.utils.helpers.stock_ledger import make_stock_ledger_entries
+
+	make_stock_ledger_entries([
+		{"item_code": "ITEM-00001", "location": "WH-1-Z-A-R01-S01-B-1", "actual_qty": 10, "incoming_rate": 4.5},
+		{"item_code": "ITEM-00002", "location": "WH-1-Z-A-R01-S01-B-1", "actual_qty": -2},
+	], voucher_type="Store Stock Entry", voucher_no="SE-0001")
+"""
+
+import hashlib
+
+import frappe
+from frappe import _
+from frappe.utils import flt, get_datetime, getdate, now, nowdate, nowtime
+
+from technical_store_system.utils.helpers.stock_valuation import (
+	apply_valuation,
+	dump_queue,
+	get_max_queue_bins,
+	get_valuation
+)
+from technical_store_system.utils.validators.stock_validator import (
+	get_negative_stock_policy,
+	validate_negative_stock
+)
+
+
+LEDGER_DOCTYPE = "Store Stock Ledger Entry"
+BALANCE_DOCTYPE = "Store Stock Balance"
+
+# Frappe document names are VARCHAR(140)
+MAX_KEY_LENGTH = 140
+KEY_SEPARATOR = "::"
+
+STANDARD_FIELDS = ["name", "creation", "modified", "modified_by", "owner", "docstatus", "idx"]
+
+LEDGER_FIELDS = [
+	*STANDARD_FIELDS,
+	"item_code", "location", "batch_no", "serial_no",
+	"posting_date", "posting_time", "posting_datetime",
+	"voucher_type", "voucher_no", "voucher_detail_no",
+	"actual_qty", "qty_after_transaction",
+	"incoming_rate", "outgoing_rate", "valuation_rate",
+	"stock_value", "stock_value_difference", "stock_queue",
+]
+
+BALANCE_FIELDS = [
+	*STANDARD_FIELDS,
+	"item_code", "location", "batch_no",
+	"actual_qty", "valuation_rate", "stock_value", "stock_queue",
+	"last_posting_datetime", "last_ledger_entry",
+]
+
+# Columns rewritten when an existing balance row is updated
+BALANCE_UPDATE_FIELDS = [
+	"modified", "modified_by", "actual_qty", "valuation_rate", "stock_value", "stock_queue",
+	"last_posting_datetime", "last_ledger_entry",
+]
+
+
+# ============================================================================
+# BALANCE KEYS
+# ============================================================================
+
+def get_balance_key(item_code, location, batch_no=None):
+	"""
+	Build the primary key of a Store Stock Balance row
+
+	Examples:
+		("ITEM-00001", "WH-1-Z-A", None)    → "ITEM-00001::WH-1-Z-A::"
+		("ITEM-00001", "WH-1-Z-A", "B-001") → "ITEM-00001::WH-1-Z-A::B-001"
+
+	Keys longer than a document name allows are replaced by their SHA-1,
+	which keeps them deterministic.
+	"""
+	key = KEY_SEPARATOR.join([item_code, location, batch_no or ""])
+	if len(key) > MAX_KEY_LENGTH:
+		key = hashlib.sha1(key.encode()).hexdigest()
+	return key
+
+
+# ============================================================================
+# POSTING
+# ============================================================================
+
+def make_stock_ledger_entries(entries, voucher_type=None, voucher_no=None):
+	"""
+	Append movements to the stock ledger and update balances atomically
+
+	Args:
+		entries: List of dicts with item_code, location, actual_qty (signed) and
+			optionally incoming_rate (receipts), incoming_rate_from, batch_no,
+			serial_no, posting_date, posting_time, voucher_type, voucher_no,
+			voucher_detail_no
+		voucher_type: Default voucher type for entries that don't set one
+		voucher_no: Default voucher number for entries that don't set one
+
+	Returns:
+		list: Names of the created ledger entries (in posting order)
+	"""
+	return [sle.name for sle in post_stock_ledger_entries(entries, voucher_type, voucher_no)]
+
+
+def post_stock_ledger_entries(entries, voucher_type=None, voucher_no=None):
+	"""
+	Posting core shared by every stock movement (see make_stock_ledger_entries)
+
+	A receipt can take its rate from an issue of the same posting:
+	incoming_rate_from is the 1-based position of that issue in entries, and
+	the issue must be applied first (earlier posting time, or same time and
+	earlier position). Transfers use it so value moves with the stock.
+
+	Returns:
+		list: Prepared ledger entries (frappe._dict) with their derived fields,
+			in posting order
+	"""
+	if not entries:
+		return []
+
+	sl_entries = [
+		prepare_sl_entry(entry, voucher_type, voucher_no, idx)
+		for idx, entry in enumerate(entries, start=1)
+	]
+	entries_by_idx = {sle.idx: sle for sle in sl_entries}
+
+	# Apply in posting order so qty_after_transaction is a running balance
+	sl_entries.sort(key=lambda sle: (sle.posting_datetime, sle.idx))
+
+	savepoint = "store_stock_ledger"
+	frappe.db.savepoint(savepoint)
+
+	try:
+		balances = lock_balances(sl_entries)
+
+		# Resolved once per posting, not per line
+		item_codes = {sle.item_code for sle in sl_entries}
+		item_settings = get_item_valuation_settings(item_codes)
+		negative_stock_policy = get_negative_stock_policy(item_codes)
+		max_queue_bins = get_max_queue_bins()
+
+		from technical_store_system.utils.helpers.stock_snapshot import get_latest_snapshot_date
+		latest_snapshot_date = get_latest_snapshot_date()
+
+		# One valuation object per balance row, advanced entry by entry
+		valuations = {}
+		backdated = {}
+		for sle in sl_entries:
+			balance = balances[sle.balance_key]
+			if is_backdated(balance, sle) or (latest_snapshot_date and sle.posting_date <= latest_snapshot_date):
+				window = (sle.item_code, sle.location)
+				backdated[window] = min(backdated.get(window, sle.posting_datetime), sle.posting_datetime)
+
+			valuation = valuations.get(sle.balance_key)
+			if valuation is None:
+				item = item_settings.get(sle.item_code) or frappe._dict()
+				valuation = valuations[sle.balance_key] = get_valuation(
+					item.valuation_method, balance.stock_queue, max_queue_bins
+				)
+
+			if sle.incoming_rate_from:
+				sle.incoming_rate = get_linked_outgoing_rate(sle, entries_by_idx)
+
+			apply_sl_entry(balance, sle, valuation, item_settings.get(sle.item_code))
+			validate_negative_stock(sle, negative_stock_policy)
+
+		insert_ledger_rows(sl_entries)
+		write_balance_rows(balances.values())
+
+		from technical_store_system.utils.helpers.stock_rollup import apply_rollup_deltas, get_rollup_deltas
+		apply_rollup_deltas(get_rollup_deltas(sl_entries))
+
+		if backdated:
+			from technical_store_system.utils.helpers.stock_repost import queue_repost
+			for (item_code, location), from_datetime in backdated.items():
+				queue_repost(item_code, location, from_datetime)
+
+	except Exception:
+		frappe.db.rollback(save_point=savepoint)
+		raise
+
+	return sl_entries
+
+
+def get_linked_outgoing_rate(sle, entries_by_idx):
+	"""Outgoing rate of the already applied issue a receipt takes its rate from"""
+	issue = entries_by_idx.get(sle.incoming_rate_from)
+	if sle.actual_qty < 0 or not issue or issue.actual_qty > 0 or issue.outgoing_rate is None:
+		frappe.throw(
+			_("Row {0}: incoming_rate_from must point at an issue posted before it").format(sle.idx)
+		)
+	return issue.outgoing_rate
+
+
+def prepare_sl_entry(entry, voucher_type, voucher_no, idx):
+	"""Validate one movement and fill in defaults and derived fields"""
+	sle = frappe._dict(entry)
+
+	if not sle.item_code or not sle.location:
+		frappe.throw(_("Row {0}: Item and Location are required for a stock movement").format(idx))
+
+	sle.actual_qty = flt(sle.actual_qty)
+	if not sle.actual_qty:
+		frappe.throw(_("Row {0}: Quantity cannot be zero for item {1}").format(idx, sle.item_code))
+
+	sle.batch_no = sle.batch_no or ""
+	sle.voucher_type = sle.voucher_type or voucher_type
+	sle.voucher_no = sle.voucher_no or voucher_no
+	sle.posting_date = getdate(sle.posting_date or nowdate())
+	sle.posting_time = sle.posting_time or nowtime()
+	sle.posting_datetime = get_datetime(f"{sle.posting_date} {sle.posting_time}")
+
+	sle.idx = idx
+	sle.name = frappe.generate_hash(length=20)
+	sle.balance_key = get_balance_key(sle.item_code, sle.location, sle.batch_no)
+
+	return sle
+
+
+def is_backdated(balance, sle):
+	"""True if the entry is posted before the latest entry already on its balance row"""
+	return bool(
+		balance.last_posting_datetime
+		and sle.posting_datetime < get_datetime(balance.last_posting_datetime)
+	)
+
+
+def apply_sl_entry(balance, sle, valuation, item=None):
+	"""Apply one ledger entry to its (locked) balance row in memory"""
+	balance.actual_qty = flt(balance.actual_qty) + sle.actual_qty
+	sle.qty_after_transaction = balance.actual_qty
+
+	fallback_rate = flt(balance.valuation_rate) or get_default_rate(item)
+	apply_valuation(valuation, sle, fallback_rate)
+	sle.stock_queue = dump_queue(valuation.get_state())
+
+	balance.valuation_rate = sle.valuation_rate
+	balance.stock_value = sle.stock_value
+	balance.stock_queue = sle.stock_queue
+
+	if not balance.last_posting_datetime or sle.posting_datetime >= get_datetime(balance.last_posting_datetime):
+		balance.last_posting_datetime = sle.posting_datetime
+
+	balance.last_ledger_entry = sle.name
+
+
+def get_item_valuation_settings(item_codes):
+	"""
+	Valuation method and default rates for all items of a posting (one query)
+
+	Returns:
+		dict: {item_code: {valuation_method, opening_valuation_rate, standard_rate}}
+	"""
+	rows = frappe.get_all(
+		"Store Item",
+		filters={"name": ["in", list(item_codes)]},
+		fields=["name", "valuation_method", "opening_valuation_rate", "standard_rate"],
+	)
+	return {row.name: row for row in rows}
+
+
+def get_default_rate(item):
+	"""Rate for receipts without incoming_rate on a row that has no value yet"""
+	if not item:
+		return 0.0
+	return flt(item.standard_rate) or flt(item.opening_valuation_rate)
+
+
+# ============================================================================
+# BALANCE TABLE ACCESS
+# ============================================================================
+
+def lock_balances(sl_entries, chunk_size=5000):
+	"""
+	Create, lock and load the balance rows touched by a posting
+
+	Every key is locked in a single pass in ascending balance key order:
+	one INSERT ... ON DUPLICATE KEY UPDATE over the sorted keys creates the
+	missing rows and takes the exclusive lock of the existing ones in the
+	same statement, row by row in key order. The SELECT ... FOR UPDATE that
+	follows only reads rows whose locks are already held.
+
+	Two postings touching the same rows therefore always queue on the first
+	key they share instead of deadlocking.
+
+	Returns:
+		dict: {balance_key: balance row (frappe._dict)}
+	"""
+	new_rows = {}
+	for sle in sorted(sl_entries, key=lambda sle: sle.balance_key):
+		if sle.balance_key not in new_rows:
+			new_rows[sle.balance_key] = frappe._dict({
+				"name": sle.balance_key,
+				"item_code": sle.item_code,
+				"location": sle.location,
+				"batch_no": sle.batch_no,
+				"actual_qty": 0,
+				"valuation_rate": 0,
+				"stock_value": 0,
+				"stock_queue": None,
+				"last_posting_datetime": None,
+				"last_ledger_entry": None,
+			})
+
+	# Chunks follow each other in key order, so the lock order stays global
+	rows = list(new_rows.values())
+	for start in range(0, len(rows), chunk_size):
+		lock_balance_keys(rows[start:start + chunk_size])
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT `name`, {", ".join(f"`{field}`" for field in BALANCE_FIELDS if field not in STANDARD_FIELDS)}
+		FROM `tab{BALANCE_DOCTYPE}`
+		WHERE `name` IN %(names)s
+		ORDER BY `name`
+		FOR UPDATE
+		""",
+		{"names": tuple(new_rows)},
+		as_dict=True,
+	)
+
+	return {row.name: row for row in rows}
+
+
+def lock_balance_keys(rows):
+	"""Insert empty balance rows or lock the existing ones, in the given order"""
+	timestamp = now()
+	columns = ", ".join(f"`{field}`" for field in BALANCE_FIELDS)
+	row_placeholder = "(" + ", ".join(["%s"] * len(BALANCE_FIELDS)) + ")"
+
+	values = []
+	for row in rows:
+		values.extend(balance_row_values(row, timestamp))
+
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tab{BALANCE_DOCTYPE}` ({columns})
+		VALUES {", ".join([row_placeholder] * len(rows))}
+		ON DUPLICATE KEY UPDATE `name` = `name`
+		""",
+		values,
+	)
+
+
+def write_balance_rows(rows, chunk_size=5000):
+	"""
+	Write balance rows with one INSERT ... ON DUPLICATE KEY UPDATE per chunk
+
+	Args:
+		rows: Iterable of balance rows (frappe._dict) holding the new values
+	"""
+	rows = list(rows)
+	if not rows:
+		return
+
+	timestamp = now()
+	columns = ", ".join(f"`{field}`" for field in BALANCE_FIELDS)
+	updates = ", ".join(f"`{field}` = VALUES(`{field}`)" for field in BALANCE_UPDATE_FIELDS)
+	row_placeholder = "(" + ", ".join(["%s"] * len(BALANCE_FIELDS)) + ")"
+
+	for start in range(0, len(rows), chunk_size):
+		chunk = rows[start:start + chunk_size]
+		values = []
+		for row in chunk:
+			values.extend(balance_row_values(row, timestamp))
+
+		frappe.db.sql(
+			f"""
+			INSERT INTO `tab{BALANCE_DOCTYPE}` ({columns})
+			VALUES {", ".join([row_placeholder] * len(chunk))}
+			ON DUPLICATE KEY UPDATE {updates}
+			""",
+			values,
+		)
+
+
+def balance_row_values(row, timestamp):
+	"""Build the value tuple of a balance row in BALANCE_FIELDS order"""
+	user = frappe.session.user
+	return (
+		row.name, timestamp, timestamp, user, user, 0, 0,
+		row.item_code, row.location, row.batch_no or "",
+		flt(row.actual_qty), flt(row.valuation_rate), flt(row.stock_value), row.stock_queue,
+		row.last_posting_datetime, row.last_ledger_entry,
+	)
+
+
+def insert_ledger_rows(sl_entries):
+	"""Bulk insert prepared ledger entries (no per-row document hooks)"""
+	timestamp = now()
+	user = frappe.session.user
+
+	values = [
+		(
+			sle.name, timestamp, timestamp, user, user, 0, sle.idx,
+			sle.item_code, sle.location, sle.batch_no, sle.serial_no,
+			sle.posting_date, sle.posting_time, sle.posting_datetime,
+			sle.voucher_type, sle.voucher_no, sle.voucher_detail_no,
+			sle.actual_qty, sle.qty_after_transaction,
+			sle.incoming_rate, sle.outgoing_rate, sle.valuation_rate,
+			sle.stock_value, sle.stock_value_difference, sle.stock_queue,
+		)
+		for sle in sl_entries
+	]
+
+	frappe.db.bulk_insert(LEDGER_DOCTYPE, LEDGER_FIELDS, values)
+
+
+def update_ledger_rows(rows, fields, chunk_size=1000):
+	"""
+	Rewrite derived columns of existing ledger rows (used by reposts)
+
+	Only running/derived columns (qty_after_transaction, valuation fields)
+	are ever rewritten - the movement itself (actual_qty) never changes.
+	One UPDATE ... CASE statement per chunk.
+
+	Args:
+		rows: List of dicts with "name" and the columns in fields
+		fields: Column names to rewrite
+	"""
+	for start in range(0, len(rows), chunk_size):
+		chunk = rows[start:start + chunk_size]
+		values = []
+		assignments = []
+
+		for field in fields:
+			cases = []
+			for row in chunk:
+				cases.append("WHEN %s THEN %s")
+				values.extend([row["name"], row.get(field)])
+			assignments.append(f"`{field}` = CASE `name` {' '.join(cases)} END")
+
+		values.append(tuple(row["name"] for row in chunk))
+
+		frappe.db.sql(
+			f"""
+			UPDATE `tab{LEDGER_DOCTYPE}`
+			SET {", ".join(assignments)}
+			WHERE `name` IN %s
+			""",
+			values,
+		)
+
+
+# ============================================================================
+# BALANCE QUERIES
+# ============================================================================
+
+def get_stock_balance(item_code, location, batch_no=None):
+	"""
+	Current quantity of an item in a location (primary-key lookup)
+
+	Returns:
+		float: Actual quantity, 0 if the item never moved in that location
+	"""
+	key = get_balance_key(item_code, location, batch_no)
+	return flt(frappe.db.get_value(BALANCE_DOCTYPE, key, "actual_qty"))
+
+
+def get_stock_balances(keys):
+	"""
+	Current quantities for many (item_code, location, batch_no) keys at once
+
+	Args:
+		keys: Iterable of (item_code, location, batch_no) tuples
+
+	Returns:
+		dict: {(item_code, location, batch_no): float}
+	"""
+	key_map = {get_balance_key(*key): key for key in keys}
+	if not key_map:
+		return {}
+
+	rows = frappe.get_all(
+		BALANCE_DOCTYPE,
+		filters={"name": ["in", list(key_map)]},
+		fields=["name", "actual_qty"],
+	)
+	found = {row.name: flt(row.actual_qty) for row in rows}
+
+	return {key: found.get(name, 0.0) for name, key in key_map.items()}
+
+
+def get_qty_posted_after(keys, after_datetime):
+	"""
+	Quantity posted after a point in time, for many keys at once
+
+	The current balance minus this is the quantity as of after_datetime.
+
+	Args:
+		keys: Iterable of (item_code, location, batch_no) tuples
+		after_datetime: Only entries posted strictly later count
+
+	Returns:
+		dict: {(item_code, location, batch_no): float}, keys without later entries left out
+	"""
+	keys = {(item_code, location, batch_no or "") for item_code, location, batch_no in keys}
+	if not keys:
+		return {}
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT `item_code`, `location`, IFNULL(`batch_no`, '') AS `batch_no`, SUM(`actual_qty`) AS `qty`
+		FROM `tab{LEDGER_DOCTYPE}`
+		WHERE (`item_code`, `location`) IN %(pairs)s
+			AND `posting_datetime` > %(after)s
+		GROUP BY `item_code`, `location`, IFNULL(`batch_no`, '')
+		""",
+		{"pairs": tuple({key[:2] for key in keys}), "after": after_datetime},
+		as_dict=True,
+	)
+
+	posted = {}
+	for row in rows:
+		key = (row.item_code, row.location, row.batch_no)
+		if key in keys:
+			posted[key] = flt(row.qty)
+	return posted
+
+
+@frappe.whitelist()
+def get_balance(item_code, location, batch_no=None):
+	"""Whitelisted balance lookup for client scripts and integrations"""
+	frappe.has_permission(BALANCE_DOCTYPE, "read", throw=True)
+	return get_stock_balance(item_code, location, batch_no)
+
+
+def get_stock_value(item_code, location, batch_no=None):
+	"""
+	Current quantity, valuation rate and value of an item in a location
+
+	Returns:
+		dict: {"actual_qty": float, "valuation_rate": float, "stock_value": float}
+	"""
+	key = get_balance_key(item_code, location, batch_no)
+	row = frappe.db.get_value(
+		BALANCE_DOCTYPE, key, ["actual_qty", "valuation_rate", "stock_value"], as_dict=True
+	) or {}
+
+	return {
+		"actual_qty": flt(row.get("actual_qty")),
+		"valuation_rate": flt(row.get("valuation_rate")),
+		"stock_value": flt(row.get("stock_value")),
+	}
@@ -0,0 +1,389 @@
+"""
+Stock Repost Helper
+Recomputes running balances and valuation after backdated stock entries
+
+A backdated receipt or issue makes qty_after_transaction and valuation of
+every later ledger entry of its (item, location) wrong. Instead of
+replaying the item's whole history, a repost:
+
+1. Starts from the nearest checkpoint - the stored state (qty, stock_queue)
+   of the last ledger entry before the backdated posting
+2. Walks forward through only that (item, location) window, chunk by chunk
+3. Rewrites the derived columns of each entry and finally the balance row
+
+Reposts run in a background job. Requests for the same window are
+coalesced into one queued Store Stock Repost record, and progress is
+checkpointed after every chunk so an interrupted job resumes where it
+stopped. Once the window is recomputed, the stock snapshots of the item are
+rebuilt from the backdated date onwards.
+
+Usage:
+	# Called automatically by make_stock_ledger_entries for backdated entries
+	queue_repost("ITEM-00001", "WH-1-Z-A-R01-S01-B-1", "2025-03-01 10:00:00")
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import flt, get_datetime, now
+
+from technical_store_system.utils.helpers.stock_ledger import (
+	BALANCE_DOCTYPE,
+	LEDGER_DOCTYPE,
+	get_balance_key,
+	update_ledger_rows,
+	write_balance_rows
+)
+from technical_store_system.utils.helpers.stock_rollup import apply_rollup_deltas
+from technical_store_system.utils.helpers.stock_snapshot import rebuild_item_snapshots
+from technical_store_system.utils.helpers.stock_valuation import (
+	apply_valuation,
+	dump_queue,
+	get_max_queue_bins,
+	get_valuation
+)
+
+
+REPOST_DOCTYPE = "Store Stock Repost"
+REPOST_JOB_ID = "technical_store_system:stock_repost"
+
+# Ledger entries recomputed and committed per checkpoint
+CHUNK_SIZE = 500
+
+# Ledger columns derived from the running state (rewritten by a repost)
+DERIVED_FIELDS = [
+	"qty_after_transaction", "incoming_rate", "outgoing_rate", "valuation_rate",
+	"stock_value", "stock_value_difference", "stock_queue",
+]
+
+# Total order of the ledger for one balance key
+LEDGER_ORDER = "`posting_datetime`, `creation`, `idx`, `name`"
+
+
+# ============================================================================
+# QUEUEING
+# ============================================================================
+
+def queue_repost(item_code, location, from_datetime):
+	"""
+	Request a repost of an (item, location) window
+
+	Coalesces with a queued request for the same window: the queued record
+	keeps the earliest from_datetime instead of a second record being made.
+
+	Returns:
+		str: Name of the Store Stock Repost record
+	"""
+	from_datetime = get_datetime(from_datetime)
+
+	existing = frappe.db.get_value(
+		REPOST_DOCTYPE,
+		{"item_code": item_code, "location": location, "status": "Queued"},
+		["name", "from_datetime"],
+		as_dict=True,
+		for_update=True,
+	)
+
+	if existing:
+		if from_datetime < get_datetime(existing.from_datetime):
+			frappe.db.set_value(
+				REPOST_DOCTYPE, existing.name, "from_datetime", from_datetime, update_modified=False
+			)
+		repost_name = existing.name
+	else:
+		doc = frappe.get_doc({
+			"doctype": REPOST_DOCTYPE,
+			"item_code": item_code,
+			"location": location,
+			"from_datetime": from_datetime,
+			"status": "Queued",
+		})
+		doc.insert(ignore_permissions=True)
+		repost_name = doc.name
+
+	enqueue_repost_job()
+	return repost_name
+
+
+def enqueue_repost_job():
+	"""Start the repost worker once the current transaction commits (single job)"""
+	frappe.enqueue(
+		"technical_store_system.utils.helpers.stock_repost.process_repost_queue",
+		queue="long",
+		job_id=REPOST_JOB_ID,
+		deduplicate=True,
+		enqueue_after_commit=True,
+	)
+
+
+def resume_pending_reposts():
+	"""
+	Scheduler: restart the worker for queued or interrupted reposts
+
+	Usage:
+		bench execute technical_store_system.utils.helpers.stock_repost.resume_pending_reposts
+	"""
+	if frappe.db.exists(REPOST_DOCTYPE, {"status": ["in", ["Queued", "In Progress"]]}):
+		enqueue_repost_job()
+
+
+@frappe.whitelist()
+def retry_repost(name):
+	"""Put a failed repost back in the queue (keeps its checkpoint)"""
+	frappe.only_for(["Store Manager", "System Manager"])
+
+	status = frappe.db.get_value(REPOST_DOCTYPE, name, "status")
+	if status != "Failed":
+		frappe.throw(_("Only failed reposts can be retried"))
+
+	frappe.db.set_value(REPOST_DOCTYPE, name, {"status": "Queued", "error_log": None})
+	enqueue_repost_job()
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def process_repost_queue():
+	"""Background job: run reposts until the queue is empty"""
+	while True:
+		repost_name = get_next_repost()
+		if not repost_name:
+			break
+		run_repost(repost_name)
+
+
+def get_next_repost():
+	"""Interrupted reposts first (they hold a checkpoint), then the oldest window"""
+	for status in ("In Progress", "Queued"):
+		names = frappe.get_all(
+			REPOST_DOCTYPE,
+			filters={"status": status},
+			order_by="from_datetime asc",
+			limit=1,
+			pluck="name",
+		)
+		if names:
+			return names[0]
+	return None
+
+
+def run_repost(repost_name):
+	"""Claim, run and close one repost record"""
+	doc = frappe.get_doc(REPOST_DOCTYPE, repost_name)
+
+	if doc.status == "Queued":
+		doc.db_set({"status": "In Progress", "started_at": now()}, update_modified=False)
+		frappe.db.commit()
+
+	try:
+		repost_window(doc)
+		doc.db_set({"status": "Completed", "completed_at": now()}, update_modified=False)
+		frappe.db.commit()
+
+	except Exception:
+		frappe.db.rollback()
+		doc.db_set({"status": "Failed", "error_log": frappe.get_traceback()}, update_modified=False)
+		frappe.db.commit()
+		frappe.log_error(frappe.get_traceback(), f"Stock Repost Failed: {repost_name}")
+
+
+# ============================================================================
+# WINDOW RECOMPUTATION
+# ============================================================================
+
+def repost_window(doc):
+	"""
+	Recompute every balance key (batch) of the repost's (item, location)
+
+	Resumes at doc.current_batch_no / doc.last_processed_entry if set.
+	"""
+	batches = get_window_batches(doc.item_code, doc.location)
+	valuation_method = frappe.db.get_value("Store Item", doc.item_code, "valuation_method")
+
+	current_batch_no = doc.current_batch_no or ""
+	start = batches.index(current_batch_no) if current_batch_no in batches else 0
+
+	for index in range(start, len(batches)):
+		batch_no = batches[index]
+		resume_entry = doc.last_processed_entry if batch_no == current_batch_no else None
+		repost_balance_key(doc, batch_no, valuation_method, resume_entry)
+
+		# Checkpoint: the next batch starts fresh from the window start
+		if index + 1 < len(batches):
+			doc.db_set({"current_batch_no": batches[index + 1], "last_processed_entry": None}, update_modified=False)
+			frappe.db.commit()
+
+	after_repost(doc)
+
+
+def repost_balance_key(doc, batch_no, valuation_method, resume_entry=None):
+	"""Recompute one (item, location, batch) from its checkpoint to the end"""
+	if resume_entry:
+		checkpoint = get_entry_state(resume_entry)
+	else:
+		checkpoint = get_previous_entry_state(doc.item_code, doc.location, batch_no, doc.from_datetime)
+
+	state = frappe._dict({
+		"qty": flt(checkpoint.qty_after_transaction) if checkpoint else 0.0,
+		"valuation": get_valuation(
+			valuation_method, checkpoint.stock_queue if checkpoint else None, get_max_queue_bins()
+		),
+		"valuation_rate": flt(checkpoint.valuation_rate) if checkpoint else 0.0,
+		"position": checkpoint if resume_entry else None,
+	})
+
+	# Chunks are committed as checkpoints while postings continue concurrently
+	while repost_next_chunk(doc, batch_no, state, commit=True):
+		pass
+
+	# Final drain under the balance lock: no new entries can appear for this key
+	balance = lock_balance(doc.item_code, doc.location, batch_no)
+	while repost_next_chunk(doc, batch_no, state, commit=False):
+		pass
+
+	if balance:
+		# Quantities are unchanged by a repost, values may move
+		value_difference = state.valuation.value - flt(balance.stock_value)
+
+		balance.actual_qty = state.qty
+		balance.valuation_rate = state.valuation_rate
+		balance.stock_value = state.valuation.value
+		balance.stock_queue = dump_queue(state.valuation.get_state())
+		write_balance_rows([balance])
+		apply_rollup_deltas({doc.location: (0.0, value_difference)})
+
+	frappe.db.commit()
+
+
+def repost_next_chunk(doc, batch_no, state, commit=True):
+	"""
+	Recompute the next chunk of ledger entries after state.position
+
+	Returns:
+		bool: True if entries were processed
+	"""
+	entries = get_entries_after(doc, batch_no, state.position)
+	if not entries:
+		return False
+
+	for sle in entries:
+		state.qty += flt(sle.actual_qty)
+		sle.qty_after_transaction = state.qty
+		apply_valuation(state.valuation, sle, state.valuation_rate)
+		sle.stock_queue = dump_queue(state.valuation.get_state())
+		state.valuation_rate = sle.valuation_rate
+
+	update_ledger_rows(entries, DERIVED_FIELDS)
+	state.position = entries[-1]
+
+	doc.db_set({
+		"current_batch_no": batch_no,
+		"last_processed_entry": state.position.name,
+		"entries_processed": (doc.entries_processed or 0) + len(entries),
+	}, update_modified=False)
+
+	if commit:
+		frappe.db.commit()
+
+	return True
+
+
+def after_repost(doc):
+	"""Rebuild data derived from the reposted window (stock snapshots of the item)"""
+	rebuild_item_snapshots([doc.item_code], get_datetime(doc.from_datetime).date())
+
+
+# ============================================================================
+# LEDGER QUERIES
+# ============================================================================
+
+def get_window_batches(item_code, location):
+	"""Batch numbers with a balance row in the window ("" = no batch), sorted"""
+	batches = frappe.get_all(
+		BALANCE_DOCTYPE,
+		filters={"item_code": item_code, "location": location},
+		pluck="batch_no",
+	)
+	return sorted({batch_no or "" for batch_no in batches})
+
+
+def get_entries_after(doc, batch_no, position, limit=CHUNK_SIZE):
+	"""Next ledger entries of one key, after a position or from the window start"""
+	values = {
+		"item_code": doc.item_code,
+		"location": doc.location,
+		"batch_no": batch_no,
+		"limit": limit,
+	}
+
+	if position:
+		condition = "(`posting_datetime`, `creation`, `idx`, `name`) > (%(pd)s, %(cr)s, %(idx)s, %(name)s)"
+		values.update({
+			"pd": position.posting_datetime,
+			"cr": position.creation,
+			"idx": position.idx,
+			"name": position.name,
+		})
+	else:
+		condition = "`posting_datetime` >= %(from_datetime)s"
+		values["from_datetime"] = doc.from_datetime
+
+	return frappe.db.sql(
+		f"""
+		SELECT `name`, `posting_datetime`, `creation`, `idx`, `actual_qty`, `incoming_rate`
+		FROM `tab{LEDGER_DOCTYPE}`
+		WHERE `item_code` = %(item_code)s
+			AND `location` = %(location)s
+			AND IFNULL(`batch_no`, '') = %(batch_no)s
+			AND {condition}
+		ORDER BY {LEDGER_ORDER}
+		LIMIT %(limit)s
+		""",
+		values,
+		as_dict=True,
+	)
+
+
+def get_previous_entry_state(item_code, location, batch_no, before_datetime):
+	"""Checkpoint: stored state of the last entry before the window starts"""
+	rows = frappe.db.sql(
+		f"""
+		SELECT `name`, `posting_datetime`, `creation`, `idx`,
+			`qty_after_transaction`, `valuation_rate`, `stock_queue`
+		FROM `tab{LEDGER_DOCTYPE}`
+		WHERE `item_code` = %(item_code)s
+			AND `location` = %(location)s
+			AND IFNULL(`batch_no`, '') = %(batch_no)s
+			AND `posting_datetime` < %(before)s
+		ORDER BY `posting_datetime` DESC, `creation` DESC, `idx` DESC, `name` DESC
+		LIMIT 1
+		""",
+		{"item_code": item_code, "location": location, "batch_no": batch_no, "before": before_datetime},
+		as_dict=True,
+	)
+	return rows[0] if rows else None
+
+
+def get_entry_state(entry_name):
+	"""Checkpoint: stored state and ordering position of a ledger entry"""
+	return frappe.db.get_value(
+		LEDGER_DOCTYPE,
+		entry_name,
+		["name", "posting_datetime", "creation", "idx", "qty_after_transaction", "valuation_rate", "stock_queue"],
+		as_dict=True,
+	)
+
+
+def lock_balance(item_code, location, batch_no):
+	"""Lock and return one balance row (None if it doesn't exist)"""
+	rows = frappe.db.sql(
+		f"""
+		SELECT *
+		FROM `tab{BALANCE_DOCTYPE}`
+		WHERE `name` = %s
+		FOR UPDATE
+		""",
+		get_balance_key(item_code, location, batch_no),
+		as_dict=True,
+	)
+	return rows[0] if rows else None
@@ -0,0 +1,362 @@
+"""
+Stock Rollup Helper
+Maintains Store Location Stock Rollup rows along the location hierarchy
+
+Every location with stock history has one rollup row holding the quantity
+and value of its whole subtree. A posting adds its net ledger delta per
+location to that location and each of its ancestors:
+
+	+10 in WH-1-Z-A-R01-S01-B-1  →  +10 on B-1, S01, R01, Z-A and WH-1
+
+so "value in WH-2" is one primary-key read.
+
+The hierarchy is read from the physical fields every location carries
+(store, zone, rack, shelf): the parent of a location is the nearest of them
+that is set, with parent_location as the fallback for free-form trees.
+
+Rollup rows are updated with one INSERT ... ON DUPLICATE KEY UPDATE per
+posting, in ascending name order (same deadlock rule as balance rows).
+
+Usage:
+	# Rebuild every rollup row from the balance table
+	bench execute technical_store_system.utils.helpers.stock_rollup.rebuild_location_rollups
+"""
+
+import frappe
+from frappe.utils import flt, now
+
+from technical_store_system.utils.helpers.stock_ledger import BALANCE_DOCTYPE, STANDARD_FIELDS
+
+
+ROLLUP_DOCTYPE = "Store Location Stock Rollup"
+LOCATION_DOCTYPE = "Store Location"
+
+ANCESTOR_CACHE_KEY = "technical_store_system:location_ancestors"
+
+ROLLUP_FIELDS = [
+	*STANDARD_FIELDS,
+	"location", "location_type", "total_qty", "stock_value",
+]
+
+# Parent fields of a location, nearest first (parent_location: free-form trees)
+PARENT_FIELDS = ["shelf", "rack", "zone", "store", "parent_location"]
+
+# Field that points at a location of each type from every location below it
+DESCENDANT_FIELDS = {"Warehouse": "store", "Zone": "zone", "Rack": "rack", "Shelf": "shelf"}
+
+# Guard against parent cycles in bad data
+MAX_DEPTH = 20
+
+
+# ============================================================================
+# LOCATION HIERARCHY
+# ============================================================================
+
+def get_location_ancestors(locations):
+	"""
+	Ancestor path of each location, starting with the location itself
+
+	Paths are cached; parents are resolved one hierarchy level per query
+	for all cache misses together.
+
+	Returns:
+		dict: {location: [location, parent, grandparent, ..., warehouse]}
+	"""
+	locations = list(set(locations))
+	if not locations:
+		return {}
+
+	paths = {}
+	for location in locations:
+		path = frappe.cache.hget(ANCESTOR_CACHE_KEY, location)
+		if path:
+			paths[location] = path
+
+	missing = [location for location in locations if location not in paths]
+	if missing:
+		parents = {}
+		pending = set(missing)
+		for _level in range(MAX_DEPTH):
+			pending -= set(parents)
+			if not pending:
+				break
+			rows = frappe.get_all(
+				LOCATION_DOCTYPE,
+				filters={"name": ["in", list(pending)]},
+				fields=["name", *PARENT_FIELDS],
+			)
+			for row in rows:
+				parents[row.name] = get_parent_location(row)
+			for location in pending - {row.name for row in rows}:
+				parents[location] = None
+			pending = {parents[row.name] for row in rows if parents[row.name]}
+
+		for location in missing:
+			path = [location]
+			while len(path) < MAX_DEPTH and parents.get(path[-1]) and parents[path[-1]] not in path:
+				path.append(parents[path[-1]])
+			paths[location] = path
+			frappe.cache.hset(ANCESTOR_CACHE_KEY, location, path)
+
+	return paths
+
+
+def get_parent_location(row):
+	"""
+	Direct parent of a location row (nearest set field of PARENT_FIELDS)
+
+	Args:
+		row: Dict with name and the PARENT_FIELDS of a Store Location
+
+	Returns:
+		str: Parent location name, None for a root
+	"""
+	for field in PARENT_FIELDS:
+		if row.get(field) and row.get(field) != row.get("name"):
+			return row.get(field)
+	return None
+
+
+def get_location_descendants(location):
+	"""
+	A location and every location below it
+
+	Warehouses, zones, racks and shelves are found with one query on the
+	field their descendants carry (store, zone, rack, shelf). Other
+	locations fall back to walking parent_location, one query per level.
+
+	Returns:
+		list: Location names, the given location first
+	"""
+	location_type = frappe.db.get_value(LOCATION_DOCTYPE, location, "location_type")
+	field = DESCENDANT_FIELDS.get(location_type)
+	if field:
+		return [location, *frappe.get_all(
+			LOCATION_DOCTYPE,
+			filters={field: location, "name": ["!=", location]},
+			order_by="name asc",
+			pluck="name",
+		)]
+
+	descendants = [location]
+	seen = {location}
+	level = [location]
+
+	for _level in range(MAX_DEPTH):
+		children = frappe.get_all(
+			LOCATION_DOCTYPE,
+			filters={"parent_location": ["in", level]},
+			pluck="name",
+		)
+		level = [child for child in children if child not in seen]
+		if not level:
+			break
+		seen.update(level)
+		descendants.extend(level)
+
+	return descendants
+
+
+def clear_location_ancestor_cache():
+	"""
+	Forget all cached ancestor paths
+
+	Call it once the hierarchy change is committed (frappe.db.after_commit):
+	cleared earlier, a concurrent posting could cache the old path again
+	before the change becomes visible.
+	"""
+	frappe.cache.delete_value(ANCESTOR_CACHE_KEY)
+
+
+# ============================================================================
+# INCREMENTAL UPDATES
+# ============================================================================
+
+def get_rollup_deltas(sl_entries):
+	"""
+	Net quantity and value change per location of a posting
+
+	Returns:
+		dict: {location: (qty_delta, value_delta)}
+	"""
+	deltas = {}
+	for sle in sl_entries:
+		qty, value = deltas.get(sle.location, (0.0, 0.0))
+		deltas[sle.location] = (qty + flt(sle.actual_qty), value + flt(sle.stock_value_difference))
+	return deltas
+
+
+def apply_rollup_deltas(deltas):
+	"""
+	Add location deltas to the rollup rows of each location and its ancestors
+
+	Args:
+		deltas: {location: (qty_delta, value_delta)}
+	"""
+	deltas = {location: delta for location, delta in deltas.items() if delta[0] or delta[1]}
+	if not deltas:
+		return
+
+	node_deltas = {}
+	for location, path in get_location_ancestors(deltas).items():
+		qty, value = deltas[location]
+		for node in path:
+			node_qty, node_value = node_deltas.get(node, (0.0, 0.0))
+			node_deltas[node] = (node_qty + qty, node_value + value)
+
+	write_rollup_rows(
+		{node: {"total_qty": qty, "stock_value": value} for node, (qty, value) in node_deltas.items()},
+		increment=True,
+	)
+
+
+def move_location_rollup(location, old_parent, new_parent):
+	"""
+	Move a location's subtree totals from its old ancestors to its new ones
+
+	The rollup row of the location itself already holds its subtree total,
+	so only the two ancestor paths change. The cached ancestor paths are
+	cleared after commit (see clear_location_ancestor_cache).
+	"""
+	frappe.db.after_commit.add(clear_location_ancestor_cache)
+
+	row = frappe.db.get_value(ROLLUP_DOCTYPE, location, ["total_qty", "stock_value"], as_dict=True)
+
+	if not row or (not flt(row.total_qty) and not flt(row.stock_value)):
+		return
+
+	paths = get_location_ancestors([parent for parent in (old_parent, new_parent) if parent])
+
+	node_deltas = {}
+	for parent, sign in ((old_parent, -1), (new_parent, 1)):
+		for node in paths.get(parent, []) if parent else []:
+			qty, value = node_deltas.get(node, (0.0, 0.0))
+			node_deltas[node] = (qty + sign * flt(row.total_qty), value + sign * flt(row.stock_value))
+
+	write_rollup_rows(
+		{node: {"total_qty": qty, "stock_value": value} for node, (qty, value) in node_deltas.items()},
+		increment=True,
+	)
+
+
+def write_rollup_rows(values_by_location, increment=False):
+	"""
+	Upsert rollup rows in ascending name order with a single statement
+
+	Args:
+		values_by_location: {location: {"total_qty": float, "stock_value": float}}
+		increment: Add to the stored totals instead of replacing them
+	"""
+	if not values_by_location:
+		return
+
+	locations = sorted(values_by_location)
+	location_types = dict(frappe.get_all(
+		LOCATION_DOCTYPE,
+		filters={"name": ["in", locations]},
+		fields=["name", "location_type"],
+		as_list=True,
+	))
+
+	timestamp = now()
+	user = frappe.session.user
+	values = []
+	for location in locations:
+		row = values_by_location[location]
+		values.extend([
+			location, timestamp, timestamp, user, user, 0, 0,
+			location, location_types.get(location), flt(row["total_qty"]), flt(row["stock_value"]),
+		])
+
+	if increment:
+		updates = "`total_qty` = `total_qty` + VALUES(`total_qty`), `stock_value` = `stock_value` + VALUES(`stock_value`)"
+	else:
+		updates = "`total_qty` = VALUES(`total_qty`), `stock_value` = VALUES(`stock_value`)"
+
+	row_placeholder = "(" + ", ".join(["%s"] * len(ROLLUP_FIELDS)) + ")"
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tab{ROLLUP_DOCTYPE}` ({", ".join(f"`{field}`" for field in ROLLUP_FIELDS)})
+		VALUES {", ".join([row_placeholder] * len(locations))}
+		ON DUPLICATE KEY UPDATE `modified` = VALUES(`modified`), {updates}
+		""",
+		values,
+	)
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def get_location_stock(location):
+	"""
+	Quantity and value of a location including everything below it
+
+	Returns:
+		dict: {"total_qty": float, "stock_value": float}
+	"""
+	row = frappe.db.get_value(ROLLUP_DOCTYPE, location, ["total_qty", "stock_value"], as_dict=True) or {}
+	return {
+		"total_qty": flt(row.get("total_qty")),
+		"stock_value": flt(row.get("stock_value")),
+	}
+
+
+@frappe.whitelist()
+def get_location_rollup(location):
+	"""Whitelisted subtree stock lookup for dashboards and client scripts"""
+	frappe.has_permission(ROLLUP_DOCTYPE, "read", throw=True)
+	return get_location_stock(location)
+
+
+# ============================================================================
+# REBUILD
+# ============================================================================
+
+@frappe.whitelist()
+def rebuild_location_rollups():
+	"""
+	Reconstruct every rollup row from Store Stock Balance
+
+	One grouped read of the balance table, then the totals are pushed up
+	the hierarchy in memory and written in a single transaction.
+
+	Usage:
+		bench execute technical_store_system.utils.helpers.stock_rollup.rebuild_location_rollups
+
+	Returns:
+		dict: {"success": bool, "locations": int}
+	"""
+	frappe.only_for(["Store Manager", "System Manager"])
+	print("\n📊 Rebuilding location stock rollups...")
+
+	clear_location_ancestor_cache()
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT `location`, SUM(`actual_qty`) AS `qty`, SUM(`stock_value`) AS `value`
+		FROM `tab{BALANCE_DOCTYPE}`
+		GROUP BY `location`
+		""",
+		as_dict=True,
+	)
+
+	totals = {}
+	paths = get_location_ancestors([row.location for row in rows])
+	for row in rows:
+		for node in paths.get(row.location, [row.location]):
+			total = totals.setdefault(node, {"total_qty": 0.0, "stock_value": 0.0})
+			total["total_qty"] += flt(row.qty)
+			total["stock_value"] += flt(row.value)
+
+	frappe.db.sql(f"DELETE FROM `tab{ROLLUP_DOCTYPE}`")
+
+	locations = sorted(totals)
+	for start in range(0, len(locations), 5000):
+		chunk = locations[start:start + 5000]
+		write_rollup_rows({location: totals[location] for location in chunk})
+
+	frappe.db.commit()
+	print(f"  ✅ Rebuilt {len(totals)} rollup rows from {len(rows)} stocked locations")
+
+	return {"success": True, "locations": len(totals)}
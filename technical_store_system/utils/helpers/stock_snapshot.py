@@ -0,0 +1,369 @@
+"""
+Stock Snapshot Helper
+Periodic balance checkpoints and as-of-date stock queries
+
+Without snapshots, "stock as of 31 March" means summing the whole ledger up
+to that date. With them, an as-of query:
+
+1. Picks the latest snapshot on or before the requested date
+2. Adds the ledger delta between the snapshot and the requested date
+
+Snapshots are built incrementally as well: each one is the previous
+snapshot plus the ledger delta of its period (one GROUP BY per item chunk).
+
+A backdated posting changes the history behind existing snapshots. Its
+repost (utils/helpers/stock_repost.py) rebuilds the snapshots of that one
+item from the backdated date onwards - other items are left alone.
+
+Usage:
+	from technical_store_system.utils.helpers.stock_snapshot import get_stock_as_of
+
+	get_stock_as_of("2025-03-31", item_codes=["ITEM-00001"])
+	# {("ITEM-00001", "WH-1-Z-A-R01-S01-B-1", ""): {"qty": 12.0, "value": 54.0}}
+"""
+
+import hashlib
+import json
+
+import frappe
+from frappe.utils import add_days, flt, get_last_day, getdate, now, nowdate
+
+from technical_store_system.utils.helpers.stock_ledger import LEDGER_DOCTYPE, STANDARD_FIELDS
+
+
+SNAPSHOT_DOCTYPE = "Store Stock Snapshot"
+
+SNAPSHOT_FIELDS = [
+	*STANDARD_FIELDS,
+	"snapshot_date", "item_code", "total_qty", "total_value", "balances",
+]
+
+# Items rebuilt per query when a full snapshot is taken
+ITEM_CHUNK_SIZE = 1000
+
+LATEST_SNAPSHOT_CACHE_KEY = "technical_store_system:latest_stock_snapshot"
+
+# Balances closer to zero than this are left out of a snapshot
+QTY_TOLERANCE = 1e-9
+
+
+# ============================================================================
+# PERIODS
+# ============================================================================
+
+def get_snapshot_frequency():
+	"""Configured snapshot frequency (Monthly / Weekly / Daily / Disabled)"""
+	return frappe.db.get_single_value("Store Settings", "stock_snapshot_frequency") or "Monthly"
+
+
+def get_period_end_dates(from_date, to_date, frequency):
+	"""
+	Period end dates between two dates (inclusive)
+
+	Examples:
+		("2025-01-15", "2025-03-31", "Monthly") → [2025-01-31, 2025-02-28, 2025-03-31]
+		("2025-03-01", "2025-03-16", "Weekly")  → [2025-03-02, 2025-03-09, 2025-03-16]
+	"""
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	dates = []
+
+	current = from_date
+	while current <= to_date:
+		if frequency == "Daily":
+			end = current
+		elif frequency == "Weekly":
+			end = getdate(add_days(current, 6 - current.weekday()))  # Sunday
+		else:
+			end = getdate(get_last_day(current))
+
+		if end <= to_date:
+			dates.append(end)
+		current = getdate(add_days(end, 1))
+
+	return dates
+
+
+# ============================================================================
+# SCHEDULED SNAPSHOTS
+# ============================================================================
+
+def create_due_snapshots():
+	"""
+	Scheduler: take every snapshot whose period has fully ended
+
+	Usage:
+		bench execute technical_store_system.utils.helpers.stock_snapshot.create_due_snapshots
+	"""
+	frequency = get_snapshot_frequency()
+	if frequency == "Disabled":
+		return
+
+	previous_date = get_latest_snapshot_date()
+	if previous_date:
+		start = add_days(previous_date, 1)
+	else:
+		start = frappe.db.sql(f"SELECT MIN(`posting_date`) FROM `tab{LEDGER_DOCTYPE}`")[0][0]
+		if not start:
+			return
+
+	# Only completed periods - today may still receive postings
+	for snapshot_date in get_period_end_dates(start, add_days(nowdate(), -1), frequency):
+		build_snapshot(snapshot_date, previous_date)
+		frappe.db.commit()
+		previous_date = snapshot_date
+
+	clear_snapshot_cache()
+
+
+def build_snapshot(snapshot_date, previous_date=None, item_codes=None):
+	"""
+	Write the snapshot of snapshot_date from the previous snapshot + ledger delta
+
+	Args:
+		snapshot_date: End date of the period (inclusive)
+		previous_date: Date of the snapshot to start from (None = empty start)
+		item_codes: Restrict to these items (None = every item with stock history)
+	"""
+	if item_codes is None:
+		item_codes = get_items_with_history(snapshot_date, previous_date)
+
+	item_codes = sorted(set(item_codes))
+	for start in range(0, len(item_codes), ITEM_CHUNK_SIZE):
+		chunk = item_codes[start:start + ITEM_CHUNK_SIZE]
+
+		balances = load_snapshot_balances(previous_date, chunk) if previous_date else {}
+		for key, delta in get_ledger_delta(previous_date, snapshot_date, chunk).items():
+			balance = balances.setdefault(key, {"qty": 0.0, "value": 0.0})
+			balance["qty"] += delta["qty"]
+			balance["value"] += delta["value"]
+
+		write_snapshot_rows(snapshot_date, chunk, balances)
+
+
+def rebuild_item_snapshots(item_codes, from_date):
+	"""
+	Rebuild the snapshots of some items from a date onwards
+
+	Called after a backdated repost: only the touched items are recomputed,
+	every snapshot of every other item stays as it is.
+	"""
+	from_date = getdate(from_date)
+	snapshot_dates = frappe.db.sql_list(
+		f"""
+		SELECT DISTINCT `snapshot_date`
+		FROM `tab{SNAPSHOT_DOCTYPE}`
+		WHERE `snapshot_date` >= %s
+		ORDER BY `snapshot_date`
+		""",
+		from_date,
+	)
+	if not snapshot_dates:
+		return
+
+	previous_date = get_latest_snapshot_date(before=from_date)
+	for snapshot_date in snapshot_dates:
+		build_snapshot(snapshot_date, previous_date, item_codes)
+		previous_date = snapshot_date
+
+
+# ============================================================================
+# AS-OF QUERIES
+# ============================================================================
+
+def get_stock_as_of(as_of_date, item_codes=None, location=None):
+	"""
+	Stock quantity and value per (item, location, batch) at the end of a date
+
+	Args:
+		as_of_date: Date (inclusive)
+		item_codes: Restrict to these items (None = all items)
+		location: Restrict to one location
+
+	Returns:
+		dict: {(item_code, location, batch_no): {"qty": float, "value": float}}
+	"""
+	as_of_date = getdate(as_of_date)
+	snapshot_date = get_latest_snapshot_date(before=add_days(as_of_date, 1))
+
+	balances = load_snapshot_balances(snapshot_date, item_codes) if snapshot_date else {}
+	for key, delta in get_ledger_delta(snapshot_date, as_of_date, item_codes).items():
+		balance = balances.setdefault(key, {"qty": 0.0, "value": 0.0})
+		balance["qty"] += delta["qty"]
+		balance["value"] += delta["value"]
+
+	return {
+		key: balance
+		for key, balance in balances.items()
+		if (not location or key[1] == location) and abs(balance["qty"]) > QTY_TOLERANCE
+	}
+
+
+def get_stock_balance_as_of(item_code, location, as_of_date, batch_no=None):
+	"""
+	Quantity of one item in one location at the end of a date
+
+	Returns:
+		float: Quantity, 0 if the item had no stock there
+	"""
+	balances = get_stock_as_of(as_of_date, item_codes=[item_code], location=location)
+	return flt(balances.get((item_code, location, batch_no or ""), {}).get("qty"))
+
+
+@frappe.whitelist()
+def get_balance_as_of(item_code, location, as_of_date, batch_no=None):
+	"""Whitelisted as-of-date balance lookup for reports and client scripts"""
+	frappe.has_permission(LEDGER_DOCTYPE, "read", throw=True)
+	return get_stock_balance_as_of(item_code, location, as_of_date, batch_no)
+
+
+# ============================================================================
+# SNAPSHOT STORAGE
+# ============================================================================
+
+def get_latest_snapshot_date(before=None):
+	"""
+	Date of the latest snapshot (optionally strictly before a date)
+
+	The unrestricted lookup runs on every stock posting and is cached.
+	"""
+	if before is None:
+		return frappe.cache.get_value(LATEST_SNAPSHOT_CACHE_KEY, generator=_get_latest_snapshot_date)
+	return _get_latest_snapshot_date(before)
+
+
+def _get_latest_snapshot_date(before=None):
+	condition = "WHERE `snapshot_date` < %(before)s" if before else ""
+	latest = frappe.db.sql(
+		f"SELECT MAX(`snapshot_date`) FROM `tab{SNAPSHOT_DOCTYPE}` {condition}",
+		{"before": getdate(before) if before else None},
+	)[0][0]
+	return getdate(latest) if latest else None
+
+
+def clear_snapshot_cache():
+	"""Forget the cached latest snapshot date"""
+	frappe.cache.delete_value(LATEST_SNAPSHOT_CACHE_KEY)
+
+
+def load_snapshot_balances(snapshot_date, item_codes=None):
+	"""
+	Unpack the stored balances of one snapshot date
+
+	Returns:
+		dict: {(item_code, location, batch_no): {"qty": float, "value": float}}
+	"""
+	filters = {"snapshot_date": snapshot_date}
+	if item_codes is not None:
+		if not item_codes:
+			return {}
+		filters["item_code"] = ["in", list(item_codes)]
+
+	rows = frappe.get_all(SNAPSHOT_DOCTYPE, filters=filters, fields=["item_code", "balances"])
+
+	balances = {}
+	for row in rows:
+		for location, batch_no, qty, value in json.loads(row.balances or "[]"):
+			balances[(row.item_code, location, batch_no)] = {"qty": flt(qty), "value": flt(value)}
+	return balances
+
+
+def get_ledger_delta(after_date, to_date, item_codes=None):
+	"""
+	Net ledger movement per (item, location, batch) in (after_date, to_date]
+
+	Returns:
+		dict: {(item_code, location, batch_no): {"qty": float, "value": float}}
+	"""
+	conditions = ["`posting_date` <= %(to_date)s"]
+	values = {"to_date": getdate(to_date)}
+
+	if after_date:
+		conditions.append("`posting_date` > %(after_date)s")
+		values["after_date"] = getdate(after_date)
+
+	if item_codes is not None:
+		if not item_codes:
+			return {}
+		conditions.append("`item_code` IN %(item_codes)s")
+		values["item_codes"] = tuple(item_codes)
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT `item_code`, `location`, IFNULL(`batch_no`, '') AS `batch_no`,
+			SUM(`actual_qty`) AS `qty`, SUM(`stock_value_difference`) AS `value`
+		FROM `tab{LEDGER_DOCTYPE}`
+		WHERE {" AND ".join(conditions)}
+		GROUP BY `item_code`, `location`, IFNULL(`batch_no`, '')
+		""",
+		values,
+		as_dict=True,
+	)
+
+	return {
+		(row.item_code, row.location, row.batch_no): {"qty": flt(row.qty), "value": flt(row.value)}
+		for row in rows
+	}
+
+
+def get_items_with_history(snapshot_date, previous_date=None):
+	"""Items in the previous snapshot or moved since - the rows a full snapshot needs"""
+	items = set()
+	if previous_date:
+		items.update(frappe.get_all(
+			SNAPSHOT_DOCTYPE, filters={"snapshot_date": previous_date}, pluck="item_code"
+		))
+
+	conditions = ["`posting_date` <= %(to_date)s"]
+	values = {"to_date": getdate(snapshot_date)}
+	if previous_date:
+		conditions.append("`posting_date` > %(after_date)s")
+		values["after_date"] = getdate(previous_date)
+
+	items.update(frappe.db.sql_list(
+		f"SELECT DISTINCT `item_code` FROM `tab{LEDGER_DOCTYPE}` WHERE {' AND '.join(conditions)}",
+		values,
+	))
+	return items
+
+
+def write_snapshot_rows(snapshot_date, item_codes, balances):
+	"""Replace the snapshot rows of some items for one date"""
+	snapshot_date = getdate(snapshot_date)
+
+	per_item = {}
+	for (item_code, location, batch_no), balance in sorted(balances.items()):
+		if abs(balance["qty"]) <= QTY_TOLERANCE and abs(balance["value"]) <= QTY_TOLERANCE:
+			continue
+		per_item.setdefault(item_code, []).append(
+			[location, batch_no, flt(balance["qty"], 9), flt(balance["value"], 9)]
+		)
+
+	frappe.db.sql(
+		f"""
+		DELETE FROM `tab{SNAPSHOT_DOCTYPE}`
+		WHERE `snapshot_date` = %(snapshot_date)s AND `item_code` IN %(item_codes)s
+		""",
+		{"snapshot_date": snapshot_date, "item_codes": tuple(item_codes)},
+	)
+
+	timestamp = now()
+	user = frappe.session.user
+	values = [
+		(
+			get_snapshot_name(snapshot_date, item_code), timestamp, timestamp, user, user, 0, 0,
+			snapshot_date, item_code,
+			sum(row[2] for row in rows), sum(row[3] for row in rows),
+			json.dumps(rows, separators=(",", ":")),
+		)
+		for item_code, rows in per_item.items()
+	]
+	if values:
+		frappe.db.bulk_insert(SNAPSHOT_DOCTYPE, SNAPSHOT_FIELDS, values)
+
+
+def get_snapshot_name(snapshot_date, item_code):
+	"""Deterministic row name: "2025-03-31::ITEM-00001" (SHA-1 if too long)"""
+	name = f"{snapshot_date}::{item_code}"
+	if len(name) > 140:
+		name = hashlib.sha1(name.encode()).hexdigest()
+	return name
@@ -0,0 +1,197 @@
+"""
+Stock Transfer Helper
+Bulk location-to-location transfers ("move entire shelf")
+
+Moves every positive balance held in a source location and all locations
+below it into one target location. Instead of one stock entry line per
+item/batch, a transfer:
+
+1. Reads the stocked balance rows of the source subtree (one query)
+2. Locks source and target balance rows together in balance key order and
+   re-reads the quantities under the lock
+3. Posts all issue/receipt pairs as one posting through the shared ledger
+   core (post_stock_ledger_entries) - each receipt takes the outgoing rate
+   of its issue (incoming_rate_from), so value moves with the stock, and
+   snapshot/backdating, negative stock and rollups are handled as for any
+   other posting
+
+Everything happens in one transaction (savepoint). With preview=1 nothing is
+written and the lines that would move are returned instead.
+
+Usage:
+	transfer_location_stock("WH-1-Z-A-R01-S01", "WH-2-Z-B-R03-S02", preview=1)
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, nowdate, nowtime
+
+from technical_store_system.utils.helpers.stock_ledger import (
+	BALANCE_DOCTYPE,
+	get_balance_key,
+	lock_balances,
+	post_stock_ledger_entries
+)
+from technical_store_system.utils.helpers.stock_rollup import get_location_descendants
+
+
+VOUCHER_TYPE = "Location Transfer"
+
+# Lines returned by a preview (totals always cover everything)
+PREVIEW_LIMIT = 500
+
+
+@frappe.whitelist()
+def transfer_location_stock(source_location, target_location, preview=1):
+	"""
+	Move all stock of a location subtree into a target location
+
+	Args:
+		source_location: Root of the subtree to empty (shelf, rack, zone, ...)
+		target_location: Location receiving the stock (outside the subtree)
+		preview: 1 = only report what would move, 0 = post the transfer
+
+	Returns:
+		dict: {"success", "preview", "voucher_no", "lines", "line_count",
+			"total_qty", "total_value", "source_locations"}
+	"""
+	frappe.only_for(["Store Manager", "Inventory Admin", "System Manager"])
+
+	source_locations = validate_transfer(source_location, target_location)
+	candidates = get_transfer_candidates(source_locations)
+
+	if cint(preview):
+		return {
+			"success": True,
+			"preview": True,
+			"voucher_no": None,
+			"lines": [
+				{
+					"item_code": row.item_code,
+					"from_location": row.location,
+					"to_location": target_location,
+					"batch_no": row.batch_no,
+					"qty": flt(row.actual_qty),
+					"value": flt(row.stock_value),
+				}
+				for row in candidates[:PREVIEW_LIMIT]
+			],
+			"line_count": len(candidates),
+			"total_qty": sum(flt(row.actual_qty) for row in candidates),
+			"total_value": sum(flt(row.stock_value) for row in candidates),
+			"source_locations": len(source_locations),
+		}
+
+	return post_location_transfer(candidates, target_location, len(source_locations))
+
+
+def validate_transfer(source_location, target_location):
+	"""
+	Check both locations and return the source subtree
+
+	Returns:
+		list: Source location and all of its descendants
+	"""
+	for location in (source_location, target_location):
+		if not frappe.db.exists("Store Location", location):
+			frappe.throw(_("Store Location {0} does not exist").format(frappe.bold(location)))
+
+	if not frappe.db.get_value("Store Location", target_location, "enabled"):
+		frappe.throw(_("Target location {0} is disabled").format(frappe.bold(target_location)))
+
+	source_locations = get_location_descendants(source_location)
+	if target_location in source_locations:
+		frappe.throw(
+			_("Target location {0} is inside the source {1}").format(
+				frappe.bold(target_location), frappe.bold(source_location)
+			)
+		)
+
+	return source_locations
+
+
+def get_transfer_candidates(source_locations):
+	"""Positive balance rows of the source subtree, in balance key order"""
+	return frappe.db.sql(
+		f"""
+		SELECT `name`, `item_code`, `location`, IFNULL(`batch_no`, '') AS `batch_no`,
+			`actual_qty`, `stock_value`
+		FROM `tab{BALANCE_DOCTYPE}`
+		WHERE `location` IN %(locations)s AND `actual_qty` > 0
+		ORDER BY `name`
+		""",
+		{"locations": tuple(source_locations)},
+		as_dict=True,
+	)
+
+
+def post_location_transfer(candidates, target_location, source_location_count):
+	"""Post the issue/receipt pairs of a transfer as one ledger posting"""
+	if not candidates:
+		frappe.throw(_("There is no stock to transfer in the selected location"))
+
+	voucher_no = f"LT-{frappe.generate_hash(length=10)}"
+	posting_date, posting_time = nowdate(), nowtime()
+
+	savepoint = "store_location_transfer"
+	frappe.db.savepoint(savepoint)
+
+	try:
+		# Source and target keys are locked together in one sorted pass,
+		# so the quantities read below cannot change before they are posted
+		keys = []
+		for row in candidates:
+			keys.append(balance_ref(row.item_code, row.location, row.batch_no))
+			keys.append(balance_ref(row.item_code, target_location, row.batch_no))
+		balances = lock_balances(keys)
+
+		entries = []
+		for row in candidates:
+			qty = flt(balances[row.name].actual_qty)
+			if qty <= 0:
+				continue
+
+			line = {
+				"item_code": row.item_code,
+				"batch_no": row.batch_no,
+				"posting_date": posting_date,
+				"posting_time": posting_time,
+			}
+			entries.append({**line, "location": row.location, "actual_qty": -qty})
+			entries.append({
+				**line,
+				"location": target_location,
+				"actual_qty": qty,
+				"incoming_rate_from": len(entries),  # The issue just added
+			})
+
+		if not entries:
+			frappe.throw(_("There is no stock to transfer in the selected location"))
+
+		sl_entries = post_stock_ledger_entries(entries, VOUCHER_TYPE, voucher_no)
+
+	except Exception:
+		frappe.db.rollback(save_point=savepoint)
+		raise
+
+	issues = [sle for sle in sl_entries if sle.actual_qty < 0]
+	return {
+		"success": True,
+		"preview": False,
+		"voucher_no": voucher_no,
+		"lines": [],
+		"line_count": len(issues),
+		"total_qty": sum(-sle.actual_qty for sle in issues),
+		"total_value": sum(-sle.stock_value_difference for sle in issues),
+		"source_locations": source_location_count,
+	}
+
+
+def balance_ref(item_code, location, batch_no):
+	"""Minimal entry carrying a balance key, as accepted by lock_balances"""
+	return frappe._dict({
+		"item_code": item_code,
+		"location": location,
+		"batch_no": batch_no or "",
+		"balance_key": get_balance_key(item_code, location, batch_no),
+	})
@@ -0,0 +1,293 @@
+"""
+Stock Valuation Helper
+Incremental valuation state per Store Stock Balance row
+
+The state lives next to the quantity on the balance row (stock_queue) and is
+advanced one ledger entry at a time, so valuing an issue never re-reads
+ledger history.
+
+Supported methods (Store Item → valuation_method):
+- FIFO: queue of [qty, rate] bins, oldest consumed first
+- LIFO: same queue, newest consumed first
+- Moving Average: a single [qty, rate] bin re-averaged on every receipt
+
+Queue compaction never changes what an issue costs:
+- adjacent bins with the same rate are merged
+- empty bins are dropped
+
+A cap on the number of bins is opt-in (Store Settings → Max FIFO/LIFO Queue
+Bins): beyond it the bins consumed last are merged into a weighted average
+bin, so issues reaching them are costed at an averaged rate.
+"""
+
+import json
+
+import frappe
+from frappe.utils import cint, flt
+
+
+FIFO = "FIFO"
+LIFO = "LIFO"
+MOVING_AVERAGE = "Moving Average"
+
+DEFAULT_VALUATION_METHOD = FIFO
+
+# Cap on FIFO/LIFO bins kept per balance row (0 = none, queues stay exact)
+MAX_QUEUE_BINS = 0
+
+# Precision used for stored quantities, rates and values
+QTY_PRECISION = 9
+RATE_PRECISION = 9
+
+
+class QueueValuation:
+	"""FIFO/LIFO valuation over a queue of [qty, rate] bins (oldest first)"""
+
+	def __init__(self, queue=None, method=FIFO, max_bins=MAX_QUEUE_BINS):
+		self.queue = [[flt(qty), flt(rate)] for qty, rate in (queue or [])]
+		self.method = method
+		self.max_bins = max_bins
+
+	# ------------------------------------------------------------------
+	# State
+	# ------------------------------------------------------------------
+
+	@property
+	def qty(self):
+		return sum(qty for qty, rate in self.queue)
+
+	@property
+	def value(self):
+		return sum(qty * rate for qty, rate in self.queue)
+
+	def get_state(self):
+		"""Compact JSON-ready representation of the queue"""
+		return [
+			[flt(qty, QTY_PRECISION), flt(rate, RATE_PRECISION)]
+			for qty, rate in self.queue
+		]
+
+	# ------------------------------------------------------------------
+	# Movements
+	# ------------------------------------------------------------------
+
+	def add_stock(self, qty, rate):
+		"""Receive qty at rate; settles negative stock first"""
+		qty, rate = flt(qty), flt(rate)
+
+		# Negative bins (issued before receipt) are filled first
+		while qty > 0 and self.queue and self.queue[0][0] < 0:
+			negative_bin = self.queue[0]
+			filled = min(qty, -negative_bin[0])
+			negative_bin[0] += filled
+			qty -= filled
+			if not negative_bin[0]:
+				self.queue.pop(0)
+
+		if qty > 0:
+			if self.queue and self.queue[-1][1] == rate:
+				self.queue[-1][0] += qty
+			else:
+				self.queue.append([qty, rate])
+
+	def remove_stock(self, qty):
+		"""
+		Issue qty from the queue
+
+		Returns:
+			float: Value of the issued quantity
+		"""
+		qty = flt(qty)
+		outgoing_value = 0.0
+		last_rate = self.queue[-1][1] if self.queue else 0.0
+
+		while qty > 0 and self.queue:
+			index = 0 if self.method != LIFO else len(self.queue) - 1
+			stock_bin = self.queue[index]
+			if stock_bin[0] <= 0:
+				break
+
+			consumed = min(qty, stock_bin[0])
+			outgoing_value += consumed * stock_bin[1]
+			last_rate = stock_bin[1]
+			stock_bin[0] -= consumed
+			qty -= consumed
+
+			if not stock_bin[0]:
+				self.queue.pop(index)
+
+		if qty > 0:
+			# Issue beyond available stock: carry a negative bin at the last known rate
+			outgoing_value += qty * last_rate
+			if self.queue and self.queue[0][0] < 0:
+				self.queue[0][0] -= qty
+			else:
+				self.queue.insert(0, [-qty, last_rate])
+
+		return outgoing_value
+
+	# ------------------------------------------------------------------
+	# Compaction
+	# ------------------------------------------------------------------
+
+	def compact(self):
+		"""Merge equal-rate neighbours, drop empty bins, cap queue length if max_bins is set"""
+		compacted = []
+		for qty, rate in self.queue:
+			if not flt(qty, QTY_PRECISION):
+				continue
+			if compacted and flt(compacted[-1][1], RATE_PRECISION) == flt(rate, RATE_PRECISION) \
+					and (compacted[-1][0] > 0) == (qty > 0):
+				compacted[-1][0] += qty
+			else:
+				compacted.append([qty, rate])
+
+		# Merge the bins that will be consumed last (tail for FIFO, head for LIFO)
+		while self.max_bins and len(compacted) > self.max_bins:
+			if self.method == LIFO:
+				first, second = compacted[0], compacted[1]
+				compacted[0:2] = [merge_bins(first, second)]
+			else:
+				first, second = compacted[-2], compacted[-1]
+				compacted[-2:] = [merge_bins(first, second)]
+
+		self.queue = compacted
+
+
+class MovingAverageValuation:
+	"""Moving average valuation stored as a single [qty, rate] bin"""
+
+	def __init__(self, queue=None, method=MOVING_AVERAGE, max_bins=None):
+		qty, rate = (queue[0] if queue else (0.0, 0.0))
+		self._qty = flt(qty)
+		self.rate = flt(rate)
+
+	@property
+	def qty(self):
+		return self._qty
+
+	@property
+	def value(self):
+		return self._qty * self.rate
+
+	def get_state(self):
+		return [[flt(self._qty, QTY_PRECISION), flt(self.rate, RATE_PRECISION)]]
+
+	def add_stock(self, qty, rate):
+		qty, rate = flt(qty), flt(rate)
+		new_qty = self._qty + qty
+
+		if self._qty > 0 and new_qty > 0:
+			self.rate = (self._qty * self.rate + qty * rate) / new_qty
+		else:
+			# First receipt, or receipt still leaves stock negative/zero
+			self.rate = rate
+
+		self._qty = new_qty
+
+	def remove_stock(self, qty):
+		qty = flt(qty)
+		self._qty -= qty
+		return qty * self.rate
+
+	def compact(self):
+		pass
+
+
+def merge_bins(first, second):
+	"""Merge two bins into one weighted-average bin"""
+	qty = first[0] + second[0]
+	if not qty:
+		return [0.0, second[1]]
+	return [qty, (first[0] * first[1] + second[0] * second[1]) / qty]
+
+
+# ============================================================================
+# ENTRY POINTS
+# ============================================================================
+
+def get_valuation(method, stock_queue=None, max_bins=MAX_QUEUE_BINS):
+	"""
+	Build a valuation object from stored state
+
+	Args:
+		method: Store Item valuation_method (FIFO, LIFO, Moving Average)
+		stock_queue: Stored state (JSON string or list)
+		max_bins: FIFO/LIFO bin cap (see get_max_queue_bins), 0 for none
+
+	Returns:
+		QueueValuation | MovingAverageValuation
+	"""
+	queue = load_queue(stock_queue)
+	method = method or DEFAULT_VALUATION_METHOD
+
+	if method == MOVING_AVERAGE:
+		return MovingAverageValuation(queue)
+
+	return QueueValuation(queue, method=method, max_bins=max_bins)
+
+
+def get_max_queue_bins():
+	"""Opt-in FIFO/LIFO bin cap from Store Settings (0 = exact queues)"""
+	return cint(frappe.db.get_single_value("Store Settings", "valuation_queue_max_bins"))
+
+
+def load_queue(stock_queue):
+	"""Parse stored stock_queue (JSON text, list or empty)"""
+	if not stock_queue:
+		return []
+	if isinstance(stock_queue, str):
+		return json.loads(stock_queue)
+	return stock_queue
+
+
+def dump_queue(queue):
+	"""Serialize queue state compactly for storage"""
+	return json.dumps(queue, separators=(",", ":"))
+
+
+def apply_valuation(valuation, sle, fallback_rate=0.0):
+	"""
+	Advance valuation state by one ledger entry and fill its value fields
+
+	Sets on sle: incoming_rate (receipts), outgoing_rate (issues),
+	valuation_rate, stock_value, stock_value_difference
+
+	Args:
+		valuation: Object returned by get_valuation (mutated in place)
+		sle: Prepared ledger entry (frappe._dict)
+		fallback_rate: Rate for receipts that don't carry an incoming_rate
+
+	Returns:
+		float: stock_value_difference
+	"""
+	previous_value = valuation.value
+
+	if sle.actual_qty > 0:
+		rate = flt(sle.incoming_rate) if sle.incoming_rate not in (None, "") else flt(fallback_rate)
+		sle.incoming_rate = rate
+		valuation.add_stock(sle.actual_qty, rate)
+	else:
+		qty = -sle.actual_qty
+		outgoing_value = valuation.remove_stock(qty)
+		sle.outgoing_rate = outgoing_value / qty if qty else 0.0
+		sle.incoming_rate = 0.0
+
+	valuation.compact()
+
+	stock_value = valuation.value
+	stock_qty = valuation.qty
+
+	sle.stock_value = stock_value
+	sle.stock_value_difference = stock_value - previous_value
+	sle.valuation_rate = stock_value / stock_qty if stock_qty else get_last_rate(valuation, sle)
+
+	return sle.stock_value_difference
+
+
+def get_last_rate(valuation, sle):
+	"""Rate to report when quantity is zero (keeps the last known rate)"""
+	state = valuation.get_state()
+	if state:
+		return state[-1][1]
+	return flt(sle.incoming_rate or sle.outgoing_rate)
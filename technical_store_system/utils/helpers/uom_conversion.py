@@ -0,0 +1,266 @@
+"""
+UOM Conversion Helper
+Precomputed conversion closure over Store UOM and bulk quantity conversion
+
+Each Store UOM with has_conversion points at a base_uom with a factor
+(1 [UOM] = conversion_factor [base UOM]). Chains like Box → Pack → Piece used
+to need one lookup per hop. The closure is built once from all UOMs:
+
+1. Follow each UOM's base chain to the root of its group (cycles rejected)
+2. Factor of a UOM to its root = product of the factors along the chain
+3. factor(A → B) = to_root[A] / to_root[B] for every pair in the same group
+
+The closure is cached and rebuilt whenever a Store UOM changes
+(see utils/controllers/store_uom_controller.py).
+
+Usage:
+	from technical_store_system.utils.helpers.uom_conversion import convert_many
+
+	convert_many([2, 3, 10], ["Box", "Pack", "Piece"], "Piece")
+	# [48.0, 18.0, 10.0]
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import flt
+
+
+UOM_DOCTYPE = "Store UOM"
+CLOSURE_CACHE_KEY = "technical_store_system:uom_conversion_closure"
+
+# Converted quantities closer to an integer than this count as whole
+WHOLE_NUMBER_TOLERANCE = 1e-6
+
+
+# ============================================================================
+# CLOSURE
+# ============================================================================
+
+def get_conversion_closure():
+	"""
+	Cached conversion closure (built on first use after a UOM change)
+
+	Returns:
+		dict: {
+			"factors": {from_uom: {to_uom: factor}},
+			"whole_number": {uom: bool},
+			"errors": [str, ...],
+		}
+	"""
+	return frappe.cache.get_value(CLOSURE_CACHE_KEY, generator=build_conversion_closure)
+
+
+def refresh_conversion_closure():
+	"""Rebuild and cache the closure (called when UOMs change)"""
+	closure = build_conversion_closure()
+	frappe.cache.set_value(CLOSURE_CACHE_KEY, closure)
+	return closure
+
+
+def build_conversion_closure(uoms=None):
+	"""
+	Compute the factor between every pair of convertible UOMs
+
+	UOMs whose base chain runs into a cycle or a missing/invalid factor are
+	left out of their group and reported in "errors" instead.
+
+	Args:
+		uoms: Optional list of dicts (name, has_conversion, base_uom,
+			conversion_factor, must_be_whole_number); read from the DB if None
+	"""
+	if uoms is None:
+		uoms = frappe.get_all(
+			UOM_DOCTYPE,
+			fields=["name", "has_conversion", "base_uom", "conversion_factor", "must_be_whole_number"],
+		)
+
+	edges = {}
+	errors = []
+	for uom in uoms:
+		if uom.get("has_conversion") and uom.get("base_uom") and uom["base_uom"] != uom["name"]:
+			if flt(uom.get("conversion_factor")) <= 0:
+				errors.append(_("{0} has no valid conversion factor").format(uom["name"]))
+				continue
+			edges[uom["name"]] = (uom["base_uom"], flt(uom["conversion_factor"]))
+
+	to_root = {}
+	for uom in uoms:
+		resolve_root(uom["name"], edges, to_root, errors)
+
+	groups = {}
+	for uom, (root, factor) in to_root.items():
+		if root is not None:
+			groups.setdefault(root, {})[uom] = factor
+
+	factors = {}
+	for members in groups.values():
+		for from_uom, from_factor in members.items():
+			factors[from_uom] = {
+				to_uom: from_factor / to_factor for to_uom, to_factor in members.items()
+			}
+
+	return {
+		"factors": factors,
+		"whole_number": {uom["name"]: bool(uom.get("must_be_whole_number")) for uom in uoms},
+		"errors": errors,
+	}
+
+
+def resolve_root(uom, edges, to_root, errors):
+	"""
+	Walk a UOM's base chain to its root and memoise (root, factor) per UOM
+
+	A UOM on or behind a cycle resolves to (None, 0) and is reported once.
+	"""
+	path = []
+	on_path = set()
+	current = uom
+
+	while current not in to_root:
+		if current in on_path:
+			cycle = path[path.index(current):] + [current]
+			errors.append(_("Conversion cycle: {0}").format(" → ".join(cycle)))
+			for node in path:
+				to_root[node] = (None, 0.0)
+			return to_root[uom]
+
+		path.append(current)
+		on_path.add(current)
+		if current not in edges:
+			to_root[current] = (current, 1.0)
+			break
+		current = edges[current][0]
+
+	# Unwind: factor to root = own factor × base's factor to root
+	root, factor = to_root[current]
+	for node in reversed(path):
+		if node in to_root:
+			root, factor = to_root[node]
+			continue
+		base_factor = edges[node][1]
+		factor = factor * base_factor if root is not None else 0.0
+		to_root[node] = (root, factor)
+
+	return to_root[uom]
+
+
+def find_conversion_cycle(uom_name, base_uom):
+	"""
+	Return the cycle that setting uom_name → base_uom would create, if any
+
+	Returns:
+		list: UOM names forming the cycle, empty if none
+	"""
+	if not base_uom:
+		return []
+
+	bases = dict(frappe.get_all(
+		UOM_DOCTYPE,
+		filters={"has_conversion": 1, "base_uom": ["is", "set"]},
+		fields=["name", "base_uom"],
+		as_list=True,
+	))
+	bases[uom_name] = base_uom
+
+	path = [uom_name]
+	current = base_uom
+	while current in bases and current not in path:
+		path.append(current)
+		current = bases[current]
+
+	return path + [current] if current == uom_name else []
+
+
+# ============================================================================
+# CONVERSION
+# ============================================================================
+
+def get_conversion_factor(from_uom, to_uom):
+	"""
+	Factor so that qty [from_uom] × factor = qty [to_uom]
+
+	Raises:
+		frappe.ValidationError: If the two UOMs are not convertible
+	"""
+	if from_uom == to_uom:
+		return 1.0
+
+	factor = get_conversion_closure()["factors"].get(from_uom, {}).get(to_uom)
+	if factor is None:
+		frappe.throw(_("No conversion defined from {0} to {1}").format(frappe.bold(from_uom), frappe.bold(to_uom)))
+	return factor
+
+
+def convert_many(qtys, from_uoms, to_uom, validate_whole_numbers=True):
+	"""
+	Convert a whole array of transaction line quantities in one call
+
+	Factors are looked up once per distinct source UOM from the cached
+	closure; whole-number rules are checked for all lines together and
+	reported in one error.
+
+	Args:
+		qtys: List of quantities
+		from_uoms: List of source UOMs (same length) or one UOM for all lines
+		to_uom: Target UOM
+		validate_whole_numbers: Check must_be_whole_number of source and target UOMs
+
+	Returns:
+		list: Converted quantities, in line order
+	"""
+	qtys = [flt(qty) for qty in qtys]
+	if isinstance(from_uoms, str):
+		from_uoms = [from_uoms] * len(qtys)
+
+	if len(from_uoms) != len(qtys):
+		frappe.throw(_("Got {0} quantities but {1} UOMs").format(len(qtys), len(from_uoms)))
+
+	closure = get_conversion_closure()
+	target_factors = {uom: factors.get(to_uom) for uom, factors in closure["factors"].items()}
+	target_factors[to_uom] = 1.0
+
+	missing = sorted({uom for uom in from_uoms if target_factors.get(uom) is None})
+	if missing:
+		frappe.throw(
+			_("No conversion defined from {0} to {1}").format(
+				", ".join(frappe.bold(uom) for uom in missing), frappe.bold(to_uom)
+			)
+		)
+
+	converted = [flt(qty * target_factors[uom], 9) for qty, uom in zip(qtys, from_uoms)]
+
+	if validate_whole_numbers:
+		validate_whole_number_qtys(qtys, from_uoms, converted, to_uom, closure["whole_number"])
+
+	return converted
+
+
+def validate_whole_number_qtys(qtys, from_uoms, converted, to_uom, whole_number):
+	"""Throw once for every line that breaks a must_be_whole_number rule"""
+	errors = []
+	target_whole = whole_number.get(to_uom)
+
+	for idx, (qty, uom, result) in enumerate(zip(qtys, from_uoms, converted), start=1):
+		if whole_number.get(uom) and not is_whole(qty):
+			errors.append(_("Row {0}: {1} {2} must be a whole number").format(idx, qty, uom))
+		elif target_whole and not is_whole(result):
+			errors.append(
+				_("Row {0}: {1} {2} is {3} {4}, which must be a whole number").format(idx, qty, uom, result, to_uom)
+			)
+
+	if errors:
+		frappe.throw("<br>".join(errors), title=_("Whole Number Quantities Required"))
+
+
+def is_whole(qty):
+	"""True if qty is an integer within WHOLE_NUMBER_TOLERANCE"""
+	return abs(qty - round(qty)) <= WHOLE_NUMBER_TOLERANCE
+
+
+@frappe.whitelist()
+def convert_quantities(qtys, from_uoms, to_uom):
+	"""Whitelisted convert_many for client scripts (JSON arrays accepted)"""
+	frappe.has_permission(UOM_DOCTYPE, "read", throw=True)
+	if isinstance(from_uoms, str) and from_uoms.lstrip().startswith("["):
+		from_uoms = frappe.parse_json(from_uoms)
+	return convert_many(frappe.parse_json(qtys), from_uoms, to_uom)
@@ -0,0 +1,99 @@
+"""
+Stock Validator
+Negative-stock enforcement for stock ledger postings
+
+The effective allow_negative_stock flag of an item is resolved as:
+
+1. Store Item.allow_negative_stock
+2. Store Item Group.allow_negative_stock of the item's group
+   (groups inherit the flag from their parent when created)
+3. Store Settings.allow_negative_stock, or Store Settings.stock_validation off
+
+The first level that allows negative stock wins. Flags are resolved once
+per posting with two queries for all items, never per ledger line.
+
+Issues are checked against the running balance of the locked balance row
+(see lock_balances in utils/helpers/stock_ledger.py), so two concurrent
+postings cannot both take the last unit.
+
+Usage:
+	policy = get_negative_stock_policy({"ITEM-00001", "ITEM-00002"})
+	validate_negative_stock(sle, policy)
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import flt
+
+
+# Quantities closer to zero than this are treated as zero (float noise)
+QTY_TOLERANCE = 1e-9
+
+
+def get_negative_stock_policy(item_codes):
+	"""
+	Resolve the effective allow_negative_stock flag for a set of items
+
+	Args:
+		item_codes: Iterable of Store Item names
+
+	Returns:
+		dict: {item_code: bool} - True if the item may go below zero
+	"""
+	item_codes = list(set(item_codes))
+	if not item_codes:
+		return {}
+
+	settings = frappe.db.get_value(
+		"Store Settings", "Store Settings", ["allow_negative_stock", "stock_validation"], as_dict=True
+	) or frappe._dict()
+
+	if settings.allow_negative_stock or not settings.get("stock_validation", 1):
+		return {item_code: True for item_code in item_codes}
+
+	items = frappe.get_all(
+		"Store Item",
+		filters={"name": ["in", item_codes]},
+		fields=["name", "item_group", "allow_negative_stock"],
+	)
+
+	group_names = list({item.item_group for item in items if item.item_group})
+	groups_allowing = set()
+	if group_names:
+		groups_allowing = set(frappe.get_all(
+			"Store Item Group",
+			filters={"name": ["in", group_names], "allow_negative_stock": 1},
+			pluck="name",
+		))
+
+	policy = {item_code: False for item_code in item_codes}
+	for item in items:
+		policy[item.name] = bool(item.allow_negative_stock or item.item_group in groups_allowing)
+
+	return policy
+
+
+def validate_negative_stock(sle, policy):
+	"""
+	Reject an issue that takes its balance row below zero
+
+	Args:
+		sle: Ledger entry already applied to its balance (qty_after_transaction set)
+		policy: Result of get_negative_stock_policy
+	"""
+	if sle.actual_qty >= 0 or policy.get(sle.item_code):
+		return
+
+	if flt(sle.qty_after_transaction) < -QTY_TOLERANCE:
+		available = flt(sle.qty_after_transaction) - sle.actual_qty
+		frappe.throw(
+			_("Row {0}: Insufficient stock for {1} in {2}{3}. Available: {4}, required: {5}").format(
+				sle.idx,
+				frappe.bold(sle.item_code),
+				frappe.bold(sle.location),
+				_(" (batch {0})").format(sle.batch_no) if sle.batch_no else "",
+				flt(available),
+				flt(-sle.actual_qty),
+			),
+			title=_("Negative Stock Not Allowed"),
+		)